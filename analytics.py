@@ -0,0 +1,5 @@
+from app.analytics import main
+
+if __name__ == "__main__":
+    # 끝난 게임 분석 기록 샤드를 한 번 훑어 집계 (app/analytics.py)
+    main()
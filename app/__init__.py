@@ -1,8 +1,16 @@
 from flask import Flask
 from flask_socketio import SocketIO
 
+from app import logs
+from app.cluster import Cluster
+
+# MIGHTY_LOG_LEVEL, MIGHTY_LOG_SAMPLE (app/logs.py)
+logs.configure()
+
 app = Flask(__name__)
 app.config["SECRET_KEY"] = "your-secret-key"
-socketio = SocketIO(app)
+# 워커가 여럿이면 환경 변수의 메시지 큐로 서로 이벤트를 주고받는다 (app/cluster.py)
+cluster = Cluster.from_env()
+socketio = SocketIO(app, **cluster.socketio_options())
 
 from app import routes
@@ -0,0 +1,107 @@
+"""
+방 명령 실행기 (방마다 하나의 실행자)
+
+방 ID마다 명령 우편함(deque)이 있고, submit은 명령을 우편함에 넣은 뒤 방 ID로
+정해지는 레인의 큐에 그 우편함을 알린다. 레인은 백그라운드 작업 하나가
+큐에서 우편함을 꺼내 빌 때까지 명령을 차례로 실행한다.
+- 한 방의 명령은 항상 같은 레인에서 넣은 순서대로 하나씩 실행되므로 게임
+  상태를 바꾸는 코드에 잠금이 필요 없다
+- 다른 레인의 방들은 동시에 실행된다
+- 우편함은 명령이 있는 동안만 있다 (빈 우편함은 레인이 지움)
+- 큐와 작업은 Socket.IO 서버의 async 모드(threading, eventlet, gevent)에
+  맞는 것을 쓴다 (engineio create_queue, start_background_task)
+
+lanes가 0이면 submit이 명령을 바로 실행한다 (테스트, 벤치마크용).
+"""
+
+import logging
+import os
+import zlib
+from collections import deque
+from typing import Any, Callable, Dict, Iterable, List, Optional
+
+logger = logging.getLogger(__name__)
+
+ROOM_LANES = int(os.environ.get("MIGHTY_ROOM_LANES", "4"))
+
+
+class RoomExecutor:
+    def __init__(
+        self,
+        lanes: int = ROOM_LANES,
+        start_task: Optional[Callable] = None,
+        create_queue: Optional[Callable] = None,
+    ):
+        self.lanes = lanes
+        self.start_task = start_task
+        self.create_queue = create_queue
+        self.mailboxes: Dict[str, deque] = {}
+        self.queues: Optional[List] = None
+        self.processed = 0  # 실행한 명령 수
+
+    def start(self) -> None:
+        if self.queues is not None or self.lanes == 0:
+            return
+        self.queues = [self.create_queue() for _ in range(self.lanes)]
+        for queue in self.queues:
+            self.start_task(self._run, queue)
+
+    def submit(self, room_id: str, fn: Callable, *args) -> None:
+        """room_id의 우편함에 fn(*args)를 넣는다"""
+        if self.lanes == 0:
+            self._call(fn, args)
+            return
+        if self.queues is None:
+            self.start()
+        mailbox = self.mailboxes.get(room_id)
+        if mailbox is None:
+            mailbox = self.mailboxes.setdefault(room_id, deque())
+        mailbox.append((fn, args))
+        lane = zlib.crc32(room_id.encode()) % self.lanes
+        self.queues[lane].put((room_id, mailbox))
+
+    def gather(self, room_ids: Iterable[str], fn: Callable) -> Dict[str, Any]:
+        """
+        방마다 그 방의 실행자에서 fn(room_id)를 실행하고 결과를 모아 돌려준다
+        (레인 작업 안에서 부르면 안 된다: 자기 레인을 기다리게 됨)
+        """
+        room_ids = list(room_ids)
+        if self.lanes == 0:
+            return {room_id: fn(room_id) for room_id in room_ids}
+        results: Dict[str, Any] = {}
+        done = self.create_queue()
+
+        def run(room_id):
+            try:
+                results[room_id] = fn(room_id)
+            finally:
+                done.put(room_id)
+
+        for room_id in room_ids:
+            self.submit(room_id, run, room_id)
+        for _ in room_ids:
+            done.get()
+        return results
+
+    def backlog(self) -> int:
+        """아직 실행하지 않은 명령 수"""
+        return sum(len(mailbox) for mailbox in list(self.mailboxes.values()))
+
+    def _run(self, queue) -> None:
+        while True:
+            room_id, mailbox = queue.get()
+            # 같은 우편함이 여러 번 알려질 수 있다 (이미 비웠으면 바로 넘어감)
+            while mailbox:
+                fn, args = mailbox.popleft()
+                self._call(fn, args)
+            # 빈 우편함은 지운다. 그 사이 submit이 이 우편함에 넣었더라도 함께
+            # 알렸으므로 실행되고, 그 뒤의 명령은 새 우편함으로 같은 레인에 온다
+            if self.mailboxes.get(room_id) is mailbox and not mailbox:
+                self.mailboxes.pop(room_id, None)
+
+    def _call(self, fn: Callable, args: tuple) -> None:
+        try:
+            fn(*args)
+        except Exception:
+            logger.exception("[Actor] 명령 실패: %s", getattr(fn, "__name__", fn))
+        self.processed += 1
@@ -0,0 +1,405 @@
+"""
+끝난 게임의 분석 기록
+
+    python analytics.py analytics/            # 모든 샤드를 한 번 훑어 집계
+    python analytics.py analytics/ --json
+
+(python -m app.analytics로 실행하면 app 패키지가 routes를 통해 이 모듈을 먼저
+불러와 두 번 실행되므로 broker.py처럼 최상위 스크립트로 실행한다. 서버의
+저장소와 백그라운드 작업은 routes.init_server()만 시작하므로 집계 도구는
+파일을 만들거나 스레드를 띄우지 않는다.)
+
+게임이 끝날 때마다(MightyGame.on_game_over) game_row()가 한 판을 정수 열
+몇 개의 행으로 줄이고, GameRecorder가 메모리에 모았다가 SHARD_ROWS행이
+차거나 첫 행이 SHARD_AGE초 지나면 샤드 파일 하나로 쓴다 (방 저장과 같은
+write-behind, 게임 진행 중에는 디스크를 기다리지 않음). 샤드는 한 번 쓰면
+바꾸지 않는 열 단위 파일이다.
+- npz: 열마다 .npy 하나씩 (읽을 때 필요한 열만 불러옴, numpy 필요)
+- csv: 헤더 + 행 (표준 라이브러리만으로 씀, 서버 기본값)
+임시 파일에 쓰고 이름을 바꾸므로 읽는 쪽은 반쯤 쓴 샤드를 보지 않는다.
+파일 이름에 시작 시각과 pid가 들어가서 여러 워커/프로세스가 같은 디렉터리에
+써도 겹치지 않는다.
+
+집계(query)는 샤드를 하나씩 읽어 누적 배열에 더하고 버리므로 게임이 수백만
+판이어도 메모리는 샤드 하나 크기다.
+- 공약 점수 x 기루다별 주공팀 승률
+- 공약 점수별 주공(혼자)과 주공팀의 평균 득점
+- 프렌드 종류별 승률
+- 조커콜 효과: 조커가 끌려 나온 비율, 부른 쪽이 트릭을 이긴 비율
+"""
+
+import argparse
+import csv
+import glob
+import json
+import logging
+import os
+import threading
+import time
+from typing import Callable, Dict, List, Optional, Tuple
+
+from app.model.card import NORMAL_SUITS
+from app.model.mighty import MightyGame
+
+logger = logging.getLogger(__name__)
+
+SHARD_ROWS = 65536  # 샤드 하나의 최대 게임 수
+SHARD_AGE = 60.0  # 덜 찬 샤드라도 첫 행을 받고 이만큼(초) 지나면 쓴다
+FORMATS = ("npz", "csv")
+
+# (열 이름, numpy dtype), 샤드의 열 순서 (모두 한 바이트 정수)
+FIELDS: List[Tuple[str, str]] = [
+    ("bid", "i1"),  # 최종 공약 점수
+    ("giruda", "i1"),  # NORMAL_SUITS의 인덱스 (기루다 없음은 -1)
+    ("friend", "i1"),  # 프렌드 종류 (FRIEND_KINDS의 인덱스)
+    ("friend_card", "i1"),  # 프렌드 카드 ID (노프렌드는 -1)
+    ("president_points", "i1"),  # 주공이 먹은 점수
+    ("team_points", "i1"),  # 주공 + 프렌드가 먹은 점수
+    ("discard_points", "i1"),  # 주공이 버린 점수 카드 수
+    ("won", "i1"),  # 주공팀 승리
+    ("joker_calls", "i1"),  # 조커콜된 트릭 수
+    ("joker_drawn", "i1"),  # 그중 조커가 나온 트릭 수
+    ("joker_call_wins", "i1"),  # 그중 부른 쪽(주공팀/야당)이 이긴 트릭 수
+]
+COLUMNS = [name for name, _ in FIELDS]
+FRIEND_KINDS = ("none", "mighty", "joker", "giruda", "other")
+MAX_BID = 20
+
+Row = Tuple[int, ...]
+
+
+def game_row(game: MightyGame) -> Row:
+    """끝난 게임 한 판의 행 (FIELDS 순서)"""
+    president, friend = game.president_idx, game.friend_player_idx
+    team = {president, friend}
+    president_points = game.players[president].points
+    team_points = president_points
+    if friend is not None:
+        team_points += game.players[friend].points
+    bid = game.current_bid.score
+    joker_call_wins = sum(
+        (caller in team) == (winner in team) for caller, winner, _ in game.joker_calls
+    )
+    return (
+        bid,
+        NORMAL_SUITS.index(game.giruda) if game.giruda is not None else -1,
+        _friend_kind(game),
+        game.friend_card.id if game.friend_card is not None else -1,
+        president_points,
+        team_points,
+        sum(card.is_point_card() for card in game.discarded_cards),
+        int(team_points >= bid),
+        len(game.joker_calls),
+        sum(drawn for _, _, drawn in game.joker_calls),
+        joker_call_wins,
+    )
+
+
+def _friend_kind(game: MightyGame) -> int:
+    card = game.friend_card
+    if card is None:
+        return FRIEND_KINDS.index("none")
+    if card.is_mighty(game.giruda):
+        return FRIEND_KINDS.index("mighty")
+    if card.is_joker():
+        return FRIEND_KINDS.index("joker")
+    if card.suit == game.giruda:
+        return FRIEND_KINDS.index("giruda")
+    return FRIEND_KINDS.index("other")
+
+
+class GameRecorder:
+    """
+    끝난 게임의 행을 모았다가 샤드 파일로 쓰는 append-only 기록기
+    record()는 행을 버퍼에 넣기만 하고, 파일은 flush()가 쓴다
+    """
+
+    def __init__(
+        self,
+        directory: str,
+        fmt: str = "csv",
+        shard_rows: int = SHARD_ROWS,
+        max_age: float = SHARD_AGE,
+        prefix: Optional[str] = None,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        if fmt not in FORMATS:
+            raise ValueError(f"지원하지 않는 형식입니다: {fmt}")
+        self.directory = directory
+        self.fmt = fmt
+        self.shard_rows = shard_rows
+        self.max_age = max_age
+        self.prefix = prefix or f"{time.strftime('%Y%m%d%H%M%S')}-{os.getpid()}"
+        self.clock = clock
+        self.rows: List[Row] = []
+        self.started: Optional[float] = None  # 버퍼의 첫 행을 받은 시각
+        self.sequence = 0  # 다음 샤드 번호
+        self.written = 0  # 파일로 쓴 게임 수
+        # 여러 방의 실행자가 record하고 백그라운드 작업이 flush하므로 잠금으로 보호
+        self.lock = threading.Lock()
+
+    def __len__(self) -> int:
+        """아직 쓰지 않은 게임 수"""
+        return len(self.rows)
+
+    def record(self, game: MightyGame) -> None:
+        """MightyGame.on_game_over로 연결한다"""
+        row = game_row(game)
+        with self.lock:
+            if not self.rows:
+                self.started = self.clock()
+            self.rows.append(row)
+
+    def flush(self, force: bool = False) -> int:
+        """
+        찬 샤드를 쓰고(force거나 오래됐으면 덜 찬 샤드도) 쓴 게임 수를 돌려준다
+        쓰다가 실패하면 쓰지 못한 행을 버퍼 앞에 되돌리고 예외를 다시 던진다
+        """
+        with self.lock:
+            if not self.rows:
+                return 0
+            if force or self.clock() - self.started >= self.max_age:
+                cut = len(self.rows)
+            else:
+                cut = len(self.rows) - len(self.rows) % self.shard_rows
+            if cut == 0:
+                return 0
+            taken, self.rows = self.rows[:cut], self.rows[cut:]
+            # 남은 행은 이제부터 나이를 센다
+            self.started = self.clock() if self.rows else None
+            shards = []
+            for start in range(0, len(taken), self.shard_rows):
+                shards.append((self.sequence, taken[start : start + self.shard_rows]))
+                self.sequence += 1
+
+        written = 0
+        try:
+            os.makedirs(self.directory, exist_ok=True)
+            for sequence, rows in shards:
+                self._write(sequence, rows)
+                written += len(rows)
+        except Exception:
+            with self.lock:
+                self.rows[:0] = taken[written:]
+                if self.started is None:
+                    self.started = self.clock()
+            raise
+        self.written += written
+        return written
+
+    def close(self) -> None:
+        self.flush(force=True)
+
+    def _write(self, sequence: int, rows: List[Row]) -> None:
+        name = f"games-{self.prefix}-{sequence:06d}.{self.fmt}"
+        path = os.path.join(self.directory, name)
+        # 점으로 시작하는 임시 파일은 query가 읽지 않는다
+        temp = os.path.join(self.directory, f".{name}.tmp")
+        if self.fmt == "npz":
+            import numpy as np
+
+            columns = list(zip(*rows))
+            with open(temp, "wb") as f:
+                np.savez(
+                    f,
+                    **{
+                        field: np.array(column, dtype)
+                        for (field, dtype), column in zip(FIELDS, columns)
+                    },
+                )
+        else:
+            with open(temp, "w", newline="") as f:
+                writer = csv.writer(f)
+                writer.writerow(COLUMNS)
+                writer.writerows(rows)
+        os.replace(temp, path)
+        logger.debug("[Analytics] %s: %d게임", name, len(rows))
+
+
+def shard_paths(directory: str) -> List[str]:
+    """directory의 샤드 파일 (쓴 순서대로)"""
+    paths = []
+    for fmt in FORMATS:
+        paths += glob.glob(os.path.join(directory, f"games-*.{fmt}"))
+    return sorted(paths)
+
+
+def read_shard(path: str, columns: List[str]) -> Dict:
+    """샤드 하나의 columns 열 (열 이름 -> int64 배열)"""
+    import numpy as np
+
+    if path.endswith(".npz"):
+        with np.load(path) as shard:
+            return {name: shard[name].astype(np.int64) for name in columns}
+    with open(path, newline="") as f:
+        header = next(csv.reader(f))
+        table = np.loadtxt(f, np.int64, delimiter=",", ndmin=2)
+    return {name: table[:, header.index(name)] for name in columns}
+
+
+class Summary:
+    """샤드를 하나씩 더해 가는 집계 (크기는 게임 수와 상관없이 고정)"""
+
+    def __init__(self):
+        import numpy as np
+
+        giruda = len(NORMAL_SUITS) + 1  # 기루다 없음(-1)이 0번
+        self.games = np.zeros((MAX_BID + 1, giruda), np.int64)
+        self.wins = np.zeros((MAX_BID + 1, giruda), np.int64)
+        self.president_points = np.zeros(MAX_BID + 1, np.int64)
+        self.team_points = np.zeros(MAX_BID + 1, np.int64)
+        self.friend_games = np.zeros(len(FRIEND_KINDS), np.int64)
+        self.friend_wins = np.zeros(len(FRIEND_KINDS), np.int64)
+        self.joker = np.zeros(3, np.int64)  # 조커콜, 조커가 나옴, 부른 쪽이 이김
+        self.joker_games = 0  # 조커콜이 한 번이라도 있었던 게임
+        self.shards = 0
+
+    def add(self, shard: Dict) -> None:
+        import numpy as np
+
+        bid, giruda, won = shard["bid"], shard["giruda"] + 1, shard["won"]
+        cells = bid * self.games.shape[1] + giruda
+        size = self.games.size
+        self.games += np.bincount(cells, minlength=size).reshape(self.games.shape)
+        self.wins += (
+            np.bincount(cells, won, minlength=size)
+            .astype(np.int64)
+            .reshape(self.wins.shape)
+        )
+        for total, column in (
+            (self.president_points, "president_points"),
+            (self.team_points, "team_points"),
+        ):
+            total += np.bincount(bid, shard[column], minlength=MAX_BID + 1).astype(
+                np.int64
+            )
+        kinds = len(FRIEND_KINDS)
+        self.friend_games += np.bincount(shard["friend"], minlength=kinds)
+        self.friend_wins += np.bincount(shard["friend"], won, minlength=kinds).astype(
+            np.int64
+        )
+        self.joker += [
+            shard["joker_calls"].sum(),
+            shard["joker_drawn"].sum(),
+            shard["joker_call_wins"].sum(),
+        ]
+        self.joker_games += int((shard["joker_calls"] > 0).sum())
+        self.shards += 1
+
+    def to_dict(self) -> Dict:
+        games = int(self.games.sum())
+        by_bid = self.games.sum(axis=1)
+        giruda_names = ["none"] + [suit.name for suit in NORMAL_SUITS]
+        calls, drawn, call_wins = (int(n) for n in self.joker)
+        return {
+            "games": games,
+            "shards": self.shards,
+            "win_rate": _rate(int(self.wins.sum()), games),
+            "win_rate_by_bid_giruda": {
+                str(bid): {
+                    giruda_names[g]: _rate(int(self.wins[bid, g]), int(n))
+                    for g, n in enumerate(self.games[bid])
+                    if n
+                }
+                for bid in range(MAX_BID + 1)
+                if by_bid[bid]
+            },
+            "games_by_bid": {str(bid): int(n) for bid, n in enumerate(by_bid) if n},
+            "president_points_by_bid": {
+                str(bid): _mean(int(self.president_points[bid]), int(n))
+                for bid, n in enumerate(by_bid)
+                if n
+            },
+            "team_points_by_bid": {
+                str(bid): _mean(int(self.team_points[bid]), int(n))
+                for bid, n in enumerate(by_bid)
+                if n
+            },
+            "president_points": _mean(int(self.president_points.sum()), games),
+            "friend": {
+                kind: {
+                    "games": int(n),
+                    "win_rate": _rate(int(self.friend_wins[i]), int(n)),
+                }
+                for i, (kind, n) in enumerate(zip(FRIEND_KINDS, self.friend_games))
+                if n
+            },
+            "joker_call": {
+                "calls": calls,
+                "games": self.joker_games,
+                "drawn_rate": _rate(drawn, calls),
+                "caller_win_rate": _rate(call_wins, calls),
+            },
+        }
+
+
+def summarize(paths: List[str]) -> Summary:
+    """샤드를 한 번씩만, 하나씩 읽어 집계"""
+    summary = Summary()
+    for path in paths:
+        summary.add(read_shard(path, COLUMNS))
+    return summary
+
+
+def print_report(report: Dict) -> None:
+    games = report["games"]
+    print(f"게임 수: {games:,} (샤드 {report['shards']}개)")
+    if not games:
+        return
+    print(f"주공팀 승률: {report['win_rate']:.3f}")
+    print(f"주공 평균 득점: {report['president_points']:.2f}")
+    giruda_names = ["none"] + [suit.name for suit in NORMAL_SUITS]
+    print()
+    print(
+        f"{'공약':>4} | {'게임':>10} | {'주공':>5} | {'주공팀':>5} | "
+        + " | ".join(f"{name:>7}" for name in giruda_names)
+    )
+    for bid, n in report["games_by_bid"].items():
+        rates = report["win_rate_by_bid_giruda"][bid]
+        cells = [
+            f"{rates[name]:>7.3f}" if name in rates else f"{'-':>7}"
+            for name in giruda_names
+        ]
+        print(
+            f"{bid:>4} | {n:>10,} | {report['president_points_by_bid'][bid]:>5.2f} | "
+            f"{report['team_points_by_bid'][bid]:>5.2f} | " + " | ".join(cells)
+        )
+    print()
+    for kind, entry in report["friend"].items():
+        print(f"프렌드 {kind}: {entry['games']:,}게임, 승률 {entry['win_rate']:.3f}")
+    joker = report["joker_call"]
+    if joker["calls"]:
+        print(
+            f"조커콜: {joker['calls']:,}번 ({joker['games']:,}게임), "
+            f"조커가 나옴 {joker['drawn_rate']:.3f}, "
+            f"부른 쪽이 이김 {joker['caller_win_rate']:.3f}"
+        )
+
+
+def _rate(wins: int, games: int) -> Optional[float]:
+    return round(wins / games, 3) if games else None
+
+
+def _mean(total: int, count: int) -> Optional[float]:
+    return round(total / count, 2) if count else None
+
+
+def main():
+    parser = argparse.ArgumentParser(description="끝난 게임 분석 기록 집계")
+    parser.add_argument("directory", help="샤드 디렉터리 (MIGHTY_ANALYTICS_DIR)")
+    parser.add_argument("--json", action="store_true", help="JSON으로 출력")
+    args = parser.parse_args()
+
+    started = time.perf_counter()
+    report = summarize(shard_paths(args.directory)).to_dict()
+    if args.json:
+        print(json.dumps(report, ensure_ascii=False, indent=2))
+        return
+    print_report(report)
+    elapsed = time.perf_counter() - started
+    if report["games"]:
+        print(f"\n{elapsed:.2f}s ({report['games'] / elapsed:,.0f} games/sec)")
+
+
+if __name__ == "__main__":
+    main()
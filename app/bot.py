@@ -0,0 +1,243 @@
+"""
+서버 측 봇 플레이어
+
+빈 자리를 채우는 봇은 보이지 않는 카드(다른 플레이어의 패, kitty, 버린
+카드)를 무작위로 나눠 본 가상의 판(determinization)들에서 GreedyPolicy로
+끝까지 두어 보고(rollout), 평균 결과가 가장 좋은 결정을 고른다.
+결정 하나에 쓰는 시간은 budget초로 제한된다.
+
+탐색은 app.bot_pool.BotPool의 워커 프로세스에서 돌아가므로 한 방의 봇이
+생각하는 동안에도 이벤트 루프는 다른 방의 소켓 이벤트를 계속 처리한다.
+"""
+
+import copy
+import random
+import time
+from collections import defaultdict
+from typing import Dict, List, Tuple
+
+from app.model.bitboard import FULL_MASK, cards_of
+from app.model.card import Card, Suit, NORMAL_SUITS
+from app.model.mighty import Bid, MightyGame, MIN_BID
+from app.sim import GreedyPolicy, Move, play_tricks, president_team_points
+from app.bot_pool import BOT_BUDGET
+
+# (페이즈, 결정 내용)
+Decision = Tuple[str, tuple]
+
+
+def _deal_unseen(
+    game: MightyGame, unseen: int, sizes: Dict[int, int], rng: random.Random
+) -> Tuple[Dict[int, List[Card]], List[Card]]:
+    """
+    보이지 않는 카드를 sizes만큼 각 플레이어에게 나눠 주고 남은 카드를 돌려준다
+    아직 공개되지 않은 프렌드 카드는 주공이 아닌 플레이어의 패에 있어야 한다
+    """
+    cards = cards_of(unseen)
+    friend = game.friend_card
+    while True:
+        rng.shuffle(cards)
+        hands = {}
+        start = 0
+        for seat, size in sizes.items():
+            hands[seat] = cards[start : start + size]
+            start += size
+        rest = cards[start:]
+        if friend is None or not unseen & friend.bit:
+            return hands, rest
+        holder = next((s for s, h in hands.items() if friend in h), None)
+        if holder is not None and holder != game.president_idx:
+            return hands, rest
+
+
+def determinize(game: MightyGame, idx: int, rng: random.Random) -> MightyGame:
+    """
+    idx 플레이어가 볼 수 있는 정보만 남기고 나머지 카드를 무작위로 채운 게임
+    (playing / friend_selection 페이즈용)
+    """
+    own = game.players[idx].mask
+    seen = own | game.played_mask
+    if idx == game.president_idx:
+        seen |= game.discarded_mask
+    sizes = {
+        seat: len(player.cards)
+        for seat, player in enumerate(game.players)
+        if seat != idx
+    }
+    hands, rest = _deal_unseen(game, FULL_MASK & ~seen, sizes, rng)
+
+    sample = copy.deepcopy(game)
+    for seat, hand in hands.items():
+        sample.players[seat].cards = hand
+    if idx != game.president_idx:
+        sample.discarded_cards = rest
+        sample.discarded_mask = 0
+        for card in rest:
+            sample.discarded_mask |= card.bit
+    friend = sample.friend_card
+    if friend is not None and not sample.played_mask & friend.bit:
+        sample.friend_player_idx = next(
+            (s for s, p in enumerate(sample.players) if p.mask & friend.bit), None
+        )
+    return sample
+
+
+class MonteCarloBot(GreedyPolicy):
+    """
+    determinized Monte Carlo rollout으로 공약, 프렌드, 카드를 고르는 정책
+    버리기는 GreedyPolicy의 휴리스틱을, rollout 중의 모든 플레이어는
+    GreedyPolicy를 사용한다
+    """
+
+    def __init__(self, rng: random.Random, budget: float = BOT_BUDGET):
+        super().__init__(rng)
+        self.budget = budget
+        self.rollout_policies = [GreedyPolicy(rng) for _ in range(5)]
+        self.rollouts = 0
+
+    def _value(self, game: MightyGame, idx: int) -> int:
+        """끝난 게임에서 idx 플레이어 쪽에서 본 주공팀 점수"""
+        points = president_team_points(game)
+        team = (game.president_idx, game.friend_player_idx)
+        return points if idx in team else -points
+
+    def _search(self, candidates: list, sample, apply) -> list:
+        """
+        시간이 남는 동안 가상의 판을 하나 뽑아 모든 후보를 rollout 해 보고
+        후보를 평균 값이 높은 순서로 돌려준다
+        sample() -> 가상의 판, apply(판, 후보) -> idx 쪽에서 본 값
+        """
+        if len(candidates) <= 1:
+            return candidates
+        totals = defaultdict(int)
+        deadline = time.perf_counter() + self.budget
+        samples = 0
+        while samples == 0 or time.perf_counter() < deadline:
+            base = sample()
+            for i, candidate in enumerate(candidates):
+                totals[i] += apply(copy.deepcopy(base), candidate)
+                self.rollouts += 1
+            samples += 1
+        order = sorted(range(len(candidates)), key=lambda i: -totals[i])
+        return [candidates[i] for i in order]
+
+    def bid(self, game, idx):
+        score = game.current_bid.score + 1 if game.current_bid else MIN_BID
+        if score > 20:
+            return None, None
+        own = game.players[idx].mask
+        sizes = {seat: 10 for seat in range(5) if seat != idx}
+        totals = defaultdict(int)
+        samples = 0
+
+        def sample():
+            hands, kitty = _deal_unseen(game, FULL_MASK & ~own, sizes, self.rng)
+            hands[idx] = game.players[idx].cards
+            return hands, kitty
+
+        def apply(deal, suit):
+            hands, kitty = deal
+            trial = MightyGame(game.dealer)
+            for seat in range(5):
+                trial.add_player(game.players[seat].name)
+                trial.players[seat].cards = hands[seat]
+            trial.kitty = kitty
+            for card in kitty:
+                trial.kitty_mask |= card.bit
+            trial.current_bid = Bid(idx, score, suit)
+            trial.president_idx = idx
+            trial.current_player_idx = idx
+            trial.giruda = suit
+            trial.phase = "discarding"
+            policy = self.rollout_policies[idx]
+            trial.discard_cards(idx, policy.discard(trial, idx))
+            trial.modify_final_bid(idx, None, None)
+            friend_suit, friend_rank = policy.friend(trial, idx)
+            trial.select_friend(idx, friend_suit, friend_rank)
+            play_tricks(trial, self.rollout_policies)
+            return president_team_points(trial)
+
+        deadline = time.perf_counter() + self.budget
+        while samples == 0 or time.perf_counter() < deadline:
+            deal = sample()
+            for suit in NORMAL_SUITS:
+                totals[suit] += apply(deal, suit)
+                self.rollouts += 1
+            samples += 1
+        suit = max(NORMAL_SUITS, key=lambda s: totals[s])
+        # 주공이 되었을 때 기대 점수가 다음 공약 이상이면 공약한다
+        if totals[suit] / samples >= score:
+            return score, suit
+        return None, None
+
+    def friend(self, game, idx):
+        own = game.players[idx].mask
+        candidates = []
+        for card in (
+            Card(Suit.DIAMOND if game.giruda == Suit.SPADE else Suit.SPADE, 14),
+            Card(Suit.JOKER, 0),
+            Card(game.giruda, 14),
+            Card(game.giruda, 13),
+            Card(game.giruda, 12),
+        ):
+            if not own & card.bit and not game.discarded_mask & card.bit:
+                candidates.append(card)
+
+        def apply(trial, card):
+            trial.select_friend(idx, card.suit, card.rank)
+            play_tricks(trial, self.rollout_policies)
+            return self._value(trial, idx)
+
+        best = self._search(candidates, lambda: determinize(game, idx, self.rng), apply)
+        if not best:
+            return super().friend(game, idx)
+        return best[0].suit, best[0].rank
+
+    def play(self, game, idx):
+        candidates: List[Move] = []
+        live_joker = not game.played_mask & Card(Suit.JOKER, 0).bit
+        for card in game.legal_moves(idx):
+            if not game.current_trick and card.is_joker():
+                candidates.extend((card, suit, False) for suit in NORMAL_SUITS)
+            elif (
+                not game.current_trick
+                and card.suit == Suit.CLOVER
+                and card.rank == 3
+                and live_joker
+            ):
+                candidates.append((card, None, True))
+                candidates.append((card, None, False))
+            else:
+                candidates.append((card, None, False))
+
+        def apply(trial, move):
+            trial.play_card(idx, *move)
+            play_tricks(trial, self.rollout_policies)
+            return self._value(trial, idx)
+
+        yield from self._search(
+            candidates, lambda: determinize(game, idx, self.rng), apply
+        )
+
+
+def decide(game: MightyGame, idx: int, seed: int, budget: float) -> Decision:
+    """
+    워커 프로세스에서 idx 플레이어의 다음 결정을 계산한다
+    Returns:
+        ("bidding", (점수, 무늬)), ("discarding", (버릴 카드들,)),
+        ("modify_bid", (점수, 무늬)), ("friend_selection", (무늬, 숫자)),
+        ("playing", (카드, 조커 무늬, 조커콜 여부))
+    """
+    bot = MonteCarloBot(random.Random(seed), budget)
+    phase = game.phase
+    if phase == "bidding":
+        return phase, bot.bid(game, idx)
+    if phase == "discarding":
+        return phase, (bot.discard(game, idx),)
+    if phase == "modify_bid":
+        return phase, bot.modify_bid(game, idx)
+    if phase == "friend_selection":
+        return phase, bot.friend(game, idx)
+    if phase == "playing":
+        return phase, next(iter(bot.play(game, idx)))
+    raise ValueError(f"봇이 결정할 수 없는 페이즈입니다: {phase}")
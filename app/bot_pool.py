@@ -0,0 +1,77 @@
+"""
+봇 결정을 맡는 워커 풀
+
+routes에서 바로 쓰는 부분만 모아 두고, 실제 탐색 코드(app.bot)는 처음
+결정을 맡길 때 불러온다. 그래서 app 패키지를 import해도 app.sim이 함께
+올라오지 않아 `python -m app.sim`이 자기 자신을 두 번 불러오지 않는다.
+"""
+
+import random
+from collections import defaultdict
+from concurrent.futures import Future, ProcessPoolExecutor
+from typing import Dict, Optional, Tuple
+
+from app.model.mighty import MightyGame
+
+BOT_BUDGET = 1.0  # 결정 하나에 쓰는 시간(초)
+BOT_WORKERS = 2
+
+
+def acting_player_idx(game: MightyGame) -> Optional[int]:
+    """지금 결정을 내려야 하는 플레이어 인덱스 (없으면 None)"""
+    if game.phase in ("bidding", "playing"):
+        return game.current_player_idx
+    if game.phase in ("discarding", "modify_bid", "friend_selection"):
+        return game.president_idx
+    return None
+
+
+class BotPool:
+    """
+    봇 결정을 계산하는 프로세스 풀
+    방마다 세대(generation) 번호를 두고, 새 결정을 맡기거나 방이 정리되면
+    세대를 올려서 이전 결정을 취소한다. 아직 시작하지 않은 작업은 풀에서
+    빠지고, 이미 돌고 있는 작업은 budget 안에 끝난 뒤 결과가 버려진다.
+    """
+
+    def __init__(self, workers: int = BOT_WORKERS, budget: float = BOT_BUDGET):
+        self.workers = workers
+        self.budget = budget
+        self.executor: Optional[ProcessPoolExecutor] = None
+        self.generations: Dict[str, int] = defaultdict(int)
+        self.pending: Dict[str, Future] = {}
+
+    def submit(self, room_id: str, game: MightyGame, idx: int) -> Tuple[int, Future]:
+        """idx 플레이어의 결정을 맡기고 (세대, Future)를 돌려준다"""
+        if self.executor is None:
+            self.executor = ProcessPoolExecutor(self.workers)
+        generation = self.cancel(room_id)
+        # 탐색 코드(app.bot -> app.sim)는 워커를 처음 쓸 때 불러온다
+        from app.bot import decide
+
+        future = self.executor.submit(
+            decide, game, idx, random.getrandbits(32), self.budget
+        )
+        self.pending[room_id] = future
+        return generation, future
+
+    def cancel(self, room_id: str) -> int:
+        """room_id의 진행 중인 결정을 취소하고 새 세대 번호를 돌려준다"""
+        future = self.pending.pop(room_id, None)
+        if future is not None:
+            future.cancel()
+        self.generations[room_id] += 1
+        return self.generations[room_id]
+
+    def is_current(self, room_id: str, generation: int) -> bool:
+        return self.generations.get(room_id) == generation
+
+    def release(self, room_id: str) -> None:
+        """정리된 방의 결정을 취소하고 세대 번호를 지운다"""
+        self.cancel(room_id)
+        del self.generations[room_id]
+
+    def shutdown(self):
+        if self.executor is not None:
+            self.executor.shutdown(wait=False, cancel_futures=True)
+            self.executor = None
@@ -0,0 +1,356 @@
+"""
+여러 워커(프로세스, 호스트)로 나눠 띄우는 배포 모드
+
+    MIGHTY_MESSAGE_QUEUE  워커들이 공유하는 Socket.IO 메시지 큐 URL
+                          (redis://, kafka://, zmq+tcp://, amqp:// 등, 테스트용은 local://)
+    MIGHTY_WORKER_ID      이 워커의 ID
+    MIGHTY_WORKERS        모든 워커의 "ID=URL" 목록 (쉼표 구분, URL은 생략 가능)
+
+방은 consistent hash로 한 워커(주인)에 고정되어 게임 상태, 봇, 저장은
+주인 워커에서만 처리한다.
+- emit(room=...)은 메시지 큐를 거쳐 모든 워커에 붙은 연결로 간다
+- 다른 워커에 붙은 연결이 보낸 방 명령은 메시지 큐로 주인 워커에 넘긴다
+- 방/게임 페이지는 주인 워커 URL로 리다이렉트해서 소켓도 주인에 붙게 한다
+
+워커를 더하거나 빼도 consistent hash라 대부분의 방은 주인이 바뀌지 않는다.
+local:// 큐는 Redis 없이 여러 프로세스를 띄워 보기 위한 작은 pub/sub
+브로커로, 다음처럼 따로 실행한다.
+
+    python broker.py --port 6390
+
+eventlet, gevent로 띄울 때 local:// 큐는 monkey_patch 없이 돌지만
+redis://, amqp:// 등의 매니저는 monkey_patch를 요구한다.
+"""
+
+import argparse
+import bisect
+import hashlib
+import json
+import os
+import socket
+import struct
+import threading
+import urllib.parse
+from typing import Callable, Dict, Iterator, List, Optional
+
+import socketio
+
+REPLICAS = 64  # 워커 하나가 링에 차지하는 점 수
+COMMAND = "mighty_command"  # 주인 워커로 넘기는 방 명령 메시지
+CHANNEL = "flask-socketio"  # Flask-SocketIO 기본 채널
+
+_LENGTH = struct.Struct(">I")
+
+
+def _hash(key: str) -> int:
+    return int.from_bytes(hashlib.md5(key.encode()).digest()[:8], "big")
+
+
+class HashRing:
+    """consistent hash 링: 키 -> 노드"""
+
+    def __init__(self, nodes: List[str], replicas: int = REPLICAS):
+        points = sorted(
+            (_hash(f"{node}#{i}"), node) for node in nodes for i in range(replicas)
+        )
+        self.nodes = sorted(nodes)
+        self._keys = [point for point, _ in points]
+        self._nodes = [node for _, node in points]
+
+    def owner(self, key: str) -> str:
+        i = bisect.bisect(self._keys, _hash(key)) % len(self._keys)
+        return self._nodes[i]
+
+
+class Cluster:
+    """이 워커의 ID와 방 주인 디렉터리"""
+
+    def __init__(
+        self,
+        worker_id: str = "main",
+        workers: Optional[Dict[str, str]] = None,
+        message_queue: Optional[str] = None,
+    ):
+        self.worker_id = worker_id
+        self.workers = workers or {worker_id: ""}  # {ID: URL}
+        if worker_id not in self.workers:
+            raise ValueError(f"워커 목록에 {worker_id}가 없습니다")
+        self.message_queue = message_queue
+        self.ring = HashRing(list(self.workers))
+        # 다른 워커가 넘긴 방 명령을 처리하는 함수 (routes에서 설정)
+        self.on_command: Optional[Callable[[Dict], None]] = None
+        self.manager = None  # 메시지 큐 매니저 (여러 워커일 때)
+
+    @classmethod
+    def from_env(cls) -> "Cluster":
+        workers = {}
+        for entry in os.environ.get("MIGHTY_WORKERS", "").split(","):
+            if entry.strip():
+                worker_id, _, url = entry.strip().partition("=")
+                workers[worker_id] = url.rstrip("/")
+        worker_id = os.environ.get("MIGHTY_WORKER_ID") or next(iter(workers), "main")
+        message_queue = os.environ.get("MIGHTY_MESSAGE_QUEUE") or None
+        return cls(worker_id, workers or None, message_queue)
+
+    @property
+    def enabled(self) -> bool:
+        return len(self.workers) > 1
+
+    def owner(self, room_id: str) -> str:
+        return self.ring.owner(room_id)
+
+    def is_local(self, room_id: str) -> bool:
+        return not self.enabled or self.owner(room_id) == self.worker_id
+
+    def url_for(self, room_id: str) -> str:
+        """방 주인 워커의 URL (모르면 빈 문자열)"""
+        return self.workers[self.owner(room_id)]
+
+    def socketio_options(self) -> Dict:
+        """SocketIO(app, **options)에 넘길 메시지 큐 설정"""
+        if not self.message_queue:
+            if self.enabled:
+                raise ValueError(
+                    "여러 워커로 띄우려면 MIGHTY_MESSAGE_QUEUE가 필요합니다"
+                )
+            return {}
+        self.manager = make_manager(self.message_queue, self)
+        return {"client_manager": self.manager}
+
+    def forward(self, room_id: str, event: str, data, sid: str, **extra) -> None:
+        """방 명령을 주인 워커로 넘긴다"""
+        self.manager._publish(
+            {
+                "method": COMMAND,
+                "worker": self.owner(room_id),
+                "event": event,
+                "data": data,
+                "sid": sid,
+                "host_id": self.manager.host_id,
+                **extra,
+            }
+        )
+
+    def broadcast(self, event: str, data) -> None:
+        """다른 모든 워커에 알린다 (on_command에 worker가 None인 메시지로 감)"""
+        self.manager._publish(
+            {
+                "method": COMMAND,
+                "worker": None,
+                "event": event,
+                "data": data,
+                "host_id": self.manager.host_id,
+            }
+        )
+
+
+class CommandForwarding:
+    """
+    PubSubManager에 섞어 쓰는 mixin
+    메시지 큐에서 이 워커로 넘어온 방 명령과 다른 워커의 broadcast는
+    cluster.on_command로 처리하고 나머지 메시지(emit, enter_room 등)는
+    원래대로 넘긴다.
+    명령은 받은 순서대로 하나씩 처리한다.
+    """
+
+    cluster: Cluster
+
+    def _listen(self):
+        for message in super()._listen():
+            data = message
+            if not isinstance(message, dict):
+                try:
+                    data = self.json.loads(message)
+                except ValueError:
+                    continue
+            if isinstance(data, dict) and data.get("method") == COMMAND:
+                if data["worker"] is None:
+                    mine = data["host_id"] != self.host_id
+                else:
+                    mine = data["worker"] == self.cluster.worker_id
+                if mine and self.cluster.on_command:
+                    try:
+                        self.cluster.on_command(data)
+                    except Exception:
+                        self.server.logger.exception("방 명령 처리 중 오류")
+                continue
+            yield data
+
+
+def _send_frame(sock: socket.socket, payload: bytes) -> None:
+    sock.sendall(_LENGTH.pack(len(payload)) + payload)
+
+
+def _recv_exact(sock: socket.socket, size: int) -> bytes:
+    data = b""
+    while len(data) < size:
+        chunk = sock.recv(size - len(data))
+        if not chunk:
+            raise ConnectionError("브로커 연결이 끊어졌습니다")
+        data += chunk
+    return data
+
+
+def _recv_frame(sock: socket.socket) -> bytes:
+    (size,) = _LENGTH.unpack(_recv_exact(sock, _LENGTH.size))
+    return _recv_exact(sock, size)
+
+
+class LocalBroker:
+    """
+    테스트용 pub/sub 브로커 (local:// 메시지 큐)
+    프레임은 [길이 u32][JSON]이며, 연결이 처음 보낸 {"subscribe": 채널}
+    프레임으로 구독자가 되고 그 뒤의 {"channel", "data"} 프레임은 같은
+    채널의 모든 구독자에게 받은 순서대로 보낸다.
+    """
+
+    def __init__(self, host: str = "127.0.0.1", port: int = 0):
+        self.server = socket.create_server((host, port))
+        self.address = self.server.getsockname()
+        self.lock = threading.Lock()
+        self.subscribers: Dict[str, List[socket.socket]] = {}
+
+    @property
+    def url(self) -> str:
+        return f"local://{self.address[0]}:{self.address[1]}"
+
+    def serve_forever(self) -> None:
+        while True:
+            conn, _ = self.server.accept()
+            conn.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+            threading.Thread(target=self._serve, args=(conn,), daemon=True).start()
+
+    def start(self) -> "LocalBroker":
+        threading.Thread(target=self.serve_forever, daemon=True).start()
+        return self
+
+    def _serve(self, conn: socket.socket) -> None:
+        try:
+            while True:
+                frame = _recv_frame(conn)
+                message = json.loads(frame)
+                if "subscribe" in message:
+                    with self.lock:
+                        self.subscribers.setdefault(message["subscribe"], []).append(
+                            conn
+                        )
+                    continue
+                with self.lock:
+                    for subscriber in list(
+                        self.subscribers.get(message["channel"], ())
+                    ):
+                        try:
+                            _send_frame(subscriber, frame)
+                        except OSError:
+                            self._drop(subscriber)
+        except (ConnectionError, OSError):
+            pass
+        finally:
+            with self.lock:
+                self._drop(conn)
+            conn.close()
+
+    def _drop(self, conn: socket.socket) -> None:
+        for subscribers in self.subscribers.values():
+            if conn in subscribers:
+                subscribers.remove(conn)
+
+
+def _cooperative(async_mode: str):
+    """async 모드에 맞는 (socket 모듈, Lock 클래스)"""
+    if async_mode == "eventlet":
+        from eventlet.green import socket as green_socket
+        from eventlet.semaphore import Semaphore
+
+        return green_socket, Semaphore
+    if "gevent" in async_mode:
+        from gevent import socket as green_socket
+        from gevent.lock import Semaphore
+
+        return green_socket, Semaphore
+    return socket, threading.Lock
+
+
+class LocalManager(socketio.PubSubManager):
+    """
+    LocalBroker를 쓰는 Socket.IO 클라이언트 매니저
+    서버에 붙으면 그 async 모드의 socket과 Lock을 쓴다. eventlet, gevent에서
+    표준 socket으로 브로커를 기다리면 monkey_patch가 없을 때 허브 전체가 멈춘다.
+    """
+
+    name = "local"
+
+    def __init__(
+        self,
+        url: str = "local://127.0.0.1:6390",
+        channel: str = "socketio",
+        write_only: bool = False,
+        logger=None,
+        json=None,
+    ):
+        super().__init__(
+            channel=channel, write_only=write_only, logger=logger, json=json
+        )
+        parts = urllib.parse.urlsplit(url)
+        self.address = (parts.hostname, parts.port)
+        self.socket = socket  # 서버 없이 쓸 때(벤치마크)는 표준 socket
+        self.publisher: Optional[socket.socket] = None
+        self.publish_lock = threading.Lock()
+
+    def set_server(self, server) -> None:
+        super().set_server(server)
+        self.socket, lock = _cooperative(server.eio.async_mode)
+        self.publish_lock = lock()
+
+    def _connect(self) -> socket.socket:
+        sock = self.socket.create_connection(self.address)
+        sock.setsockopt(self.socket.IPPROTO_TCP, self.socket.TCP_NODELAY, 1)
+        return sock
+
+    def _publish(self, data) -> None:
+        frame = self.json.dumps({"channel": self.channel, "data": data}).encode()
+        with self.publish_lock:
+            if self.publisher is None:
+                self.publisher = self._connect()
+            try:
+                _send_frame(self.publisher, frame)
+            except OSError:
+                # 브로커가 다시 떴으면 한 번만 다시 연결해서 보낸다
+                self.publisher = self._connect()
+                _send_frame(self.publisher, frame)
+
+    def _listen(self) -> Iterator[Dict]:
+        sock = self._connect()
+        _send_frame(sock, self.json.dumps({"subscribe": self.channel}).encode())
+        while True:
+            yield self.json.loads(_recv_frame(sock))["data"]
+
+
+def make_manager(url: str, cluster: Cluster) -> socketio.PubSubManager:
+    """메시지 큐 URL에 맞는 매니저에 방 명령 전달을 더한 것"""
+    if url.startswith("local://"):
+        base = LocalManager
+    elif url.startswith(("redis://", "rediss://")):
+        base = socketio.RedisManager
+    elif url.startswith("kafka://"):
+        base = socketio.KafkaManager
+    elif url.startswith("zmq"):
+        base = socketio.ZmqManager
+    else:
+        base = socketio.KombuManager
+    manager_class = type(
+        f"Forwarding{base.__name__}",
+        (CommandForwarding, base),
+        {"cluster": cluster},
+    )
+    return manager_class(url, channel=CHANNEL)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="local:// 메시지 큐 브로커")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=6390)
+    args = parser.parse_args()
+    broker = LocalBroker(args.host, args.port)
+    print(f"[Cluster] 브로커 시작: {broker.url}")
+    broker.serve_forever()
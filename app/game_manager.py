@@ -1,8 +1,37 @@
-from typing import Dict, Optional, List
+import logging
+from typing import Callable, Dict, Optional, List, Set, Tuple
 from app.model.mighty import MightyGame, Card
 from app.model.player import Player
+from app.model.deal import DealGenerator
+from app.model.view import GameView
+from app.model.log import ActionLog, recover
+from app.store import RoomRecord, RoomStore
+from app.lobby import LobbyFeed, room_entry
+from app.lifecycle import RoomReaper
+from app.turns import TurnTimers
 import secrets  # 안전한 토큰 생성을 위해
 
+logger = logging.getLogger(__name__)
+
+
+class Session:
+    """토큰 하나에 대응하는 접속 정보 (방, 좌석 번호, 플레이어)"""
+
+    def __init__(self, token: str, room: "GameRoom", seat: int, player: Player):
+        self.token = token
+        self.room = room
+        self.seat = seat  # room.players와 room.game.players에서의 인덱스
+        self.player = player
+        # 상태 동기화: 마지막으로 보낸 version, 클라이언트가 확인한 version
+        self.sent_version = 0
+        self.acked_version = 0
+        # 연결이 끊긴 시각 (RoomReaper의 시계 기준, 연결되어 있으면 None)
+        self.disconnected_at: Optional[float] = None
+
+    @property
+    def sid(self) -> Optional[str]:
+        return self.player.sid
+
 
 class GameRoom:
     def __init__(self, room_id: str, host_name: str, host_sid: str):
@@ -10,35 +39,72 @@ class GameRoom:
         self.host_name = host_name
         self.players: List[Player] = []
         self.player_tokens = {}  # {player_name: token} 매핑으로 변경
+        self.sessions: Dict[str, Session] = {}  # {token: Session}
         self.game: Optional[MightyGame] = None
+        self.views: Optional[GameView] = None  # 좌석별 화면 상태 캐시
         self.ready_players = set()
+        self.bot_names = set()  # 봇이 앉은 자리의 플레이어 이름
+        # 방마다 독립된 분배 스트림 (seed, deal_no로 패 재현 가능)
+        self.dealer = DealGenerator()
+        # 게임의 차례가 시작될 때마다 on_turn(room) (GameManager가 연결)
+        self.on_turn: Optional[Callable[["GameRoom"], None]] = None
+        # 게임이 끝나면 on_game_over(room) (GameManager가 연결)
+        self.on_game_over: Optional[Callable[["GameRoom"], None]] = None
         # 호스트 추가 및 토큰 생성
         self.add_player(host_name, host_sid)
 
-    def add_player(self, player_name: str, sid: str) -> tuple[bool, str | None]:
+    def add_player(
+        self, player_name: str, sid: str, token: Optional[str] = None
+    ) -> tuple[bool, str | None]:
         if len(self.players) >= 5:
             return False, None
         if any(player.name == player_name for player in self.players):
             return False, None
 
-        # 유저별 고유 토큰 생성
-        token = secrets.token_urlsafe(16)
+        # 유저별 고유 토큰 생성 (저장소에서 복원할 때는 원래 토큰을 사용)
+        token = token or secrets.token_urlsafe(16)
         self.player_tokens[player_name] = token  # player_name을 키로 사용
-        self.players.append(Player(player_name, sid))
+        player = Player(player_name, sid)
+        self.sessions[token] = Session(token, self, len(self.players), player)
+        self.players.append(player)
         return True, token
 
+    def add_bot(self) -> Optional[str]:
+        """빈 자리에 준비 완료 상태의 봇을 앉히고 이름을 돌려준다"""
+        number = 1
+        while any(player.name == f"Bot {number}" for player in self.players):
+            number += 1
+        name = f"Bot {number}"
+        success, _ = self.add_player(name, None)
+        if not success:
+            return None
+        self.bot_names.add(name)
+        self.ready_players.add(name)
+        return name
+
+    def is_bot(self, player_idx: int) -> bool:
+        return self.players[player_idx].name in self.bot_names
+
     def get_player_token(self, player_name: str) -> Optional[str]:
         return self.player_tokens.get(player_name)
 
+    def get_session(self, token: Optional[str]) -> Optional[Session]:
+        return self.sessions.get(token)
+
     def get_player_by_token(self, token: str) -> Optional[Player]:
-        if token not in self.player_tokens:
-            return None
-        player_name = self.player_tokens[token]
-        return next((p for p in self.players if p.name == player_name), None)
+        session = self.sessions.get(token)
+        return session.player if session else None
 
-    def remove_player(self, player_name: str) -> None:
+    def remove_player(self, player_name: str) -> Optional[Session]:
+        """플레이어를 내보내고 그 세션을 돌려준다 (남은 좌석 번호는 당겨진다)"""
+        token = self.player_tokens.pop(player_name, None)
+        session = self.sessions.pop(token, None)
         self.players = [player for player in self.players if player.name != player_name]
         self.ready_players.discard(player_name)
+        self.bot_names.discard(player_name)
+        for seat, player in enumerate(self.players):
+            self.sessions[self.player_tokens[player.name]].seat = seat
+        return session
 
     def is_ready_to_start(self) -> bool:
         return len(self.players) == 5 and len(self.ready_players) == 5
@@ -46,38 +112,359 @@ class GameRoom:
     def get_player_list(self) -> List[Player]:
         return self.players
 
+    def start_game(self) -> MightyGame:
+        """방의 플레이어로 새 게임을 만들고 카드를 나눈다"""
+        self.game = MightyGame(self.dealer)
+        # 받아들여진 명령을 기록해 두면 스냅샷 + 로그로 게임을 복구할 수 있다
+        self.game.log = ActionLog(self.dealer.seed)
+        self.game.on_turn = self._turn_started
+        self.game.on_game_over = self._game_over
+        self.views = GameView(self.game)
+        for player in self.players:
+            self.game.add_player(player.name)
+        self.game.initialize_deck()
+        self.game.deal_cards()
+        # 새 게임의 version은 0부터 시작
+        for session in self.sessions.values():
+            session.sent_version = session.acked_version = 0
+        return self.game
+
+    def _turn_started(self, game: MightyGame) -> None:
+        if self.on_turn is not None and game is self.game:
+            self.on_turn(self)
+
+    def _game_over(self, game: MightyGame) -> None:
+        if self.on_game_over is not None and game is self.game:
+            self.on_game_over(self)
+
+    def to_record(
+        self, since: int = 0, saved_snapshot: Optional[int] = None
+    ) -> RoomRecord:
+        """
+        저장소에 쓸 (JSON으로 바꿀 수 있는 방 정보, 게임 스냅샷)
+        게임은 명령 로그와 그 마지막 스냅샷으로 저장한다 (접속 sid는 저장하지 않음)
+        현재 로그의 명령 since개와 saved_snapshot 위치의 스냅샷이 이미 저장되어
+        있으면 그 뒤의 명령만 넣고, 스냅샷이 그대로면 스냅샷은 None으로 둔다
+        """
+        data = {
+            "room_id": self.room_id,
+            "host_name": self.host_name,
+            "players": [[p.name, self.player_tokens[p.name]] for p in self.players],
+            "ready_players": sorted(self.ready_players),
+            "bot_names": sorted(self.bot_names),
+            "dealer": [self.dealer.seed, self.dealer.next_deal_no],
+            "game": None,
+        }
+        log = self.game.log if self.game else None
+        if log is None:
+            return data, None
+        position, snapshot = log.snapshot or (None, None)
+        data["game"] = {
+            "seed": log.seed,
+            "snapshot": position,
+            "first": since,  # actions[0]의 로그 안에서의 위치
+            "actions": log.actions[since:],
+        }
+        if since and position == saved_snapshot:
+            snapshot = None
+        return data, snapshot
+
+    @classmethod
+    def from_record(cls, record: RoomRecord) -> "GameRoom":
+        """to_record로 저장한 방을 복원 (게임은 스냅샷 + 이후 명령으로 복구)"""
+        data, snapshot = record
+        room = cls(data["room_id"], data["host_name"], None)
+        # 새로 앉힌 호스트를 비우고 저장된 좌석 순서와 토큰으로 다시 앉힌다
+        room.players, room.player_tokens, room.sessions = [], {}, {}
+        for name, token in data["players"]:
+            room.add_player(name, None, token)
+        room.ready_players = set(data["ready_players"])
+        room.bot_names = set(data["bot_names"])
+        seed, next_deal_no = data["dealer"]
+        room.dealer = DealGenerator(seed)
+        room.dealer.next_deal_no = next_deal_no
+        if data["game"] is not None:
+            log = ActionLog(data["game"]["seed"])
+            log.actions = [tuple(action) for action in data["game"]["actions"]]
+            if snapshot is not None:
+                log.snapshot = (data["game"]["snapshot"], snapshot)
+            room.game = recover(log)
+            room.game.dealer = room.dealer
+            room.game.on_turn = room._turn_started
+            room.game.on_game_over = room._game_over
+            room.views = GameView(room.game)
+        return room
+
 
 class GameManager:
-    def __init__(self):
+    """
+    방 목록과 세션 색인
+    토큰 -> Session, sid -> Session을 dict로 유지해서 소켓 이벤트마다
+    행동한 플레이어를 O(1)에 찾는다. 입장, 재접속, 퇴장 때 갱신된다.
+
+    store가 있으면 바뀐 방을 mark_dirty로 표시해 두었다가 flush()에서 한 번에
+    저장하고(write-behind), 재시작 후 메모리에 없는 방이나 토큰을 처음 찾을 때
+    저장소에서 불러온다. 여러 워커가 저장소를 같이 쓸 때는 owns(방 ID)가
+    참인 방(이 워커가 주인인 방)만 불러온다.
+
+    방의 활동과 연결 상태는 reaper에 알리고, reap()이 오래 쓰이지 않은 방을
+    정리한다 (app/lifecycle.py). 게임의 차례가 바뀌면 turns에 제한 시간을
+    건다 (app/turns.py).
+    """
+
+    def __init__(
+        self,
+        store: Optional[RoomStore] = None,
+        owns: Optional[Callable[[str], bool]] = None,
+        reaper: Optional[RoomReaper] = None,
+        turns: Optional[TurnTimers] = None,
+    ):
         self.rooms: Dict[str, GameRoom] = {}
+        self.sessions: Dict[str, Session] = {}  # {token: Session}
+        self.sid_sessions: Dict[str, Session] = {}  # {sid: Session}
+        self.store = store
+        self.dirty: Set[str] = set()  # 저장해야 하는 방
+        self.deleted: Set[str] = set()  # 저장소에서 지워야 하는 방
+        # 방 -> (저장한 로그, 저장한 명령 수, 저장한 스냅샷 위치)
+        self.saved: Dict[str, Tuple[ActionLog, int, Optional[int]]] = {}
+        # 저장소에서 방을 불러온 직후 호출 (멈춰 있던 봇 차례를 이어서 진행 등)
+        self.on_load: Optional[Callable[[GameRoom], None]] = None
+        # 방의 게임이 끝날 때 호출 (분석 기록 등)
+        self.on_game_over: Optional[Callable[[GameRoom], None]] = None
+        self.owns = owns
+        self.reaper = reaper or RoomReaper()
+        self.turns = turns if turns is not None else TurnTimers()
+        # 로비 방 목록 (아직 불러오지 않은 저장된 방도 보인다)
+        self.lobby = LobbyFeed()
+        if store is not None:
+            self.lobby.apply(
+                {"op": "add", "room": room_entry(room_id, players, started)}
+                for room_id, players, started in store.list_rooms()
+            )
 
     def create_room(
         self, room_id: str, host_name: str, host_sid: str
     ) -> Optional[GameRoom]:
-        if room_id in self.rooms:
+        if self.get_room(room_id) is not None:
             return None
         room = GameRoom(room_id, host_name, host_sid)
+        room.on_turn = self.turns.arm
+        room.on_game_over = self._game_over
         self.rooms[room_id] = room
+        self._index(room.get_session(room.get_player_token(host_name)))
+        self.mark_dirty(room)
         return room
 
+    def _game_over(self, room: GameRoom) -> None:
+        if self.on_game_over is not None:
+            self.on_game_over(room)
+
     def get_room(self, room_id: str) -> Optional[GameRoom]:
-        return self.rooms.get(room_id)
+        room = self.rooms.get(room_id)
+        if (
+            room is None
+            and self.store is not None
+            and room_id not in self.deleted
+            and (self.owns is None or self.owns(room_id))
+        ):
+            room = self._load(room_id)
+        return room
+
+    def join_room(
+        self, room_id: str, player_name: str, sid: str
+    ) -> tuple[bool, str | None]:
+        room = self.get_room(room_id)
+        if not room:
+            return False, None
+        success, token = room.add_player(player_name, sid)
+        if success:
+            self._index(room.get_session(token))
+            self.mark_dirty(room)
+        return success, token
+
+    def add_bot(self, room_id: str) -> Optional[str]:
+        room = self.get_room(room_id)
+        if not room:
+            return None
+        bot_name = room.add_bot()
+        if bot_name:
+            self._index(room.get_session(room.get_player_token(bot_name)))
+            self.mark_dirty(room)
+        return bot_name
+
+    def remove_player(self, room_id: str, player_name: str) -> None:
+        room = self.get_room(room_id)
+        if room:
+            self._unindex(room.remove_player(player_name))
+            self.mark_dirty(room)
 
     def remove_room(self, room_id: str) -> None:
-        if room_id in self.rooms:
+        # 메모리에 있는 방만 지운다 (지우려고 저장소에서 불러오지 않음)
+        room = self.rooms.get(room_id)
+        if room:
             del self.rooms[room_id]
+            for session in room.sessions.values():
+                self._unindex(session)
+            self.dirty.discard(room_id)
+            self.saved.pop(room_id, None)
+            self.lobby.remove(room_id)
+            self.reaper.forget(room_id)
+            self.turns.cancel(room_id)
+            if self.store is not None:
+                self.deleted.add(room_id)
 
-    def get_all_rooms(self):
-        rooms_data = []
-        for room_id, room in self.rooms.items():
-            player_list = [player.name for player in room.players]
-            rooms_data.append(
-                {
-                    "id": room_id,
-                    "name": f"Room {room_id}",
-                    "current_players": len(room.players),
-                    "max_players": 5,  # 마이티 게임은 5명이 최대
-                    "players": player_list,
-                }
-            )
-        return rooms_data
+    def get_session(self, token: Optional[str]) -> Optional[Session]:
+        """
+        토큰만으로 세션을 찾는다 (메모리에 없으면 저장소에서 그 방을 불러옴)
+        방 ID를 아는 소켓 이벤트에서는 get_room 후 방의 get_session을 쓴다
+        """
+        session = self.sessions.get(token)
+        if session is None and token and self.store is not None:
+            # 재시작 후 처음 보는 토큰이면 그 토큰의 방을 불러온다
+            room_id = self.store.room_for_token(token)
+            if room_id is not None and room_id not in self.rooms:
+                self.get_room(room_id)
+                session = self.sessions.get(token)
+        return session
+
+    def get_session_by_sid(self, sid: str) -> Optional[Session]:
+        return self.sid_sessions.get(sid)
+
+    def bind_sid(self, session: Session, sid: str) -> None:
+        """재접속 등으로 바뀐 소켓 sid를 세션에 연결"""
+        if session.sid and self.sid_sessions.get(session.sid) is session:
+            del self.sid_sessions[session.sid]
+        session.player.sid = sid
+        self.sid_sessions[sid] = session
+        session.disconnected_at = None
+        self.reaper.touch(session.room)
+
+    def disconnect(self, sid: str) -> Optional[Session]:
+        """sid의 연결이 끊겼음을 표시하고 그 세션을 돌려준다"""
+        session = self.sid_sessions.pop(sid, None)
+        if session is not None:
+            session.player.sid = None
+            session.disconnected_at = self.reaper.clock()
+            self.reaper.touch(session.room)
+        return session
+
+    def reap(self, now: Optional[float] = None) -> List[Tuple[str, str]]:
+        """정리할 때가 된 방을 지우고 (방 ID, 이유) 목록을 돌려준다"""
+        evicted = []
+        for room_id in self.reaper.due(now):
+            reason = self.evict(room_id, now)
+            if reason is not None:
+                evicted.append((room_id, reason))
+        return evicted
+
+    def evict(self, room_id: str, now: Optional[float] = None) -> Optional[str]:
+        """타이머가 만료된 방을 다시 확인해서 정리하고 그 이유를 돌려준다"""
+        room = self.rooms.get(room_id)
+        if room is None:
+            return None
+        reason = self.reaper.reason(room, now)
+        if reason is None:
+            self.reaper.schedule(room)  # 그 사이 조건이 바뀐 방
+            return None
+        self.remove_room(room_id)
+        self.reaper.evictions[reason] += 1
+        return reason
+
+    def mark_dirty(self, room: GameRoom) -> None:
+        """room이 바뀌었음을 표시 (로비 목록, 마지막 활동 갱신, 다음 flush에서 저장)"""
+        self.lobby.touch(room)
+        self.reaper.touch(room)
+        if self.store is not None:
+            self.dirty.add(room.room_id)
+
+    def flush(self, gather: Optional[Callable] = None) -> int:
+        """
+        표시된 방을 한 번에 저장하고 저장한 방 수를 돌려준다
+        게임 로그는 지난번에 저장한 뒤에 쌓인 명령만 덧붙인다
+        gather(room_ids, fn)를 주면 방의 기록을 만드는 fn(room_id)를 그것으로
+        실행한다 (방의 실행자에서 만들기 위함)
+        """
+        if self.store is None or not (self.dirty or self.deleted):
+            return 0
+        dirty, self.dirty = self.dirty, set()
+        deleted, self.deleted = self.deleted, set()
+        if gather is None:
+            built = {room_id: self._record(room_id) for room_id in dirty}
+        else:
+            built = gather(dirty, self._record)
+            # 기록을 만들지 못한 방은 다음 flush에서 다시 시도한다
+            self.dirty |= dirty - built.keys()
+        records = {}
+        progress = {}
+        for room_id, result in built.items():
+            if result is None:
+                continue
+            records[room_id], entry = result
+            if entry is not None:
+                progress[room_id] = entry
+        try:
+            self.store.save(records, deleted)
+        except Exception:
+            # 저장하지 못한 방은 다음 flush에서 다시 시도한다
+            self.dirty |= dirty
+            self.deleted |= deleted
+            raise
+        self.saved.update(progress)
+        return len(records)
+
+    def _record(self, room_id: str):
+        """방의 저장 기록과 저장 후의 로그 진행 상태 (없는 방이면 None)"""
+        room = self.rooms.get(room_id)
+        if room is None:
+            return None
+        log = room.game.log if room.game else None
+        saved_log, since, saved_snapshot = self.saved.get(room_id, (None, 0, None))
+        if saved_log is not log:
+            since, saved_snapshot = 0, None
+        record = room.to_record(since, saved_snapshot)
+        if log is None:
+            return record, None
+        game = record[0]["game"]
+        saved = game["first"] + len(game["actions"])
+        return record, (log, saved, game["snapshot"])
+
+    def _load(self, room_id: str) -> Optional[GameRoom]:
+        record = self.store.load(room_id)
+        if record is None:
+            return None
+        room = GameRoom.from_record(record)
+        room.on_turn = self.turns.arm
+        room.on_game_over = self._game_over
+        self.rooms[room_id] = room
+        if room.game is not None:
+            log = room.game.log
+            snapshot = log.snapshot[0] if log.snapshot else None
+            self.saved[room_id] = (log, len(log), snapshot)
+        now = self.reaper.clock()
+        for session in room.sessions.values():
+            self._index(session)
+            # 재시작하면 모든 연결이 끊긴 상태에서 다시 접속을 기다린다
+            if not room.is_bot(session.seat):
+                session.disconnected_at = now
+        self.lobby.touch(room)
+        self.reaper.touch(room, now)
+        if room.game is not None:
+            self.turns.arm(room)  # 멈춰 있던 차례는 복원한 때부터 다시 잰다
+        logger.info("[Store] 방 %s 복원", room_id)
+        if self.on_load is not None:
+            self.on_load(room)
+        return room
+
+    def _index(self, session: Optional[Session]) -> None:
+        if session is None:
+            return
+        self.sessions[session.token] = session
+        if session.sid:
+            self.sid_sessions[session.sid] = session
+
+    def _unindex(self, session: Optional[Session]) -> None:
+        if session is None:
+            return
+        self.sessions.pop(session.token, None)
+        if session.sid and self.sid_sessions.get(session.sid) is session:
+            del self.sid_sessions[session.sid]
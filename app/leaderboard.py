@@ -0,0 +1,321 @@
+"""
+플레이어 순위표
+
+방이 없어져도 남는 플레이어 프로필(누적 점수, 게임 수, 주공/프렌드 승률,
+공약 대비 득점)을 이름별로 들고, 누적 점수 순위를 SkipList로 색인한다.
+게임이 끝날 때마다 record()가 그 게임의 사람 플레이어 프로필을 고치고
+색인에서 뺐다 다시 넣으므로(기대 O(log n)) 읽을 때 전체를 정렬하지 않는다.
+- rank(name): 순위 (1부터), top(k): 상위 k명, around(name, radius): 내 주변
+순위는 누적 점수가 높은 순, 같으면 이름 순이다. 봇은 넣지 않는다.
+
+프로필은 표시 이름으로 구분한다. 계정이 없고 토큰은 방마다 새로 발급되므로
+방을 넘어 같은 사람을 알아볼 안정된 식별자가 없다. 그래서 어느 방에서든 같은
+이름으로 둔 게임은 한 프로필에 더해지고, 이름을 바꾸면 새 프로필이 된다.
+
+store가 있으면 시작할 때 모든 프로필을 불러오고, 바뀐 프로필은 표시해 두었다가
+flush()가 한 번에 저장한다 (방 저장과 같은 write-behind). 여러 워커가 있으면
+게임이 끝난 워커가 바뀐 프로필 행을 다른 워커에 보내고 apply()로 반영한다.
+"""
+
+import random
+import threading
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+from app.model.mighty import MightyGame
+from app.store import ProfileRow, ProfileStore
+
+MAX_TOP = 100  # top, around로 한 번에 돌려주는 최대 인원
+MAX_LEVEL = 32
+
+
+class _Node:
+    __slots__ = ("key", "next", "span")
+
+    def __init__(self, key, level: int):
+        self.key = key
+        self.next: List[Optional["_Node"]] = [None] * level
+        # 층마다 next까지 건너뛰는 노드 수 (next가 없으면 끝까지)
+        self.span = [0] * level
+
+
+class SkipList:
+    """
+    순서 있는 키 집합 (indexable skip list)
+    노드가 층마다 다음 노드까지의 거리(span)를 들고 있어서 삽입, 삭제, 키의
+    순위, 순위의 키가 모두 기대 O(log n)이다.
+    """
+
+    def __init__(self, seed: Optional[int] = None):
+        self.head = _Node(None, MAX_LEVEL)
+        self.level = 1
+        self.size = 0
+        self.rng = random.Random(seed)
+
+    def __len__(self) -> int:
+        return self.size
+
+    def _random_level(self) -> int:
+        level = 1
+        while level < MAX_LEVEL and self.rng.random() < 0.25:
+            level += 1
+        return level
+
+    def insert(self, key) -> None:
+        update = [self.head] * MAX_LEVEL
+        rank = [0] * MAX_LEVEL  # update[i]의 순위 (head는 0)
+        node = self.head
+        for i in reversed(range(self.level)):
+            rank[i] = rank[i + 1] if i + 1 < self.level else 0
+            while node.next[i] is not None and node.next[i].key < key:
+                rank[i] += node.span[i]
+                node = node.next[i]
+            update[i] = node
+        level = self._random_level()
+        if level > self.level:
+            for i in range(self.level, level):
+                self.head.span[i] = self.size
+            self.level = level
+        new = _Node(key, level)
+        for i in range(level):
+            new.next[i] = update[i].next[i]
+            update[i].next[i] = new
+            new.span[i] = update[i].span[i] - (rank[0] - rank[i])
+            update[i].span[i] = rank[0] - rank[i] + 1
+        for i in range(level, self.level):
+            update[i].span[i] += 1
+        self.size += 1
+
+    def remove(self, key) -> bool:
+        update = [self.head] * MAX_LEVEL
+        node = self.head
+        for i in reversed(range(self.level)):
+            while node.next[i] is not None and node.next[i].key < key:
+                node = node.next[i]
+            update[i] = node
+        node = node.next[0]
+        if node is None or node.key != key:
+            return False
+        for i in range(self.level):
+            if update[i].next[i] is node:
+                update[i].span[i] += node.span[i] - 1
+                update[i].next[i] = node.next[i]
+            else:
+                update[i].span[i] -= 1
+        while self.level > 1 and self.head.next[self.level - 1] is None:
+            self.level -= 1
+        self.size -= 1
+        return True
+
+    def rank(self, key) -> Optional[int]:
+        """key의 0부터 시작하는 순위 (없으면 None)"""
+        rank = 0
+        node = self.head
+        for i in reversed(range(self.level)):
+            while node.next[i] is not None and node.next[i].key <= key:
+                rank += node.span[i]
+                node = node.next[i]
+        if node is not self.head and node.key == key:
+            return rank - 1
+        return None
+
+    def slice(self, start: int, stop: int) -> List:
+        """순위 start부터 stop 전까지의 키"""
+        start = max(0, start)
+        stop = min(stop, self.size)
+        if start >= stop:
+            return []
+        traversed = 0
+        node = self.head
+        for i in reversed(range(self.level)):
+            while node.next[i] is not None and traversed + node.span[i] <= start:
+                traversed += node.span[i]
+                node = node.next[i]
+        keys = []
+        for _ in range(stop - start):
+            node = node.next[0]
+            keys.append(node.key)
+        return keys
+
+
+class Profile:
+    def __init__(self, name: str):
+        self.name = name
+        self.score = 0  # 게임마다의 total_score 합
+        self.games = 0
+        self.wins = 0  # 자기 팀(주공팀 또는 야당)이 이긴 게임
+        self.president_games = 0
+        self.president_wins = 0
+        self.friend_games = 0
+        self.friend_wins = 0
+        self.bid_margin = 0  # 주공일 때 (주공팀 득점 - 공약)의 합
+
+    @property
+    def key(self) -> Tuple[int, str]:
+        return -self.score, self.name
+
+    def to_row(self) -> ProfileRow:
+        return (
+            self.name,
+            self.score,
+            self.games,
+            self.wins,
+            self.president_games,
+            self.president_wins,
+            self.friend_games,
+            self.friend_wins,
+            self.bid_margin,
+        )
+
+    @classmethod
+    def from_row(cls, row: ProfileRow) -> "Profile":
+        profile = cls(row[0])
+        (
+            profile.score,
+            profile.games,
+            profile.wins,
+            profile.president_games,
+            profile.president_wins,
+            profile.friend_games,
+            profile.friend_wins,
+            profile.bid_margin,
+        ) = row[1:]
+        return profile
+
+    def to_dict(self, rank: int) -> Dict:
+        return {
+            "rank": rank,
+            "name": self.name,
+            "score": self.score,
+            "games": self.games,
+            "win_rate": _rate(self.wins, self.games),
+            "president_games": self.president_games,
+            "president_win_rate": _rate(self.president_wins, self.president_games),
+            "friend_games": self.friend_games,
+            "friend_win_rate": _rate(self.friend_wins, self.friend_games),
+            # 주공일 때 공약보다 평균 몇 점 더(음수면 덜) 땄는지
+            "bid_margin": (
+                round(self.bid_margin / self.president_games, 2)
+                if self.president_games
+                else None
+            ),
+        }
+
+
+class Leaderboard:
+    def __init__(self, store: Optional[ProfileStore] = None):
+        self.profiles: Dict[str, Profile] = {}
+        self.index = SkipList()
+        self.store = store
+        self.dirty: Set[str] = set()  # 저장해야 하는 프로필
+        # 여러 방의 실행자와 요청 처리가 같이 쓰므로 잠금으로 보호
+        self.lock = threading.Lock()
+        if store is not None:
+            self.apply(store.load())
+
+    def __len__(self) -> int:
+        return len(self.profiles)
+
+    def record(self, game: MightyGame, bots: Iterable[str] = ()) -> List[ProfileRow]:
+        """끝난 게임의 결과를 사람 플레이어 프로필에 더하고 바뀐 행을 돌려준다"""
+        if game.phase != "game_over":
+            return []
+        bots = set(bots)
+        president, friend = game.president_idx, game.friend_player_idx
+        team = game.players[president].points
+        if friend is not None:
+            team += game.players[friend].points
+        won = team >= game.current_bid.score
+        rows = []
+        with self.lock:
+            for seat, player in enumerate(game.players):
+                if player.name in bots:
+                    continue
+                profile = self._take(player.name)
+                profile.score += player.total_score
+                profile.games += 1
+                on_team = seat == president or seat == friend
+                profile.wins += on_team == won
+                if seat == president:
+                    profile.president_games += 1
+                    profile.president_wins += won
+                    profile.bid_margin += team - game.current_bid.score
+                elif seat == friend:
+                    profile.friend_games += 1
+                    profile.friend_wins += won
+                self.index.insert(profile.key)
+                self.dirty.add(profile.name)
+                rows.append(profile.to_row())
+        return rows
+
+    def apply(self, rows: Iterable[ProfileRow]) -> None:
+        """저장소나 다른 워커에서 온 프로필 행으로 바꾼다 (저장 표시는 하지 않음)"""
+        with self.lock:
+            for row in rows:
+                self._take(row[0])
+                profile = self.profiles[row[0]] = Profile.from_row(row)
+                self.index.insert(profile.key)
+
+    def rank(self, name: str) -> Optional[int]:
+        """name의 순위 (1부터, 없으면 None)"""
+        with self.lock:
+            profile = self.profiles.get(name)
+            if profile is None:
+                return None
+            return self.index.rank(profile.key) + 1
+
+    def entry(self, name: str) -> Optional[Dict]:
+        """name의 프로필과 순위 (없으면 None)"""
+        with self.lock:
+            profile = self.profiles.get(name)
+            if profile is None:
+                return None
+            return profile.to_dict(self.index.rank(profile.key) + 1)
+
+    def top(self, count: int = 10) -> List[Dict]:
+        return self.range(0, min(count, MAX_TOP))
+
+    def around(self, name: str, radius: int = 5) -> List[Dict]:
+        """name의 위아래 radius명씩 (name이 없으면 빈 목록)"""
+        radius = max(0, min(radius, MAX_TOP // 2))
+        rank = self.rank(name)
+        if rank is None:
+            return []
+        return self.range(rank - 1 - radius, rank + radius)
+
+    def range(self, start: int, stop: int) -> List[Dict]:
+        """0부터 센 순위 start부터 stop 전까지의 프로필"""
+        start = max(0, start)
+        with self.lock:
+            keys = self.index.slice(start, stop)
+            return [
+                self.profiles[name].to_dict(start + i + 1)
+                for i, (_, name) in enumerate(keys)
+            ]
+
+    def flush(self) -> int:
+        """바뀐 프로필을 한 번에 저장하고 저장한 수를 돌려준다"""
+        if self.store is None or not self.dirty:
+            return 0
+        with self.lock:
+            dirty, self.dirty = self.dirty, set()
+            rows = [self.profiles[name].to_row() for name in dirty]
+        try:
+            self.store.save(rows)
+        except Exception:
+            with self.lock:
+                self.dirty |= dirty
+            raise
+        return len(rows)
+
+    def _take(self, name: str) -> Profile:
+        """name의 프로필을 색인에서 빼고 돌려준다 (없으면 새로 만듦)"""
+        profile = self.profiles.get(name)
+        if profile is None:
+            profile = self.profiles[name] = Profile(name)
+        else:
+            self.index.remove(profile.key)
+        return profile
+
+
+def _rate(wins: int, games: int) -> Optional[float]:
+    return round(wins / games, 3) if games else None
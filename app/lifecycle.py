@@ -0,0 +1,218 @@
+"""
+방 수명 관리
+
+GameManager가 방이 바뀌거나 접속 상태가 바뀔 때마다 RoomReaper.touch(room)로
+방의 마지막 활동 시각을 남기면, 방이 정리될 수 있는 가장 이른 시각에 타이머
+휠 타이머를 건다. 타이머가 만료되면 그때 다시 확인해서 아직 조건이 맞으면
+방을 정리한다.
+- idle_lobby: 게임을 시작하지 않은 방에서 IDLE_LOBBY_TIMEOUT초 동안 활동이 없음
+- finished: 끝난 게임에서 FINISHED_TIMEOUT초 동안 활동이 없음
+- abandoned: 모든 사람 플레이어의 연결이 DISCONNECT_GRACE초 넘게 끊김
+"""
+
+import time
+from collections import Counter
+from typing import Callable, Dict, Hashable, List, Optional, Tuple
+
+IDLE_LOBBY_TIMEOUT = 600.0
+FINISHED_TIMEOUT = 300.0
+DISCONNECT_GRACE = 120.0
+REAP_TICK = 1.0  # 타이머 휠 한 칸의 길이(초), 정리 작업 주기
+WHEEL_SLOTS = 512
+
+
+class TimerWheel:
+    """
+    해시 타이머 휠
+    만료 시각을 tick 단위 칸에 나눠 넣고 advance(now)는 지나간 칸만 본다.
+    한 바퀴보다 먼 타이머는 같은 칸에 있다가 만료 시각이 될 때 꺼낸다.
+    같은 키로 다시 걸면 이전 타이머는 취소된다.
+    """
+
+    def __init__(self, tick: float = REAP_TICK, slots: int = WHEEL_SLOTS, now=0.0):
+        self.tick = tick
+        self.slots: List[Dict[Hashable, float]] = [{} for _ in range(slots)]
+        self.timers: Dict[Hashable, int] = {}  # 키 -> 칸 번호
+        self.current = int(now // tick)  # 다음에 볼 tick
+
+    def __len__(self) -> int:
+        return len(self.timers)
+
+    def schedule(self, key: Hashable, deadline: float) -> None:
+        self.cancel(key)
+        slot = max(int(deadline // self.tick), self.current) % len(self.slots)
+        self.slots[slot][key] = deadline
+        self.timers[key] = slot
+
+    def cancel(self, key: Hashable) -> None:
+        slot = self.timers.pop(key, None)
+        if slot is not None:
+            self.slots[slot].pop(key, None)
+
+    def advance(self, now: float) -> List[Hashable]:
+        """now까지 만료된 키를 꺼낸다"""
+        target = int(now // self.tick)
+        if target < self.current:
+            return []
+        expired = []
+        # 오래 멈춰 있었어도 모든 칸을 한 번씩만 본다
+        for i in range(min(target - self.current + 1, len(self.slots))):
+            index = (self.current + i) % len(self.slots)
+            slot = self.slots[index]
+            for key, deadline in list(slot.items()):
+                # 다른 레인이 그 사이 타이머를 다시 걸거나 취소했을 수 있다
+                if deadline <= now and slot.pop(key, None) is not None:
+                    if self.timers.get(key) == index:
+                        self.timers.pop(key, None)
+                    expired.append(key)
+        # 현재 tick의 칸에는 아직 만료되지 않은 타이머가 남을 수 있다
+        self.current = target
+        return expired
+
+
+class HierarchicalTimerWheel:
+    """
+    계층 타이머 휠
+    levels개의 휠이 각각 slots칸이고, level 휠의 한 칸은 tick * slots**level초다.
+    만료까지 남은 tick 수로 휠을 골라 넣고(O(1)), 위 휠의 칸은 그 구간이
+    시작될 때 아래 휠로 다시 나눠 넣는다. 취소는 키로 칸을 찾아 지운다(O(1)).
+    가장 위 휠보다 먼 타이머는 위 휠을 여러 바퀴 돈다.
+    """
+
+    def __init__(
+        self, tick: float = REAP_TICK, slots: int = 64, levels: int = 4, now=0.0
+    ):
+        self.tick = tick
+        self.size = slots
+        self.wheels: List[List[Dict[Hashable, float]]] = [
+            [{} for _ in range(slots)] for _ in range(levels)
+        ]
+        self.timers: Dict[Hashable, Tuple[int, int]] = {}  # 키 -> (휠, 칸)
+        self.current = int(now // tick)  # 다음에 볼 tick
+
+    def __len__(self) -> int:
+        return len(self.timers)
+
+    def schedule(self, key: Hashable, deadline: float) -> None:
+        self.cancel(key)
+        self._place(key, deadline)
+
+    def cancel(self, key: Hashable) -> None:
+        place = self.timers.pop(key, None)
+        if place is not None:
+            level, slot = place
+            self.wheels[level][slot].pop(key, None)
+
+    def advance(self, now: float) -> List[Hashable]:
+        """now까지 만료된 키를 꺼낸다"""
+        target = int(now // self.tick)
+        expired = []
+        while self.current <= target:
+            self._cascade()
+            slot = self.current % self.size
+            bucket = self.wheels[0][slot]
+            for key, deadline in list(bucket.items()):
+                # 다른 레인이 그 사이 타이머를 다시 걸거나 취소했을 수 있다
+                if deadline <= now and bucket.pop(key, None) is not None:
+                    if self.timers.get(key) == (0, slot):
+                        self.timers.pop(key, None)
+                    expired.append(key)
+            if self.current == target:
+                # 현재 tick의 칸에는 아직 만료되지 않은 타이머가 남을 수 있다
+                break
+            self.current += 1
+        return expired
+
+    def _place(self, key: Hashable, deadline: float) -> None:
+        due = max(int(deadline // self.tick), self.current)
+        level = 0
+        span = self.size
+        while level < len(self.wheels) - 1 and due - self.current >= span:
+            level += 1
+            span *= self.size
+        slot = due // (span // self.size) % self.size
+        self.wheels[level][slot][key] = deadline
+        self.timers[key] = (level, slot)
+
+    def _cascade(self) -> None:
+        """current에서 시작하는 위 휠의 칸을 아래 휠로 나눠 넣는다"""
+        span = 1
+        for level in range(1, len(self.wheels)):
+            span *= self.size
+            if self.current % span:
+                break
+            slot = self.current // span % self.size
+            bucket = self.wheels[level][slot]
+            self.wheels[level][slot] = {}
+            for key, deadline in bucket.items():
+                if self.timers.get(key) == (level, slot):
+                    self._place(key, deadline)
+
+
+class RoomReaper:
+    """방별 마지막 활동 시각과 정리 타이머, 정리한 방 수(이유별)"""
+
+    def __init__(
+        self,
+        idle_lobby: float = IDLE_LOBBY_TIMEOUT,
+        finished: float = FINISHED_TIMEOUT,
+        grace: float = DISCONNECT_GRACE,
+        tick: float = REAP_TICK,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.idle_lobby = idle_lobby
+        self.finished = finished
+        self.grace = grace
+        self.clock = clock
+        self.wheel = TimerWheel(tick, now=clock())
+        self.last_active: Dict[str, float] = {}
+        self.evictions: Counter = Counter()
+
+    def touch(self, room, now: Optional[float] = None) -> None:
+        """room에 활동이 있었음 (타이머를 다시 건다)"""
+        self.last_active[room.room_id] = self.clock() if now is None else now
+        self.schedule(room)
+
+    def schedule(self, room) -> None:
+        deadline = min(
+            (deadline for deadline, _ in self._deadlines(room)), default=None
+        )
+        if deadline is None:
+            self.wheel.cancel(room.room_id)
+        else:
+            self.wheel.schedule(room.room_id, deadline)
+
+    def due(self, now: Optional[float] = None) -> List[str]:
+        """타이머가 만료된 방 ID (정리할지는 reason으로 다시 확인)"""
+        return self.wheel.advance(self.clock() if now is None else now)
+
+    def reason(self, room, now: Optional[float] = None) -> Optional[str]:
+        """지금 room을 정리해야 하는 이유 (없으면 None)"""
+        now = self.clock() if now is None else now
+        for deadline, reason in self._deadlines(room):
+            if deadline <= now:
+                return reason
+        return None
+
+    def forget(self, room_id: str) -> None:
+        self.wheel.cancel(room_id)
+        self.last_active.pop(room_id, None)
+
+    def _deadlines(self, room) -> List[Tuple[float, str]]:
+        last = self.last_active.get(room.room_id)
+        if last is None:
+            last = self.last_active[room.room_id] = self.clock()
+        deadlines = []
+        if room.game is None:
+            deadlines.append((last + self.idle_lobby, "idle_lobby"))
+        elif room.game.phase == "game_over":
+            deadlines.append((last + self.finished, "finished"))
+        humans = [
+            session
+            for session in room.sessions.values()
+            if not room.is_bot(session.seat)
+        ]
+        if humans and all(session.disconnected_at is not None for session in humans):
+            left = max(session.disconnected_at for session in humans)
+            deadlines.append((left + self.grace, "abandoned"))
+        return deadlines
@@ -0,0 +1,118 @@
+"""
+로비 방 목록 피드
+
+GameManager가 방이 바뀔 때마다 touch(room)로 방 요약을 갱신한다. 바뀐 방은
+pending에 마지막 요약만 남겨 두었다가 flush()가 LOBBY_INTERVAL마다 한 번에
+add/update/remove 변경 목록으로 돌려주므로, 그 사이 같은 방이 여러 번
+바뀌어도 로비에는 한 번만 간다. 로비 클라이언트는 처음에 page()로 한
+페이지를 받고, 그 뒤로는 로비 채널로 이 변경 목록만 받는다.
+
+    {"op": "add" | "update", "room": 방 요약}
+    {"op": "remove", "id": 방 ID}
+"""
+
+from typing import Dict, Iterable, List, Optional, Set
+
+MAX_PLAYERS = 5  # 마이티 게임은 5명이 최대
+LOBBY_INTERVAL = 0.5  # 변경을 모아서 보내는 주기(초)
+PER_PAGE = 20
+MAX_PER_PAGE = 100
+
+
+def room_entry(room_id: str, players: List[str], started: bool) -> Dict:
+    """로비에 보여줄 방 요약"""
+    return {
+        "id": room_id,
+        "name": f"Room {room_id}",
+        "current_players": len(players),
+        "max_players": MAX_PLAYERS,
+        "players": players,
+        "started": started,
+    }
+
+
+def summarize(room) -> Dict:
+    return room_entry(
+        room.room_id, [player.name for player in room.players], room.game is not None
+    )
+
+
+def is_open(entry: Dict) -> bool:
+    """빈 자리가 있고 아직 시작하지 않은 방"""
+    return not entry["started"] and entry["current_players"] < entry["max_players"]
+
+
+class LobbyFeed:
+    def __init__(self):
+        self.entries: Dict[str, Dict] = {}  # 방 -> 요약 (만든 순서)
+        self.open: Dict[str, None] = {}  # 빈 자리가 있는 방 (순서 있는 집합)
+        self.pending: Dict[str, Optional[Dict]] = {}  # 보낼 변경 (None이면 삭제)
+        self.added: Set[str] = set()  # 이번 주기에 새로 생긴 방
+
+    def touch(self, room) -> None:
+        """방 요약을 갱신하고, 달라졌으면 다음 flush에 보낸다"""
+        entry = summarize(room)
+        previous = self.entries.get(room.room_id)
+        if previous != entry:
+            if previous is None and room.room_id not in self.pending:
+                self.added.add(room.room_id)
+            self._set(room.room_id, entry)
+            self.pending[room.room_id] = entry
+
+    def remove(self, room_id: str) -> None:
+        if room_id in self.entries:
+            self._set(room_id, None)
+            self.pending[room_id] = None
+
+    def flush(self) -> List[Dict]:
+        """지난 flush 이후의 변경 목록 (방마다 하나)"""
+        # 다른 레인의 touch가 그 사이에 넣는 변경은 다음 flush로 넘어간다
+        pending, self.pending = self.pending, {}
+        added, self.added = self.added, set()
+        ops = []
+        for room_id, entry in pending.items():
+            if room_id in added:
+                # 생겼다가 같은 주기 안에 없어진 방은 알리지 않는다
+                if entry is not None:
+                    ops.append({"op": "add", "room": entry})
+            elif entry is None:
+                ops.append({"op": "remove", "id": room_id})
+            else:
+                ops.append({"op": "update", "room": entry})
+        return ops
+
+    def apply(self, ops: Iterable[Dict]) -> None:
+        """다른 워커가 보낸 변경을 반영 (다시 보내지 않음)"""
+        for op in ops:
+            if op["op"] == "remove":
+                self._set(op["id"], None)
+            else:
+                self._set(op["room"]["id"], op["room"])
+
+    def page(
+        self, page: int = 0, per_page: int = PER_PAGE, open_only: bool = False
+    ) -> Dict:
+        """한 페이지의 방 요약과 전체 방 수"""
+        per_page = max(1, min(per_page, MAX_PER_PAGE))
+        page = max(0, page)
+        # 방 ID를 한 번에 복사해 두고 자른다 (다른 레인이 목록을 바꾸는 중일 수 있음)
+        ids = list(self.open if open_only else self.entries)
+        start = page * per_page
+        rooms = map(self.entries.get, ids[start : start + per_page])
+        return {
+            "rooms": [entry for entry in rooms if entry is not None],
+            "total": len(ids),
+            "page": page,
+            "per_page": per_page,
+            "open_only": open_only,
+        }
+
+    def _set(self, room_id: str, entry: Optional[Dict]) -> None:
+        if entry is None:
+            self.entries.pop(room_id, None)
+        else:
+            self.entries[room_id] = entry
+        if entry is not None and is_open(entry):
+            self.open.setdefault(room_id, None)
+        else:
+            self.open.pop(room_id, None)
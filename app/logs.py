@@ -0,0 +1,59 @@
+"""
+서버 로그 설정
+
+모든 모듈은 logger = logging.getLogger(__name__)으로 "app" 아래의 로거를 쓴다.
+- MIGHTY_LOG_LEVEL: 남길 최소 수준 (기본 INFO). 요청마다 남기는 자세한
+  로그는 DEBUG라서 기본으로는 만들지도 않는다 (인자를 % 형식으로 넘기면
+  수준이 꺼져 있을 때 문자열을 만들지 않음)
+- MIGHTY_LOG_SAMPLE: DEBUG 로그 중 남길 비율 (기본 1.0, 0.01이면 1%)
+손 패 전체처럼 만드는 데 비용이 드는 로그는 sampled(logger)가 참일 때만
+만들고 extra=SAMPLED로 남긴다 (핸들러에서 다시 표본을 뽑지 않도록).
+"""
+
+import logging
+import os
+import random
+import sys
+
+LOG_LEVEL = os.environ.get("MIGHTY_LOG_LEVEL", "INFO").upper()
+LOG_SAMPLE = float(os.environ.get("MIGHTY_LOG_SAMPLE", "1.0"))
+
+
+SAMPLED = {"sampled": True}
+
+
+class SampleFilter(logging.Filter):
+    """DEBUG 로그를 rate 비율만 통과시킨다 (그보다 높은 수준은 모두 통과)"""
+
+    def __init__(self, rate: float = LOG_SAMPLE):
+        super().__init__()
+        self.rate = rate
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        return (
+            record.levelno > logging.DEBUG
+            or self.rate >= 1.0
+            or getattr(record, "sampled", False)  # sampled()로 이미 고름
+            or random.random() < self.rate
+        )
+
+
+def configure(level: str = LOG_LEVEL, rate: float = LOG_SAMPLE) -> None:
+    """ "app" 로거에 수준과 표준 출력 핸들러를 붙인다 (여러 번 불러도 한 번만)"""
+    global LOG_SAMPLE
+    LOG_SAMPLE = rate
+    logger = logging.getLogger("app")
+    logger.setLevel(level)
+    if not logger.handlers:
+        handler = logging.StreamHandler(sys.stdout)
+        handler.setFormatter(logging.Formatter("%(levelname).1s %(name)s %(message)s"))
+        handler.addFilter(SampleFilter(rate))
+        logger.addHandler(handler)
+        logger.propagate = False
+
+
+def sampled(logger: logging.Logger, level: int = logging.DEBUG) -> bool:
+    """level 로그를 지금 남길지 (꺼져 있거나 표본에서 빠지면 False)"""
+    if not logger.isEnabledFor(level):
+        return False
+    return level > logging.DEBUG or LOG_SAMPLE >= 1.0 or random.random() < LOG_SAMPLE
@@ -0,0 +1,312 @@
+"""
+서버 지표 (Prometheus 텍스트 형식)
+
+prometheus_client 없이 쓰는 작은 지표 모음이다. 모듈에 만들어 둔 지표는
+REGISTRY에 등록되고 render()가 /metrics 응답을 만든다.
+- Counter: 늘기만 하는 값 (라벨별)
+- Gauge: 지금 값 (set/inc 또는 읽을 때마다 부르는 함수)
+- Histogram: 누적 버킷 + 합계 + 개수, quantile()로 p50/p95/p99 추정
+라벨 값은 생성자에 준 라벨 이름 순서대로 넘긴다. 여러 레인과 백그라운드
+작업이 같은 지표를 바꾸므로 값 변경은 지표마다 잠금 하나로 보호한다.
+"""
+
+import bisect
+import functools
+import os
+import threading
+import time
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
+
+try:
+    import resource
+except ImportError:  # 윈도우에는 없음 (최대 RSS 지표를 빼고 시작)
+    resource = None
+
+# 소켓 이벤트 처리 시간 버킷(초)
+LATENCY_BUCKETS = (
+    0.0005,
+    0.001,
+    0.0025,
+    0.005,
+    0.01,
+    0.025,
+    0.05,
+    0.1,
+    0.25,
+    0.5,
+    1.0,
+    2.5,
+)
+
+Labels = Tuple[str, ...]
+
+
+class Metric:
+    kind = "untyped"
+
+    def __init__(self, name: str, help: str, labels: Sequence[str] = ()):
+        self.name = name
+        self.help = help
+        self.labels = tuple(labels)
+        self.lock = threading.Lock()
+        REGISTRY.append(self)
+
+    def samples(self) -> List[Tuple[str, Labels, float]]:
+        """(이름 뒤에 붙일 접미사, 라벨 값, 값) 목록"""
+        raise NotImplementedError
+
+    @property
+    def family(self) -> str:
+        """HELP, TYPE 줄에 쓰는 이름"""
+        return self.name
+
+    def render(self) -> List[str]:
+        lines = self._header()
+        for suffix, values, value in self.samples():
+            lines.append(f"{self.name}{suffix}{self._labels(values)} {_number(value)}")
+        return lines
+
+    def _header(self) -> List[str]:
+        return [
+            f"# HELP {self.family} {self.help}",
+            f"# TYPE {self.family} {self.kind}",
+        ]
+
+    def _labels(self, values: Labels, extra: str = "") -> str:
+        pairs = [
+            f'{name}="{_escape(str(value))}"'
+            for name, value in zip(self.labels, values)
+        ]
+        if extra:
+            pairs.append(extra)
+        return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+class Counter(Metric):
+    kind = "counter"
+
+    @property
+    def family(self) -> str:
+        # 값을 name_total로 내보내므로 HELP, TYPE도 같은 이름이어야 한다 (0.0.4)
+        return self.name + "_total"
+
+    def __init__(self, name: str, help: str, labels: Sequence[str] = ()):
+        super().__init__(name, help, labels)
+        self.values: Dict[Labels, float] = {} if self.labels else {(): 0.0}
+
+    def inc(self, *labels: str, amount: float = 1.0) -> None:
+        with self.lock:
+            self.values[labels] = self.values.get(labels, 0.0) + amount
+
+    def get(self, *labels: str) -> float:
+        return self.values.get(labels, 0.0)
+
+    def samples(self):
+        with self.lock:
+            return [("_total", labels, value) for labels, value in self.values.items()]
+
+
+class Gauge(Metric):
+    kind = "gauge"
+
+    def __init__(
+        self,
+        name: str,
+        help: str,
+        labels: Sequence[str] = (),
+        function: Optional[Callable[[], object]] = None,
+    ):
+        super().__init__(name, help, labels)
+        self.values: Dict[Labels, float] = {} if self.labels else {(): 0.0}
+        # 읽을 때마다 부른다: 숫자, 또는 라벨 값(문자열이나 튜플) -> 숫자 dict
+        self.function = function
+
+    def set(self, value: float, *labels: str) -> None:
+        with self.lock:
+            self.values[labels] = value
+
+    def inc(self, *labels: str, amount: float = 1.0) -> None:
+        with self.lock:
+            self.values[labels] = self.values.get(labels, 0.0) + amount
+
+    def dec(self, *labels: str, amount: float = 1.0) -> None:
+        self.inc(*labels, amount=-amount)
+
+    def samples(self):
+        if self.function is None:
+            with self.lock:
+                return [("", labels, value) for labels, value in self.values.items()]
+        value = self.function()
+        if not isinstance(value, dict):
+            return [("", (), value)]
+        return [
+            ("", key if isinstance(key, tuple) else (key,), number)
+            for key, number in value.items()
+        ]
+
+
+class Histogram(Metric):
+    kind = "histogram"
+
+    def __init__(
+        self,
+        name: str,
+        help: str,
+        labels: Sequence[str] = (),
+        buckets: Sequence[float] = LATENCY_BUCKETS,
+    ):
+        super().__init__(name, help, labels)
+        self.buckets = tuple(buckets)
+        # 라벨 값 -> [버킷별 개수(누적 아님, 마지막은 +Inf), 합계]
+        self.values: Dict[Labels, list] = {}
+
+    def observe(self, value: float, *labels: str) -> None:
+        index = bisect.bisect_left(self.buckets, value)
+        with self.lock:
+            entry = self.values.get(labels)
+            if entry is None:
+                entry = self.values[labels] = [[0] * (len(self.buckets) + 1), 0.0]
+            entry[0][index] += 1
+            entry[1] += value
+
+    def quantile(self, q: float, *labels: str) -> Optional[float]:
+        """버킷 안에서 선형 보간한 q 분위수 (관측이 없으면 None)"""
+        entry = self.values.get(labels)
+        if entry is None:
+            return None
+        counts = list(entry[0])
+        rank = q * sum(counts)
+        seen = 0
+        for index, count in enumerate(counts):
+            if count and seen + count >= rank:
+                lower = self.buckets[index - 1] if index else 0.0
+                if index == len(self.buckets):
+                    return lower  # +Inf 버킷: 가장 큰 경계값
+                return lower + (self.buckets[index] - lower) * (rank - seen) / count
+            seen += count
+        return None
+
+    def summary(self, quantiles=(0.5, 0.95, 0.99)) -> Dict[str, Dict[str, float]]:
+        """라벨 값(첫 라벨)별 {"p50": .., "p95": .., "p99": ..}"""
+        return {
+            labels[0] if labels else "": {
+                f"p{round(q * 100)}": self.quantile(q, *labels) for q in quantiles
+            }
+            for labels in list(self.values)
+        }
+
+    def samples(self):
+        with self.lock:
+            items = [
+                (labels, list(counts), total)
+                for labels, (counts, total) in self.values.items()
+            ]
+        samples = []
+        for labels, counts, total in items:
+            cumulative = 0
+            for bound, count in zip(self.buckets + (float("inf"),), counts):
+                cumulative += count
+                samples.append(("_bucket", labels + (bound,), cumulative))
+            samples.append(("_sum", labels, total))
+            samples.append(("_count", labels, cumulative))
+        return samples
+
+    def render(self) -> List[str]:
+        lines = self._header()
+        for suffix, values, value in self.samples():
+            if suffix == "_bucket":
+                values, bound = values[:-1], values[-1]
+                labels = self._labels(values, f'le="{_number(bound)}"')
+            else:
+                labels = self._labels(values)
+            lines.append(f"{self.name}{suffix}{labels} {_number(value)}")
+        return lines
+
+
+REGISTRY: List[Metric] = []
+
+
+def render() -> str:
+    """등록된 모든 지표 (Prometheus 텍스트 형식 0.0.4)"""
+    lines = []
+    for metric in REGISTRY:
+        lines.extend(metric.render())
+    return "\n".join(lines) + "\n"
+
+
+def timed(event: str):
+    """핸들러가 끝날 때까지 걸린 시간을 EVENT_LATENCY에 event로 남긴다"""
+
+    def decorator(handler):
+        @functools.wraps(handler)
+        def wrapper(*args, **kwargs):
+            start = time.perf_counter()
+            try:
+                return handler(*args, **kwargs)
+            finally:
+                EVENT_LATENCY.observe(time.perf_counter() - start, event)
+
+        return wrapper
+
+    return decorator
+
+
+def memory_bytes() -> Dict[str, float]:
+    """프로세스 메모리: 지금 RSS(리눅스만)와 최대 RSS(resource 모듈이 있을 때만)"""
+    usage = {}
+    if resource is not None:
+        usage["max_rss"] = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024.0
+    try:
+        with open("/proc/self/statm") as statm:
+            usage["rss"] = float(
+                int(statm.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+            )
+    except (OSError, ValueError):
+        pass
+    return usage
+
+
+def cpu_seconds() -> Dict[str, float]:
+    """프로세스가 쓴 CPU 시간 (사용자, 커널)"""
+    times = os.times()
+    return {"user": times.user, "system": times.system}
+
+
+def _number(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    if float(value).is_integer():
+        return str(int(value))
+    return repr(float(value))
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+# 서버 지표 (routes와 GameManager가 갱신)
+EVENT_LATENCY = Histogram(
+    "mighty_event_latency_seconds",
+    "소켓 이벤트를 받은 때부터 처리가 끝날 때까지 걸린 시간",
+    ["event"],
+)
+REJECTED_COMMANDS = Counter(
+    "mighty_rejected_commands", "거절한 명령 (오류 메시지를 보냄)", ["event"]
+)
+GAMES_STARTED = Counter("mighty_games_started", "시작한 게임")
+GAMES_FINISHED = Counter("mighty_games_finished", "끝난 게임")
+TRICKS_RESOLVED = Counter("mighty_tricks_resolved", "끝난 트릭")
+BOT_DECISIONS = Counter("mighty_bot_decisions", "적용한 봇 결정", ["phase"])
+CONNECTED_SOCKETS = Gauge("mighty_connected_sockets", "이 워커에 연결된 소켓")
+MEMORY = Gauge(
+    "mighty_memory_bytes",
+    "프로세스 메모리",
+    ["kind"],
+    function=memory_bytes,
+)
+CPU = Gauge(
+    "mighty_cpu_seconds",
+    "프로세스가 쓴 CPU 시간 (시작 후 누적)",
+    ["mode"],
+    function=cpu_seconds,
+)
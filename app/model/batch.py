@@ -0,0 +1,256 @@
+"""
+여러 게임의 플레이 페이즈를 NumPy 배열로 한꺼번에 진행하는 배치 엔진
+
+    batch = BatchGame.from_games(games)  # playing 페이즈가 막 시작된 MightyGame들
+    batch.run(random_policy(np.random.default_rng(0)))
+
+K개 게임의 상태를 게임 축을 가진 배열로 들고(struct of arrays), 한 수를
+모든 게임에 벡터 연산 한 번으로 둔다. 플레이 페이즈는 어느 게임이든
+50수(10트릭)이므로 모든 게임이 같은 걸음으로 나아간다.
+- hands: (K, 5) uint64 손패 비트보드 (bitboard와 같은 카드 ID 비트)
+- trick: (K, 5) 이번 트릭에 나온 카드 ID (나온 순서)
+- giruda, lead_suit, trick_suit: 무늬 번호 (SUITS의 인덱스, 기루다 없음은 -1)
+- points, total_score: (K, 5) 먹은 점수와 게임 결과 점수
+규칙은 MightyGame.play_card와 같다: 무늬 따르기, 마이티와 조커는 언제나 낼
+수 있음, 조커콜(클로버 3 선)된 트릭에서 조커가 있으면 조커, 트릭 판정은
+power 표, 프렌드 공개, 끝나면 _update_total_score. 비딩부터 프렌드 선택까지는
+게임마다 한 번씩인 결정이므로 MightyGame으로 진행한 뒤 넘겨받는다.
+numpy가 필요하다 (서버는 이 모듈을 쓰지 않음).
+"""
+
+from typing import Callable, List, Optional, Tuple
+
+import numpy as np
+
+from .bitboard import FOLLOW_MASKS, JOKER_BIT, mighty_bit
+from .card import Card, Suit, NORMAL_SUITS, JOKER_ID, DECK_SIZE
+from .mighty import MightyGame, MIN_BID
+from .power import GIRUDA_OPTIONS, power_table
+
+TRICKS = 10
+
+# 무늬 번호: NORMAL_SUITS 순서 다음에 조커 (Suit 정의 순서와 같음)
+SUITS = NORMAL_SUITS + (Suit.JOKER,)
+SUIT_INDEX = {suit: i for i, suit in enumerate(SUITS)}
+NO_SUIT = -1
+
+# 카드 ID별 무늬 번호와 점수 카드 여부
+CARD_SUIT = np.array([SUIT_INDEX[card.suit] for card in Card.all_cards()], np.int8)
+POINT_CARD = np.array([card.is_point_card() for card in Card.all_cards()], np.int16)
+CARD_BITS = np.array([card.bit for card in Card.all_cards()], np.uint64)
+CLOVER_THREE = Card(Suit.CLOVER, 3).id
+
+# 아래 표들은 기루다 번호 + 1로 찾는다 (0이 기루다 없음)
+# [기루다, 선카드 무늬, 조커콜 여부, 카드 ID] -> 파워
+POWER = np.array(
+    [
+        [
+            [power_table(giruda, leading_suit, called) for called in (False, True)]
+            for leading_suit in SUITS
+        ]
+        for giruda in GIRUDA_OPTIONS
+    ],
+    np.int16,
+)
+# [기루다, 선카드 무늬] -> 따라야 하는 카드 마스크
+FOLLOW = np.array(
+    [
+        [FOLLOW_MASKS[giruda][suit] for suit in NORMAL_SUITS]
+        for giruda in GIRUDA_OPTIONS
+    ],
+    np.uint64,
+)
+# [기루다] -> 무늬와 상관없이 낼 수 있는 카드 (마이티, 조커)
+FREE = np.array(
+    [mighty_bit(giruda) | JOKER_BIT for giruda in GIRUDA_OPTIONS], np.uint64
+)
+JOKER_MASK = np.uint64(JOKER_BIT)
+
+# (카드 ID, 조커 무늬 번호, 조커콜 여부), 게임마다 하나씩
+Moves = Tuple[np.ndarray, np.ndarray, np.ndarray]
+Policy = Callable[["BatchGame", np.ndarray], Moves]
+
+
+class BatchGame:
+    def __init__(
+        self,
+        hands: np.ndarray,
+        turn: np.ndarray,
+        giruda: np.ndarray,
+        president: np.ndarray,
+        friend: np.ndarray,
+        friend_card: np.ndarray,
+        bid: np.ndarray,
+        points: np.ndarray,
+        total_score: np.ndarray,
+    ):
+        k = len(hands)
+        self.size = k
+        self.games = np.arange(k)
+        self.hands = hands.astype(np.uint64)
+        self.turn = turn.astype(np.int64)
+        self.giruda = giruda.astype(np.int64)
+        self.president = president.astype(np.int64)
+        # 프렌드 좌석(노프렌드는 -1)은 select_friend 때 정해지고, 공개는 따로 본다
+        self.friend = friend.astype(np.int64)
+        self.friend_card = friend_card.astype(np.int64)
+        self.friend_revealed = np.zeros(k, bool)
+        self.bid = bid.astype(np.int64)
+        self.points = points.astype(np.int64)
+        self.total_score = total_score.astype(np.int64)
+        self.trick = np.full((k, 5), -1, np.int64)
+        # 따라야 할 무늬(조커 선이면 지정한 무늬)와 판정 기준인 첫 카드의 무늬
+        self.lead_suit = np.full(k, NO_SUIT, np.int64)
+        self.trick_suit = np.full(k, NO_SUIT, np.int64)
+        self.joker_called = np.zeros(k, bool)
+        self.step = 0  # 지금까지 둔 수 (모든 게임이 같음)
+
+    @classmethod
+    def from_games(cls, games: List[MightyGame]) -> "BatchGame":
+        """playing 페이즈가 막 시작된(아직 아무도 내지 않은) 게임들"""
+        for game in games:
+            if game.phase != "playing" or game.played_mask:
+                raise ValueError("플레이 페이즈가 막 시작된 게임만 넣을 수 있습니다")
+        return cls(
+            hands=np.array(
+                [[player.mask for player in game.players] for game in games], np.uint64
+            ),
+            turn=np.array([game.current_player_idx for game in games]),
+            giruda=np.array([_suit_index(game.giruda) for game in games]),
+            president=np.array([game.president_idx for game in games]),
+            friend=np.array([_seat(game.friend_player_idx) for game in games]),
+            friend_card=np.array(
+                [game.friend_card.id if game.friend_card else -1 for game in games]
+            ),
+            bid=np.array([game.current_bid.score for game in games]),
+            points=np.array([[p.points for p in game.players] for game in games]),
+            total_score=np.array(
+                [[p.total_score for p in game.players] for game in games]
+            ),
+        )
+
+    @property
+    def finished(self) -> bool:
+        return self.step == TRICKS * 5
+
+    @property
+    def position(self) -> int:
+        """이번 트릭에서 몇 번째로 내는지 (0이면 선)"""
+        return self.step % 5
+
+    def current_hands(self) -> np.ndarray:
+        return self.hands[self.games, self.turn]
+
+    def legal_masks(self) -> np.ndarray:
+        """게임마다 차례인 플레이어가 낼 수 있는 카드 (legal_move_mask와 같음)"""
+        hand = self.current_hands()
+        if self.finished:
+            return np.zeros(self.size, np.uint64)
+        if self.position == 0:
+            return hand
+        giruda = self.giruda + 1
+        follow = hand & FOLLOW[giruda, self.lead_suit]
+        legal = np.where(follow != 0, follow | (hand & FREE[giruda]), hand)
+        # 조커콜된 트릭에서 조커가 있으면 조커를 내야 함
+        must_joker = self.joker_called & (hand & JOKER_MASK != 0)
+        return np.where(must_joker, JOKER_MASK, legal)
+
+    def play(
+        self, cards: np.ndarray, joker_suits: np.ndarray, call_joker: np.ndarray
+    ) -> None:
+        """
+        모든 게임에서 차례인 플레이어가 한 장씩 낸다
+        낼 수 없는 카드가 하나라도 있으면 아무것도 바꾸지 않고 ValueError
+        """
+        if self.finished:
+            raise ValueError("이미 끝난 게임입니다")
+        cards = np.asarray(cards, np.int64)
+        bits = CARD_BITS[cards]
+        illegal = self.legal_masks() & bits == 0
+        position = self.position
+        if position == 0:
+            # 첫 카드가 조커인 경우, 무늬를 지정해야 함
+            joker_suits = np.asarray(joker_suits, np.int64)
+            lead_joker = cards == JOKER_ID
+            illegal |= lead_joker & ((joker_suits < 0) | (joker_suits >= 4))
+        if illegal.any():
+            raise ValueError(f"낼 수 없는 카드입니다: 게임 {np.flatnonzero(illegal)}")
+
+        if position == 0:
+            self.trick_suit = CARD_SUIT[cards].astype(np.int64)
+            self.lead_suit = np.where(lead_joker, joker_suits, self.trick_suit)
+            # 조커콜: 클로버 3으로 시작
+            self.joker_called = (cards == CLOVER_THREE) & np.asarray(call_joker, bool)
+        self.hands[self.games, self.turn] &= ~bits
+        self.trick[:, position] = cards
+        self.friend_revealed |= cards == self.friend_card
+        self.turn = (self.turn + 1) % 5
+        self.step += 1
+        if position == 4:
+            self._resolve_trick()
+            if self.finished:
+                self._update_total_score()
+
+    def run(self, policy: Policy) -> "BatchGame":
+        """policy(batch, legal_masks)가 돌려주는 수로 끝까지 진행"""
+        while not self.finished:
+            self.play(*policy(self, self.legal_masks()))
+        return self
+
+    def _resolve_trick(self):
+        powers = POWER[
+            (self.giruda + 1)[:, None],
+            self.trick_suit[:, None],
+            self.joker_called[:, None].astype(np.int64),
+            self.trick,
+        ]
+        # argmax는 MightyGame의 powers.index(max(powers))처럼 처음 나온 최댓값
+        first_winner = powers.argmax(axis=1)
+        winner = (self.turn - (5 - first_winner)) % 5
+        self.points[self.games, winner] += POINT_CARD[self.trick].sum(axis=1)
+        self.turn = winner
+        self.trick[:] = -1
+        self.lead_suit[:] = NO_SUIT
+        self.trick_suit[:] = NO_SUIT
+        self.joker_called[:] = False
+
+    def _update_total_score(self):
+        """MightyGame._update_total_score를 모든 게임에 한꺼번에"""
+        has_friend = self.friend >= 0
+        friend = np.where(has_friend, self.friend, 0)
+        score = self.points[self.games, self.president] + np.where(
+            has_friend, self.points[self.games, friend], 0
+        )
+        won = score >= self.bid
+        base = np.where(
+            won, (score - self.bid) + (self.bid - MIN_BID) * 2, self.bid - score
+        )
+        sign = np.where(won, 1, -1)
+        # 나머지 플레이어는 base만큼 반대로, 주공은 2배(노프렌드 4배), 프렌드는 1배
+        delta = np.repeat((-sign * base)[:, None], 5, axis=1)
+        delta[self.games, self.president] = sign * base * np.where(has_friend, 2, 4)
+        delta[self.games[has_friend], self.friend[has_friend]] = (sign * base)[
+            has_friend
+        ]
+        self.total_score += delta
+
+
+def random_policy(rng: np.random.Generator, joker_call_rate: float = 0.5) -> Policy:
+    """낼 수 있는 카드 중 무작위 (조커 선이면 무작위 무늬, 조커콜은 joker_call_rate)"""
+
+    def policy(batch: BatchGame, legal: np.ndarray) -> Moves:
+        held = (legal[:, None] >> np.arange(DECK_SIZE, dtype=np.uint64)) & np.uint64(1)
+        cards = (rng.random(held.shape) * held).argmax(axis=1)
+        joker_suits = rng.integers(0, 4, batch.size)
+        call_joker = rng.random(batch.size) < joker_call_rate
+        return cards, joker_suits, call_joker
+
+    return policy
+
+
+def _suit_index(suit: Optional[Suit]) -> int:
+    return NO_SUIT if suit is None else SUIT_INDEX[suit]
+
+
+def _seat(idx: Optional[int]) -> int:
+    return -1 if idx is None else idx
@@ -0,0 +1,59 @@
+"""
+카드 집합을 53비트 정수(비트보드)로 다루는 유틸리티
+
+카드 ID(0..52)가 곧 비트 위치이므로 패, kitty, 버린 카드, 낸 카드 집합을
+int 하나로 표현할 수 있다. 소지 여부, 무늬 따르기, 무늬 없음 판정은
+모두 AND 한 번으로 끝난다.
+"""
+
+from typing import Dict, Iterable, List, Optional
+from .card import Card, Suit, NORMAL_SUITS, JOKER_ID
+
+
+def mask_of(cards: Iterable[Card]) -> int:
+    mask = 0
+    for card in cards:
+        mask |= card.bit
+    return mask
+
+
+FULL_MASK = (1 << 53) - 1
+JOKER_BIT = 1 << JOKER_ID
+
+# 무늬별 13장 마스크
+SUIT_MASKS: Dict[Suit, int] = {
+    suit: 0x1FFF << (i * 13) for i, suit in enumerate(NORMAL_SUITS)
+}
+SUIT_MASKS[Suit.JOKER] = JOKER_BIT
+
+# 점수 카드 (A, K, Q, J, 10)
+POINT_MASK = mask_of(card for card in Card.all_cards() if card.is_point_card())
+
+SPADE_ACE_BIT = Card(Suit.SPADE, 14).bit
+DIAMOND_ACE_BIT = Card(Suit.DIAMOND, 14).bit
+
+
+def mighty_bit(giruda: Optional[Suit]) -> int:
+    """기루다에 따른 마이티 카드의 비트"""
+    return DIAMOND_ACE_BIT if giruda == Suit.SPADE else SPADE_ACE_BIT
+
+
+# (기루다, 선카드 무늬)별로 "따라야 하는 카드" 마스크
+# 마이티와 조커는 무늬를 따르지 않아도 되므로 제외한다
+FOLLOW_MASKS: Dict[Optional[Suit], Dict[Suit, int]] = {
+    giruda: {
+        suit: SUIT_MASKS[suit] & ~mighty_bit(giruda) & ~JOKER_BIT
+        for suit in NORMAL_SUITS
+    }
+    for giruda in (None,) + NORMAL_SUITS
+}
+
+
+def cards_of(mask: int) -> List[Card]:
+    """비트보드를 카드 ID 순서의 카드 목록으로 변환"""
+    cards = []
+    while mask:
+        low = mask & -mask
+        cards.append(Card.from_id(low.bit_length() - 1))
+        mask ^= low
+    return cards
@@ -1,5 +1,5 @@
 from enum import Enum
-from typing import Optional
+from typing import Dict, List, Optional, Union
 
 
 class Suit(Enum):
@@ -10,19 +10,122 @@ class Suit(Enum):
     JOKER = "🃏"
 
 
+# 카드 ID 배치: 무늬 순서(SPADE, DIAMOND, HEART, CLOVER)대로 13장씩, 조커는 52
+NORMAL_SUITS = (Suit.SPADE, Suit.DIAMOND, Suit.HEART, Suit.CLOVER)
+JOKER_ID = 52
+DECK_SIZE = 53
+
+_SUIT_BASE = {suit: i * 13 for i, suit in enumerate(NORMAL_SUITS)}
+_RANK_STR = {11: "J", 12: "Q", 13: "K", 14: "A"}
+
+# 소켓에서 들어오는 무늬 표기(기호, 영문 이름)를 Suit로 변환
+SUIT_ALIASES: Dict[str, Suit] = {
+    "♠": Suit.SPADE,
+    "♦": Suit.DIAMOND,
+    "♥": Suit.HEART,
+    "♣": Suit.CLOVER,
+    "🃏": Suit.JOKER,
+    "spade": Suit.SPADE,
+    "diamond": Suit.DIAMOND,
+    "heart": Suit.HEART,
+    "club": Suit.CLOVER,
+    "clover": Suit.CLOVER,
+    "joker": Suit.JOKER,
+}
+
+
+def parse_suit(suit: Union[Suit, str, None]) -> Optional[Suit]:
+    """Suit 또는 무늬 문자열을 Suit로 변환 (알 수 없으면 None)"""
+    if isinstance(suit, Suit):
+        return suit
+    if not isinstance(suit, str):
+        return None
+    return SUIT_ALIASES.get(suit) or SUIT_ALIASES.get(suit.lower())
+
+
+def card_id(suit: Suit, rank: int) -> int:
+    """(무늬, 숫자)에 해당하는 카드 ID (0..52)"""
+    if suit == Suit.JOKER:
+        return JOKER_ID
+    return _SUIT_BASE[suit] + rank - 2
+
+
 class Card:
-    def __init__(self, suit: Suit, rank: int):
-        self.suit = suit
-        self.rank = rank  # 2-14 (11=J, 12=Q, 13=K, 14=A), 조커는 rank=0
+    """
+    53장의 카드는 모두 미리 만들어진 공유 인스턴스를 사용한다.
+    Card(suit, rank)도 새 객체를 만들지 않고 테이블의 인스턴스를 돌려주므로
+    카드 비교는 항상 identity 비교가 된다.
+    """
+
+    __slots__ = ("suit", "rank", "id", "bit", "_str", "_hash")
+
+    _table: List["Card"] = []
+
+    def __new__(cls, suit: Suit, rank: int):
+        if not cls.is_valid_card(suit, rank):
+            raise ValueError(f"유효하지 않은 카드입니다: {suit} {rank}")
+        return cls._table[card_id(suit, rank)]
+
+    @classmethod
+    def _create(cls, suit: Suit, rank: int) -> "Card":
+        card = object.__new__(cls)
+        set_attr = object.__setattr__
+        set_attr(card, "suit", suit)
+        set_attr(card, "rank", rank)  # 2-14 (11=J, 12=Q, 13=K, 14=A), 조커는 rank=0
+        set_attr(card, "id", card_id(suit, rank))
+        set_attr(card, "bit", 1 << card.id)  # 비트보드에서의 위치
+        if suit == Suit.JOKER:
+            set_attr(card, "_str", suit.value)
+        else:
+            set_attr(card, "_str", f"{suit.value}{_RANK_STR.get(rank, str(rank))}")
+        set_attr(card, "_hash", card.id)
+        return card
+
+    @classmethod
+    def from_id(cls, card_id: int) -> "Card":
+        """카드 ID로 공유 인스턴스를 조회"""
+        return cls._table[card_id]
+
+    @classmethod
+    def from_wire(cls, suit: Union[Suit, str, None], rank) -> Optional["Card"]:
+        """
+        소켓 페이로드의 (무늬, 숫자)로 공유 인스턴스를 조회
+        무늬는 기호("♠")나 이름("spade")을 모두 받으며, 잘못된 카드는 None
+        """
+        suit = parse_suit(suit)
+        if suit is None:
+            return None
+        if suit == Suit.JOKER:
+            return cls._table[JOKER_ID]
+        if isinstance(rank, str) and rank.isdigit():
+            rank = int(rank)
+        if not isinstance(rank, int) or not 2 <= rank <= 14:
+            return None
+        return cls._table[_SUIT_BASE[suit] + rank - 2]
+
+    @classmethod
+    def all_cards(cls) -> List["Card"]:
+        """카드 ID 순서의 53장 목록"""
+        return list(cls._table)
+
+    def __setattr__(self, name, value):
+        raise AttributeError("Card는 변경할 수 없습니다")
+
+    def __reduce__(self):
+        # pickle/copy 시에도 공유 인스턴스로 복원
+        return (Card.from_id, (self.id,))
 
     def __str__(self):
-        if self.suit == Suit.JOKER:
-            return self.suit.value
-        rank_str = {11: "J", 12: "Q", 13: "K", 14: "A"}.get(self.rank, str(self.rank))
-        return f"{self.suit.value}{rank_str}"
+        return self._str
+
+    def __repr__(self):
+        return self._str
+
+    def to_dict(self) -> Dict:
+        return {"suit": self.suit.value, "rank": self.rank}
 
     def is_joker(self) -> bool:
-        return self.suit == Suit.JOKER
+        return self.id == JOKER_ID
 
     def is_point_card(self) -> bool:
         """점수 카드인지 확인 (A, K, Q, J, 10)"""
@@ -51,4 +154,13 @@ class Card:
         return False
 
     def __eq__(self, other):
-        return self.suit == other.suit and self.rank == other.rank
+        return self is other
+
+    def __hash__(self):
+        return self._hash
+
+
+Card._table = [
+    Card._create(suit, rank) for suit in NORMAL_SUITS for rank in range(2, 15)
+]
+Card._table.append(Card._create(Suit.JOKER, 0))
@@ -0,0 +1,162 @@
+"""
+시드 기반 카드 분배기
+
+방마다 하나의 DealGenerator를 두고, 각 분배는 (seed, deal_no)로 다시 만들 수
+있다. 따라서 실제 게임에서 나온 패는 seed와 deal_no만 있으면 그대로 다시
+만들 수 있다.
+
+섞기는 카운터 기반이다. (seed, deal_no, attempt)의 splitmix64 스트림에서
+카드마다 32비트 키를 하나씩 받아 키 순서로 카드를 늘어놓는다 (64비트 값
+하나가 카드 두 장의 키). 키는 다른 분배와 무관하므로 deal()은 한 분배를,
+batch_ids()는 numpy로 여러 분배의 키를 한 번에 계산해 정렬하고 유효성도 한
+번에 검사하며, 둘의 결과는 같다. 유효하지 않은 분배는 attempt를 1 올려 그
+분배만 다시 만든다.
+
+prefetch를 주면 next_deal()이 prefetch개씩 batch_ids()로 미리 만들어 둔다
+(시뮬레이션용, numpy가 없으면 하나씩 만든다).
+"""
+
+import secrets
+from typing import Iterator, List, Optional, Tuple
+
+try:
+    import numpy as np
+except ImportError:  # 서버는 numpy 없이 돈다 (batch, batch_ids를 쓸 수 없음)
+    np = None
+
+from .card import DECK_SIZE, Card, Suit
+from .bitboard import POINT_MASK, mighty_bit
+
+CARDS_PER_PLAYER = 10
+
+# (플레이어별 10장씩 5개의 패, kitty 3장)
+Deal = Tuple[List[List[Card]], List[Card]]
+
+_MASK64 = (1 << 64) - 1
+_GAMMA = 0x9E3779B97F4A7C15  # splitmix64의 증분
+_MIX1 = 0xBF58476D1CE4E5B9
+_MIX2 = 0x94D049BB133111EB
+_KEY_MASK = (1 << 32) - 1
+# 카드 ID 2k, 2k+1의 키는 _mix(상태 + _STEPS[k])의 위, 아래 32비트
+_STEPS = [(k + 1) * _GAMMA for k in range((DECK_SIZE + 1) // 2)]
+
+
+def _mix(x: int) -> int:
+    """splitmix64의 섞기 함수 (64비트 정수)"""
+    x = (x ^ (x >> 30)) * _MIX1 & _MASK64
+    x = (x ^ (x >> 27)) * _MIX2 & _MASK64
+    return x ^ (x >> 31)
+
+
+def _keys(state: int) -> List[int]:
+    """상태에서 카드 ID 순서의 키 (마지막 하나는 남는 키)"""
+    keys = []
+    for step in _STEPS:
+        x = _mix(state + step & _MASK64)
+        keys.append(x >> 32)
+        keys.append(x & _KEY_MASK)
+    return keys
+
+
+def _deal_of(cards: List[Card], ids) -> Deal:
+    deck = [cards[i] for i in ids]
+    hands = [
+        deck[start : start + CARDS_PER_PLAYER]
+        for start in range(0, 50, CARDS_PER_PLAYER)
+    ]
+    return hands, deck[50:]
+
+
+class DealGenerator:
+    def __init__(self, seed: Optional[int] = None, prefetch: int = 0):
+        self.seed = seed if seed is not None else secrets.randbits(64)
+        self.next_deal_no = 0
+        self.prefetch = prefetch
+        self._prefetched = None  # (seed, giruda, 시작 번호, 카드 ID 배열)
+
+    def _state(self, deal_no: int, attempt: int) -> int:
+        """(seed, deal_no, attempt) 스트림의 시작 상태"""
+        state = _mix((self.seed & _MASK64) ^ _mix(deal_no * _GAMMA & _MASK64))
+        return _mix(state ^ attempt * _GAMMA & _MASK64)
+
+    def deal(self, deal_no: int, giruda: Optional[Suit] = None) -> Deal:
+        """
+        deal_no번째 분배를 만든다
+        모든 패에 마이티를 제외한 점수 카드가 1장 이상 있을 때까지
+        attempt를 올려 다시 만드므로 결과는 항상 같다
+        """
+        valid_mask = POINT_MASK & ~mighty_bit(giruda)
+        cards = Card.all_cards()
+        attempt = 0
+        while True:
+            keys = _keys(self._state(deal_no, attempt))
+            hands, kitty = _deal_of(
+                cards, sorted(range(DECK_SIZE), key=keys.__getitem__)
+            )
+            if all(sum(card.bit for card in hand) & valid_mask for hand in hands):
+                return hands, kitty
+            attempt += 1
+
+    def next_deal(self, giruda: Optional[Suit] = None) -> Tuple[int, Deal]:
+        """다음 번호의 분배와 그 번호"""
+        deal_no = self.next_deal_no
+        self.next_deal_no += 1
+        if not self.prefetch or np is None:
+            return deal_no, self.deal(deal_no, giruda)
+        seed, cached_giruda, start, ids = self._prefetched or (None, None, 0, ())
+        if (seed, cached_giruda) != (self.seed, giruda) or not (
+            start <= deal_no < start + len(ids)
+        ):
+            start, ids = deal_no, self.batch_ids(deal_no, self.prefetch, giruda)
+            self._prefetched = (self.seed, giruda, start, ids)
+        return deal_no, _deal_of(Card.all_cards(), ids[deal_no - start])
+
+    def batch(
+        self, start: int, count: int, giruda: Optional[Suit] = None
+    ) -> Iterator[Tuple[int, Deal]]:
+        """
+        start번부터 count개의 분배 (시뮬레이션, 여러 방 동시 시작용)
+        deal()과 같은 분배를 numpy로 한꺼번에 만든다 (numpy가 필요함)
+        """
+        cards = Card.all_cards()
+        for offset, ids in enumerate(self.batch_ids(start, count, giruda)):
+            yield start + offset, _deal_of(cards, ids)
+
+    def batch_ids(self, start: int, count: int, giruda: Optional[Suit] = None):
+        """
+        start번부터 count개의 분배를 카드 ID의 (count, 53) 배열로
+        앞의 50열이 10장씩 5개의 패, 나머지 3열이 kitty
+        """
+        if np is None:
+            raise ImportError("batch_ids에는 numpy가 필요합니다")
+        valid = np.array(
+            [bool(POINT_MASK & ~mighty_bit(giruda) & 1 << i) for i in range(DECK_SIZE)]
+        )
+        seed = np.uint64(self.seed & _MASK64)
+        deal_nos = np.arange(start, start + count, dtype=np.uint64)
+        attempts = np.zeros(count, dtype=np.uint64)
+        # (seed, deal_no) 상태는 attempt와 무관하므로 한 번만 계산
+        base = _mix_array(seed ^ _mix_array(deal_nos * np.uint64(_GAMMA)))
+        steps = np.array([step & _MASK64 for step in _STEPS], dtype=np.uint64)
+        low = np.uint64(_KEY_MASK)
+        ids = np.empty((count, DECK_SIZE), dtype=np.int64)
+        pending = np.arange(count)
+        while pending.size:
+            state = _mix_array(base[pending] ^ attempts[pending] * np.uint64(_GAMMA))
+            mixed = _mix_array(state[:, None] + steps[None, :])
+            keys = np.stack((mixed >> np.uint64(32), mixed & low), axis=2)
+            keys = keys.reshape(len(pending), -1)[:, :DECK_SIZE]
+            rows = np.argsort(keys, axis=1, kind="stable")
+            hands = valid[rows[:, :50]].reshape(-1, 5, CARDS_PER_PLAYER)
+            ok = hands.any(axis=2).all(axis=1)
+            ids[pending[ok]] = rows[ok]
+            pending = pending[~ok]
+            attempts[pending] += np.uint64(1)
+        return ids
+
+
+def _mix_array(x):
+    """_mix의 numpy uint64 배열판 (곱셈은 2**64로 감싸짐)"""
+    x = (x ^ (x >> np.uint64(30))) * np.uint64(_MIX1)
+    x = (x ^ (x >> np.uint64(27))) * np.uint64(_MIX2)
+    return x ^ (x >> np.uint64(31))
@@ -0,0 +1,128 @@
+"""
+게임 명령 로그 (event sourcing)
+
+MightyGame에 ActionLog를 붙이면 받아들여진 명령만 작은 튜플로 쌓인다.
+카드는 카드 ID, 무늬는 Suit.value 문자열이라 그대로 JSON으로 저장할 수 있다.
+
+    ("join", 이름)
+    ("deck",)
+    ("deal", deal_no)
+    ("bid", seat, 점수, 무늬)               점수/무늬가 None이면 패스
+    ("discard", seat, [카드 ID 3개])
+    ("final_bid", seat, 점수, 무늬)         점수가 None이면 수정하지 않음
+    ("friend", seat, 카드 ID)               None이면 노프렌드
+    ("play", seat, 카드 ID, 조커 무늬, 조커콜 여부)
+    ("reset",)
+
+패는 (dealer seed, deal_no)로 다시 만들어지므로 replay(log)는 같은 명령을
+같은 순서로 다시 적용해 version과 패치까지 똑같은 게임을 만든다.
+snapshot_every개의 명령마다 게임 전체를 pickle한 스냅샷을 남기므로 복구는
+recover(log)로 마지막 스냅샷 + 그 이후 명령만 다시 적용하면 된다.
+"""
+
+import pickle
+from typing import List, Optional, Tuple
+
+from .card import Card, parse_suit
+from .deal import DealGenerator
+from .mighty import MightyGame
+
+SNAPSHOT_EVERY = 32  # 스냅샷 사이의 명령 수
+
+Action = tuple
+
+_CARDS = Card.all_cards()
+
+
+class ActionLog:
+    def __init__(self, seed: int, snapshot_every: int = SNAPSHOT_EVERY):
+        self.seed = seed  # 게임 dealer의 seed
+        self.snapshot_every = snapshot_every
+        self.actions: List[Action] = []
+        # (스냅샷 시점의 명령 수, pickle된 게임)
+        self.snapshot: Optional[Tuple[int, bytes]] = None
+
+    def __len__(self) -> int:
+        return len(self.actions)
+
+    def append(self, game: MightyGame, action: Action):
+        """game에 방금 적용된 명령을 기록하고 주기마다 스냅샷을 남긴다"""
+        self.actions.append(action)
+        if len(self.actions) % self.snapshot_every == 0:
+            self.take_snapshot(game)
+
+    def take_snapshot(self, game: MightyGame):
+        # MightyGame은 pickle할 때 log를 빼므로 스냅샷에 로그가 중첩되지 않는다
+        self.snapshot = (
+            len(self.actions),
+            pickle.dumps(game, pickle.HIGHEST_PROTOCOL),
+        )
+
+
+def apply(game: MightyGame, action: Action):
+    """명령 하나를 게임에 적용, 엔진이 거부하면 ValueError"""
+    op = action[0]
+    if op == "join":
+        accepted = game.add_player(action[1])
+    elif op == "deck":
+        game.initialize_deck()
+        accepted = True
+    elif op == "deal":
+        deal_no = action[1]
+        game.deal_cards(deal_no)
+        # 원래 게임처럼 다음 분배 번호도 맞춰 둔다
+        game.dealer.next_deal_no = max(game.dealer.next_deal_no, deal_no + 1)
+        accepted = True
+    elif op == "bid":
+        _, seat, score, suit = action
+        accepted = game.submit_bid(seat, score, parse_suit(suit))
+    elif op == "discard":
+        _, seat, ids = action
+        accepted = game.discard_cards(seat, [_CARDS[i] for i in ids])
+    elif op == "final_bid":
+        _, seat, score, suit = action
+        accepted = game.modify_final_bid(seat, score, parse_suit(suit))
+    elif op == "friend":
+        _, seat, card_id = action
+        if card_id is None:
+            accepted = game.select_friend(seat)
+        else:
+            card = _CARDS[card_id]
+            accepted = game.select_friend(seat, card.suit, card.rank)
+    elif op == "play":
+        _, seat, card_id, joker_suit, call_joker = action
+        accepted = game.play_card(
+            seat, _CARDS[card_id], parse_suit(joker_suit), call_joker
+        )
+    elif op == "reset":
+        game.reset_game()
+        accepted = True
+    else:
+        raise ValueError(f"알 수 없는 명령입니다: {op}")
+    if not accepted:
+        raise ValueError(f"로그의 명령을 적용할 수 없습니다: {action}")
+
+
+def _apply_all(game: MightyGame, actions: List[Action]) -> MightyGame:
+    for action in actions:
+        apply(game, action)
+    return game
+
+
+def replay(log: ActionLog) -> MightyGame:
+    """로그의 모든 명령을 처음부터 다시 적용한 게임 (로그는 붙이지 않음)"""
+    return _apply_all(MightyGame(DealGenerator(log.seed)), log.actions)
+
+
+def recover(log: ActionLog) -> MightyGame:
+    """
+    마지막 스냅샷에서 시작해 그 이후 명령만 다시 적용한 게임
+    복구한 게임에는 log를 다시 붙여서 이어서 기록되게 한다
+    """
+    if log.snapshot is None:
+        game = replay(log)
+    else:
+        position, data = log.snapshot
+        game = _apply_all(pickle.loads(data), log.actions[position:])
+    game.log = log
+    return game
@@ -1,10 +1,21 @@
+import logging
+from collections import deque
 from enum import Enum
-from typing import List, Dict, Optional, Union
-import random
-from .card import Card, Suit
+from itertools import islice
+from typing import Callable, Deque, List, Dict, Optional, Tuple, Union
+from .card import Card, Suit, NORMAL_SUITS
 from .player import Player
+from .bitboard import FOLLOW_MASKS, FULL_MASK, JOKER_BIT, cards_of, mask_of, mighty_bit
+from .deal import DealGenerator
+from .power import power_table, sort_cards
+
+logger = logging.getLogger(__name__)
 
 MIN_BID = 13
+PATCH_HISTORY = 512  # 다시 보낼 수 있도록 보관하는 최근 패치 수
+
+# (version, 공개 패치, 좌석별 비공개 패치)
+Patch = Tuple[int, Dict, Optional[Dict[int, Dict]]]
 
 
 class Bid:
@@ -15,8 +26,11 @@ class Bid:
 
 
 class MightyGame:
-    def __init__(self):
+    def __init__(self, dealer: Optional[DealGenerator] = None):
         self.players: List[Player] = []
+        # 방마다 공유하는 분배기, (dealer.seed, deal_no)로 패를 재현할 수 있다
+        self.dealer = dealer if dealer is not None else DealGenerator()
+        self.deal_no: Optional[int] = None
         self.deck: List[Card] = []
         self.current_player_idx = 0
         self.giruda: Optional[Suit] = None
@@ -30,6 +44,10 @@ class MightyGame:
         self.passed_players = set()
         self.kitty: List[Card] = []
         self.discarded_cards: List[Card] = []
+        # 비트보드: kitty, 버린 카드, 지금까지 낸 카드
+        self.kitty_mask = 0
+        self.discarded_mask = 0
+        self.played_mask = 0
         self.joker_suit = None  # 조커로 지정한 무늬 저장
         self.friend_card: Optional[Card] = None  # 프렌드 카드
         self.friend_player_idx: Optional[int] = None  # 프렌드 플레이어 인덱스
@@ -37,85 +55,126 @@ class MightyGame:
             "bidding"  # bidding, discarding, friend_selection, playing으로 수정
         )
         self.joker_called_in_this_trick = False  # 현재 트릭에서 조커콜 발동 여부
+        # 조커콜된 트릭마다 (부른 좌석, 트릭 승자, 조커가 나왔는지)
+        self.joker_calls: List[Tuple[int, int, bool]] = []
+        # 상태 동기화: 변경마다 version이 1 오르고 그 변경의 패치가 쌓인다
+        self.version = 0
+        self.patches: Deque[Patch] = deque(maxlen=PATCH_HISTORY)
+        self._synced_turn = (self.phase, self.current_player_idx)
+        # 명령 로그 (app.model.log.ActionLog), 있으면 받아들여진 명령을 기록
+        self.log = None
+        # 차례가 시작될 때마다 on_turn(game)을 부른다 (차례 제한 시간 등)
+        self.on_turn: Optional[Callable[["MightyGame"], None]] = None
+        # 게임이 끝나면(game_over로 바뀌면) on_game_over(game)을 부른다 (분석 기록 등)
+        self.on_game_over: Optional[Callable[["MightyGame"], None]] = None
+
+    def __getstate__(self):
+        # 로그는 원래 게임에만 붙어 있고 복사본(봇 탐색, 스냅샷)에는 넣지 않는다
+        state = self.__dict__.copy()
+        state["log"] = None
+        state["on_turn"] = None
+        state["on_game_over"] = None
+        return state
+
+    def __setstate__(self, state):
+        # 나중에 생긴 속성이 없는 예전 스냅샷도 불러올 수 있도록
+        state.setdefault("on_turn", None)
+        state.setdefault("on_game_over", None)
+        state.setdefault("joker_calls", [])
+        self.__dict__.update(state)
+
+    def _log(self, *action):
+        if self.log is not None:
+            self.log.append(self, action)
 
     def initialize_deck(self):
-        self.deck = []
-        # 모든 카드 생성 (조커 포함)
-        for suit in Suit:
-            if suit == Suit.JOKER:
-                self.deck.append(Card(suit, 0))  # 조커는 rank 0
-            else:
-                for rank in range(2, 15):  # 2부터 A까지
-                    self.deck.append(Card(suit, rank))
+        # 공유 카드 테이블의 53장 (조커 포함)
+        self.deck = Card.all_cards()
+        self._log("deck")
 
     def add_player(self, name: str):
         if len(self.players) < 5:
             self.players.append(Player(name))
+            self._log("join", name)
             return True
         return False
 
-    def deal_cards(self):
-        while True:  # 적절한 패가 나올 때까지 반복
-            random.shuffle(self.deck)
-            # 각 플레이어에게 10장씩 카드 배분
-            cards_per_player = 10
-            temp_hands = []  # 임시로 패를 저장
-
-            for i in range(5):  # 5명의 플레이어
-                start_idx = i * cards_per_player
-                end_idx = start_idx + cards_per_player
-                hand = self.deck[start_idx:end_idx]
-                temp_hands.append(hand)
-
-            # 남은 3장은 kitty에 저장
-            self.kitty = self.deck[50:]
-
-            # 각 플레이어의 패 검증
-            valid_distribution = True
-            for hand in temp_hands:
-                if not self._is_valid_hand(hand):
-                    valid_distribution = False
-                    break
-
-            if valid_distribution:
-                # 유효한 패 분배면 플레이어들에게 할당
-                for player, hand in zip(self.players, temp_hands):
-                    player.cards = hand
-                break
-
-    def _is_valid_hand(self, hand: List[Union[Card, str]]) -> bool:
+    def deal_cards(self, deal_no: Optional[int] = None):
         """
-        유효한 패인지 검사
-        - 마이티를 제외한 점수 카드가 최소 1장은 있어야 함
+        각 플레이어에게 10장씩 분배하고 남은 3장은 kitty로
+        deal_no를 주면 해당 번호의 분배를 다시 만든다
         """
-        point_cards = 0
-        mighty = None
-
-        # 마이티 카드 결정 (초기에는 기루다가 없으므로 스페이드A가 마이티)
-        if self.giruda == Suit.SPADE:
-            mighty = (Suit.DIAMOND, 14)  # 다이아A
+        if deal_no is None:
+            deal_no, (hands, kitty) = self.dealer.next_deal(self.giruda)
         else:
-            mighty = (Suit.SPADE, 14)  # 스페이드A
-
-        for card in hand:
-            if isinstance(card, Card):
-                # 마이티가 아닌 점수 카드 개수 세기
-                if card.is_point_card() and not (
-                    card.suit == mighty[0] and card.rank == mighty[1]
-                ):
-                    point_cards += 1
-
-        return point_cards > 0  # 마이티 제외 점수카드가 1장 이상이면 유효
+            hands, kitty = self.dealer.deal(deal_no, self.giruda)
+        self.deal_no = deal_no
+        self.deck = [card for hand in hands for card in hand] + kitty
+
+        for player, hand in zip(self.players, hands):
+            player.cards = hand
+        self.kitty = kitty
+        self.kitty_mask = mask_of(self.kitty)
+
+        counts = [len(player.cards) for player in self.players]
+        self._record(
+            {"op": "deal", "counts": counts},
+            {
+                seat: {"op": "deal", "counts": counts, "hand": _cards(player.cards)}
+                for seat, player in enumerate(self.players)
+            },
+        )
+        self._sync_turn()
+        self._log("deal", deal_no)
 
     def submit_bid(
         self, player_idx: int, score: Optional[int], suit: Optional[Suit]
+    ) -> bool:
+        history = len(self.bid_history)
+        if not self._submit_bid(player_idx, score, suit):
+            return False
+        for bid in self.bid_history[history:]:
+            self._record(
+                {
+                    "op": "bid",
+                    "seat": bid.player_idx,
+                    "score": bid.score or None,
+                    "suit": _suit(bid.suit),
+                }
+            )
+        if self.phase == "discarding":
+            self._record(
+                {
+                    "op": "president",
+                    "seat": self.president_idx,
+                    "score": self.current_bid.score,
+                    "suit": _suit(self.giruda),
+                },
+                {
+                    self.president_idx: {
+                        "op": "president",
+                        "seat": self.president_idx,
+                        "score": self.current_bid.score,
+                        "suit": _suit(self.giruda),
+                        "kitty": _cards(self.kitty),
+                    }
+                },
+            )
+        self._sync_turn()
+        self._log("bid", player_idx, score, _suit(suit))
+        return True
+
+    def _submit_bid(
+        self, player_idx: int, score: Optional[int], suit: Optional[Suit]
     ) -> bool:
         if self.phase != "bidding":
-            print("비딩 중이 아닙니다.")
+            logger.debug("비딩 중이 아닙니다.")
             return False
         if player_idx != self.current_player_idx:
-            print(
-                f"현재 플레이어가 아닙니다. {player_idx} != {self.current_player_idx}"
+            logger.debug(
+                "현재 플레이어가 아닙니다. %s != %s",
+                player_idx,
+                self.current_player_idx,
             )
             return False
 
@@ -152,12 +211,12 @@ class MightyGame:
         else:
             # 점수 범위 체크 (MIN_BID~20)
             if score < MIN_BID or score > 20:
-                print("13 이상 20 이하의 점수를 공약해야 하여야 합니다.")
+                logger.debug("13 이상 20 이하의 점수를 공약해야 하여야 합니다.")
                 return False
 
             # 이전 공약보다 높아야 함
             if self.current_bid and score <= self.current_bid.score:
-                print("이전 공약보다 높은 점수를 공약해야 하여야 합니다.")
+                logger.debug("이전 공약보다 높은 점수를 공약해야 하여야 합니다.")
                 return False
 
             # suit는 반드시 선택해야 함
@@ -228,49 +287,36 @@ class MightyGame:
             return False
 
         player = self.players[player_idx]
-        if card not in player.cards:
+        # 소지 여부, 조커콜, 선카드 무늬 따르기 규칙
+        if not self.legal_move_mask(player_idx) & card.bit:
             return False
 
-        # 첫커콜 처리
         if not self.current_trick:  # 첫 카드일 때
-            if card.suit == Suit.CLOVER and card.rank == 3:  # 클로버3으로 시작
-                if call_joker:
-                    self.joker_called_in_this_trick = True
-                    print("조커콜!")
-        elif self.joker_called_in_this_trick:  # 조커콜된 트릭에서
-            has_joker = any(c.is_joker() for c in player.cards)
-            if has_joker and not card.is_joker():  # 조커 있는데 안냈으면
-                return False
-
-        # 첫 카드가 조커인 경우, 무늬를 지정해야 함
-        if not self.current_trick and card.is_joker():
-            if joker_suit is None or joker_suit == Suit.JOKER:
-                return False
-            self.joker_suit = joker_suit
-
-        # 첫 카드가 아닌 경우, 선카드 무늬를 따라야 함
-        if self.current_trick:
-            leading_suit = (
-                self.joker_suit
-                if self.current_trick[0].is_joker()
-                else self.current_trick[0].suit
-            )
-
-            # 마이티나 조커는 아무 때나 낼 수 있음
-            if not (card.is_joker() or card.is_mighty(self.giruda)):
-                # 선카드 무늬를 가지고 있는지 확인 (마이티와 조커 제외)
-                has_leading_suit = any(
-                    c.suit == leading_suit
-                    for c in player.cards
-                    if not (c.is_joker() or c.is_mighty(self.giruda))
-                )
-                # 선카드 무늬가 있는데 다른 무늬를 낸 경우
-                if has_leading_suit and card.suit != leading_suit:
+            # 첫 카드가 조커인 경우, 무늬를 지정해야 함
+            if card.is_joker():
+                if joker_suit is None or joker_suit == Suit.JOKER:
                     return False
+                self.joker_suit = joker_suit
+            # 첫커콜 처리: 클로버3으로 시작
+            elif card.suit == Suit.CLOVER and card.rank == 3 and call_joker:
+                self.joker_called_in_this_trick = True
+                logger.debug("조커콜!")
 
         # 카드 플레이
         player.remove_card(card)
         self.current_trick.append(card)
+        self.played_mask |= card.bit
+        self._record(
+            {
+                "op": "play",
+                "seat": player_idx,
+                "card": card.to_dict(),
+                "joker_suit": _suit(self.joker_suit) if card.is_joker() else None,
+                "call_joker": self.joker_called_in_this_trick,
+            }
+        )
+        if card is self.friend_card:
+            self._record({"op": "friend_revealed", "seat": player_idx})
 
         # 다음 플레이어로 턴 넘기기
         self.current_player_idx = (self.current_player_idx + 1) % 5
@@ -293,7 +339,7 @@ class MightyGame:
             )
         ):  # 일반 카드인 경우
             self.friend_player_idx = player_idx
-            print(f"프렌드가 공개되었습니다! Player {player_idx}")
+            logger.debug("프렌드가 공개되었습니다! Player %s", player_idx)
 
         # 게임이 종료 되었는지 확인 후 player total score 업데이트
         # total score update 계산법
@@ -307,13 +353,76 @@ class MightyGame:
         # 주공은 위 점수의 2배를 잃고 프렌드는 1배를 잃음
         # 나머지 플레이어는 위 점수 만큼 얻는다
         # 노프렌드시 주공은 위점수의 4배를 잃고 나머지는 위 점수 만큼 얻는다
-        if all(len(player.cards) == 0 for player in self.players):
+        if not any(player.mask for player in self.players):
             self.phase = "game_over"
-            print("최종 점수 업데이트###########################")
             self._update_total_score()
+            self._record(
+                {
+                    "op": "game_over",
+                    "points": [player.points for player in self.players],
+                    "scores": [player.total_score for player in self.players],
+                }
+            )
 
+        self._sync_turn()
+        self._log("play", player_idx, card.id, _suit(joker_suit), call_joker)
+        if self.phase == "game_over" and self.on_game_over is not None:
+            self.on_game_over(self)
         return True
 
+    def legal_move_mask(self, player_idx: int) -> int:
+        """
+        player_idx가 지금 낼 수 있는 카드의 비트보드 (차례가 아니면 0)
+        손패와 트릭 상태는 매 수마다 비트보드로 갱신되어 있으므로
+        AND 몇 번으로 바로 계산된다
+        """
+        if self.phase != "playing" or player_idx != self.current_player_idx:
+            return 0
+        hand = self.players[player_idx].mask
+        if not self.current_trick:
+            return hand
+
+        # 조커콜된 트릭에서 조커가 있으면 조커를 내야 함
+        if self.joker_called_in_this_trick and hand & JOKER_BIT:
+            return JOKER_BIT
+
+        first_card = self.current_trick[0]
+        leading_suit = self.joker_suit if first_card.is_joker() else first_card.suit
+        # 선카드 무늬가 없으면 아무 카드나 낼 수 있음
+        follow = hand & FOLLOW_MASKS[self.giruda][leading_suit]
+        if not follow:
+            return hand
+        # 마이티나 조커는 아무 때나 낼 수 있음
+        return follow | (hand & (JOKER_BIT | mighty_bit(self.giruda)))
+
+    def legal_moves(self, player_idx: int) -> List[Card]:
+        """player_idx가 지금 낼 수 있는 카드 목록"""
+        return cards_of(self.legal_move_mask(player_idx))
+
+    def legal_bids(self, player_idx: int) -> List[Tuple[Optional[int], Optional[Suit]]]:
+        """
+        player_idx가 지금 제출할 수 있는 공약 (점수, 무늬) 목록
+        패스는 (None, None), 차례가 아니면 빈 목록
+        """
+        if self.phase != "bidding" or player_idx != self.current_player_idx:
+            return []
+        if player_idx in self.passed_players:
+            return [(None, None)]
+        lowest = self.current_bid.score + 1 if self.current_bid else MIN_BID
+        return [(None, None)] + [
+            (score, suit) for score in range(lowest, 21) for suit in NORMAL_SUITS
+        ]
+
+    def legal_friend_cards(self, player_idx: int) -> List[Card]:
+        """
+        주공이 프렌드로 지정할 수 있는 카드 목록
+        자신의 카드와 버린 카드는 제외하며, 노프렌드는 항상 가능
+        """
+        if self.phase != "friend_selection" or player_idx != self.president_idx:
+            return []
+        own = self.players[player_idx].mask
+        return cards_of(FULL_MASK & ~own & ~self.discarded_mask)
+
     def _update_total_score(self):
         """
         최종 점수 업데이트
@@ -363,6 +472,11 @@ class MightyGame:
 
         # 승자의 점수 추가
         self.players[winner_idx].points += trick_points
+        if self.joker_called_in_this_trick:
+            # 트릭이 다 돌았으므로 current_player_idx는 선(조커콜을 한 플레이어)
+            joker_played = any(card.is_joker() for card in self.current_trick)
+            self.joker_calls.append((self.current_player_idx, winner_idx, joker_played))
+        self._record({"op": "trick", "winner": winner_idx, "points": trick_points})
 
         # 현재 트릭 초기화하고 승자를 다음 선플레이어로 설정
         self.current_trick = []
@@ -374,52 +488,25 @@ class MightyGame:
         트릭의 승자를 결정하는 로직
         우선순위: 마이티 > 조커(조커콜 아닐 때) > 기루다 >  카드와 같은 무늬
         """
-        first_card = self.current_trick[0]
-        leading_suit = first_card.suit if isinstance(first_card, Card) else None
-        highest_power = -1
-        winner_idx = 0
-
-        for i, card in enumerate(self.current_trick):
-            power = self._calculate_card_power(card, leading_suit)
-            if power > highest_power:
-                highest_power = power
-                winner_idx = (self.current_player_idx - (5 - i)) % 5
-
-        return winner_idx
+        table = power_table(
+            self.giruda, self.current_trick[0].suit, self.joker_called_in_this_trick
+        )
+        powers = [table[card.id] for card in self.current_trick]
+        first_winner = powers.index(max(powers))
+        return (self.current_player_idx - (5 - first_winner)) % 5
 
-    def _calculate_card_power(self, card: Card, leading_suit: Optional[Suit]) -> int:
+    def _calculate_card_power(self, card: Card, leading_suit: Suit) -> int:
         """
         카드의 파워(강함)를 계산
         Returns:
             1000: 마이티
-            900: 조커
+            900: 조커 (조커콜된 트릭에서는 0)
             800-814: 기루다
             700-714: 선카드와 같은 무늬
             1-14: 나머지 카드
         """
-        # 조커콜된 트릭에서 조커는 가장 약한 카드
-        if self.joker_called_in_this_trick and card.is_joker():
-            return 0
-
-        # 조커인 경우
-        if card.is_joker():
-            # 조커콜 구현 필요
-            return 900
-
-        # 마이티 카드인 경우
-        if card.is_mighty(self.giruda):
-            return 1000
-
-        # 기루다인 ���우
-        if card.suit == self.giruda:
-            return 800 + card.rank
-
-        # 선카드와 같은 무늬인 경우
-        if card.suit == leading_suit:
-            return 700 + card.rank
-
-        # 그 외의 카드
-        return card.rank
+        table = power_table(self.giruda, leading_suit, self.joker_called_in_this_trick)
+        return table[card.id]
 
     def get_game_state(self) -> Dict:
         state = {
@@ -458,6 +545,103 @@ class MightyGame:
 
         return state
 
+    def get_snapshot(self, viewer: Optional[int] = None) -> Dict:
+        """
+        viewer 좌석이 볼 수 있는 현재 상태 전체 (입장하거나 패치가 끊겼을 때)
+        다른 플레이어의 패는 장수만, 아직 공개되지 않은 프렌드는 숨긴다
+        """
+        friend_seat = None
+        if self.friend_card is not None and self.played_mask & self.friend_card.bit:
+            friend_seat = self.friend_player_idx
+        snapshot = {
+            "v": self.version,
+            "phase": self.phase,
+            "turn": self.current_player_idx,
+            "counts": [len(player.cards) for player in self.players],
+            "points": [player.points for player in self.players],
+            "scores": [player.total_score for player in self.players],
+            "bids": [
+                {
+                    "seat": bid.player_idx,
+                    "score": bid.score or None,
+                    "suit": _suit(bid.suit),
+                }
+                for bid in self.bid_history
+            ],
+            "president": self.president_idx,
+            "giruda": _suit(self.giruda),
+            "bid": (
+                {"score": self.current_bid.score, "suit": _suit(self.current_bid.suit)}
+                if self.current_bid
+                else None
+            ),
+            "friend": self.friend_card.to_dict() if self.friend_card else None,
+            "friend_seat": friend_seat,
+            "trick": _cards(self.current_trick),
+            "joker_suit": _suit(self.joker_suit),
+            "joker_called": self.joker_called_in_this_trick,
+        }
+        if viewer is not None:
+            snapshot.update(self.get_private_state(viewer))
+        return snapshot
+
+    def get_private_state(self, viewer: int) -> Dict:
+        """
+        viewer 좌석에게만 보이는 상태
+        자신의 패(기루다 기준 정렬), 주공이면 kitty(discarding 중)와 버린 카드
+        """
+        state = {"hand": _cards(self.sort_cards(self.players[viewer].cards))}
+        if viewer == self.president_idx:
+            if self.phase == "discarding":
+                state["kitty"] = _cards(self.sort_cards(self.kitty))
+            if self.discarded_cards:
+                state["discarded"] = _cards(self.discarded_cards)
+        return state
+
+    def get_patches(
+        self, since: int, viewer: Optional[int] = None
+    ) -> Optional[List[Dict]]:
+        """
+        version since 이후의 패치 목록 (viewer 좌석 기준으로 가린 것)
+        보관 중인 패치로 이어 붙일 수 없으면 None (스냅샷을 보내야 함)
+        """
+        if since == self.version:
+            return []
+        if since > self.version or not self.patches:
+            return None
+        first = self.patches[0][0]
+        if since + 1 < first:
+            return None
+        return [
+            private[viewer] if private and viewer in private else patch
+            for _, patch, private in islice(self.patches, since + 1 - first, None)
+        ]
+
+    def _record(self, patch: Dict, private: Optional[Dict[int, Dict]] = None):
+        """
+        변경 하나를 기록한다
+        private에는 해당 좌석에게만 보여 줄 패치를 좌석별로 넣는다
+        """
+        self.version += 1
+        patch["v"] = self.version
+        if private:
+            for seat_patch in private.values():
+                seat_patch["v"] = self.version
+        self.patches.append((self.version, patch, private))
+
+    def _sync_turn(self):
+        """
+        페이즈나 차례가 바뀌었으면 turn 패치를 기록한다
+        받아들여진 명령마다 불리므로, 같은 플레이어가 이어서 두는 경우도
+        새 차례로 보고 on_turn을 부른다
+        """
+        turn = (self.phase, self.current_player_idx)
+        if turn != self._synced_turn:
+            self._synced_turn = turn
+            self._record({"op": "turn", "phase": self.phase, "seat": turn[1]})
+        if self.on_turn is not None:
+            self.on_turn(self)
+
     def give_kitty_to_president(self) -> List[Card]:
         """주공에게 남은 3장의 카드를 보여줌"""
         if self.phase != "discarding" or self.president_idx is None:
@@ -479,27 +663,25 @@ class MightyGame:
             return False
 
         if isinstance(cards_to_discard[0], dict):
-            mapping = {
-                "♠": Suit.SPADE,
-                "♦": Suit.DIAMOND,
-                "♥": Suit.HEART,
-                "♣": Suit.CLOVER,
-                "🃏": Suit.JOKER,
-            }
             cards_to_discard = [
-                Card(mapping[card["suit"]], card["rank"]) for card in cards_to_discard
+                Card.from_wire(card.get("suit"), card.get("rank"))
+                for card in cards_to_discard
             ]
-
-        print(cards_to_discard)
+            if None in cards_to_discard:
+                return False
 
         president = self.players[self.president_idx]
 
         # 버릴 카드가 실제로 주공의 패에 있는지 확인
         all_cards = president.cards + self.kitty
+        all_mask = president.mask | self.kitty_mask
         for card in cards_to_discard:
-            if card not in all_cards:
-                print(f"버릴 카드가 주공의 패에 없습니다: {card.suit} {card.rank}")
+            if not all_mask & card.bit:
+                logger.debug("버릴 카드가 주공의 패에 없습니다: %s", card)
                 return False
+        discard_mask = mask_of(cards_to_discard)
+        if discard_mask.bit_count() != 3:  # 같은 카드를 중복해서 버릴 수 없음
+            return False
 
         # 버린 카드의 점수 계산 (A, K, Q, J, 10 각각 1점)
         discarded_points = sum(1 for card in cards_to_discard if card.is_point_card())
@@ -507,13 +689,27 @@ class MightyGame:
 
         # 카드 버리기
         self.discarded_cards = cards_to_discard
+        self.discarded_mask = discard_mask
 
         # 주공의 새로운 패 설정
-        new_hand = [card for card in all_cards if card not in cards_to_discard]
+        new_hand = [card for card in all_cards if not discard_mask & card.bit]
         president.cards = new_hand
 
         # 게임 페이즈를 공약 수정으로 변경
         self.phase = "modify_bid"
+        self._record(
+            {"op": "discard", "seat": player_idx, "points": president.points},
+            {
+                player_idx: {
+                    "op": "discard",
+                    "seat": player_idx,
+                    "points": president.points,
+                    "cards": _cards(cards_to_discard),
+                }
+            },
+        )
+        self._sync_turn()
+        self._log("discard", player_idx, [card.id for card in cards_to_discard])
         return True
 
     def modify_final_bid(
@@ -528,11 +724,15 @@ class MightyGame:
             return False
         if score is None:  # 수정하지 않고 진행
             self.phase = "friend_selection"  # playing 대신 friend_selection으로 변경
+            self._sync_turn()
+            self._log("final_bid", player_idx, score, _suit(suit))
             return True
 
         # 이전과 동일하면 수정하지 않고 진행
         if score == self.current_bid.score and suit == self.current_bid.suit:
             self.phase = "friend_selection"
+            self._sync_turn()
+            self._log("final_bid", player_idx, score, _suit(suit))
             return True
 
         # 공약 수정 규칙 검증
@@ -545,6 +745,9 @@ class MightyGame:
         self.current_bid = Bid(player_idx, score, suit)
         self.giruda = suit
         self.phase = "friend_selection"  # playing 대신 friend_selection으로 변경
+        self._record({"op": "final_bid", "score": score, "suit": _suit(suit)})
+        self._sync_turn()
+        self._log("final_bid", player_idx, score, _suit(suit))
         return True
 
     def get_player_points(self, player_idx: int) -> int:
@@ -570,39 +773,41 @@ class MightyGame:
             self.friend_card = None
             self.friend_player_idx = None
             self.phase = "playing"
+            self._record({"op": "friend", "card": None})
+            self._sync_turn()
+            self._log("friend", player_idx, None)
             return True
 
         # suit와 rank가 유효한지 확인
-        print(suit, rank)
         if not Card.is_valid_card(suit, rank):
             return False
 
+        friend_card = Card(suit, rank)
+
         # 주공 자신의 카드는 프렌드 카드로 선택할 수 없음
-        if any(
-            c.suit == suit and c.rank == rank for c in self.players[player_idx].cards
-        ):
+        if self.players[player_idx].mask & friend_card.bit:
             return False
 
         # 프렌드 카드가 버려진 카드에 있는지 확인
-        if any(c.suit == suit and c.rank == rank for c in self.discarded_cards):
+        if self.discarded_mask & friend_card.bit:
             return False
 
         # 게임 페이즈를 공약 수정으로 변경
-        self.friend_card = Card(suit, rank)
+        self.friend_card = friend_card
         self.friend_player_idx = next(
-            (
-                i
-                for i, p in enumerate(self.players)
-                if any(c.suit == suit and c.rank == rank for c in p.cards)
-            ),
+            (i for i, p in enumerate(self.players) if p.mask & friend_card.bit),
             None,
         )
         self.phase = "playing"
+        self._record({"op": "friend", "card": friend_card.to_dict()})
+        self._sync_turn()
+        self._log("friend", player_idx, friend_card.id)
         return True
 
     def reset_game(self):
         """게임을 초기화하되 플레이어는 유지"""
         self.deck = []
+        self.deal_no = None
         self.current_player_idx = 0
         self.giruda = None
         self.mighty_card = None
@@ -615,16 +820,24 @@ class MightyGame:
         self.passed_players = set()
         self.kitty = []
         self.discarded_cards = []
+        self.kitty_mask = 0
+        self.discarded_mask = 0
+        self.played_mask = 0
         self.joker_suit = None
         self.friend_card = None
         self.friend_player_idx = None
         self.phase = "bidding"
         self.joker_called_in_this_trick = False
+        self.joker_calls = []
 
         # 플레이어들의 카드와 점수 초기화
         for player in self.players:
             player.cards = []
             player.points = 0
+        # version은 이어서 증가시켜 이전 판의 패치와 섞이지 않게 한다
+        self._record({"op": "reset"})
+        self._sync_turn()
+        self._log("reset")
 
     def get_player_cards(self, player_name: str) -> List[Card]:
         """
@@ -647,26 +860,12 @@ class MightyGame:
         )
 
     def sort_cards(self, cards: List[Card]) -> List[Card]:
-        giruda = self.giruda
-
-        def get_card_power(card: Card) -> tuple:
-            # 마이티 카드
-            if card.is_mighty(giruda):
-                return (0, 0, 0)  # 가장 높은 우선순위
-
-            # 조커
-            if card.suit == Suit.JOKER:
-                return (1, 0, 0)
+        return sort_cards(cards, self.giruda)
 
-            # 기루다
-            if giruda and card.suit == giruda:
-                return (2, card.suit.value, -card.rank)
 
-            # 일반 카드 (스페이드 > 다이아 > 하트 > 클로버)
-            suit_order = {Suit.SPADE: 0, Suit.DIAMOND: 1, Suit.HEART: 2, Suit.CLOVER: 3}
-            return (3, suit_order[card.suit], -card.rank)
+def _cards(cards: List[Card]) -> List[Dict]:
+    return [card.to_dict() for card in cards]
 
-        # 카드 정렬
-        sorted_cards = sorted(cards, key=get_card_power)
 
-        return sorted_cards
+def _suit(suit: Optional[Suit]) -> Optional[str]:
+    return suit.value if suit else None
@@ -1,4 +1,5 @@
 from .card import Card
+from .bitboard import mask_of
 from typing import List
 
 
@@ -6,15 +7,31 @@ class Player:
     def __init__(self, name: str, sid: str = None):
         self.name = name
         self.sid = sid
-        self.cards: List[Card] = []
+        self._cards: List[Card] = []
+        self.mask: int = 0  # 손패 비트보드 (cards와 항상 같은 집합)
         self.points: int = 0
         self.total_score: int = 0
 
+    @property
+    def cards(self) -> List[Card]:
+        """손패의 리스트 뷰 (변경은 add_card/remove_card 또는 대입으로)"""
+        return self._cards
+
+    @cards.setter
+    def cards(self, cards: List[Card]):
+        self._cards = list(cards)
+        self.mask = mask_of(self._cards)
+
+    def has_card(self, card: Card) -> bool:
+        return bool(self.mask & card.bit)
+
     def add_card(self, card: Card):
-        self.cards.append(card)
+        self._cards.append(card)
+        self.mask |= card.bit
 
     def remove_card(self, card: Card):
-        self.cards.remove(card)
+        self._cards.remove(card)
+        self.mask &= ~card.bit
 
     def update_total_score(self, points: int):
         self.total_score += points
@@ -0,0 +1,93 @@
+"""
+카드 파워와 정렬 순서를 미리 계산한 표
+
+트릭 판정에 쓰이는 카드 파워는 (기루다, 선카드 무늬, 조커콜 여부)에만
+의존하므로 5×5×2개의 53칸짜리 표를 한 번만 만들어 두고, 카드 ID로
+바로 찾아 쓴다. 손패 정렬 키도 기루다별로 같은 방식의 표를 사용한다.
+"""
+
+from typing import Dict, List, Optional, Tuple
+
+from .card import Card, Suit, NORMAL_SUITS
+
+GIRUDA_OPTIONS = (None,) + NORMAL_SUITS
+
+
+def _card_power(
+    card: Card, giruda: Optional[Suit], leading_suit: Suit, joker_called: bool
+) -> int:
+    """
+    카드의 파워(강함)를 계산
+    Returns:
+        1000: 마이티
+        900: 조커
+        800-814: 기루다
+        700-714: 선카드와 같은 무늬
+        1-14: 나머지 카드
+        0: 조커콜된 트릭의 조커
+    """
+    if card.is_joker():
+        # 조커콜된 트릭에서 조커는 가장 약한 카드
+        return 0 if joker_called else 900
+    if card.is_mighty(giruda):
+        return 1000
+    if card.suit == giruda:
+        return 800 + card.rank
+    if card.suit == leading_suit:
+        return 700 + card.rank
+    return card.rank
+
+
+# (기루다, 선카드 무늬, 조커콜 여부) -> 카드 ID별 파워
+POWER_TABLES: Dict[Tuple[Optional[Suit], Suit, bool], Tuple[int, ...]] = {
+    (giruda, leading_suit, joker_called): tuple(
+        _card_power(card, giruda, leading_suit, joker_called)
+        for card in Card.all_cards()
+    )
+    for giruda in GIRUDA_OPTIONS
+    for leading_suit in Suit
+    for joker_called in (False, True)
+}
+
+
+def power_table(
+    giruda: Optional[Suit], leading_suit: Suit, joker_called: bool
+) -> Tuple[int, ...]:
+    return POWER_TABLES[(giruda, leading_suit, bool(joker_called))]
+
+
+def _sort_key(card: Card, giruda: Optional[Suit]) -> tuple:
+    # 마이티 카드
+    if card.is_mighty(giruda):
+        return (0, 0, 0)  # 가장 높은 우선순위
+
+    # 조커
+    if card.suit == Suit.JOKER:
+        return (1, 0, 0)
+
+    # 기루다
+    if giruda and card.suit == giruda:
+        return (2, 0, -card.rank)
+
+    # 일반 카드 (스페이드 > 다이아 > 하트 > 클로버)
+    return (3, NORMAL_SUITS.index(card.suit), -card.rank)
+
+
+def _build_sort_table(giruda: Optional[Suit]) -> List[int]:
+    order = sorted(Card.all_cards(), key=lambda card: _sort_key(card, giruda))
+    table = [0] * len(order)
+    for position, card in enumerate(order):
+        table[card.id] = position
+    return table
+
+
+# 기루다 -> 카드 ID별 정렬 순위 (작을수록 앞)
+SORT_TABLES: Dict[Optional[Suit], List[int]] = {
+    giruda: _build_sort_table(giruda) for giruda in GIRUDA_OPTIONS
+}
+
+
+def sort_cards(cards: List[Card], giruda: Optional[Suit] = None) -> List[Card]:
+    """마이티, 조커, 기루다, 나머지(스페이드 > 다이아 > 하트 > 클로버) 순으로 정렬"""
+    table = SORT_TABLES[giruda]
+    return sorted(cards, key=lambda card: table[card.id])
@@ -0,0 +1,546 @@
+"""
+완전 정보(double-dummy) 마이티 솔버
+
+다섯 명의 패, 현재 트릭, 기루다, 조커 무늬, 프렌드가 모두 알려진 국면에서
+주공팀(주공 + 프렌드)이 남은 트릭에서 가져갈 수 있는 점수 카드의 최댓값을
+정확히 계산한다. 모든 플레이어가 최선을 다한다고 가정한다.
+
+- alpha-beta 탐색 (주공팀은 최대화, 나머지는 최소화)
+- 트릭 시작 국면마다 무늬별로 순위를 당긴(rank-collapsed) 손패를 키로 하는
+  transposition table. 남은 카드가 누구 손에 있는지를 순서대로만 기록하므로
+  나간 카드만 다르고 남은 카드의 순서가 같은 국면들은 같은 항목을 쓴다
+- 마이티와 빠른 트릭(quick trick)으로 정한 값의 하한/상한, 남은 점수로 정한
+  상한으로 탐색하지 않고 자른다
+- 트릭 수를 늘려 가는 반복 심화(iterative deepening)로 최선 수와 첫 추정값을
+  얻고, MTD(f) null window 탐색으로 값을 확정한다
+- 카드 파워와 transposition table의 최선 수를 이용한 수 정렬
+- 결과가 같은 수(남은 카드 사이에 끼어드는 카드가 없는 같은 무늬 인접 카드,
+  이번 트릭에서 어차피 지는 인접 카드)는 하나만 탐색
+- 마지막 트릭은 탐색하지 않고 바로 계산
+
+열린 과제: 10트릭 전체 국면을 1초 안에 푸는 목표는 아직 맞추지 못했다.
+남은 트릭이 하나 늘 때마다 노드 수가 대략 5-8배가 되어, 5트릭은 평균
+0.1초, 6트릭은 평균 0.5초(최대 2초 남짓)지만 7트릭은 평균 5초(최대 20초
+가까이), 10트릭 전체 국면은 2천만 노드 이상에 수 분이 걸린다
+(python -m benchmarks.solver --tricks 10 -v).
+정확성은 test_solver.py가 엔진 위의 완전 탐색, 자르기를 끈 탐색과 비교해
+확인한다.
+"""
+
+from typing import Dict, List, Optional, Tuple
+
+from .bitboard import FOLLOW_MASKS, JOKER_BIT, POINT_MASK, mighty_bit
+from .card import Card, Suit, NORMAL_SUITS, JOKER_ID
+from .power import power_table
+
+CLOVER_THREE = Card(Suit.CLOVER, 3).id
+CLOVER_TWO = Card(Suit.CLOVER, 2).id
+
+# 카드 ID별 무늬 번호(NORMAL_SUITS 순서, 조커는 4), 점수
+_SUIT_INDEX = [card.id // 13 for card in Card.all_cards()]
+_POINTS = [1 if card.is_point_card() else 0 for card in Card.all_cards()]
+_SHIFTS = (0, 13, 26, 39)
+_LEAD_SUITS = NORMAL_SUITS + (Suit.JOKER,)
+
+# (카드 ID, 조커 무늬, 조커콜 여부)
+SolverMove = Tuple[int, Optional[Suit], bool]
+
+
+def _suit_code(fields: int) -> int:
+    """
+    한 무늬의 남은 카드를 순위 순서대로 본 소유자 번호의 나열
+    fields는 좌석마다 13비트씩 이어 붙인 손패. 점수 없는 카드(2-9)와
+    점수 카드(10-A)는 따로 나열해서 점수 여부가 섞이지 않게 한다
+    """
+    low = high = 0
+    for rank_bit in range(13):
+        for seat in range(5):
+            if fields >> (seat * 13 + rank_bit) & 1:
+                if rank_bit < 8:
+                    low = low * 6 + seat + 1
+                else:
+                    high = high * 6 + seat + 1
+                break
+    return low * 7776 + high
+
+
+class Position:
+    """솔버가 다루는 국면 (카드는 모두 카드 ID/비트보드로 표현)"""
+
+    def __init__(
+        self,
+        hands: List[int],
+        giruda: Optional[Suit],
+        team: List[int],
+        leader: int,
+        trick: Optional[List[int]] = None,
+        joker_suit: Optional[Suit] = None,
+        joker_called: bool = False,
+    ):
+        self.hands = list(hands)
+        self.giruda = giruda
+        self.team = list(team)  # 주공팀 좌석 (주공, 프렌드)
+        self.leader = leader  # 현재 트릭의 선 플레이어
+        self.trick = list(trick or [])
+        self.joker_suit = joker_suit
+        self.joker_called = joker_called
+
+    @classmethod
+    def from_game(cls, game) -> "Position":
+        """플레이 중인 MightyGame에서 국면을 만든다"""
+        team = [game.president_idx]
+        if game.friend_player_idx is not None:
+            team.append(game.friend_player_idx)
+        leader = (game.current_player_idx - len(game.current_trick)) % 5
+        return cls(
+            hands=[player.mask for player in game.players],
+            giruda=game.giruda,
+            team=team,
+            leader=leader,
+            trick=[card.id for card in game.current_trick],
+            joker_suit=game.joker_suit,
+            joker_called=game.joker_called_in_this_trick,
+        )
+
+
+class DoubleDummySolver:
+    # 반복 심화에서 미리 풀어 보는 최대 트릭 수
+    DEEPEN_TRICKS = 3
+
+    def __init__(self, position: Position):
+        self.position = position
+        self.giruda = position.giruda
+        self.team_bits = 0
+        for seat in position.team:
+            self.team_bits |= 1 << seat
+        # 무늬 번호별 따라야 하는 카드 (번호 4는 조커 선으로 쓰지 않는다)
+        follow = FOLLOW_MASKS[self.giruda]
+        self.follow = [follow[suit] for suit in NORMAL_SUITS] + [0]
+        self.suit_masks = [self.follow[i] >> _SHIFTS[i] for i in range(4)]
+        self.giruda_index = (
+            NORMAL_SUITS.index(self.giruda) if self.giruda in NORMAL_SUITS else -1
+        )
+        self.mighty_bit = mighty_bit(self.giruda)
+        self.special = JOKER_BIT | self.mighty_bit
+        # 조커콜 여부 -> 선카드 무늬 번호 -> 카드 ID별 파워
+        self.powers = [
+            [power_table(self.giruda, suit, called) for suit in _LEAD_SUITS]
+            for called in (False, True)
+        ]
+        # 키 -> (하한, 상한, 최선 카드)
+        self.table: Dict[tuple, Tuple[int, int, int]] = {}
+        self.codes: Dict[int, int] = {}
+        self.nodes = 0
+        self.horizon = 99  # 반복 심화 중 더 둘 트릭 수
+
+        # 탐색 중 변경되는 상태
+        self.hands = list(position.hands)
+        self.trick = list(position.trick)
+        self.leader = position.leader
+        # 현재 트릭에서 따라야 하는 무늬 번호 (조커 선이면 부른 무늬)
+        self.lead_suit = -1
+        if self.trick:
+            first = self.trick[0]
+            if first == JOKER_ID:
+                self.lead_suit = NORMAL_SUITS.index(position.joker_suit)
+            else:
+                self.lead_suit = _SUIT_INDEX[first]
+        self.joker_called = bool(position.joker_called)
+        self.trick_points = sum(_POINTS[cid] for cid in self.trick)
+        self.hand_points = sum((hand & POINT_MASK).bit_count() for hand in self.hands)
+
+    def solve(self) -> int:
+        """주공팀이 이 국면 이후 가져갈 수 있는 점수 카드의 최댓값"""
+        total = self.hand_points + self.trick_points
+        guess = total // 2
+        if not self.trick:
+            # 앞쪽 몇 트릭만 풀어서 최선 수와 추정값을 얻는다
+            tricks = self.hands[self.leader].bit_count()
+            for depth in range(1, min(tricks, self.DEEPEN_TRICKS + 1)):
+                self.horizon = depth
+                guess = self._mtd(total, guess)
+                for key, entry in self.table.items():
+                    self.table[key] = (0, 99, entry[2])
+            self.horizon = 99
+            # 앞쪽 트릭만 센 값은 실제 값보다 작으므로 위로 당긴다
+            guess += (total - guess) // 2
+        return self._mtd(total, guess)
+
+    def _mtd(self, total: int, guess: int) -> int:
+        """guess에서 시작해 null window 탐색으로 값의 범위를 좁힌다 (MTD(f))"""
+        lower, upper = 0, total
+        value = min(max(guess, lower), upper)
+        while lower < upper:
+            beta = value + 1 if value == lower else value
+            value = self._search(beta - 1, beta)
+            if value < beta:
+                upper = value
+            else:
+                lower = value
+        return lower
+
+    def best_moves(self) -> List[Tuple[SolverMove, int]]:
+        """현재 차례 플레이어의 각 수와 그 수를 둔 뒤의 정확한 값"""
+        results = []
+        seat = (self.leader + len(self.trick)) % 5
+        hands = self.hands
+        live = hands[0] | hands[1] | hands[2] | hands[3] | hands[4]
+        for move in self._moves(seat, self._legal_mask(seat), live, -1):
+            value = self._play(seat, move, -1, 21)
+            card_id, joker_suit, call_joker = move
+            if joker_suit is not None:
+                move = (card_id, NORMAL_SUITS[joker_suit], call_joker)
+            results.append((move, value))
+        maximizing = self.team_bits >> seat & 1
+        results.sort(key=lambda item: -item[1] if maximizing else item[1])
+        return results
+
+    def _search(self, alpha: int, beta: int) -> int:
+        self.nodes += 1
+        # 남은 점수로 값의 범위가 정해지면 바로 끝낸다
+        total = self.hand_points + self.trick_points
+        if alpha >= total:
+            return total
+        if beta <= 0 or not total:
+            return 0
+
+        trick = self.trick
+        hands = self.hands
+        live = hands[0] | hands[1] | hands[2] | hands[3] | hands[4]
+        key = None
+        hint = -1
+        if not trick:
+            if self.horizon <= 0:
+                return 0
+            lead_hand = hands[self.leader]
+            if not lead_hand & (lead_hand - 1):
+                return self._last_trick()
+            # 반복 심화 중에는 앞쪽 트릭만 세므로 하한/상한을 쓰지 않는다
+            if self.horizon > 10:
+                lower, upper = self._bounds(total)
+                if lower >= beta:
+                    return lower
+                if upper <= alpha:
+                    return upper
+            key = self._key(live)
+            entry = self.table.get(key)
+            if entry is not None:
+                lower, upper, hint = entry
+                if lower >= beta:
+                    return lower
+                if upper <= alpha:
+                    return upper
+                alpha = max(alpha, lower)
+                beta = min(beta, upper)
+                if alpha >= beta:
+                    return lower
+            alpha0, beta0 = alpha, beta
+
+        seat = (self.leader + len(trick)) % 5
+        maximizing = self.team_bits >> seat & 1
+        best = -1 if maximizing else 99
+        best_card = -1
+        for move in self._moves(seat, self._legal_mask(seat), live, hint):
+            value = self._play(seat, move, alpha, beta)
+            if maximizing:
+                if value > best:
+                    best = value
+                    best_card = move[0]
+                    if best > alpha:
+                        alpha = best
+                        if alpha >= beta:
+                            break
+            else:
+                if value < best:
+                    best = value
+                    best_card = move[0]
+                    if best < beta:
+                        beta = best
+                        if alpha >= beta:
+                            break
+
+        if key is not None:
+            entry = self.table.get(key)
+            lower, upper = (entry[0], entry[1]) if entry else (0, 99)
+            if best <= alpha0:
+                upper = min(upper, best)
+            elif best >= beta0:
+                lower = max(lower, best)
+            else:
+                lower = upper = best
+            self.table[key] = (lower, upper, best_card)
+        return best
+
+    def _last_trick(self) -> int:
+        """모두 한 장씩 남은 마지막 트릭의 값 (선 클로버3의 조커콜만 고를 수 있다)"""
+        hands = self.hands
+        lead = hands[self.leader].bit_length() - 1
+        live = hands[0] | hands[1] | hands[2] | hands[3] | hands[4]
+        options = [False]
+        if lead == CLOVER_THREE and live & JOKER_BIT:
+            options.append(True)
+        values = []
+        for called in options:
+            table = self.powers[called][_SUIT_INDEX[lead]]
+            best_power = -1
+            winner = 0
+            for seat in range(5):
+                power = table[hands[seat].bit_length() - 1]
+                if power > best_power:
+                    best_power = power
+                    winner = seat
+            values.append(self.hand_points if self.team_bits >> winner & 1 else 0)
+        if self.team_bits >> self.leader & 1:
+            return max(values)
+        return min(values)
+
+    def _bounds(self, total: int) -> Tuple[int, int]:
+        """
+        트릭 시작 국면에서 주공팀 값의 하한과 상한
+        마이티를 가진 편은 마이티 한 점을 반드시 얻는다. 상대편에 마이티도
+        조커도 없으면 선 플레이어는 상대편의 어떤 카드보다 높은 카드를 위에서부터
+        내서 이길 수 있다 (기루다 무늬가 아니면 기루다를 가진 상대의 그 무늬
+        장수까지만 센다). 그렇게 이기는 카드 자신의 점수를 더한다
+        """
+        hands = self.hands
+        team = self.team_bits
+        side = team if team >> self.leader & 1 else ~team & 31
+        own = other = 0
+        for seat in range(5):
+            if side >> seat & 1:
+                own |= hands[seat]
+            else:
+                other |= hands[seat]
+        side_sure = 1 if own & self.mighty_bit else 0
+        other_sure = 1 if other & self.mighty_bit else 0
+        if not other & self.special:
+            lead_hand = hands[self.leader]
+            giruda = self.giruda_index
+            trumps = []
+            if giruda >= 0:
+                trumps = [
+                    hands[seat]
+                    for seat in range(5)
+                    if not side >> seat & 1 and hands[seat] & self.follow[giruda]
+                ]
+            for index in range(4):
+                shift = _SHIFTS[index]
+                mask = self.suit_masks[index]
+                mine = lead_hand >> shift & mask
+                if not mine:
+                    continue
+                length = (other >> shift & mask).bit_length()
+                winners = mine >> length << length
+                if not winners:
+                    continue
+                count = winners.bit_count()
+                if index != giruda:
+                    for hand in trumps:
+                        count = min(count, (hand >> shift & mask).bit_count())
+                # 위에서 count장만 남긴다 (점수 카드는 8번 비트부터)
+                for _ in range(winners.bit_count() - count):
+                    winners &= winners - 1
+                side_sure += (winners >> 8).bit_count()
+        if side == team:
+            return side_sure, total - other_sure
+        return other_sure, total - side_sure
+
+    def _key(self, live: int) -> tuple:
+        """
+        트릭 시작 국면의 transposition table 키
+        무늬마다 남은 카드의 소유자를 순위 순서대로 나열한 값에 조커와
+        마이티의 소유자, 조커콜에 쓰이는 클로버3의 위치를 더한다
+        """
+        hands = self.hands
+        codes = self.codes
+        h0, h1, h2, h3, h4 = hands
+        parts = [self.leader]
+        for index in range(4):
+            shift = _SHIFTS[index]
+            mask = self.suit_masks[index]
+            fields = (
+                (h0 >> shift & mask)
+                | (h1 >> shift & mask) << 13
+                | (h2 >> shift & mask) << 26
+                | (h3 >> shift & mask) << 39
+                | (h4 >> shift & mask) << 52
+            )
+            code = codes.get(fields)
+            if code is None:
+                code = codes[fields] = _suit_code(fields)
+            parts.append(code)
+        special = 0
+        for seat in range(5):
+            if hands[seat] & JOKER_BIT:
+                special += seat + 1
+            if hands[seat] & self.mighty_bit:
+                special += (seat + 1) * 6
+        if live >> CLOVER_THREE & 1:
+            special += 36 * (1 + (live >> CLOVER_TWO & 1))
+        parts.append(special)
+        return tuple(parts)
+
+    def _play(self, seat: int, move: SolverMove, alpha: int, beta: int) -> int:
+        """move를 두고 그 이후의 값을 구한 뒤 상태를 되돌린다"""
+        card_id, joker_suit, call_joker = move
+        bit = 1 << card_id
+        point = _POINTS[card_id]
+        trick = self.trick
+        hands = self.hands
+        if not trick:
+            if card_id == JOKER_ID:
+                self.lead_suit = joker_suit
+            else:
+                self.lead_suit = _SUIT_INDEX[card_id]
+            self.joker_called = call_joker
+
+        hands[seat] ^= bit
+        self.hand_points -= point
+        trick.append(card_id)
+        if len(trick) < 5:
+            self.trick_points += point
+            value = self._search(alpha, beta)
+            self.trick_points -= point
+        else:
+            # 트릭 종료: 승자와 점수 카드 계산
+            table = self.powers[self.joker_called][_SUIT_INDEX[trick[0]]]
+            best_power = -1
+            winner = 0
+            for i in range(5):
+                power = table[trick[i]]
+                if power > best_power:
+                    best_power = power
+                    winner = i
+            winner = (self.leader + winner) % 5
+            points = self.trick_points + point
+            gain = points if self.team_bits >> winner & 1 else 0
+
+            saved_trick = trick[:]
+            saved_leader = self.leader
+            saved_suit = self.lead_suit
+            saved_called = self.joker_called
+            trick.clear()
+            self.trick_points = 0
+            self.leader = winner
+            self.joker_called = False
+            self.horizon -= 1
+            value = gain + self._search(alpha - gain, beta - gain)
+            self.horizon += 1
+            self.leader = saved_leader
+            self.lead_suit = saved_suit
+            self.joker_called = saved_called
+            self.trick_points = points - point
+            trick.extend(saved_trick)
+
+        trick.pop()
+        hands[seat] ^= bit
+        self.hand_points += point
+        return value
+
+    def _legal_mask(self, seat: int) -> int:
+        hand = self.hands[seat]
+        if not self.trick:
+            return hand
+        if self.joker_called and hand & JOKER_BIT:
+            return JOKER_BIT
+        follow = hand & self.follow[self.lead_suit]
+        if not follow:
+            return hand
+        return follow | (hand & self.special)
+
+    def _moves(self, seat: int, legal: int, live: int, hint: int) -> list:
+        """
+        seat이 둘 수 있는 수 (live는 손패에 남은 카드 전체, hint는 먼저 볼 카드)
+        결과가 같은 수는 하나만 남기고, 좋아 보이는 수부터 정렬한다
+        조커 선의 무늬는 NORMAL_SUITS의 번호로 담는다
+        """
+        hands = self.hands
+        trick = self.trick
+        table = None
+        best_power = -1
+        winner = 0
+        played = 0
+        if trick:
+            table = self.powers[self.joker_called][_SUIT_INDEX[trick[0]]]
+            for i, cid in enumerate(trick):
+                played |= 1 << cid
+                if table[cid] > best_power:
+                    best_power = table[cid]
+                    winner = (self.leader + i) % 5
+
+        # 같은 무늬에서 사이에 남아 있는 카드가 없고 점수 여부가 같은 인접
+        # 카드는 결과가 같으므로 가장 높은 카드 하나만 남긴다. 이번 트릭에서
+        # 어차피 지는 카드끼리는 이번 트릭에 나온 카드도 사이에 없는 것으로 본다
+        cards = []
+        prev = -1
+        mask = legal
+        while mask:
+            low = mask & -mask
+            cid = low.bit_length() - 1
+            mask ^= low
+            if (
+                prev >= 0
+                and prev // 13 == cid // 13
+                and cid != JOKER_ID
+                and _POINTS[prev] == _POINTS[cid]
+                and not (1 << prev | low) & self.special
+                and prev != CLOVER_THREE
+                and cid != CLOVER_THREE
+            ):
+                between = (low - 1) ^ ((2 << prev) - 1)
+                if table is not None and table[cid] <= best_power:
+                    blockers = live
+                else:
+                    blockers = live | played
+                if not blockers & between:
+                    cards[-1] = cid
+                    prev = cid
+                    continue
+            cards.append(cid)
+            prev = cid
+
+        if not trick:
+            # 선 플레이어는 강한 카드부터
+            power = self.powers[False]
+            cards.sort(key=lambda cid: -power[_SUIT_INDEX[cid]][cid])
+            if hint in cards:
+                cards.remove(hint)
+                cards.insert(0, hint)
+            moves = []
+            for cid in cards:
+                if cid == JOKER_ID:
+                    # 아무도 따라낼 카드가 없는 무늬는 어느 것을 불러도 같다
+                    free_suit = False
+                    for suit in range(4):
+                        if not live & ~hands[seat] & self.follow[suit]:
+                            if free_suit:
+                                continue
+                            free_suit = True
+                        moves.append((cid, suit, False))
+                elif cid == CLOVER_THREE and live & JOKER_BIT:
+                    if not hands[seat] & JOKER_BIT:
+                        moves.append((cid, None, True))
+                    moves.append((cid, None, False))
+                else:
+                    moves.append((cid, None, False))
+            return moves
+
+        if (self.team_bits >> winner & 1) == (self.team_bits >> seat & 1):
+            # 같은 팀이 이기고 있으면 점수 카드를 얹고, 약한 카드부터
+            cards.sort(key=lambda cid: table[cid] - 1000 * _POINTS[cid])
+        else:
+            # 이길 수 있으면 이기는 카드 중 약한 카드부터,
+            # 질 수밖에 없으면 점수 없는 약한 카드부터
+            cards.sort(
+                key=lambda cid: (
+                    table[cid]
+                    if table[cid] > best_power
+                    else 2000 + 1000 * _POINTS[cid] + table[cid]
+                )
+            )
+        return [(cid, None, False) for cid in cards]
+
+
+def solve_game(game) -> int:
+    """플레이 중인 MightyGame에서 주공팀이 남은 트릭에서 가져갈 최대 점수"""
+    return DoubleDummySolver(Position.from_game(game)).solve()
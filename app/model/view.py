@@ -0,0 +1,70 @@
+"""
+좌석별 게임 화면 상태 캐시
+
+MightyGame.get_snapshot으로 만드는 좌석별 상태를 version 단위로 캐시한다.
+- 관전자 화면(공개 정보)은 version마다 한 번만 만들고 모든 관전자가 공유
+- 좌석 화면은 관전자 화면에 그 좌석의 비공개 정보(정렬된 패, 주공의
+  kitty/버린 카드)를 더한 것
+- 비공개 정보는 손패 비트보드와 기루다 등이 바뀔 때만 다시 정렬한다
+
+캐시된 dict는 여러 요청이 공유하므로 호출하는 쪽에서 바꾸면 안 된다.
+"""
+
+from typing import Dict, Optional, Tuple
+
+from .mighty import MightyGame
+
+
+class GameView:
+    def __init__(self, game: MightyGame):
+        self.game = game
+        self._spectator: Tuple[int, Optional[Dict]] = (-1, None)
+        self._seats: Dict[int, Tuple[int, Dict]] = {}
+        self._private: Dict[int, Tuple[tuple, Dict]] = {}
+        self.hits = 0
+        self.misses = 0
+
+    def spectator(self) -> Dict:
+        """모든 관전자가 공유하는 공개 상태"""
+        version, view = self._spectator
+        if version == self.game.version:
+            self.hits += 1
+            return view
+        self.misses += 1
+        view = self.game.get_snapshot(None)
+        self._spectator = (self.game.version, view)
+        return view
+
+    def seat(self, seat: Optional[int]) -> Dict:
+        """seat 좌석의 상태 (seat이 None이면 관전자 상태)"""
+        if seat is None:
+            return self.spectator()
+        entry = self._seats.get(seat)
+        if entry is not None and entry[0] == self.game.version:
+            self.hits += 1
+            return entry[1]
+        view = dict(self.spectator())
+        view.update(self.private(seat))
+        self._seats[seat] = (self.game.version, view)
+        return view
+
+    def private(self, seat: int) -> Dict:
+        """seat 좌석의 비공개 상태, 관련된 값이 바뀌었을 때만 다시 만든다"""
+        game = self.game
+        is_president = seat == game.president_idx
+        key = (
+            game.players[seat].mask,
+            game.giruda,
+            is_president and game.phase == "discarding",
+            game.discarded_mask if is_president else 0,
+        )
+        entry = self._private.get(seat)
+        if entry is not None and entry[0] == key:
+            return entry[1]
+        state = game.get_private_state(seat)
+        self._private[seat] = (key, state)
+        return state
+
+    def hand(self, seat: int):
+        """seat 좌석의 기루다 기준으로 정렬된 패 (카드 dict 목록)"""
+        return self.private(seat)["hand"]
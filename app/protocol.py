@@ -0,0 +1,224 @@
+"""
+압축 바이너리 소켓 프로토콜
+
+연결마다 negotiate_protocol 이벤트로 켜며, 켠 연결에는 트래픽이 많은
+이벤트(카드 제출, 트릭 종료, 낼 수 있는 카드, 손패, 상태 패치)를 JSON
+대신 "frame" 이벤트 하나에 바이너리로 보낸다. 나머지 이벤트와 협상하지
+않은 연결은 기존 JSON 프로토콜을 그대로 쓴다.
+
+    프레임: [이벤트 코드 u8][본문]
+    카드: 카드 ID 1바이트 (0..51, 조커 52), 없음은 255
+    순서 있는 카드 목록(손패): [장수 u8][카드 ID...], 없음은 장수 255
+    카드 집합(낼 수 있는 카드): 64비트 비트보드 (little endian)
+
+game.js의 decodeFrame이 같은 형식을 풀어서 JSON과 같은 객체로 만든 뒤
+원래 이벤트 핸들러에 넘긴다. decode_frame은 그 동작을 파이썬으로 옮긴
+것으로, 벤치마크에서 왕복 결과를 확인하는 데 쓴다.
+"""
+
+import struct
+from typing import Dict, List, Optional, Tuple
+
+from app.model.bitboard import cards_of
+from app.model.card import Card, Suit, NORMAL_SUITS
+
+PROTOCOLS = ("json", "binary")
+FRAME_EVENT = "frame"
+
+EVENTS = ("card_submitted", "clear_trick", "legal_moves", "game_start", "state_patch")
+EVENT_CODES = {name: code for code, name in enumerate(EVENTS, 1)}
+
+PHASES = (
+    "bidding",
+    "discarding",
+    "modify_bid",
+    "friend_selection",
+    "playing",
+    "game_over",
+)
+PATCH_OPS = (
+    "deal",
+    "turn",
+    "bid",
+    "president",
+    "discard",
+    "final_bid",
+    "friend",
+    "play",
+    "friend_revealed",
+    "trick",
+    "game_over",
+    "reset",
+)
+
+NONE = 255
+_SUITS = NORMAL_SUITS + (Suit.JOKER,)
+_SUIT_CODES = {suit.value: code for code, suit in enumerate(_SUITS)}
+_CARDS = Card.all_cards()
+_WIRE_IDS = {(card.suit.value, card.rank): card.id for card in _CARDS}
+_WIRE_CARDS = [card.to_dict() for card in _CARDS]
+
+_PATCH_HEADER = struct.Struct("<IB")  # 패치: version, op
+_SCORES = struct.Struct("<5i")
+
+
+def _card(card: Optional[Dict]) -> int:
+    return NONE if card is None else _WIRE_IDS[(card["suit"], card["rank"])]
+
+
+def _suit(suit: Optional[str]) -> int:
+    return NONE if suit is None else _SUIT_CODES[suit]
+
+
+def _cards(cards: Optional[List[Dict]]) -> bytes:
+    if cards is None:
+        return bytes((NONE,))
+    return bytes([len(cards)] + [_WIRE_IDS[(c["suit"], c["rank"])] for c in cards])
+
+
+def encode_card_submitted(seat: int, card: Card) -> bytes:
+    return bytes((EVENT_CODES["card_submitted"], seat, card.id))
+
+
+def encode_clear_trick(winner: int) -> bytes:
+    return bytes((EVENT_CODES["clear_trick"], winner))
+
+
+def encode_legal_moves(mask: int) -> bytes:
+    return struct.pack("<BQ", EVENT_CODES["legal_moves"], mask)
+
+
+def encode_game_start(hand: List[Dict]) -> bytes:
+    return bytes((EVENT_CODES["game_start"],)) + _cards(hand)
+
+
+def encode_state_patch(patches: List[Dict]) -> bytes:
+    out = bytearray(struct.pack("<BH", EVENT_CODES["state_patch"], len(patches)))
+    for patch in patches:
+        op = patch["op"]
+        out += _PATCH_HEADER.pack(patch["v"], PATCH_OPS.index(op))
+        if op == "deal":
+            out += bytes(patch["counts"]) + _cards(patch.get("hand"))
+        elif op == "turn":
+            out += bytes((PHASES.index(patch["phase"]), patch["seat"]))
+        elif op == "bid":
+            out += bytes((patch["seat"], patch["score"] or 0, _suit(patch["suit"])))
+        elif op == "president":
+            out += bytes((patch["seat"], patch["score"], _suit(patch["suit"])))
+            out += _cards(patch.get("kitty"))
+        elif op == "discard":
+            out += bytes((patch["seat"], patch["points"])) + _cards(patch.get("cards"))
+        elif op == "final_bid":
+            out += bytes((patch["score"], _suit(patch["suit"])))
+        elif op == "friend":
+            out += bytes((_card(patch["card"]),))
+        elif op == "play":
+            out += bytes(
+                (
+                    patch["seat"],
+                    _card(patch["card"]),
+                    _suit(patch["joker_suit"]),
+                    patch["call_joker"],
+                )
+            )
+        elif op == "friend_revealed":
+            out += bytes((patch["seat"],))
+        elif op == "trick":
+            out += bytes((patch["winner"], patch["points"]))
+        elif op == "game_over":
+            out += bytes(patch["points"]) + _SCORES.pack(*patch["scores"])
+    return bytes(out)
+
+
+def _read_cards(frame: bytes, pos: int) -> Tuple[Optional[List[Dict]], int]:
+    count = frame[pos]
+    if count == NONE:
+        return None, pos + 1
+    ids = frame[pos + 1 : pos + 1 + count]
+    return [_WIRE_CARDS[i] for i in ids], pos + 1 + count
+
+
+def _read_suit(code: int) -> Optional[str]:
+    return None if code == NONE else _SUITS[code].value
+
+
+def _decode_patch(frame: bytes, pos: int) -> Tuple[Dict, int]:
+    version, op_code = _PATCH_HEADER.unpack_from(frame, pos)
+    pos += _PATCH_HEADER.size
+    op = PATCH_OPS[op_code]
+    patch = {"op": op}
+    if op == "deal":
+        patch["counts"] = list(frame[pos : pos + 5])
+        hand, pos = _read_cards(frame, pos + 5)
+        if hand is not None:
+            patch["hand"] = hand
+    elif op == "turn":
+        patch["phase"] = PHASES[frame[pos]]
+        patch["seat"] = frame[pos + 1]
+        pos += 2
+    elif op == "bid":
+        patch["seat"] = frame[pos]
+        patch["score"] = frame[pos + 1] or None
+        patch["suit"] = _read_suit(frame[pos + 2])
+        pos += 3
+    elif op == "president":
+        patch["seat"] = frame[pos]
+        patch["score"] = frame[pos + 1]
+        patch["suit"] = _read_suit(frame[pos + 2])
+        kitty, pos = _read_cards(frame, pos + 3)
+        if kitty is not None:
+            patch["kitty"] = kitty
+    elif op == "discard":
+        patch["seat"] = frame[pos]
+        patch["points"] = frame[pos + 1]
+        cards, pos = _read_cards(frame, pos + 2)
+        if cards is not None:
+            patch["cards"] = cards
+    elif op == "final_bid":
+        patch["score"] = frame[pos]
+        patch["suit"] = _read_suit(frame[pos + 1])
+        pos += 2
+    elif op == "friend":
+        patch["card"] = None if frame[pos] == NONE else _WIRE_CARDS[frame[pos]]
+        pos += 1
+    elif op == "play":
+        patch["seat"] = frame[pos]
+        patch["card"] = _WIRE_CARDS[frame[pos + 1]]
+        patch["joker_suit"] = _read_suit(frame[pos + 2])
+        patch["call_joker"] = bool(frame[pos + 3])
+        pos += 4
+    elif op == "friend_revealed":
+        patch["seat"] = frame[pos]
+        pos += 1
+    elif op == "trick":
+        patch["winner"] = frame[pos]
+        patch["points"] = frame[pos + 1]
+        pos += 2
+    elif op == "game_over":
+        patch["points"] = list(frame[pos : pos + 5])
+        patch["scores"] = list(_SCORES.unpack_from(frame, pos + 5))
+        pos += 5 + _SCORES.size
+    patch["v"] = version
+    return patch, pos
+
+
+def decode_frame(frame: bytes, seat_names: List[str]) -> Tuple[str, Dict]:
+    """프레임을 (이벤트 이름, JSON 프로토콜과 같은 본문)으로 푼다"""
+    event = EVENTS[frame[0] - 1]
+    if event == "card_submitted":
+        return event, {"player_name": seat_names[frame[1]], **_WIRE_CARDS[frame[2]]}
+    if event == "clear_trick":
+        return event, {"winner_name": seat_names[frame[1]]}
+    if event == "legal_moves":
+        (mask,) = struct.unpack_from("<Q", frame, 1)
+        return event, {"cards": [card.to_dict() for card in cards_of(mask)]}
+    if event == "game_start":
+        cards, _ = _read_cards(frame, 1)
+        return event, {"cards": cards}
+    (count,) = struct.unpack_from("<H", frame, 1)
+    pos = 3
+    patches = []
+    for _ in range(count):
+        patch, pos = _decode_patch(frame, pos)
+        patches.append(patch)
+    return event, {"patches": patches}
@@ -1,15 +1,190 @@
 from flask import render_template, request, redirect, url_for, jsonify
 from flask_socketio import emit, join_room, leave_room
-from app import app, socketio
+from app import app, cluster, socketio
 from app.game_manager import GameManager
+import atexit
+import functools
+import logging
+import os
 import random
 import string
+import time
+from typing import Optional
 from app.model.mighty import MightyGame, Suit
-from app.utils import print_game_status
-from app.model.card import Card
+from app.utils import format_game_status
+from app.model.card import Card, parse_suit
+from app.store import FLUSH_INTERVAL, SQLiteProfileStore, SQLiteRoomStore
+from app.lobby import LOBBY_INTERVAL, PER_PAGE
+from app.leaderboard import Leaderboard
+from app.analytics import GameRecorder
+from app.lifecycle import REAP_TICK
+from app.actor import RoomExecutor
+from app.turns import TURN_TICK, default_decision
+from app.model.bitboard import cards_of
+from app import metrics, protocol
+from app.logs import SAMPLED, sampled
+from app.bot_pool import BotPool, acting_player_idx
+
+logger = logging.getLogger(__name__)
+
+# 방 저장소 경로 (빈 문자열이면 저장하지 않고 메모리에만 둔다)
+ROOM_DB = os.environ.get("MIGHTY_ROOM_DB", "mighty.db")
+# 끝난 게임의 분석 기록 샤드 디렉터리 (빈 문자열이면 기록하지 않음)
+# python analytics.py <디렉터리>로 집계한다
+ANALYTICS_DIR = os.environ.get("MIGHTY_ANALYTICS_DIR", "analytics")
+ANALYTICS_FORMAT = os.environ.get("MIGHTY_ANALYTICS_FORMAT", "csv")
+
+# import만 하면 메모리에만 두는 방 목록과 순위표 (저장소는 init_server가 연다)
+game_manager = GameManager(owns=cluster.is_local)
+# 방이 없어져도 남는 플레이어 순위표 (같은 저장소 파일의 profiles 테이블)
+leaderboard = Leaderboard()
+analytics: Optional[GameRecorder] = None
+server_started = False
+bot_pool = BotPool()
+# 방마다 명령을 하나씩 차례로 실행 (방 상태를 바꾸는 코드는 모두 여기서 실행)
+room_actors = RoomExecutor(
+    start_task=socketio.start_background_task,
+    create_queue=socketio.server.eio.create_queue,
+)
+binary_sids = set()  # 바이너리 프로토콜을 협상한 연결의 sid
+room_handlers = {}  # 방 이벤트 이름 -> 핸들러 (다른 워커가 넘긴 명령 처리용)
+LOBBY_ROOM = "lobby"  # 로비 클라이언트만 들어가는 Socket.IO 방
+remote_rooms = {}  # sid -> 명령을 다른 워커로 넘긴 방 (연결이 끊기면 알림)
+BOT_MIN_DELAY = 0.5  # 사람이 봇의 수를 따라갈 수 있도록 최소한 기다리는 시간(초)
+
+# /metrics에서 읽을 때마다 지금 값을 세는 지표
+metrics.Gauge("mighty_rooms", "이 워커의 방", function=lambda: len(game_manager.rooms))
+metrics.Gauge(
+    "mighty_sessions",
+    "플레이어 세션 (토큰)",
+    function=lambda: len(game_manager.sessions),
+)
+metrics.Gauge(
+    "mighty_leaderboard_players", "순위표의 플레이어", function=lambda: len(leaderboard)
+)
+metrics.Gauge(
+    "mighty_analytics_pending",
+    "아직 샤드로 쓰지 않은 끝난 게임",
+    function=lambda: len(analytics) if analytics is not None else 0,
+)
+metrics.Gauge(
+    "mighty_room_commands", "방 실행자에서 기다리는 명령", function=room_actors.backlog
+)
+metrics.Gauge(
+    "mighty_room_timers",
+    "방 정리 타이머",
+    function=lambda: len(game_manager.reaper.wheel),
+)
+metrics.Gauge(
+    "mighty_turn_timers",
+    "차례 제한 시간 타이머",
+    function=lambda: len(game_manager.turns),
+)
+metrics.Gauge(
+    "mighty_room_evictions",
+    "정리한 방 (이유별, 시작 후 누적)",
+    ["reason"],
+    function=lambda: dict(game_manager.reaper.evictions),
+)
+metrics.Gauge(
+    "mighty_turn_timeouts",
+    "시간 초과로 기본 행동을 둔 차례 (페이즈별, 시작 후 누적)",
+    ["phase"],
+    function=lambda: dict(game_manager.turns.timeouts_applied),
+)
+
+
+def room_event(event):
+    """
+    data["room_id"]로 방을 찾는 소켓 이벤트 핸들러를 등록한다
+    방의 주인이 다른 워커면 처리하지 않고 주인 워커로 넘긴다
+    내 방이면 그 방의 실행자에 넣어 같은 방의 명령과 차례로 처리한다
+    """
+
+    def decorator(handler):
+        room_handlers[event] = handler
+        timed = metrics.timed(event)(handler)
+
+        @functools.wraps(handler)
+        def wrapper(data):
+            received = time.perf_counter()
+            if not isinstance(data, dict):
+                # 실행자에 넣기 전에 거절 (핸들러는 data.get을 쓴다)
+                reject("잘못된 요청입니다")
+                return
+            room_id = data.get("room_id")
+            if room_id and not cluster.is_local(room_id):
+                remote_rooms[request.sid] = room_id
+                cluster.forward(
+                    room_id, event, data, request.sid, binary=request.sid in binary_sids
+                )
+                return
+            if room_id is None:
+                return timed(data)
+            room_actors.submit(
+                room_id, run_as, request.sid, event, handler, data, received
+            )
+
+        socketio.on(event)(wrapper)
+        return wrapper
+
+    return decorator
+
+
+def handle_forwarded(message):
+    """다른 워커에 붙은 연결이 보낸 방 명령을 그 연결의 요청처럼 처리한다"""
+    if message["event"] == "lobby_delta":
+        # 다른 워커의 방 목록 변경 (로비 페이지를 모든 방으로 채우기 위함)
+        game_manager.lobby.apply(message["data"])
+        return
+    if message["event"] == "leaderboard":
+        # 다른 워커에서 끝난 게임으로 바뀐 프로필
+        leaderboard.apply(message["data"])
+        publish_profiles(message["data"])
+        return
+    handler = room_handlers.get(message["event"])
+    if handler is None:
+        return
+    sid = message["sid"]
+    if message.get("binary"):
+        binary_sids.add(sid)
+    else:
+        binary_sids.discard(sid)
+    data = message["data"]
+    room_actors.submit(
+        data["room_id"],
+        run_as,
+        sid,
+        message["event"],
+        handler,
+        data,
+        time.perf_counter(),
+    )
 
 
-game_manager = GameManager()
+def run_as(sid, event, handler, data, received):
+    """
+    소켓 이벤트 밖(실행자, 다른 워커가 넘긴 명령)에서 sid의 요청처럼 처리한다
+    받은 때(received)부터 끝날 때까지의 시간을 event의 지연 시간으로 남긴다
+    """
+    # emit, join_room이 request.sid로 원래 연결을 찾는다
+    with app.test_request_context("/"):
+        request.sid = sid
+        request.namespace = "/"
+        request.event = {"message": event, "args": (data,)}
+        try:
+            handler(data)
+        finally:
+            metrics.EVENT_LATENCY.observe(time.perf_counter() - received, event)
+
+
+def reject(message, event="error_message"):
+    """보낸 연결에 명령을 거절한 이유를 알린다 (이벤트별 거절 수를 셈)"""
+    metrics.REJECTED_COMMANDS.inc(request.event["message"])
+    emit(event, {"message": message})
+
+
+cluster.on_command = handle_forwarded
 
 
 @app.route("/")
@@ -17,8 +192,55 @@ def index():
     return render_template("index.html")
 
 
+@app.route("/stats")
+def stats():
+    """방, 세션, 연결 수와 정리한 방 수 (이유별)"""
+    return jsonify(
+        {
+            "rooms": len(game_manager.rooms),
+            "sessions": len(game_manager.sessions),
+            "connections": len(game_manager.sid_sessions),
+            "room_timers": len(game_manager.reaper.wheel),
+            "evictions": dict(game_manager.reaper.evictions),
+            "turn_timers": len(game_manager.turns),
+            "turn_timeouts": dict(game_manager.turns.timeouts_applied),
+            "room_commands": room_actors.backlog(),
+            # 이벤트별 처리 시간 분위수(초, 버킷에서 추정)
+            "latency": metrics.EVENT_LATENCY.summary(),
+        }
+    )
+
+
+@app.route("/metrics")
+def metrics_page():
+    """Prometheus 텍스트 형식의 지표"""
+    return app.response_class(
+        metrics.render(), content_type="text/plain; version=0.0.4; charset=utf-8"
+    )
+
+
+@app.route("/leaderboard")
+def leaderboard_json():
+    """순위표 (?name=&top=&radius=)"""
+    return jsonify(
+        leaderboard_page(
+            request.args.get("name"),
+            request.args.get("top", 10, type=int),
+            request.args.get("radius", 5, type=int),
+        )
+    )
+
+
 @app.route("/room/<room_id>")
 def room(room_id):
+    if not cluster.is_local(room_id):
+        # 소켓도 주인 워커에 붙도록 주인에게 보낸다
+        if cluster.url_for(room_id):
+            return redirect(cluster.url_for(room_id) + request.path)
+        # 주소를 모르면 방 이벤트를 넘겨서 처리한다 (목록은 reconnect_room으로 받음)
+        return render_template(
+            "room.html", room_id=room_id, players=[], ready_players=set()
+        )
     room = game_manager.get_room(room_id)
     if not room:
         return redirect(url_for("index"))
@@ -33,28 +255,80 @@ def room(room_id):
 
 @app.route("/game/<room_id>")
 def game(room_id):
+    if not cluster.is_local(room_id):
+        if cluster.url_for(room_id):
+            return redirect(cluster.url_for(room_id) + request.path)
+        return render_template("game.html", room={"room_id": room_id})
     room = game_manager.get_room(room_id)
     if not room or not room.game:
         return redirect(url_for("index"))
     return render_template("game.html", room=room)
 
 
+@socketio.on("negotiate_protocol")
+@metrics.timed("negotiate_protocol")
+def handle_negotiate_protocol(data):
+    """연결마다 프로토콜 선택 (json 또는 binary), 알 수 없으면 json"""
+    requested = data.get("protocol") if isinstance(data, dict) else None
+    chosen = requested if requested in protocol.PROTOCOLS else "json"
+    if chosen == "binary":
+        binary_sids.add(request.sid)
+    else:
+        binary_sids.discard(request.sid)
+    emit("protocol", {"protocol": chosen})
+
+
+@socketio.on("connect")
+def handle_connect(auth=None):
+    metrics.CONNECTED_SOCKETS.inc()
+
+
+@socketio.on("disconnect")
+def handle_disconnect(*args):
+    metrics.CONNECTED_SOCKETS.dec()
+    binary_sids.discard(request.sid)
+    room_id = remote_rooms.pop(request.sid, None)
+    if room_id is not None:
+        # 세션은 방의 주인 워커에 있다
+        cluster.forward(
+            room_id, "player_disconnected", {"room_id": room_id}, request.sid
+        )
+    else:
+        session = game_manager.get_session_by_sid(request.sid)
+        if session is not None:
+            room_actors.submit(
+                session.room.room_id, game_manager.disconnect, request.sid
+            )
+
+
+def handle_player_disconnected(data):
+    game_manager.disconnect(request.sid)
+
+
+room_handlers["player_disconnected"] = handle_player_disconnected
+
+
 @socketio.on("create_room")
+@metrics.timed("create_room")
 def handle_create_room(data):
-    room_id = "".join(random.choices(string.ascii_uppercase + string.digits, k=6))
+    # 새 방은 이 워커가 주인인 ID로 만든다
+    while True:
+        room_id = "".join(random.choices(string.ascii_uppercase + string.digits, k=6))
+        if cluster.is_local(room_id):
+            break
     room = game_manager.create_room(room_id, data["username"], request.sid)
-    token = room.player_tokens[data["username"]]
+    token = room.get_player_token(data["username"])
     emit("room_created", {"room_id": room_id, "token": token})
 
 
-@socketio.on("join_room")
+@room_event("join_room")
 def handle_join_room(data):
     room = game_manager.get_room(data["room_id"])
     if not room:
-        emit("join_error", {"message": "존재하지 않는 방입니다."})
+        reject("존재하지 않는 방입니다.", "join_error")
         return
 
-    success, token = room.add_player(data["username"], request.sid)
+    success, token = game_manager.join_room(room.room_id, data["username"], request.sid)
     if success:
         join_room(data["room_id"])
 
@@ -71,58 +345,129 @@ def handle_join_room(data):
             room=data["room_id"],
         )
     else:
-        emit("join_error", {"message": "방에 입장할 수 없습니다."})
+        reject("방에 입장할 수 없습니다.", "join_error")
 
 
-@socketio.on("ready")
+@room_event("ready")
 def handle_ready(data):
-    print(f"[Ready] 준비 요청 수신. room_id: {data['room_id']}, token: {data['token']}")
+    logger.debug("[Ready] 준비 요청 수신. room_id: %s", data["room_id"])
     room = game_manager.get_room(data["room_id"])
-    print(room)
     if room:
-        player = next(
-            (p for p in room.players if room.player_tokens[p.name] == data["token"]),
-            None,
-        )
-        if player:
-            print(f"[Ready] {player.name} 플레이어가 준비 완료")
+        session = room.get_session(data["token"])
+        if session:
+            player = session.player
+            logger.debug("[Ready] %s 플레이어가 준비 완료", player.name)
             room.ready_players.add(player.name)
+            game_manager.mark_dirty(room)
             emit("player_ready", {"username": player.name}, room=data["room_id"])
 
             if room.is_ready_to_start():
-                print(
-                    f"[Ready] 방 {data['room_id']}의 모든 플레이어가 준비 완료. 게임 시작"
-                )
-                room.game = MightyGame()
-                for player in room.players:
-                    room.game.add_player(player.name)
-                room.game.initialize_deck()
-                room.game.deal_cards()
-                emit("game_start", room=data["room_id"])
+                start_game(room)
 
 
-@socketio.on("update_room_list")
-def handle_update_room_list():
-    rooms_data = game_manager.get_all_rooms()
-    emit("update_room_list", {"rooms": rooms_data}, broadcast=True)
+@room_event("add_bot")
+def handle_add_bot(data):
+    room = game_manager.get_room(data["room_id"])
+    if not room or room.game:
+        reject("봇을 추가할 수 없습니다.", "join_error")
+        return
+    # 방장만 봇을 추가할 수 있음
+    if room.get_player_token(room.host_name) != data.get("token"):
+        reject("방장만 봇을 추가할 수 있습니다.", "join_error")
+        return
+
+    bot_name = game_manager.add_bot(room.room_id)
+    if not bot_name:
+        reject("빈 자리가 없습니다.", "join_error")
+        return
+    logger.info("[Add Bot] 방 %s에 %s 추가", room.room_id, bot_name)
+    socketio.emit(
+        "update_player_list",
+        {
+            "players": [player.name for player in room.players],
+            "ready_players": list(room.ready_players),
+        },
+        room=room.room_id,
+    )
+    if room.is_ready_to_start():
+        start_game(room)
+
+
+def start_game(room):
+    room.start_game()
+    metrics.GAMES_STARTED.inc()
+    logger.info(
+        "[Ready] 방 %s 게임 시작 (분배 seed: %s, deal_no: %s)",
+        room.room_id,
+        room.dealer.seed,
+        room.game.deal_no,
+    )
+    socketio.emit("game_start", room=room.room_id)
+    after_action(room)
+
+
+@socketio.on("subscribe_lobby")
+@metrics.timed("subscribe_lobby")
+def handle_subscribe_lobby(data=None):
+    """
+    로비 채널에 들어가서 요청한 페이지를 받는다 (페이지를 바꿀 때도 사용)
+    이후 방 목록 변경은 lobby_delta로 로비 채널에만 간다
+    """
+    data = data if isinstance(data, dict) else {}
+    join_room(LOBBY_ROOM)
+    emit(
+        "lobby_page",
+        game_manager.lobby.page(
+            int(data.get("page") or 0),
+            int(data.get("per_page") or PER_PAGE),
+            bool(data.get("open_only")),
+        ),
+    )
 
 
-@socketio.on("request_room_list")
-def handle_room_list_request():
-    rooms_data = game_manager.get_all_rooms()
-    emit("update_room_list", {"rooms": rooms_data})
+def leaderboard_page(name=None, top=10, radius=5):
+    """상위 top명과 (name이 있으면) name의 순위와 위아래 radius명"""
+    page = {"total": len(leaderboard), "top": leaderboard.top(top)}
+    if name:
+        page["me"] = leaderboard.entry(name)
+        page["around"] = leaderboard.around(name, radius)
+    return page
 
 
-@socketio.on("reconnect_room")
+def publish_profiles(rows):
+    """바뀐 프로필을 지금 순위와 함께 로비 채널에 알린다"""
+    if not rows:
+        return
+    players = [leaderboard.entry(row[0]) for row in rows]
+    socketio.emit(
+        "leaderboard_delta",
+        {"total": len(leaderboard), "players": [p for p in players if p]},
+        room=LOBBY_ROOM,
+    )
+
+
+@socketio.on("get_leaderboard")
+@metrics.timed("get_leaderboard")
+def handle_get_leaderboard(data=None):
+    """순위표 (로비 채널에 들어가 있으면 이후 바뀐 프로필은 leaderboard_delta로)"""
+    data = data if isinstance(data, dict) else {}
+    emit(
+        "leaderboard",
+        leaderboard_page(
+            data.get("name"),
+            int(data.get("top") or 10),
+            int(data.get("radius") or 5),
+        ),
+    )
+
+
+@room_event("reconnect_room")
 def handle_reconnect(data):
     room = game_manager.get_room(data["room_id"])
     if room:
-        player = next(
-            (p for p in room.players if room.player_tokens[p.name] == data["token"]),
-            None,
-        )
-        if player:
-            player.sid = request.sid
+        session = room.get_session(data["token"])
+        if session:
+            game_manager.bind_sid(session, request.sid)
             join_room(data["room_id"])
             emit(
                 "update_player_list",
@@ -137,10 +482,9 @@ def handle_reconnect(data):
     emit("reconnect_failed")
 
 
-@socketio.on("init_game")
+@room_event("init_game")
 def handle_init_game(data):
-    print("\n=== init_game 이벤트 ===")
-    print("받은 데이터:", data)
+    logger.debug("[Init Game] 받은 데이터: %s", data)
 
     room_id = data.get("room_id")
     token = data.get("token")
@@ -150,15 +494,12 @@ def handle_init_game(data):
         return
 
     # 현재 요청한 플레이어 찾기
-    current_player = None
-    if token:
-        current_player = next(
-            (p for p in room.players if room.player_tokens[p.name] == token), None
-        )
-    if current_player:
+    session = room.get_session(token)
+    if session:
+        current_player = session.player
         # 플레이어 순서 정보 생성
         player_list = list(room.players)
-        current_idx = player_list.index(current_player)
+        current_idx = session.seat
         players = []
 
         for i in range(len(player_list)):
@@ -172,18 +513,11 @@ def handle_init_game(data):
                 }
             )
 
-        # 현재 플레이어의 카드 정보 가져오기
-        player_cards = room.game.get_player_cards(current_player.name)
-        print("현재 플레이어의 카드 정보:", player_cards)
-        sorted_cards = room.game.sort_cards(player_cards)  # 카드 정렬
-        cards_data = [
-            {"suit": card.suit.value, "rank": card.rank} for card in sorted_cards
-        ]
+        # 현재 플레이어의 카드 정보 (기루다 기준으로 정렬된 캐시)
+        cards_data = room.views.hand(session.seat)
 
         # 선 플레이어인 경우 추가 정보 전송
-        is_first_player = room.game.current_player_idx == room.players.index(
-            current_player
-        )
+        is_first_player = room.game.current_player_idx == session.seat
 
         emit(
             "init_game",
@@ -191,25 +525,23 @@ def handle_init_game(data):
                 "players": players,
                 "cards": cards_data,
                 "is_first_player": is_first_player,
-                "phase": "bidding",  # 게임 페이즈 추가
+                "phase": room.game.phase,
+                "seat": session.seat,  # 바이너리 프레임의 좌석 번호 -> 이름 변환용
             },
             to=request.sid,
         )
     else:
-        # 관전자 등 토큰이 없는 경우는 플레이어 정보만 전송
-        players = [
-            {
-                "id": player.sid,
-                "name": player.name,
-                "token": room.player_tokens[player.name],
-            }
-            for player in room.players
-        ]
+        # 관전자 등 토큰이 없는 경우는 플레이어 정보와 공유 관전자 상태만 전송
+        players = [{"id": player.sid, "name": player.name} for player in room.players]
 
-        emit("init_game", {"players": players}, room=room_id)
+        emit(
+            "init_game",
+            {"players": players, "state": room.views.spectator()},
+            to=request.sid,
+        )
 
 
-@socketio.on("join_game_room")
+@room_event("join_game_room")
 def handle_join_game_room(data):
     room_id = data.get("room_id")
     token = data.get("token")
@@ -219,17 +551,16 @@ def handle_join_game_room(data):
 
     room = game_manager.get_room(room_id)
     if room:
-        if token:
-            player = next(
-                (p for p in room.players if room.player_tokens[p.name] == token), None
-            )
-            if player:
-                player.sid = request.sid
+        session = room.get_session(token)
+        if session:
+            game_manager.bind_sid(session, request.sid)
+            # 확인받지 못한 패치는 새 연결로 다시 보낸다
+            session.sent_version = session.acked_version
         join_room(room_id)
         handle_init_game({"room_id": room_id, "token": token})
 
 
-@socketio.on("submit_bid")
+@room_event("submit_bid")
 def handle_submit_bid(data):
     room_id = data.get("room_id")
     token = data.get("token")
@@ -238,22 +569,24 @@ def handle_submit_bid(data):
 
     room = game_manager.get_room(room_id)
     if not room or not room.game:
-        emit("error_message", {"message": "게임을 찾을 수 없습니다"})
+        reject("게임을 찾을 수 없습니다")
         return
 
     # 토큰으로 현재 플레이어 확인
-    current_player = next(
-        (p for p in room.game.players if room.player_tokens[p.name] == token), None
-    )
-    if not current_player:
-        emit("error_message", {"message": "플레이어를 찾을 수 없습니다"})
+    session = room.get_session(token)
+    if not session:
+        reject("플레이어를 찾을 수 없습니다")
         return
 
-    player_idx = room.game.players.index(current_player)
+    player_idx = session.seat
+    current_player = room.game.players[player_idx]
 
     # 비딩 제출
-    print(
-        f"[Submit Bid] 공약 제출 시도 - player: {current_player.name}, suit: {suit}, score: {score}"
+    logger.debug(
+        "[Submit Bid] 공약 제출 시도 - player: %s, suit: %s, score: %s",
+        current_player.name,
+        suit,
+        score,
     )
     try:
         suit_obj = getattr(Suit, suit.upper())
@@ -261,10 +594,23 @@ def handle_submit_bid(data):
         suit_obj = None
     success = room.game.submit_bid(player_idx, score, suit_obj)
     if not success:
-        emit("error_message", {"message": "잘못된 공약입니다"})
+        reject("잘못된 공약입니다")
         return
 
-    print(f"[Submit Bid] {current_player.name}님이 {suit} {score}을(를) 공약했습니다.")
+    broadcast_bid(room, player_idx, score, suit)
+    after_action(room)
+
+
+def broadcast_bid(room, player_idx, score, suit):
+    """공약(패스) 결과와 다음 차례, 비딩이 끝났으면 주공에게 kitty를 보냄"""
+    room_id = room.room_id
+    current_player = room.game.players[player_idx]
+    logger.debug(
+        "[Submit Bid] %s님이 %s %s을(를) 공약했습니다.",
+        current_player.name,
+        suit,
+        score,
+    )
 
     # 비딩 결과 브로드캐스트
     if score is None:  # 패스한 경우
@@ -276,9 +622,6 @@ def handle_submit_bid(data):
             room=room_id,
         )
     else:  # 공약 제시한 경우
-        print(
-            f"[Submit Bid] bid_updated 이벤트 emit - player: {current_player.name}, suit: {suit}, score: {score}"
-        )
         socketio.emit(
             "bid_updated",
             {
@@ -291,7 +634,7 @@ def handle_submit_bid(data):
 
     # 비딩 페이즈가 끝났는지 확인
     if room.game.phase == "bidding":  # 다음 플레이어 턴
-        print(f"[Submit Bid] 다음 플레이어 턴: {player_idx}")
+        logger.debug("[Submit Bid] 다음 플레이어 턴: %s", player_idx)
         next_player_idx = (player_idx + 1) % len(room.game.players)
         while next_player_idx in room.game.passed_players:
             next_player_idx = (next_player_idx + 1) % len(room.game.players)
@@ -302,7 +645,9 @@ def handle_submit_bid(data):
             room=room_id,
         )
     else:  # 비딩이 끝난 경우
-        print(f"[Submit Bid] 비딩이 끝났습니다. 대통령: {room.game.president_idx}")
+        logger.debug(
+            "[Submit Bid] 비딩이 끝났습니다. 대통령: %s", room.game.president_idx
+        )
         game_president = room.game.players[room.game.president_idx]
         # room.players에서 실제 sid를 가진 플레이어 객체를 찾음
         president = next(p for p in room.players if p.name == game_president.name)
@@ -323,16 +668,13 @@ def handle_submit_bid(data):
         sorted_cards = room.game.sort_cards(
             player_cards + kitty
         )  # 기루다 기준으로 정렬
-        print(
-            f"[Submit Bid] Kitty 전송 - president: {president.name}, sid: {president.sid}"
-        )
+        logger.debug("[Submit Bid] Kitty 전송 - president: %s", president.name)
+        if not president.sid:
+            return
         socketio.emit(
             "discard_and_update_bid",
             {
-                "cards": [
-                    {"suit": card.suit.value, "rank": card.rank}
-                    for card in sorted_cards
-                ],
+                "cards": [card.to_dict() for card in sorted_cards],
                 "current_bid": room.game.current_bid.score,
                 "current_bid_suit": room.game.current_bid.suit.value,
             },
@@ -340,57 +682,43 @@ def handle_submit_bid(data):
         )
 
 
-@socketio.on("discard_cards_and_update_bid")
+@room_event("discard_cards_and_update_bid")
 def handle_discard_cards_and_update_bid(data):
-    print(
-        f"[Discard Cards and Update Bid] 버리기 및 공약 수정 요청 수신 - data: {data}"
-    )
+    logger.debug("[Discard Cards and Update Bid] 요청 수신 - data: %s", data)
     room_id = data.get("room_id")
     token = data.get("token")
     cards = data.get("cards")
     updated_bid = data.get("updated_bid")
 
     room = game_manager.get_room(room_id)
-    current_player = next(
-        (p for p in room.players if room.player_tokens[p.name] == token), None
-    )
-
     if not room or not room.game:
-        emit("error_message", {"message": "게임을 찾을 수 없습니다"})
+        reject("게임을 찾을 수 없습니다")
         return
 
+    session = room.get_session(token)
+    if not session:
+        reject("플레이어를 찾을 수 없습니다")
+        return
+    current_player = session.player
+
     if room.game.phase != "discarding":
-        emit(
-            "error_message",
-            {"message": "현재 페이즈에서는 버리기 작업을 할 수 없습니다"},
-        )
+        reject("현재 페이즈에서는 버리기 작업을 할 수 없습니다")
         return
 
-    if room.game.president_idx != room.players.index(current_player):
-        emit("error_message", {"message": "현재 플레이어가 주공이 아닙니다"})
+    if room.game.president_idx != session.seat:
+        reject("현재 플레이어가 주공이 아닙니다")
         return
 
     if room.game.discard_cards(room.game.president_idx, cards):
         socketio.emit("discard_complete", {}, room=room_id)
     else:
-        emit("error_message", {"message": "잘못된 버리기 작업입니다"})
-
-    suit_map = {
-        "♠": Suit.SPADE,
-        "♦": Suit.DIAMOND,
-        "♥": Suit.HEART,
-        "♣": Suit.CLOVER,
-        "🃏": Suit.JOKER,
-        "spade": Suit.SPADE,
-        "diamond": Suit.DIAMOND,
-        "heart": Suit.HEART,
-        "club": Suit.CLOVER,
-        "joker": Suit.JOKER,
-    }
+        reject("잘못된 버리기 작업입니다")
+
     if room.game.phase == "modify_bid":
-        print(f"[Discard Cards and Update Bid] 공약 수정 페이즈로 변경")
         if room.game.modify_final_bid(
-            room.game.president_idx, updated_bid["score"], suit_map[updated_bid["suit"]]
+            room.game.president_idx,
+            updated_bid["score"],
+            parse_suit(updated_bid["suit"]),
         ):
             socketio.emit(
                 "bid_updated",
@@ -402,90 +730,90 @@ def handle_discard_cards_and_update_bid(data):
                 room=room_id,
             )
         else:
-            emit("error_message", {"message": "잘못된 공약입니다"})
+            reject("잘못된 공약입니다")
 
     emit("end_discard_and_update_bid", {}, room=current_player.sid)
+    after_action(room)
 
 
-@socketio.on("submit_friend")
+@room_event("submit_friend")
 def handle_submit_friend(data):
-    print(f"[Submit Friend] 프렌드 선택 요청 수신 - data: {data}")
+    logger.debug("[Submit Friend] 프렌드 선택 요청 수신 - data: %s", data)
     room_id = data.get("room_id")
     token = data.get("token")
     suit = data.get("suit")
     rank = data.get("rank")
 
-    suit_map = {
-        "spade": Suit.SPADE,
-        "diamond": Suit.DIAMOND,
-        "heart": Suit.HEART,
-        "club": Suit.CLOVER,
-        "joker": Suit.JOKER,
-    }
-    suit = suit_map.get(suit, None)
-    if not suit:
-        emit("error_message", {"message": "잘못된 무늬입니다"})
-        return
+    # suit가 null이면 노프렌드
+    if suit is not None:
+        suit = parse_suit(suit)
+        if not suit:
+            reject("잘못된 무늬입니다")
+            return
     room = game_manager.get_room(room_id)
-    current_player = next(
-        (p for p in room.players if room.player_tokens[p.name] == token), None
-    )
     if not room or not room.game:
-        emit("error_message", {"message": "게임을 찾을 수 없습니다"})
+        reject("게임을 찾을 수 없습니다")
         return
 
-    if not current_player:
-        emit("error_message", {"message": "플레이어를 찾을 수 없습니다"})
+    session = room.get_session(token)
+    if not session:
+        reject("플레이어를 찾을 수 없습니다")
         return
+    current_player = session.player
 
     if room.game.phase != "friend_selection":
-        emit(
-            "error_message",
-            {"message": "현재 페이즈에서는 프렌드 선택을 할 수 없습니다"},
-        )
+        reject("현재 페이즈에서는 프렌드 선택을 할 수 없습니다")
         return
 
-    if room.game.president_idx != room.players.index(current_player):
-        emit("error_message", {"message": "현재 플레이어가 주공이 아닙니다"})
+    if room.game.president_idx != session.seat:
+        reject("현재 플레이어가 주공이 아닙니다")
         return
 
-    if not isinstance(rank, int):
+    if suit is None:
+        rank = None
+    elif not isinstance(rank, int):
         rank = int(rank)
 
     if room.game.select_friend(room.game.president_idx, suit, rank):
-        print(f"프렌드 카드 선택 성공: {suit.value}{rank}")
-        emit(
-            "end_friend_selection",
-            {"suit": suit.value, "rank": rank, "president_name": current_player.name},
-            room=room_id,
-        )
-        # 각 유저에게 카드덱 전송하면서 게임 시작
-        for player in room.players:
-            player_cards = room.game.get_player_cards(player.name)
-            sorted_cards = room.game.sort_cards(player_cards)
-            emit(
-                "game_start",
-                {
-                    "cards": [
-                        {"suit": card.suit.value, "rank": card.rank}
-                        for card in sorted_cards
-                    ]
-                },
-                room=player.sid,
-            )
+        logger.debug("[Submit Friend] 프렌드 선택 성공: %s %s", suit, rank)
+        broadcast_friend(room, current_player.name, suit, rank)
+        after_action(room)
 
     else:
-        emit(
-            "error_message_friend_selection",
-            {"message": "프렌드로 선택할 수 없는 카드입니다"},
+        reject("프렌드로 선택할 수 없는 카드입니다", "error_message_friend_selection")
+
+    # 모든 패를 문자열로 만드는 비용이 커서 DEBUG 표본에 든 때만 만든다
+    if sampled(logger):
+        logger.debug("게임 상태\n%s", format_game_status(room.game), extra=SAMPLED)
+
+
+def broadcast_friend(room, president_name, suit, rank):
+    """
+    프렌드 카드를 알리고 각 유저에게 카드덱 전송하면서 게임 시작
+    노프렌드면 suit, rank가 None
+    """
+    socketio.emit(
+        "end_friend_selection",
+        {
+            "suit": suit.value if suit else None,
+            "rank": rank,
+            "president_name": president_name,
+        },
+        room=room.room_id,
+    )
+    for seat, player in enumerate(room.players):
+        if not player.sid:
+            continue
+        hand = room.views.hand(seat)
+        send_to(
+            player.sid, "game_start", {"cards": hand}, protocol.encode_game_start(hand)
         )
+    emit_legal_moves(room)
 
-    print_game_status(room.game)
 
-
-@socketio.on("submit_card")
+@room_event("submit_card")
 def handle_submit_card(data):
-    print(f"[Submit Card] 카드 제출 요청 수신 - data: {data}")
+    logger.debug("[Submit Card] 카드 제출 요청 수신 - data: %s", data)
     room_id = data.get("room_id")
     token = data.get("token")
     suit = data.get("suit")
@@ -493,55 +821,375 @@ def handle_submit_card(data):
 
     room = game_manager.get_room(room_id)
     if not room or not room.game:
-        emit("error_message", {"message": "게임을 찾을 수 없습니다"})
-        return
-
-    suit_map = {
-        "♠": Suit.SPADE,
-        "♦": Suit.DIAMOND,
-        "♥": Suit.HEART,
-        "♣": Suit.CLOVER,
-        "🃏": Suit.JOKER,
-        "spade": Suit.SPADE,
-        "diamond": Suit.DIAMOND,
-        "heart": Suit.HEART,
-        "club": Suit.CLOVER,
-        "joker": Suit.JOKER,
-    }
-    current_player = next(
-        (p for p in room.players if room.player_tokens[p.name] == token), None
-    )
-    if not current_player:
-        emit("error_message", {"message": "플레이어를 찾을 수 없습니다"})
+        reject("게임을 찾을 수 없습니다")
         return
 
+    session = room.get_session(token)
+    if not session:
+        reject("플레이어를 찾을 수 없습니다")
+        return
+    current_player = session.player
+
     if room.game.phase != "playing":
-        emit(
-            "error_message", {"message": "현재 페이즈에서는 카드를 제출할 수 없습니다"}
+        reject("현재 페이즈에서는 카드를 제출할 수 없습니다")
+        return
+
+    if room.game.current_player_idx != session.seat:
+        reject("현재 플레이어가 아닙니다")
+        return
+
+    card = Card.from_wire(suit, rank)
+    if card is None:
+        reject("잘못된 카드입니다")
+        return
+
+    # 선으로 조커를 내면 따라야 할 무늬, 선으로 클로버 3을 내면 조커콜 여부
+    joker_suit = parse_suit(data.get("joker_suit"))
+    call_joker = data.get("call_joker") is True
+    if not room.game.current_trick and card.is_joker():
+        if joker_suit is None or joker_suit == Suit.JOKER:
+            reject("조커로 시작할 때는 무늬를 정해야 합니다")
+            return
+
+    if not room.game.play_card(session.seat, card, joker_suit, call_joker):
+        reject("잘못된 카드입니다")
+        return
+
+    broadcast_card(room, session.seat, card)
+    after_action(room)
+
+
+def broadcast_card(room, seat, card):
+    """낸 카드를 알리고, 트릭이 끝났으면 승자를 알린 뒤 다음 차례에 낼 수 있는 카드를 보냄"""
+    send_to_room(
+        room,
+        "card_submitted",
+        {"player_name": room.players[seat].name, **card.to_dict()},
+        protocol.encode_card_submitted(seat, card),
+    )
+
+    # 트릭이 끝났는지 확인
+    if len(room.game.current_trick) == 0:
+        winner = room.game.current_player_idx
+        metrics.TRICKS_RESOLVED.inc()
+        logger.debug("[Trick] 트릭 종료, 승자: %s", room.game.players[winner].name)
+        send_to_room(
+            room,
+            "clear_trick",
+            {"winner_name": room.game.players[winner].name},
+            protocol.encode_clear_trick(winner),
         )
+        if room.game.phase == "game_over":
+            metrics.GAMES_FINISHED.inc()
+            logger.info("[Game] 방 %s 게임 종료", room.room_id)
+            rows = leaderboard.record(room.game, room.bot_names)
+            publish_profiles(rows)
+            if rows and cluster.enabled:
+                cluster.broadcast("leaderboard", rows)
+
+    emit_legal_moves(room)
+
+
+def emit_legal_moves(room):
+    """현재 차례인 플레이어에게 낼 수 있는 카드 목록을 보냄"""
+    if room.game.phase != "playing":
         return
+    player_idx = room.game.current_player_idx
+    if not room.players[player_idx].sid:
+        return
+    mask = room.game.legal_move_mask(player_idx)
+    send_to(
+        room.players[player_idx].sid,
+        "legal_moves",
+        {"cards": [card.to_dict() for card in cards_of(mask)]},
+        protocol.encode_legal_moves(mask),
+    )
 
-    if room.game.current_player_idx != room.players.index(current_player):
-        emit("error_message", {"message": "현재 플레이어가 아닙니다"})
+
+def send_to(sid, event, data, frame):
+    """sid에게 이벤트를 보냄 (바이너리 프로토콜을 협상한 연결이면 frame으로)"""
+    if sid in binary_sids:
+        socketio.emit(protocol.FRAME_EVENT, frame, to=sid)
+    else:
+        socketio.emit(event, data, to=sid)
+
+
+def send_to_room(room, event, data, frame):
+    """방 전체에 이벤트를 보냄 (바이너리 연결에는 frame, 나머지는 JSON)"""
+    binary = [
+        session.sid for session in room.sessions.values() if session.sid in binary_sids
+    ]
+    for sid in binary:
+        socketio.emit(protocol.FRAME_EVENT, frame, to=sid)
+    socketio.emit(event, data, room=room.room_id, skip_sid=binary or None)
+
+
+@room_event("sync_state")
+def handle_sync_state(data):
+    """
+    클라이언트가 가진 version 이후의 패치를 요청 (입장하거나 패치가 끊겼을 때)
+    이어 붙일 수 없으면 스냅샷을 보낸다
+    """
+    room = game_manager.get_room(data.get("room_id"))
+    if not room or not room.game:
+        return
+    session = room.get_session(data.get("token"))
+    seat = session.seat if session else None
+    version = data.get("version") or 0
+    patches = room.game.get_patches(version, seat)
+    if patches is None:
+        emit("state_snapshot", room.views.seat(seat))
+    else:
+        send_to(
+            request.sid,
+            "state_patch",
+            {"patches": patches},
+            protocol.encode_state_patch(patches),
+        )
+    if session:
+        session.sent_version = room.game.version
+
+
+@room_event("ack_state")
+def handle_ack_state(data):
+    # room_id는 여러 워커일 때 주인 워커를 찾는 데만 쓴다
+    session = game_manager.get_session_by_sid(request.sid)
+    if session and isinstance(data.get("version"), int):
+        session.acked_version = data["version"]
+
+
+def push_state(room):
+    """각 플레이어에게 마지막으로 보낸 version 이후의 패치만 보냄"""
+    game = room.game
+    for session in room.sessions.values():
+        if not session.sid or session.sent_version == game.version:
+            continue
+        patches = game.get_patches(session.sent_version, session.seat)
+        if patches is None:
+            socketio.emit(
+                "state_snapshot", room.views.seat(session.seat), room=session.sid
+            )
+        else:
+            send_to(
+                session.sid,
+                "state_patch",
+                {"patches": patches},
+                protocol.encode_state_patch(patches),
+            )
+        session.sent_version = game.version
+
+
+def after_action(room):
+    """게임 상태가 바뀐 뒤: 패치를 보내고, 다음 차례가 봇이면 결정을 맡긴다"""
+    game_manager.mark_dirty(room)
+    push_state(room)
+    schedule_bot(room)
+
+
+def schedule_bot(room):
+    """결정을 내려야 하는 플레이어가 봇이면 워커 풀에 결정을 맡긴다"""
+    game = room.game
+    if not game:
+        return
+    player_idx = acting_player_idx(game)
+    if player_idx is None or not room.is_bot(player_idx):
         return
+    generation, future = bot_pool.submit(room.room_id, game, player_idx)
+    socketio.start_background_task(
+        wait_bot_decision, room, game, player_idx, generation, future
+    )
+
+
+def wait_bot_decision(room, game, player_idx, generation, future):
+    """이벤트 루프를 막지 않도록 결정이 끝날 때까지 양보하며 기다린다"""
+    socketio.sleep(BOT_MIN_DELAY)
+    while not future.done():
+        if not bot_pool.is_current(room.room_id, generation):
+            future.cancel()
+            return
+        socketio.sleep(0.05)
+    room_actors.submit(
+        room.room_id, finish_bot_decision, room, game, player_idx, generation, future
+    )
 
-    if room.game.play_card(
-        room.players.index(current_player), Card(suit_map[suit], rank), None, False
+
+def finish_bot_decision(room, game, player_idx, generation, future):
+    """봇의 결정을 방의 실행자에서 적용한다"""
+    # 그 사이 방이 정리되었거나 새 게임이 시작되었으면 결과를 버린다
+    if (
+        future.cancelled()
+        or not bot_pool.is_current(room.room_id, generation)
+        or room.game is not game
+        or acting_player_idx(game) != player_idx
     ):
-        emit(
-            "card_submitted",
-            {"player_name": current_player.name, "suit": suit, "rank": rank},
-            room=room_id,
+        return
+    try:
+        phase, decision = future.result()
+    except Exception as e:
+        logger.warning("[Bot] 결정 실패: %s", e)
+        return
+    if phase != game.phase:
+        return
+    metrics.BOT_DECISIONS.inc(phase)
+    apply_bot_decision(room, player_idx, phase, decision)
+    after_action(room)
+
+
+def apply_bot_decision(room, player_idx, phase, decision):
+    game = room.game
+    bot = game.players[player_idx]
+    logger.debug("[Bot] %s: %s %s", bot.name, phase, decision)
+    if phase == "bidding":
+        score, suit = decision
+        if not game.submit_bid(player_idx, score, suit):
+            score, suit = None, None
+            game.submit_bid(player_idx, None, None)
+        broadcast_bid(room, player_idx, score, suit.name.lower() if suit else None)
+    elif phase == "discarding":
+        (cards,) = decision
+        if game.discard_cards(player_idx, cards):
+            socketio.emit("discard_complete", {}, room=room.room_id)
+    elif phase == "modify_bid":
+        score, suit = decision
+        if not game.modify_final_bid(player_idx, score, suit):
+            game.modify_final_bid(player_idx, None, None)
+        bid = game.current_bid
+        socketio.emit(
+            "bid_updated",
+            {
+                "player_name": bot.name,
+                "suit": bid.suit.name.lower() if bid.suit else None,
+                "score": bid.score,
+            },
+            room=room.room_id,
         )
-    else:
-        emit("error_message", {"message": "잘못된 카드입니다"})
+    elif phase == "friend_selection":
+        suit, rank = decision
+        if not game.select_friend(player_idx, suit, rank):
+            suit, rank = None, None  # 고를 수 없는 카드면 노프렌드
+            game.select_friend(player_idx)
+        broadcast_friend(room, bot.name, suit, rank)
+    elif phase == "playing":
+        card, joker_suit, call_joker = decision
+        if game.play_card(player_idx, card, joker_suit, call_joker):
+            broadcast_card(room, player_idx, card)
+
+
+def apply_default_action(room, player_idx):
+    """제한 시간이 지난 플레이어 대신 기본 행동을 둔다 (app/turns.py)"""
+    game = room.game
+    phase, decision = default_decision(game, player_idx)
+    name = game.players[player_idx].name
+    logger.info("[Turn] %s: 시간 초과, %s %s", name, phase, decision)
+    apply_bot_decision(room, player_idx, phase, decision)
+    if phase == "discarding" and game.phase == "modify_bid":
+        # 화면은 버리기와 공약 수정을 한 번에 보내므로 공약도 그대로 두고 넘어간다
+        apply_bot_decision(room, player_idx, *default_decision(game, player_idx))
+    if phase in ("discarding", "modify_bid"):
+        # 주공의 버리기, 공약 수정 화면을 닫고 프렌드 선택 화면을 띄운다
+        sid = room.players[player_idx].sid
+        if sid:
+            socketio.emit("end_discard_and_update_bid", {}, room=sid)
+
+
+def flush_rooms():
+    """write-behind: 바뀐 방을 FLUSH_INTERVAL초마다 한 번에 저장"""
+    while True:
+        socketio.sleep(FLUSH_INTERVAL)
+        try:
+            # 방의 기록은 그 방의 실행자에서 만든다 (바뀌는 중인 상태를 읽지 않도록)
+            game_manager.flush(room_actors.gather)
+            leaderboard.flush()
+        except Exception as e:
+            logger.error("[Store] 저장 실패: %s", e)
+
+
+def flush_analytics():
+    """끝난 게임 기록을 FLUSH_INTERVAL초마다 확인해 찬(또는 오래된) 샤드를 쓴다"""
+    while True:
+        socketio.sleep(FLUSH_INTERVAL)
+        try:
+            analytics.flush()
+        except Exception as e:
+            logger.error("[Analytics] 기록 실패: %s", e)
+
+
+def publish_lobby():
+    """방 목록 변경을 LOBBY_INTERVAL 동안 모아서 로비 채널에만 보냄"""
+    while True:
+        socketio.sleep(LOBBY_INTERVAL)
+        ops = game_manager.lobby.flush()
+        if ops:
+            socketio.emit("lobby_delta", {"ops": ops}, room=LOBBY_ROOM)
+            if cluster.enabled:
+                cluster.broadcast("lobby_delta", ops)
+
+
+def reap_rooms():
+    """수명이 다한 방을 REAP_TICK마다 정리 (토큰, 봇 결정, 소켓 방도 함께)"""
+    while True:
+        socketio.sleep(REAP_TICK)
+        for room_id in game_manager.reaper.due():
+            room_actors.submit(room_id, reap_room, room_id)
+
+
+def expire_turns():
+    """TURN_TICK마다 차례 제한 시간이 지난 방을 그 방의 실행자에 맡긴다"""
+    while True:
+        socketio.sleep(TURN_TICK)
+        for room_id in game_manager.turns.due():
+            room_actors.submit(room_id, turn_timeout, room_id)
+
+
+def turn_timeout(room_id):
+    """방의 실행자에서 차례가 그대로인지 다시 확인하고 기본 행동을 둔다"""
+    room = game_manager.rooms.get(room_id)
+    if room is None or room.game is None:
+        return
+    player_idx = game_manager.turns.expired(room)
+    if player_idx is None:
+        return
+    apply_default_action(room, player_idx)
+    after_action(room)
 
-    # 트릭이 끝났는지 확인
-    if len(room.game.current_trick) == 0:
-        print("\n=== 트릭 종료 ===")
-        print( room.game.players[room.game.current_player_idx])
-        emit(
-            "clear_trick", 
-            {"winner_name": room.game.players[room.game.current_player_idx].name}, 
-            room=room_id
-        )
\ No newline at end of file
+
+def reap_room(room_id):
+    """방의 실행자에서 정리 조건을 다시 확인하고 정리한다"""
+    reason = game_manager.evict(room_id)
+    if reason is None:
+        return
+    logger.info("[Reaper] 방 %s 정리: %s", room_id, reason)
+    bot_pool.release(room_id)
+    socketio.close_room(room_id)
+
+
+def init_server():
+    """
+    서버 프로세스에서 한 번 부른다 (run.py)
+    저장소와 분석 기록을 열고 백그라운드 작업과 종료 시 저장을 등록한다.
+    app 패키지를 import하기만 하는 도구(app.sim, 벤치마크, 봇 워커 프로세스)는
+    부르지 않으므로 파일을 만들거나 스레드를 띄우지 않는다.
+    """
+    global game_manager, leaderboard, analytics, server_started
+    if server_started:
+        return
+    server_started = True
+    if ROOM_DB:
+        game_manager = GameManager(SQLiteRoomStore(ROOM_DB), owns=cluster.is_local)
+        leaderboard = Leaderboard(SQLiteProfileStore(ROOM_DB))
+    if ANALYTICS_DIR:
+        analytics = GameRecorder(ANALYTICS_DIR, ANALYTICS_FORMAT)
+        game_manager.on_game_over = lambda room: analytics.record(room.game)
+
+    socketio.start_background_task(publish_lobby)
+    socketio.start_background_task(reap_rooms)
+    socketio.start_background_task(expire_turns)
+    if game_manager.store is not None:
+        # 재시작 후 불러온 방에서 봇 차례였으면 이어서 진행
+        game_manager.on_load = schedule_bot
+        socketio.start_background_task(flush_rooms)
+        atexit.register(game_manager.flush)
+        atexit.register(leaderboard.flush)
+    if analytics is not None:
+        socketio.start_background_task(flush_analytics)
+        atexit.register(analytics.close)
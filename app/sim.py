@@ -0,0 +1,355 @@
+"""
+헤드리스 셀프 플레이 시뮬레이터
+
+    python -m app.sim --games 100000 --workers 8 --policy greedy
+
+MightyGame의 전체 흐름(deal_cards, submit_bid, discard_cards,
+modify_final_bid, select_friend, play_card)을 정책(Policy)에 따라 끝까지
+진행하고, 여러 프로세스에 나눠 돌린 뒤 처리량과 결과 통계를 출력한다.
+
+    python -m app.sim --games 1000000 --workers 8 --chunk 50000 --record analytics/
+
+--record를 주면 끝난 게임을 서버와 같은 분석 기록 샤드(app/analytics.py)로
+남긴다. 작업 단위(chunk)마다 샤드를 따로 쓰므로 게임이 많으면 chunk를 키운다.
+"""
+
+import argparse
+import random
+import time
+from abc import ABC, abstractmethod
+from collections import Counter
+from multiprocessing import Pool
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from app.analytics import FORMATS, GameRecorder
+from app.model.card import Card, Suit, NORMAL_SUITS
+from app.model.deal import DealGenerator
+from app.model.mighty import MightyGame, MIN_BID
+from app.model.power import power_table
+
+# (카드, 조커 무늬, 조커콜 여부)
+Move = Tuple[Card, Optional[Suit], bool]
+DEAL_PREFETCH = 1024  # 분배를 이만큼씩 한 번에 만든다 (DealGenerator.batch_ids)
+
+
+class Policy(ABC):
+    """
+    게임 진행 중 결정을 내리는 정책
+    각 메서드는 현재 게임과 결정할 플레이어 인덱스를 받는다
+    play만 구현하면 되고, 나머지는 기본 결정(패스, 무작위 버리기 등)이 있다
+    """
+
+    def __init__(self, rng: random.Random):
+        self.rng = rng
+
+    def bid(self, game: MightyGame, idx: int) -> Tuple[Optional[int], Optional[Suit]]:
+        """(점수, 무늬), 패스는 (None, None)"""
+        return None, None
+
+    def discard(self, game: MightyGame, idx: int) -> List[Card]:
+        """주공의 패 + kitty 중 버릴 3장"""
+        cards = game.players[idx].cards + game.kitty
+        return self.rng.sample(cards, 3)
+
+    def modify_bid(
+        self, game: MightyGame, idx: int
+    ) -> Tuple[Optional[int], Optional[Suit]]:
+        """최종 공약 수정, 수정하지 않으면 (None, None)"""
+        return None, None
+
+    def friend(
+        self, game: MightyGame, idx: int
+    ) -> Tuple[Optional[Suit], Optional[int]]:
+        """프렌드 카드 (무늬, 숫자), 노프렌드는 (None, None)"""
+        return None, None
+
+    @abstractmethod
+    def play(self, game: MightyGame, idx: int) -> Iterable[Move]:
+        """game.legal_moves(idx) 중에서 낼 카드를 선호 순서대로"""
+
+
+class RandomPolicy(Policy):
+    """무작위로 공약하고 무작위 카드를 내는 정책"""
+
+    def bid(self, game, idx):
+        score = game.current_bid.score + 1 if game.current_bid else MIN_BID
+        if score <= 20 and self.rng.random() < 0.3:
+            return score, self.rng.choice(NORMAL_SUITS)
+        return None, None
+
+    def friend(self, game, idx):
+        if self.rng.random() < 0.1:
+            return None, None
+        card = self.rng.choice(game.legal_friend_cards(idx))
+        return card.suit, card.rank
+
+    def play(self, game, idx):
+        card = self.rng.choice(game.legal_moves(idx))
+        joker_suit = self.rng.choice(NORMAL_SUITS) if card.is_joker() else None
+        yield card, joker_suit, self.rng.random() < 0.5
+
+
+class GreedyPolicy(Policy):
+    """
+    간단한 휴리스틱 정책
+    - 가장 많은 무늬의 장수와 점수 카드로 공약
+    - 점수 카드가 아닌 낮은 카드부터 버림
+    - 마이티(없으면 조커, 기루다 A)를 프렌드로 지정
+    - 트릭을 이길 수 있으면 이기는 카드 중 가장 약한 카드, 아니면 가장 약한 카드
+    - 선으로 낼 때는 가장 센 카드
+    """
+
+    def _strength(self, cards: List[Card], suit: Suit) -> int:
+        same_suit = sum(1 for c in cards if c.suit == suit)
+        points = sum(1 for c in cards if c.is_point_card())
+        specials = sum(1 for c in cards if c.is_joker() or c.is_mighty(suit))
+        return 6 + same_suit + points // 2 + specials * 2
+
+    def bid(self, game, idx):
+        cards = game.players[idx].cards
+        suit = max(NORMAL_SUITS, key=lambda s: sum(1 for c in cards if c.suit == s))
+        target = min(self._strength(cards, suit), 20)
+        score = game.current_bid.score + 1 if game.current_bid else MIN_BID
+        if score <= target:
+            return score, suit
+        return None, None
+
+    def discard(self, game, idx):
+        cards = game.players[idx].cards + game.kitty
+        return sorted(
+            cards,
+            key=lambda c: (
+                c.is_joker() or c.is_mighty(game.giruda),
+                c.suit == game.giruda,
+                c.is_point_card(),
+                c.rank,
+            ),
+        )[:3]
+
+    def friend(self, game, idx):
+        own = game.players[idx].mask
+        for card in (
+            Card(Suit.DIAMOND if game.giruda == Suit.SPADE else Suit.SPADE, 14),
+            Card(Suit.JOKER, 0),
+            Card(game.giruda, 14),
+            Card(game.giruda, 13),
+        ):
+            if not own & card.bit and not game.discarded_mask & card.bit:
+                return card.suit, card.rank
+        return None, None
+
+    def play(self, game, idx):
+        hand = game.legal_moves(idx)
+        trick = game.current_trick
+        if trick:
+            table = power_table(
+                game.giruda, trick[0].suit, game.joker_called_in_this_trick
+            )
+            order = sorted(hand, key=lambda c: table[c.id])
+            best = max(table[c.id] for c in trick)
+            winners = [c for c in order if table[c.id] > best]
+            # 이길 수 있으면 이기는 카드 중 가장 약한 카드부터
+            order = winners + [c for c in order if c not in winners]
+        else:
+            # 선으로 낼 때는 카드마다 자기 무늬로 시작하는 트릭에서의 파워로 비교
+            order = sorted(
+                hand,
+                key=lambda c: power_table(game.giruda, c.suit, False)[c.id],
+            )
+            order.reverse()
+        for card in order:
+            yield card, game.giruda or Suit.SPADE, False
+
+
+POLICIES = {"random": RandomPolicy, "greedy": GreedyPolicy}
+
+
+def play_game(game: MightyGame, policies: List[Policy]) -> Dict:
+    """준비된(카드가 분배된) 게임을 끝까지 진행하고 결과를 돌려준다"""
+    while game.phase == "bidding":
+        idx = game.current_player_idx
+        score, suit = (None, None)
+        if idx not in game.passed_players:
+            score, suit = policies[idx].bid(game, idx)
+        if not game.submit_bid(idx, score, suit):
+            game.submit_bid(idx, None, None)
+
+    president = game.president_idx
+    if not game.discard_cards(president, policies[president].discard(game, president)):
+        raise RuntimeError("정책이 잘못된 카드를 버렸습니다")
+    score, suit = policies[president].modify_bid(game, president)
+    if not game.modify_final_bid(president, score, suit):
+        game.modify_final_bid(president, None, None)
+    suit, rank = policies[president].friend(game, president)
+    if not game.select_friend(president, suit, rank):
+        game.select_friend(president)
+
+    tricks = play_tricks(game, policies)
+    team_points = president_team_points(game)
+    return {
+        "tricks": tricks,
+        "bid": game.current_bid.score,
+        "giruda": game.giruda.name,
+        "no_friend": game.friend_card is None,
+        "team_points": team_points,
+        "president_won": team_points >= game.current_bid.score,
+    }
+
+
+def play_tricks(game: MightyGame, policies: List[Policy]) -> int:
+    """playing 페이즈의 게임을 끝까지 진행하고 끝난 트릭 수를 돌려준다"""
+    tricks = 0
+    while game.phase == "playing":
+        idx = game.current_player_idx
+        for card, joker_suit, call_joker in policies[idx].play(game, idx):
+            if game.play_card(idx, card, joker_suit, call_joker):
+                break
+        else:
+            raise RuntimeError(f"Player {idx}가 낼 수 있는 카드가 없습니다")
+        if not game.current_trick:
+            tricks += 1
+    return tricks
+
+
+def president_team_points(game: MightyGame) -> int:
+    """주공팀(주공 + 프렌드)이 가져간 점수"""
+    team_points = game.players[game.president_idx].points
+    if game.friend_player_idx is not None:
+        team_points += game.players[game.friend_player_idx].points
+    return team_points
+
+
+def run_chunk(args: Tuple[int, int, str, Optional[str], str]) -> Dict:
+    """
+    seed부터 games개의 게임을 한 프로세스에서 진행하고 집계
+    record 디렉터리가 있으면 끝난 게임을 fmt 형식의 샤드로 기록한다
+    """
+    seed, games, policy_name, record, fmt = args
+    rng = random.Random(seed)
+    policies = [POLICIES[policy_name](rng) for _ in range(5)]
+    game = MightyGame(DealGenerator(seed, prefetch=min(games, DEAL_PREFETCH)))
+    for i in range(5):
+        game.add_player(f"Player {i}")
+    recorder = None
+    if record:
+        # 한 프로세스가 여러 작업 단위를 돌리므로 이름에 seed를 넣어 겹치지 않게 한다
+        prefix = f"{time.strftime('%Y%m%d%H%M%S')}-sim{seed}"
+        recorder = GameRecorder(record, fmt, shard_rows=games, prefix=prefix)
+        game.on_game_over = recorder.record
+
+    stats = Counter()
+    bids = Counter()
+    wins_by_giruda = Counter()
+    games_by_giruda = Counter()
+    for _ in range(games):
+        game.reset_game()
+        game.initialize_deck()
+        game.deal_cards()
+        result = play_game(game, policies)
+        stats["games"] += 1
+        stats["tricks"] += result["tricks"]
+        stats["team_points"] += result["team_points"]
+        stats["president_won"] += result["president_won"]
+        stats["no_friend"] += result["no_friend"]
+        bids[result["bid"]] += 1
+        games_by_giruda[result["giruda"]] += 1
+        wins_by_giruda[result["giruda"]] += result["president_won"]
+    if recorder is not None:
+        recorder.close()
+    return {
+        "stats": stats,
+        "bids": bids,
+        "games_by_giruda": games_by_giruda,
+        "wins_by_giruda": wins_by_giruda,
+    }
+
+
+def simulate(
+    games: int,
+    workers: int = 1,
+    policy: str = "greedy",
+    seed: int = 0,
+    chunk: int = 500,
+    record: Optional[str] = None,
+    record_format: str = "npz",
+) -> Dict:
+    tasks = []
+    for i, start in enumerate(range(0, games, chunk)):
+        tasks.append(
+            (
+                seed * 1_000_003 + i,
+                min(chunk, games - start),
+                policy,
+                record,
+                record_format,
+            )
+        )
+
+    total = {
+        "stats": Counter(),
+        "bids": Counter(),
+        "games_by_giruda": Counter(),
+        "wins_by_giruda": Counter(),
+    }
+    started = time.perf_counter()
+    if workers > 1:
+        with Pool(workers) as pool:
+            results = pool.imap_unordered(run_chunk, tasks)
+            for result in results:
+                for key in total:
+                    total[key].update(result[key])
+    else:
+        for task in tasks:
+            result = run_chunk(task)
+            for key in total:
+                total[key].update(result[key])
+    total["elapsed"] = time.perf_counter() - started
+    return total
+
+
+def print_report(total: Dict):
+    stats = total["stats"]
+    elapsed = total["elapsed"]
+    games = stats["games"]
+    print(f"게임 수: {games}  ({elapsed:.2f}s)")
+    print(
+        f"처리량: {games / elapsed:,.0f} games/sec, {stats['tricks'] / elapsed:,.0f} tricks/sec"
+    )
+    print(f"주공팀 승률: {stats['president_won'] / games:.3f}")
+    print(f"주공팀 평균 득점: {stats['team_points'] / games:.2f}")
+    print(f"노프렌드 비율: {stats['no_friend'] / games:.3f}")
+    print(
+        "공약별 게임 수: "
+        + ", ".join(f"{b}: {n}" for b, n in sorted(total["bids"].items()))
+    )
+    for giruda, n in sorted(total["games_by_giruda"].items()):
+        print(
+            f"기루다 {giruda}: {n}게임, 승률 {total['wins_by_giruda'][giruda] / n:.3f}"
+        )
+
+
+def main():
+    parser = argparse.ArgumentParser(description="마이티 셀프 플레이 시뮬레이터")
+    parser.add_argument("--games", type=int, default=10000)
+    parser.add_argument("--workers", type=int, default=1)
+    parser.add_argument("--policy", choices=sorted(POLICIES), default="greedy")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--chunk", type=int, default=500, help="작업 단위당 게임 수")
+    parser.add_argument("--record", help="끝난 게임을 기록할 분석 샤드 디렉터리")
+    parser.add_argument("--record-format", choices=FORMATS, default="npz")
+    args = parser.parse_args()
+    print_report(
+        simulate(
+            args.games,
+            args.workers,
+            args.policy,
+            args.seed,
+            args.chunk,
+            args.record,
+            args.record_format,
+        )
+    )
+
+
+if __name__ == "__main__":
+    main()
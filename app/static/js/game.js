@@ -6,18 +6,33 @@ class GameUI {
         console.log('[GameUI 생성] 저장된 토큰:', this.token);
         this.initializeSocketEvents();
         this.currentPhase = null;
+        // 서버 상태의 사본과 version (패치로 갱신)
+        this.state = null;
+        this.stateVersion = 0;
     }
 
     initializeSocketEvents() {
         // 소켓 연결 후 방에 join
         this.socket.on('connect', () => {
+            // 이 연결에서는 압축 바이너리 프로토콜을 사용 (다른 이벤트보다 먼저 협상)
+            this.socket.emit('negotiate_protocol', { protocol: 'binary' });
             this.joinRoom(ROOM_ID);
             this.socket.emit('init_game', {
                 room_id: ROOM_ID,
                 token: this.token
             });
+            this.requestStateSync();
         });
 
+        // 바이너리 프레임은 JSON과 같은 객체로 풀어서 원래 이벤트 핸들러에 넘긴다
+        this.socket.on('frame', (buffer) => {
+            const [event, data] = this.decodeFrame(buffer);
+            this.socket.listeners(event).forEach(handler => handler(data));
+        });
+
+        this.socket.on('state_snapshot', (data) => this.handleStateSnapshot(data));
+        this.socket.on('state_patch', (data) => this.handleStatePatch(data));
+
         this.socket.on('init_game', (data) => this.handleInitGame(data));
 
         // 공약 관련 이벤트
@@ -72,6 +87,10 @@ class GameUI {
             console.log('clear trick');
             this.handleClearTrick(data);
         });
+
+        this.socket.on('legal_moves', (data) => {
+            this.handleLegalMoves(data);
+        });
     }
 
     joinRoom(roomId) {
@@ -93,6 +112,12 @@ class GameUI {
             return;
         }
         
+        // 좌석 번호 -> 이름 (바이너리 프레임은 이름 대신 좌석 번호를 보냄)
+        this.seatNames = [];
+        players.forEach((player, i) => {
+            this.seatNames[(data.seat + i) % players.length] = player.name;
+        });
+
         this.initializePlayerNames(players);
         this.updatePlayerPositions(players, myIndex);
         
@@ -641,7 +666,8 @@ class GameUI {
         // 현재 공약과 프렌드 정보 함께 표시
         const bidInfoPanel = document.querySelector('.bid-info-panel');
         const currentBid = bidInfoPanel.innerHTML; // 기존 공약 정보 저장
-        bidInfoPanel.innerHTML = `${currentBid}<br>현재 프렌드: ${data.suit} ${data.rank}`;
+        const friend = data.suit ? `${data.suit} ${data.rank}` : '노프렌드';
+        bidInfoPanel.innerHTML = `${currentBid}<br>현재 프렌드: ${friend}`;
 
         // 주공 플레이어 이름 파란색으로 표시
         const presidentName = data.president_name;
@@ -685,13 +711,11 @@ class GameUI {
                 
                 // 카드 클릭 이벤트 추가
                 cardElement.addEventListener('click', () => {
-                    // 서버에 카드 제출 이벤트 전송
-                    this.socket.emit('submit_card', {
-                        room_id: ROOM_ID,
-                        token: this.token,
-                        suit: card.suit,
-                        rank: card.rank
-                    });
+                    // 낼 수 없는 카드는 서버에 보내지 않음
+                    if (cardElement.classList.contains('illegal-card')) {
+                        return;
+                    }
+                    this.submitCard(card);
                 });
                 
                 cardsContainer.appendChild(cardElement);
@@ -699,6 +723,68 @@ class GameUI {
         }
     }
 
+    submitCard(card) {
+        const payload = {
+            room_id: ROOM_ID,
+            token: this.token,
+            suit: card.suit,
+            rank: card.rank
+        };
+        const leading = this.state && this.state.trick.length === 0;
+        if (leading && card.suit === '🃏') {
+            // 조커로 시작할 때는 따라야 할 무늬를 정해야 함
+            this.showJokerSuitUI(suit => {
+                this.socket.emit('submit_card', { ...payload, joker_suit: suit });
+            });
+            return;
+        }
+        if (leading && card.suit === '♣' && card.rank === 3) {
+            payload.call_joker = confirm('조커콜 하시겠습니까?');
+        }
+        // 서버에 카드 제출 이벤트 전송
+        this.socket.emit('submit_card', payload);
+    }
+
+    showJokerSuitUI(onSelect) {
+        if (document.querySelector('.joker-suit-ui')) {
+            return;
+        }
+        const jokerUI = document.createElement('div');
+        jokerUI.className = 'bidding-ui joker-suit-ui';
+
+        const box = document.createElement('div');
+        box.className = 'bidding-box';
+
+        const title = document.createElement('div');
+        title.className = 'bidding-title';
+        title.textContent = '조커 무늬 선택';
+        box.appendChild(title);
+
+        const suitSelection = document.createElement('div');
+        suitSelection.className = 'suit-selection';
+        const suitSymbols = {'spade': '♠', 'diamond': '♦', 'heart': '♥', 'club': '♣'};
+        Object.entries(suitSymbols).forEach(([suit, symbol]) => {
+            const suitElement = document.createElement('div');
+            suitElement.className = `suit ${suit}`;
+            suitElement.textContent = symbol;
+            suitElement.onclick = () => {
+                jokerUI.remove();
+                onSelect(suit);
+            };
+            suitSelection.appendChild(suitElement);
+        });
+        box.appendChild(suitSelection);
+
+        const cancelBtn = document.createElement('button');
+        cancelBtn.className = 'pass-btn';
+        cancelBtn.textContent = '취소';
+        cancelBtn.onclick = () => jokerUI.remove();
+        box.appendChild(cancelBtn);
+
+        jokerUI.appendChild(box);
+        document.body.appendChild(jokerUI);
+    }
+
     handleCardSubmitted(data) {
         const playerName = data.player_name;
         const suit = data.suit;
@@ -707,6 +793,7 @@ class GameUI {
 
         // 카드를 낸 플레이어가 본인인 경우에만 카드 덱에서 제거
         if (playerName === this.name) {
+            this.clearLegalMoves();
             const cardElement = document.querySelector(`.player-bottom .card[data-suit="${suit}"][data-rank="${rank}"]`);
             if (cardElement) {
                 //카드가 가운데로 이동
@@ -761,6 +848,233 @@ class GameUI {
             }
         }
     }
+    handleLegalMoves(data) {
+        // 내 차례에 낼 수 있는 카드만 선택 가능하게 표시
+        const legal = new Set(data.cards.map(card => `${card.suit}${card.rank}`));
+        document.querySelectorAll('.player-bottom .cards-container .card').forEach(cardElement => {
+            const key = `${cardElement.dataset.suit}${cardElement.dataset.rank}`;
+            cardElement.classList.toggle('illegal-card', !legal.has(key));
+        });
+    }
+
+    decodeFrame(buffer) {
+        // app/protocol.py의 형식: [이벤트 코드 u8][본문], 카드는 1바이트 ID
+        const bytes = new Uint8Array(buffer);
+        const view = new DataView(bytes.buffer, bytes.byteOffset, bytes.byteLength);
+        const NONE = 255;
+        const SUITS = ['♠', '♦', '♥', '♣', '🃏'];
+        const PHASES = ['bidding', 'discarding', 'modify_bid', 'friend_selection', 'playing', 'game_over'];
+        const OPS = ['deal', 'turn', 'bid', 'president', 'discard', 'final_bid', 'friend',
+                     'play', 'friend_revealed', 'trick', 'game_over', 'reset'];
+        const card = (id) => id === 52 ? { suit: '🃏', rank: 0 } : { suit: SUITS[Math.floor(id / 13)], rank: id % 13 + 2 };
+        const suit = (code) => code === NONE ? null : SUITS[code];
+        let pos = 0;
+        const u8 = () => bytes[pos++];
+        const cards = () => {
+            const count = u8();
+            if (count === NONE) return null;
+            const result = [];
+            for (let i = 0; i < count; i++) result.push(card(u8()));
+            return result;
+        };
+
+        switch (u8()) {
+            case 1:
+                return ['card_submitted', { player_name: this.seatNames[u8()], ...card(u8()) }];
+            case 2:
+                return ['clear_trick', { winner_name: this.seatNames[u8()] }];
+            case 3: {
+                const low = view.getUint32(1, true);
+                const high = view.getUint32(5, true);
+                const legal = [];
+                for (let id = 0; id < 53; id++) {
+                    const bit = id < 32 ? (low >>> id) & 1 : (high >>> (id - 32)) & 1;
+                    if (bit) legal.push(card(id));
+                }
+                return ['legal_moves', { cards: legal }];
+            }
+            case 4:
+                return ['game_start', { cards: cards() }];
+        }
+
+        const count = view.getUint16(pos, true);
+        pos += 2;
+        const patches = [];
+        for (let i = 0; i < count; i++) {
+            const patch = { v: view.getUint32(pos, true), op: OPS[bytes[pos + 4]] };
+            pos += 5;
+            switch (patch.op) {
+                case 'deal': {
+                    patch.counts = Array.from(bytes.slice(pos, pos + 5));
+                    pos += 5;
+                    const hand = cards();
+                    if (hand) patch.hand = hand;
+                    break;
+                }
+                case 'turn':
+                    patch.phase = PHASES[u8()];
+                    patch.seat = u8();
+                    break;
+                case 'bid':
+                    patch.seat = u8();
+                    patch.score = u8() || null;
+                    patch.suit = suit(u8());
+                    break;
+                case 'president': {
+                    patch.seat = u8();
+                    patch.score = u8();
+                    patch.suit = suit(u8());
+                    const kitty = cards();
+                    if (kitty) patch.kitty = kitty;
+                    break;
+                }
+                case 'discard': {
+                    patch.seat = u8();
+                    patch.points = u8();
+                    const discarded = cards();
+                    if (discarded) patch.cards = discarded;
+                    break;
+                }
+                case 'final_bid':
+                    patch.score = u8();
+                    patch.suit = suit(u8());
+                    break;
+                case 'friend': {
+                    const id = u8();
+                    patch.card = id === NONE ? null : card(id);
+                    break;
+                }
+                case 'play':
+                    patch.seat = u8();
+                    patch.card = card(u8());
+                    patch.joker_suit = suit(u8());
+                    patch.call_joker = u8() === 1;
+                    break;
+                case 'friend_revealed':
+                    patch.seat = u8();
+                    break;
+                case 'trick':
+                    patch.winner = u8();
+                    patch.points = u8();
+                    break;
+                case 'game_over':
+                    patch.points = Array.from(bytes.slice(pos, pos + 5));
+                    pos += 5;
+                    patch.scores = [];
+                    for (let j = 0; j < 5; j++, pos += 4) patch.scores.push(view.getInt32(pos, true));
+                    break;
+            }
+            patches.push(patch);
+        }
+        return ['state_patch', { patches }];
+    }
+
+    requestStateSync() {
+        // 가진 version 이후의 패치를 요청 (처음이거나 끊겼으면 서버가 스냅샷을 보냄)
+        this.socket.emit('sync_state', {
+            room_id: ROOM_ID,
+            token: this.token,
+            version: this.state ? this.stateVersion : 0
+        });
+    }
+
+    handleStateSnapshot(snapshot) {
+        this.state = snapshot;
+        this.stateVersion = snapshot.v;
+        this.socket.emit('ack_state', { room_id: ROOM_ID, version: this.stateVersion });
+    }
+
+    handleStatePatch(data) {
+        if (!this.state) {
+            this.requestStateSync();
+            return;
+        }
+        for (const patch of data.patches) {
+            if (patch.v <= this.stateVersion) {
+                continue;  // 이미 반영한 패치
+            }
+            if (patch.v !== this.stateVersion + 1) {
+                // 중간 패치가 빠졌으면 다시 요청
+                this.requestStateSync();
+                return;
+            }
+            this.applyStatePatch(this.state, patch);
+            this.stateVersion = patch.v;
+        }
+        this.socket.emit('ack_state', { room_id: ROOM_ID, version: this.stateVersion });
+    }
+
+    applyStatePatch(state, patch) {
+        const sameCard = (a, b) => a.suit === b.suit && a.rank === b.rank;
+        switch (patch.op) {
+            case 'deal':
+                state.counts = patch.counts;
+                if (patch.hand) state.hand = patch.hand;
+                break;
+            case 'turn':
+                state.phase = patch.phase;
+                state.turn = patch.seat;
+                break;
+            case 'bid':
+                state.bids.push({ seat: patch.seat, score: patch.score, suit: patch.suit });
+                if (patch.score) state.bid = { score: patch.score, suit: patch.suit };
+                break;
+            case 'president':
+                state.president = patch.seat;
+                state.giruda = patch.suit;
+                state.bid = { score: patch.score, suit: patch.suit };
+                if (patch.kitty) state.kitty = patch.kitty;
+                break;
+            case 'discard':
+                state.points[patch.seat] = patch.points;
+                if (patch.cards) {
+                    state.hand = state.hand.concat(state.kitty || [])
+                        .filter(card => !patch.cards.some(d => sameCard(card, d)));
+                    state.discarded = patch.cards;
+                    delete state.kitty;
+                }
+                break;
+            case 'final_bid':
+                state.bid = { score: patch.score, suit: patch.suit };
+                state.giruda = patch.suit;
+                break;
+            case 'friend':
+                state.friend = patch.card;
+                break;
+            case 'play':
+                if (state.trick.length === 0) {
+                    state.joker_suit = patch.joker_suit;
+                    state.joker_called = patch.call_joker;
+                }
+                state.trick.push(patch.card);
+                state.counts[patch.seat] -= 1;
+                if (state.hand) state.hand = state.hand.filter(card => !sameCard(card, patch.card));
+                break;
+            case 'friend_revealed':
+                state.friend_seat = patch.seat;
+                break;
+            case 'trick':
+                state.points[patch.winner] += patch.points;
+                state.trick = [];
+                state.joker_suit = null;
+                state.joker_called = false;
+                break;
+            case 'game_over':
+                state.points = patch.points;
+                state.scores = patch.scores;
+                break;
+            case 'reset':
+                this.requestStateSync();
+                break;
+        }
+    }
+
+    clearLegalMoves() {
+        document.querySelectorAll('.player-bottom .illegal-card').forEach(cardElement => {
+            cardElement.classList.remove('illegal-card');
+        });
+    }
+
     handleClearTrick(data) {
         console.log("[handleClearTrick] 플레이어의 카드 제거 완료");
         const winnerName = data.winner_name;
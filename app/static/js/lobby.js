@@ -22,6 +22,7 @@ function setNickname() {
         document.getElementById('nickname-modal').style.display = 'none';
         // 서버에 닉네임 설정 알림
         socket.emit('set_nickname', { username: nickname });
+        requestLeaderboard();
     } else {
         alert('닉네임을 입력해주세요.');
     }
@@ -45,21 +46,132 @@ socket.on('room_created', (data) => {
     window.location.href = `/room/${data.room_id}`;
 });
 
-// 방 목록 업데이트 (초기 로딩 및 실시간 업데이트에 모두 사용)
-socket.on('update_room_list', (data) => {
+// 방 목록: 처음에 한 페이지를 받고 이후에는 로비 채널의 변경분(lobby_delta)만 받음
+const ROOMS_PER_PAGE = 20;
+let lobbyPage = 0;
+let lobbyOpenOnly = false;
+let lobbyRooms = [];
+let lobbyTotal = 0;
+
+function isOpenRoom(room) {
+    return !room.started && room.current_players < room.max_players;
+}
+
+function requestLobbyPage() {
+    socket.emit('subscribe_lobby', {
+        page: lobbyPage,
+        per_page: ROOMS_PER_PAGE,
+        open_only: lobbyOpenOnly
+    });
+}
+
+function changeLobbyPage(delta) {
+    const lastPage = Math.max(0, Math.ceil(lobbyTotal / ROOMS_PER_PAGE) - 1);
+    lobbyPage = Math.min(Math.max(0, lobbyPage + delta), lastPage);
+    requestLobbyPage();
+}
+
+function toggleOpenOnly() {
+    lobbyOpenOnly = document.getElementById('open-only').checked;
+    lobbyPage = 0;
+    requestLobbyPage();
+}
+
+function renderRoomList() {
     const roomList = document.getElementById('room-list');
     roomList.innerHTML = '';
-    
-    data.rooms.forEach(room => {
+
+    lobbyRooms.forEach(room => {
         const roomElement = document.createElement('div');
         roomElement.className = 'room-item';
         roomElement.innerHTML = `
             <div class="room-name">${room.name}</div>
-            <div class="room-players">${room.current_players}/${room.max_players}</div>
-            <button onclick="joinRoom('${room.id}')">입장</button>
+            <div class="room-players">${room.started ? '게임 중 ' : ''}${room.current_players}/${room.max_players}</div>
+            <button onclick="joinRoom('${room.id}')" ${isOpenRoom(room) ? '' : 'disabled'}>입장</button>
         `;
         roomList.appendChild(roomElement);
     });
+
+    const pages = Math.max(1, Math.ceil(lobbyTotal / ROOMS_PER_PAGE));
+    document.getElementById('lobby-page').textContent = `${lobbyPage + 1} / ${pages}`;
+}
+
+socket.on('lobby_page', (data) => {
+    lobbyRooms = data.rooms;
+    lobbyTotal = data.total;
+    lobbyPage = data.page;
+    renderRoomList();
+});
+
+socket.on('lobby_delta', (data) => {
+    // 보이는 방은 그 자리에서 고치고, 페이지 구성이 바뀌면 페이지를 다시 받음
+    let refetch = false;
+    data.ops.forEach(op => {
+        const roomId = op.op === 'remove' ? op.id : op.room.id;
+        const idx = lobbyRooms.findIndex(room => room.id === roomId);
+        const visible = op.op !== 'remove' && (!lobbyOpenOnly || isOpenRoom(op.room));
+        if (idx >= 0 && visible) {
+            lobbyRooms[idx] = op.room;
+        } else if (idx >= 0 || (visible && lobbyRooms.length < ROOMS_PER_PAGE)) {
+            refetch = true;
+        } else if (op.op === 'add' && visible) {
+            lobbyTotal += 1;  // 다른 페이지에 추가된 방
+        } else if (op.op === 'remove' && !lobbyOpenOnly) {
+            lobbyTotal = Math.max(0, lobbyTotal - 1);
+        }
+    });
+    if (refetch) {
+        requestLobbyPage();
+    } else {
+        renderRoomList();
+    }
+});
+
+// 재연결하면 로비 채널에 다시 들어가야 하므로 연결될 때마다 페이지 요청
+socket.on('connect', () => {
+    requestLobbyPage();
+    requestLeaderboard();
+});
+
+// 순위표: 상위 10명과 (닉네임이 있으면) 내 주변, 게임이 끝나면 leaderboard_delta가 옴
+const LEADERBOARD_TOP = 10;
+let leaderboardNames = new Set();
+
+function requestLeaderboard() {
+    socket.emit('get_leaderboard', { top: LEADERBOARD_TOP, name: nickname, radius: 2 });
+}
+
+function leaderboardRow(entry) {
+    const rate = entry.win_rate === null ? '-' : `${Math.round(entry.win_rate * 100)}%`;
+    const row = document.createElement('div');
+    row.className = 'leaderboard-item' + (entry.name === nickname ? ' me' : '');
+    row.textContent = `${entry.rank}. ${entry.name}  ${entry.score}점  (${entry.games}게임, 승률 ${rate})`;
+    return row;
+}
+
+socket.on('leaderboard', (data) => {
+    const board = document.getElementById('leaderboard');
+    board.innerHTML = '';
+    leaderboardNames = new Set();
+    const shown = new Set();
+    [...data.top, ...(data.around || [])].forEach(entry => {
+        if (shown.has(entry.rank)) {
+            return;
+        }
+        shown.add(entry.rank);
+        leaderboardNames.add(entry.name);
+        board.appendChild(leaderboardRow(entry));
+    });
+});
+
+socket.on('leaderboard_delta', (data) => {
+    // 보이는 순위에 들어오거나 보이는 플레이어가 바뀌었을 때만 다시 받음
+    const changed = data.players.some(entry =>
+        entry.rank <= LEADERBOARD_TOP || leaderboardNames.has(entry.name) || entry.name === nickname
+    );
+    if (changed) {
+        requestLeaderboard();
+    }
 });
 
 function generateRandomNickname() {
@@ -86,11 +198,6 @@ document.addEventListener('keydown', (e) => {
     }
 });
 
-// 페이지 로드 시 방 목록 요청
-document.addEventListener('DOMContentLoaded', () => {
-    socket.emit('request_room_list');
-});
-
 // 방 입장 성공 시 토큰 저장
 socket.on('player_joined', (data) => {
     sessionStorage.setItem('playerToken', data.token);
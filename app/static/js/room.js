@@ -54,6 +54,18 @@ function toggleReady() {
     });
 }
 
+// 빈 자리에 봇 추가 (방장만 가능)
+function addBot() {
+    socket.emit('add_bot', {
+        room_id: roomId,
+        token: token
+    });
+}
+
+socket.on('join_error', (data) => {
+    alert(data.message);
+});
+
 function getRoomId() {
     const pathParts = window.location.pathname.split('/');
     return pathParts[pathParts.length - 1];
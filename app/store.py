@@ -0,0 +1,237 @@
+"""
+방 저장소
+
+GameManager는 방이 바뀔 때마다 방 ID만 표시해 두고(write-behind), 백그라운드
+작업이 FLUSH_INTERVAL초마다 바뀐 방들을 한 트랜잭션으로 저장한다. 그래서
+소켓 이벤트 처리 중에는 디스크를 기다리지 않고, 서버가 죽어도 잃는 것은
+마지막 FLUSH_INTERVAL초 동안의 변경뿐이다.
+
+저장 단위는 GameRoom.to_record()가 만드는 (JSON으로 바꿀 수 있는 dict,
+게임 스냅샷 bytes)이다. 다른 백엔드는 RoomStore의 메서드를 구현하면 된다.
+"""
+
+import json
+import sqlite3
+import threading
+from typing import Dict, Iterable, List, Optional, Tuple
+
+FLUSH_INTERVAL = 1.0  # 바뀐 방을 저장하는 주기(초)
+
+# (방 정보 dict, 게임 스냅샷)
+RoomRecord = Tuple[Dict, Optional[bytes]]
+
+
+class RoomStore:
+    """방 저장소 인터페이스"""
+
+    def save(self, rooms: Dict[str, RoomRecord], deleted: Iterable[str]) -> None:
+        """rooms를 저장하고 deleted의 방을 지운다 (한 번에 반영)"""
+        raise NotImplementedError
+
+    def load(self, room_id: str) -> Optional[RoomRecord]:
+        raise NotImplementedError
+
+    def room_for_token(self, token: str) -> Optional[str]:
+        """토큰이 속한 방 ID"""
+        raise NotImplementedError
+
+    def list_rooms(self) -> List[Tuple[str, List[str], bool]]:
+        """저장된 모든 방의 (방 ID, 플레이어 이름 목록, 게임 시작 여부)"""
+        raise NotImplementedError
+
+    def close(self) -> None:
+        pass
+
+
+class SQLiteRoomStore(RoomStore):
+    """
+    SQLite 저장소 (기본 백엔드)
+    WAL + synchronous=NORMAL이라 커밋마다 fsync하지 않는다
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        # 백그라운드 저장 작업과 요청 처리가 같은 연결을 쓰므로 잠금으로 보호
+        self.lock = threading.Lock()
+        # 방 -> 마지막으로 쓴 방 정보 JSON (바뀌지 않았으면 방 행과 토큰을 다시 쓰지 않음)
+        self.written: Dict[str, str] = {}
+        self.db = sqlite3.connect(path, check_same_thread=False)
+        self.db.execute("PRAGMA journal_mode=WAL")
+        self.db.execute("PRAGMA synchronous=NORMAL")
+        self.db.executescript("""
+            CREATE TABLE IF NOT EXISTS rooms (
+                room_id TEXT PRIMARY KEY,
+                players TEXT NOT NULL,
+                data TEXT NOT NULL,
+                snapshot BLOB
+            );
+            CREATE TABLE IF NOT EXISTS actions (
+                room_id TEXT NOT NULL,
+                first INTEGER NOT NULL,
+                actions TEXT NOT NULL,
+                PRIMARY KEY (room_id, first)
+            ) WITHOUT ROWID;
+            CREATE TABLE IF NOT EXISTS tokens (
+                token TEXT PRIMARY KEY,
+                room_id TEXT NOT NULL
+            );
+            CREATE INDEX IF NOT EXISTS tokens_room ON tokens (room_id);
+            """)
+        self.db.commit()
+
+    def save(self, rooms: Dict[str, RoomRecord], deleted: Iterable[str]) -> None:
+        """
+        게임 로그는 record의 game.first 위치부터 덧붙이고, first가 0이면(새 게임)
+        이전 로그와 스냅샷을 지우고 새로 쓴다. 덧붙일 때 스냅샷이 None이면
+        저장된 스냅샷을 그대로 둔다. 한 번에 덧붙이는 명령들은 JSON 배열 한
+        행(chunk)으로 저장한다.
+        """
+        rows = []
+        tokens = []
+        deleted = [(room_id,) for room_id in deleted]
+        reset = list(deleted)  # 로그를 지울 방
+        actions = []
+        snapshots = []
+        for room_id, (data, snapshot) in rooms.items():
+            game = data["game"]
+            meta = dict(data)
+            first = 0
+            if game is not None:
+                first = game["first"]
+                meta["game"] = {"seed": game["seed"], "snapshot": game["snapshot"]}
+                if game["actions"]:
+                    actions.append((room_id, first, json.dumps(game["actions"])))
+            if first == 0:
+                reset.append((room_id,))
+            if first == 0 or snapshot is not None:
+                snapshots.append((snapshot, room_id))
+            meta = json.dumps(meta)
+            if self.written.get(room_id) != meta:
+                names = [name for name, _ in data["players"]]
+                rows.append((room_id, json.dumps(names), meta))
+                tokens.extend((token, room_id) for _, token in data["players"])
+        with self.lock, self.db:
+            self.db.executemany("DELETE FROM rooms WHERE room_id = ?", deleted)
+            self.db.executemany("DELETE FROM actions WHERE room_id = ?", reset)
+            # 퇴장한 플레이어의 토큰이 남지 않도록 저장하는 방의 토큰도 다시 쓴다
+            self.db.executemany(
+                "DELETE FROM tokens WHERE room_id = ?",
+                deleted + [(row[0],) for row in rows],
+            )
+            self.db.executemany(
+                "INSERT INTO rooms (room_id, players, data) VALUES (?, ?, ?) "
+                "ON CONFLICT (room_id) DO UPDATE SET "
+                "players = excluded.players, data = excluded.data",
+                rows,
+            )
+            self.db.executemany(
+                "UPDATE rooms SET snapshot = ? WHERE room_id = ?", snapshots
+            )
+            self.db.executemany("INSERT INTO actions VALUES (?, ?, ?)", actions)
+            self.db.executemany("INSERT OR REPLACE INTO tokens VALUES (?, ?)", tokens)
+        for (room_id,) in deleted:
+            self.written.pop(room_id, None)
+        for room_id, _, meta in rows:
+            self.written[room_id] = meta
+
+    def load(self, room_id: str) -> Optional[RoomRecord]:
+        with self.lock:
+            row = self.db.execute(
+                "SELECT data, snapshot FROM rooms WHERE room_id = ?", (room_id,)
+            ).fetchone()
+            if row is None:
+                return None
+            self.written[room_id] = row[0]
+            chunks = self.db.execute(
+                "SELECT actions FROM actions WHERE room_id = ? ORDER BY first",
+                (room_id,),
+            ).fetchall()
+        data = json.loads(row[0])
+        if data["game"] is not None:
+            data["game"]["first"] = 0
+            data["game"]["actions"] = [
+                action for (chunk,) in chunks for action in json.loads(chunk)
+            ]
+        return data, row[1]
+
+    def room_for_token(self, token: str) -> Optional[str]:
+        with self.lock:
+            row = self.db.execute(
+                "SELECT room_id FROM tokens WHERE token = ?", (token,)
+            ).fetchone()
+        return row[0] if row else None
+
+    def list_rooms(self) -> List[Tuple[str, List[str], bool]]:
+        with self.lock:
+            rows = self.db.execute(
+                "SELECT room_id, players, json_extract(data, '$.game') IS NOT NULL "
+                "FROM rooms"
+            ).fetchall()
+        return [
+            (room_id, json.loads(players), bool(started))
+            for room_id, players, started in rows
+        ]
+
+    def close(self) -> None:
+        with self.lock:
+            self.db.close()
+
+
+# (이름, 누적 점수, 게임, 승리, 주공 게임, 주공 승리, 프렌드 게임, 프렌드 승리,
+#  공약 대비 득점 합)
+ProfileRow = Tuple[str, int, int, int, int, int, int, int, int]
+
+
+class ProfileStore:
+    """플레이어 프로필 저장소 인터페이스 (app/leaderboard.py)"""
+
+    def save(self, rows: Iterable[ProfileRow]) -> None:
+        """rows를 이름별로 덮어쓴다 (한 번에 반영)"""
+        raise NotImplementedError
+
+    def load(self) -> List[ProfileRow]:
+        """저장된 모든 프로필"""
+        raise NotImplementedError
+
+    def close(self) -> None:
+        pass
+
+
+class SQLiteProfileStore(ProfileStore):
+    """방 저장소와 같은 SQLite 파일의 profiles 테이블"""
+
+    def __init__(self, path: str):
+        self.path = path
+        self.lock = threading.Lock()
+        self.db = sqlite3.connect(path, check_same_thread=False)
+        self.db.execute("PRAGMA journal_mode=WAL")
+        self.db.execute("PRAGMA synchronous=NORMAL")
+        self.db.execute("""
+            CREATE TABLE IF NOT EXISTS profiles (
+                name TEXT PRIMARY KEY,
+                score INTEGER NOT NULL,
+                games INTEGER NOT NULL,
+                wins INTEGER NOT NULL,
+                president_games INTEGER NOT NULL,
+                president_wins INTEGER NOT NULL,
+                friend_games INTEGER NOT NULL,
+                friend_wins INTEGER NOT NULL,
+                bid_margin INTEGER NOT NULL
+            ) WITHOUT ROWID
+            """)
+        self.db.commit()
+
+    def save(self, rows: Iterable[ProfileRow]) -> None:
+        with self.lock, self.db:
+            self.db.executemany(
+                "INSERT OR REPLACE INTO profiles VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                list(rows),
+            )
+
+    def load(self) -> List[ProfileRow]:
+        with self.lock:
+            return [tuple(row) for row in self.db.execute("SELECT * FROM profiles")]
+
+    def close(self) -> None:
+        with self.lock:
+            self.db.close()
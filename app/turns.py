@@ -0,0 +1,123 @@
+"""
+차례 제한 시간
+
+게임의 차례가 시작될 때마다(MightyGame.on_turn) 그 차례의 사람 플레이어에게
+페이즈별 제한 시간을 건다. 모든 방의 타이머는 계층 타이머 휠 하나에 있고,
+routes가 TURN_TICK마다 만료된 방을 꺼내 그 방의 실행자에서 기본 행동을
+적용한다. 봇의 차례에는 타이머를 걸지 않는다 (BotPool이 budget 안에 둔다).
+- bidding: 패스
+- discarding: 점수 카드가 아닌 가장 낮은 카드 3장을 버림
+- modify_bid: 공약을 그대로 둠
+- friend_selection: 노프렌드
+- playing: 낼 수 있는 가장 낮은 카드
+"""
+
+import time
+from collections import Counter
+from typing import Callable, Dict, Optional, Tuple
+
+from app.bot_pool import acting_player_idx
+from app.lifecycle import HierarchicalTimerWheel
+from app.model.mighty import MightyGame, Suit
+
+TURN_TIMEOUTS = {
+    "bidding": 30.0,
+    "discarding": 60.0,
+    "modify_bid": 30.0,
+    "friend_selection": 45.0,
+    "playing": 30.0,
+}
+TURN_TICK = 0.5  # 타이머 휠 한 칸의 길이(초), 만료 확인 주기
+
+
+def default_decision(game: MightyGame, seat: int) -> Tuple[str, tuple]:
+    """제한 시간이 지난 seat 대신 둘 (페이즈, 결정), 결정은 봇 결정과 같은 형식"""
+    phase = game.phase
+    giruda = game.giruda
+    if phase == "discarding":
+        cards = game.players[seat].cards + game.kitty
+        cards = sorted(
+            cards,
+            key=lambda card: (
+                card.is_joker(),
+                card.is_point_card(),
+                card.suit == giruda,
+                card.rank,
+            ),
+        )
+        return phase, (cards[:3],)
+    if phase == "friend_selection":
+        return phase, (None, None)
+    if phase == "playing":
+        card = min(
+            game.legal_moves(seat),
+            key=lambda card: (
+                card.is_joker(),
+                card.is_mighty(giruda),
+                card.suit == giruda,
+                card.rank,
+            ),
+        )
+        joker_suit = None
+        if card.is_joker() and not game.current_trick:
+            joker_suit = giruda or Suit.SPADE
+        return phase, (card, joker_suit, False)
+    # bidding: 패스, modify_bid: 그대로
+    return phase, (None, None)
+
+
+class TurnTimers:
+    """방별 지금 차례의 (게임, 페이즈, 좌석, 만료 시각)과 타이머 휠"""
+
+    def __init__(
+        self,
+        timeouts: Optional[Dict[str, float]] = None,
+        tick: float = TURN_TICK,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.timeouts = TURN_TIMEOUTS if timeouts is None else timeouts
+        self.clock = clock
+        self.wheel = HierarchicalTimerWheel(tick, now=clock())
+        self.turns: Dict[str, Tuple[MightyGame, str, int, float]] = {}
+        self.timeouts_applied: Counter = Counter()  # 페이즈별 시간 초과 수
+
+    def __len__(self) -> int:
+        return len(self.wheel)
+
+    def arm(self, room, now: Optional[float] = None) -> None:
+        """room의 지금 차례에 제한 시간을 건다 (사람 차례가 아니면 취소)"""
+        game = room.game
+        seat = acting_player_idx(game) if game is not None else None
+        timeout = self.timeouts.get(game.phase) if seat is not None else None
+        if timeout is None or room.is_bot(seat):
+            self.cancel(room.room_id)
+            return
+        deadline = (self.clock() if now is None else now) + timeout
+        self.turns[room.room_id] = (game, game.phase, seat, deadline)
+        self.wheel.schedule(room.room_id, deadline)
+
+    def cancel(self, room_id: str) -> None:
+        self.wheel.cancel(room_id)
+        self.turns.pop(room_id, None)
+
+    def due(self, now: Optional[float] = None):
+        """타이머가 만료된 방 ID (기본 행동을 둘지는 expired로 다시 확인)"""
+        return self.wheel.advance(self.clock() if now is None else now)
+
+    def expired(self, room, now: Optional[float] = None) -> Optional[int]:
+        """room의 차례가 아직 그대로이고 시간이 지났으면 그 좌석"""
+        turn = self.turns.get(room.room_id)
+        if turn is None:
+            return None
+        game, phase, seat, deadline = turn
+        now = self.clock() if now is None else now
+        if (
+            game is not room.game
+            or game.phase != phase
+            or acting_player_idx(game) != seat
+            or deadline > now
+        ):
+            return None
+        self.turns.pop(room.room_id, None)
+        self.timeouts_applied[phase] += 1
+        return seat
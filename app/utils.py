@@ -1,46 +1,26 @@
 from app.model.card import Suit, Card
+from app.model import power
 from typing import Optional
 
 RED = "\033[91m"
 RESET = "\033[0m"
 
 
+# 카드 ID별 출력 문자열 (하트와 다이아몬드는 빨간색으로 표시)
+_FORMATTED_CARDS = [
+    f"{RED}{card}{RESET}" if card.suit in (Suit.HEART, Suit.DIAMOND) else str(card)
+    for card in Card.all_cards()
+]
+
+
 def format_card(card):
     if isinstance(card, str) and card == "Joker":
         return "🃏"
-
-    # 하트와 다이아몬드는 빨간색으로 표시
-    if card.suit in [Suit.HEART, Suit.DIAMOND]:
-        return f"{RED}{card}{RESET}"
-    return str(card)
+    return _FORMATTED_CARDS[card.id]
 
 
 def sort_cards(cards, giruda: Optional[Suit] = None):
-    # 조커와 일반 카드 분리
-    jokers = [card for card in cards if card.suit == Suit.JOKER]
-    normal_cards = [card for card in cards if card.suit != Suit.JOKER]
-
-    def get_card_power(card: Card) -> tuple:
-        # 마이티 카드
-        if card.is_mighty(giruda):
-            return (0, 0, 0)  # 가장 높은 우선순위
-
-        # 조커
-        if card.suit == Suit.JOKER:
-            return (1, 0, 0)
-
-        # 기루다
-        if giruda and card.suit == giruda:
-            return (2, card.suit.value, -card.rank)
-
-        # 일반 카드 (스페이드 > 다이아 > 하트 > 클로버)
-        suit_order = {Suit.SPADE: 0, Suit.DIAMOND: 1, Suit.HEART: 2, Suit.CLOVER: 3}
-        return (3, suit_order[card.suit], -card.rank)
-
-    # 카드 정렬
-    sorted_cards = sorted(cards, key=get_card_power)
-
-    return sorted_cards
+    return power.sort_cards(cards, giruda)
 
 
 def print_cards(cards, giruda: Optional[Suit] = None):
@@ -77,33 +57,29 @@ def print_cards(cards, giruda: Optional[Suit] = None):
     return " / ".join(output)
 
 
-def print_game_status(game):
-    print("\n=== 현재 게�� 상태 ===")
-    print(f"페이즈: {game.phase}")
-    print(f"현재 플레이어: Player {game.current_player_idx}")
+def format_game_status(game) -> str:
+    """게임 상태와 모든 플레이어의 패 (디버그 로그용, 만드는 비용이 커서 표본만 남김)"""
+    lines = ["=== 현재 게임 상태 ===", f"페이즈: {game.phase}"]
+    lines.append(f"현재 플레이어: Player {game.current_player_idx}")
     if game.current_bid:
-        print(
-            f"현재 공약: {game.current_bid.score} ({game.current_bid.suit.value if game.current_bid.suit else 'None'})"
-        )
-    print(f"기루다: {game.giruda.value if game.giruda else 'None'}")
+        suit = game.current_bid.suit.value if game.current_bid.suit else "None"
+        lines.append(f"현재 공약: {game.current_bid.score} ({suit})")
+    lines.append(f"기루다: {game.giruda.value if game.giruda else 'None'}")
 
-    print("\n=== 플레이어 카드 ===")
+    lines.append("=== 플레이어 카드 ===")
     for i, player in enumerate(game.players):
+        name = f"Player {i}"
         if i == game.president_idx:
-            print(
-                f"\033[91mPlayer {i}\033[0m: {print_cards(player.cards, game.giruda)}"
-            )
+            name = f"\033[91m{name}\033[0m"
         elif i == game.friend_player_idx:
-            print(
-                f"\033[94mPlayer {i}\033[0m: {print_cards(player.cards, game.giruda)}"
-            )
-        else:
-            print(f"Player {i}: {print_cards(player.cards, game.giruda)}")
+            name = f"\033[94m{name}\033[0m"
+        lines.append(f"{name}: {print_cards(player.cards, game.giruda)}")
 
     if game.current_trick:
-        print("\n현재 트릭:", print_cards(game.current_trick, game.giruda))
+        lines.append(f"현재 트릭: {print_cards(game.current_trick, game.giruda)}")
 
     if game.friend_card:
-        print(f"프렌드 카드: {game.friend_card}")
+        lines.append(f"프렌드 카드: {game.friend_card}")
         if game.friend_player_idx is not None:
-            print(f"프렌드: Player {game.friend_player_idx}")
+            lines.append(f"프렌드: Player {game.friend_player_idx}")
+    return "\n".join(lines)
@@ -0,0 +1,151 @@
+"""
+방 명령 실행자 벤치마크
+
+    python -m benchmarks.actors --rooms 200 --producers 16 --io 0.001
+
+rooms개의 방에서 봇 다섯 명이 한 판씩 두는 명령을 producers개의 스레드가
+무작위 방에 보낸다. 명령은 routes의 핸들러처럼 지금 차례를 확인하고 한 수를
+둔 뒤 mark_dirty를 부르고, io초 동안 소켓에 쓰는 것처럼 기다린다. 스레드는
+명령의 결과를 받아야 다음 명령을 보낸다 (클라이언트의 요청/응답처럼).
+- unsafe: 각 스레드가 바로 실행 (변경 전 서버와 같음)
+- global lock: 잠금 하나로 모든 명령을 차례로 실행
+- actor: RoomExecutor의 레인 수별 (방마다 차례로, 다른 방은 동시에)
+초당 받아들여진 명령 수와 거절/예외 수, 그리고 로그를 다시 재생한 상태가
+실제 상태와 다르거나 끝나지 않은 게임 수를 비교한다. GIL 때문에 게임
+계산은 어느 방식이든 한 번에 하나씩이므로, actor의 처리량 이득은 잠금
+밖에서 기다리는 시간(io)에서 나온다.
+"""
+
+import argparse
+import queue
+import random
+import sys
+import threading
+import time
+from collections import Counter
+
+from app.actor import RoomExecutor
+from app.game_manager import GameManager
+from app.model.log import replay
+from app.sim import GreedyPolicy
+from benchmarks.persistence import step
+from benchmarks.replay import state_of
+
+
+def start_thread(fn, *args):
+    threading.Thread(target=fn, args=args, daemon=True).start()
+
+
+def run(rooms: int, producers: int, io: float, lanes, limit: float):
+    """
+    lanes가 None이면 unsafe, 0이면 global lock, 그 밖에는 actor
+    (초당 받아들여진 명령 수, 결과별 명령 수, 깨지거나 끝나지 않은 게임 수)
+    """
+    manager = GameManager()
+    policies = {}
+    for i in range(rooms):
+        room = manager.create_room(f"R{i:05d}", "Host", None)
+        for _ in range(4):
+            manager.add_bot(room.room_id)
+        room.dealer.seed = i
+        room.start_game()
+        policies[room.room_id] = GreedyPolicy(random.Random(i))
+    active = list(manager.rooms.values())
+    lock = threading.Lock()
+    executor = RoomExecutor(lanes or 0, start_thread, queue.Queue)
+    deadline = time.perf_counter() + limit
+
+    def command(room, reply=None):
+        game = room.game
+        try:
+            if game.phase == "game_over":
+                result = "rejected"
+            else:
+                version = game.version
+                step(game, policies[room.room_id])
+                manager.mark_dirty(room)
+                result = "accepted" if game.version != version else "rejected"
+        except Exception:
+            result = "error"
+        if io:
+            time.sleep(io)  # emit (소켓 쓰기)
+        if reply is not None:
+            reply.put(result)
+        return result
+
+    def producer(counts: Counter, seed: int):
+        rng = random.Random(seed)
+        reply = queue.Queue()
+        while active and time.perf_counter() < deadline:
+            try:
+                room = rng.choice(active)
+            except IndexError:
+                break
+            if lanes is None:
+                result = command(room)
+            elif lanes == 0:
+                with lock:
+                    result = command(room)
+            else:
+                executor.submit(room.room_id, command, room, reply)
+                result = reply.get()
+            counts[result] += 1
+            if room.game.phase == "game_over":
+                try:
+                    active.remove(room)
+                except ValueError:
+                    pass  # 다른 스레드가 먼저 뺌
+
+    counts = [Counter() for _ in range(producers)]
+    threads = [
+        threading.Thread(target=producer, args=(counts[i], i)) for i in range(producers)
+    ]
+    start = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    elapsed = time.perf_counter() - start
+    broken = 0
+    for room in manager.rooms.values():
+        try:
+            same = state_of(replay(room.game.log)) == state_of(room.game)
+        except Exception:
+            same = False
+        if not same or room.game.phase != "game_over":
+            broken += 1
+    total = sum(counts, Counter())
+    return total["accepted"] / elapsed, total, broken
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--rooms", type=int, default=200)
+    parser.add_argument("--producers", type=int, default=16)
+    parser.add_argument("--io", type=float, default=0.001)
+    parser.add_argument("--lanes", type=int, nargs="+", default=[1, 4, 16])
+    parser.add_argument("--limit", type=float, default=20.0)
+    parser.add_argument(
+        "--switch", type=float, default=1e-5, help="sys.setswitchinterval (경합 유도)"
+    )
+    args = parser.parse_args()
+
+    sys.setswitchinterval(args.switch)
+    modes = [("unsafe", None), ("global lock", 0)]
+    modes += [(f"actor x{lanes}", lanes) for lanes in args.lanes]
+    print(f"방 수: {args.rooms}, 스레드: {args.producers}, io: {args.io * 1000:g} ms")
+    print(
+        f"{'방식':<12} | {'명령/초':>9} | {'거절':>6} | {'예외':>6} | {'깨진 게임':>8}"
+    )
+    for name, lanes in modes:
+        rate, counts, broken = run(
+            args.rooms, args.producers, args.io, lanes, args.limit
+        )
+        print(
+            f"{name:<12} | {rate:>9,.0f} | {counts['rejected']:>6} | "
+            f"{counts['error']:>6} | {broken:>8}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,117 @@
+"""
+분석 기록 벤치마크
+
+    python -m benchmarks.analytics --games 2000000 --shard-rows 65536
+
+먼저 실제로 끝까지 둔 게임 sample판으로 게임이 끝날 때 드는 비용
+(game_row + GameRecorder.record, 방의 실행자에서 실행됨)을 잰다.
+그다음 그 행들을 되풀이해 games판을 형식별(npz, csv) 샤드로 쓰고, 집계를
+두 방식으로 잰다.
+- streaming: summarize (샤드를 하나씩 읽어 더하고 버림)
+- load all: 모든 샤드를 이어 붙인 뒤 한 번에 집계
+tracemalloc으로 잰 최대 메모리와, 두 방식의 결과가 같은지도 보인다.
+"""
+
+import argparse
+import random
+import tempfile
+import time
+import tracemalloc
+
+import numpy as np
+
+from app.analytics import (
+    COLUMNS,
+    FORMATS,
+    GameRecorder,
+    Summary,
+    read_shard,
+    shard_paths,
+    summarize,
+)
+from app.model.batch import SUITS
+from benchmarks.games import game_at_playing
+
+
+def finished_games(sample: int):
+    """무작위로 끝까지 둔 게임 (조커콜은 절반)"""
+    games = []
+    rng = random.Random(0)
+    for seed in range(sample):
+        game = game_at_playing(seed, no_friend=seed % 7 == 0)
+        while game.phase == "playing":
+            idx = game.current_player_idx
+            card = rng.choice(game.legal_moves(idx))
+            joker_suit = rng.choice(SUITS[:4]) if card.is_joker() else None
+            game.play_card(idx, card, joker_suit, rng.random() < 0.5)
+        games.append(game)
+    return games
+
+
+def traced(function):
+    """(결과, 걸린 시간, 최대 메모리 바이트)"""
+    tracemalloc.start()
+    start = time.perf_counter()
+    result = function()
+    elapsed = time.perf_counter() - start
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return result, elapsed, peak
+
+
+def load_all(paths):
+    shards = [read_shard(path, COLUMNS) for path in paths]
+    summary = Summary()
+    summary.add({name: np.concatenate([s[name] for s in shards]) for name in COLUMNS})
+    summary.shards = len(paths)
+    return summary
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--games", type=int, default=2000000)
+    parser.add_argument("--shard-rows", type=int, default=65536)
+    parser.add_argument("--sample", type=int, default=500, help="실제로 둘 게임 수")
+    parser.add_argument("--formats", default=",".join(FORMATS))
+    args = parser.parse_args()
+
+    games = finished_games(args.sample)
+    with tempfile.TemporaryDirectory() as directory:
+        recorder = GameRecorder(directory, prefix="hook")
+        start = time.perf_counter()
+        for game in games:
+            recorder.record(game)
+        elapsed = time.perf_counter() - start
+        print(f"게임 종료 훅: {elapsed / len(games) * 1e6:.1f}µs/게임")
+        rows = recorder.rows
+
+    print(f"게임: {args.games:,}, 샤드당 {args.shard_rows:,}행")
+    print(
+        f"{'형식':<4} | {'샤드':>5} | {'쓰기 games/sec':>14} | {'방식':<9} | "
+        f"{'집계 games/sec':>14} | {'최대 메모리':>10}"
+    )
+    for fmt in args.formats.split(","):
+        with tempfile.TemporaryDirectory() as directory:
+            recorder = GameRecorder(directory, fmt, shard_rows=args.shard_rows)
+            # 표본의 행을 되풀이해 버퍼를 채우고 샤드 쓰기만 잰다
+            recorder.rows = [rows[i % len(rows)] for i in range(args.games)]
+            start = time.perf_counter()
+            recorder.close()
+            written = time.perf_counter() - start
+            paths = shard_paths(directory)
+
+            reports = []
+            for name, function in (("streaming", summarize), ("load all", load_all)):
+                summary, elapsed, peak = traced(lambda: function(paths))
+                reports.append(summary.to_dict())
+                print(
+                    f"{fmt:<4} | {len(paths):>5} | {args.games / written:>14,.0f} | "
+                    f"{name:<9} | {args.games / elapsed:>14,.0f} | "
+                    f"{peak / 2**20:>8.1f}MB"
+                )
+            if reports[0] != reports[1]:
+                print(f"{fmt}: 집계 결과 불일치!")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,125 @@
+"""
+배치 엔진 차분 검사와 처리량 비교
+
+    python -m benchmarks.batch --games 500 --sizes 100,1000,10000
+
+먼저 시드 0..games-1의 게임(일곱 판에 한 판은 노프렌드)을 BatchGame과
+MightyGame에서 같은 수로 끝까지 둔다. 수마다 차례와 낼 수 있는 카드가
+같은지, 끝나면 먹은 점수, 최종 점수, 프렌드 공개가 같은지 확인하고 하나라도
+다르면 종료 코드 1로 끝난다. 수는 random_policy가 고르므로 조커 선과
+조커콜(절반)도 나온다.
+
+그다음 무작위로 끝까지 두는 플레이 페이즈를 MightyGame.play_card로 한 판씩
+돌릴 때와 BatchGame으로 size판을 한꺼번에 돌릴 때의 초당 게임 수를 비교한다
+(배치는 from_games로 배열을 만드는 시간을 따로 보임).
+"""
+
+import argparse
+import copy
+import random
+import sys
+import time
+
+import numpy as np
+
+from app.model.batch import SUITS, BatchGame, random_policy
+from app.model.card import Card
+from benchmarks.games import game_at_playing
+
+
+def starting_games(games: int):
+    return [game_at_playing(seed, no_friend=seed % 7 == 0) for seed in range(games)]
+
+
+def differential(starts, seed: int, joker_call_rate: float = 0.5) -> list:
+    """두 엔진이 어긋난 곳의 설명 목록 (같으면 빈 목록, test_batch.py도 씀)"""
+    games = copy.deepcopy(starts)
+    batch = BatchGame.from_games(games)
+    policy = random_policy(np.random.default_rng(seed), joker_call_rate)
+    errors = []
+    while not batch.finished:
+        legal = batch.legal_masks()
+        for k, game in enumerate(games):
+            turn = game.current_player_idx
+            if batch.turn[k] != turn:
+                errors.append(
+                    f"게임 {k} 수 {batch.step}: 차례 {batch.turn[k]} != {turn}"
+                )
+            elif int(legal[k]) != game.legal_move_mask(turn):
+                errors.append(f"게임 {k} 수 {batch.step}: 낼 수 있는 카드가 다름")
+        if errors:
+            return errors
+        cards, joker_suits, call_joker = policy(batch, legal)
+        for k, game in enumerate(games):
+            card = Card.from_id(int(cards[k]))
+            joker_suit = SUITS[joker_suits[k]] if card.is_joker() else None
+            if not game.play_card(
+                game.current_player_idx, card, joker_suit, bool(call_joker[k])
+            ):
+                errors.append(f"게임 {k} 수 {batch.step}: MightyGame이 {card}를 거절")
+        if errors:
+            return errors
+        batch.play(cards, joker_suits, call_joker)
+
+    for k, game in enumerate(games):
+        if game.phase != "game_over":
+            errors.append(f"게임 {k}: MightyGame이 끝나지 않음 ({game.phase})")
+        points = [player.points for player in game.players]
+        if batch.points[k].tolist() != points:
+            errors.append(f"게임 {k}: 점수 {batch.points[k].tolist()} != {points}")
+        scores = [player.total_score for player in game.players]
+        if batch.total_score[k].tolist() != scores:
+            errors.append(
+                f"게임 {k}: 최종 점수 {batch.total_score[k].tolist()} != {scores}"
+            )
+        revealed = game.friend_card is not None
+        if bool(batch.friend_revealed[k]) != revealed:
+            errors.append(f"게임 {k}: 프렌드 공개 {batch.friend_revealed[k]}")
+    return errors
+
+
+def object_rate(starts, seed: int) -> float:
+    """MightyGame으로 한 판씩 무작위로 끝까지 둘 때 초당 게임 수"""
+    games = copy.deepcopy(starts)
+    rng = random.Random(seed)
+    start = time.perf_counter()
+    for game in games:
+        while game.phase == "playing":
+            idx = game.current_player_idx
+            card = rng.choice(game.legal_moves(idx))
+            joker_suit = rng.choice(SUITS[:4]) if card.is_joker() else None
+            game.play_card(idx, card, joker_suit, rng.random() < 0.5)
+    elapsed = time.perf_counter() - start
+    return len(games) / elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--games", type=int, default=500)
+    parser.add_argument("--sizes", default="100,1000,10000", help="배치 크기 목록")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    starts = starting_games(args.games)
+    errors = differential(starts, args.seed)
+    if errors:
+        print("\n".join(errors[:20]))
+        print(f"차분 검사 실패: {len(errors)}건")
+        sys.exit(1)
+    print(f"차분 검사: {args.games}게임 일치")
+
+    print(f"MightyGame: {object_rate(starts, args.seed):>12,.0f} games/sec")
+    print(f"{'배치':>8} | {'from_games':>10} | {'games/sec':>12}")
+    for size in map(int, args.sizes.split(",")):
+        games = [starts[i % len(starts)] for i in range(size)]
+        start = time.perf_counter()
+        batch = BatchGame.from_games(games)
+        loaded = time.perf_counter() - start
+        start = time.perf_counter()
+        batch.run(random_policy(np.random.default_rng(args.seed)))
+        elapsed = time.perf_counter() - start
+        print(f"{size:>8,} | {loaded * 1000:>8.1f}ms | {size / elapsed:>12,.0f}")
+
+
+if __name__ == "__main__":
+    main()
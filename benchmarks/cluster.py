@@ -0,0 +1,144 @@
+"""
+방 주인 워커 분산 벤치마크
+
+    python -m benchmarks.cluster --workers 4 --rooms 200 --seconds 5
+
+local:// 브로커 하나에 워커 프로세스 K개(1..workers)를 붙이고, 방 rooms개를
+consistent hash 링으로 주인 워커에 나눈다. 부하 발생기는 방마다 명령을
+하나씩 보내고(턴제 게임처럼 응답을 받아야 다음 명령), 주인 워커는 봇
+정책으로 한 수를 둔 뒤 그 패치를 방 emit 메시지로 돌려준다. 명령과 응답은
+서버와 같은 형식으로 메시지 큐를 지난다.
+
+초당 처리한 명령 수와 워커별 방 수를 워커 수별로 보여준다. 명령 처리는
+워커마다 독립이므로 CPU 코어가 충분하면 처리량이 워커 수에 거의 비례하고,
+코어보다 워커가 많으면 더 늘지 않는다 (브로커와 부하 발생기도 코어를 쓴다).
+"""
+
+import argparse
+import multiprocessing
+import os
+import random
+import threading
+import time
+from collections import Counter
+
+from app.cluster import COMMAND, HashRing, LocalBroker, LocalManager
+from app.game_manager import GameManager
+from app.sim import GreedyPolicy
+from benchmarks.persistence import step
+
+CHANNEL = "benchmark"
+
+
+def worker_main(url: str, worker_id: str):
+    """주인 워커: 자기 방으로 온 명령을 처리하고 패치를 방에 emit"""
+    queue = LocalManager(url, channel=CHANNEL, write_only=True)
+    manager = GameManager()
+    policy = GreedyPolicy(random.Random(worker_id))
+    for message in queue._listen():
+        method = message.get("method")
+        if method == "ping":
+            queue._publish({"method": "pong", "worker": worker_id})
+        elif method == COMMAND and message["worker"] == worker_id:
+            room_id = message["data"]
+            room = manager.get_room(room_id)
+            if room is None:
+                room = manager.create_room(room_id, "Host", None)
+                for _ in range(4):
+                    manager.add_bot(room_id)
+            if room.game is None or room.game.phase == "game_over":
+                room.start_game()
+            version = room.game.version
+            step(room.game, policy)
+            queue._publish(
+                {
+                    "method": "emit",
+                    "event": "state_patch",
+                    "data": [{"patches": room.game.get_patches(version, None)}],
+                    "room": room_id,
+                }
+            )
+
+
+def run(url: str, workers: int, rooms: int, seconds: float):
+    """워커 workers개로 seconds초 동안 처리한 (초당 명령 수, 워커별 방 수)"""
+    worker_ids = [f"w{i}" for i in range(workers)]
+    context = multiprocessing.get_context("spawn")
+    processes = [
+        context.Process(target=worker_main, args=(url, worker_id), daemon=True)
+        for worker_id in worker_ids
+    ]
+    for process in processes:
+        process.start()
+
+    queue = LocalManager(url, channel=CHANNEL, write_only=True)
+    messages = queue._listen()
+    ring = HashRing(worker_ids)
+    room_ids = [f"R{i:05d}" for i in range(rooms)]
+    owners = {room_id: ring.owner(room_id) for room_id in room_ids}
+    try:
+        # 모든 워커가 구독할 때까지 ping을 반복한다
+        ready = set()
+
+        def ping():
+            while len(ready) < workers:
+                queue._publish({"method": "ping"})
+                time.sleep(0.1)
+
+        threading.Thread(target=ping, daemon=True).start()
+        while len(ready) < workers:
+            message = next(messages)
+            if message.get("method") == "pong":
+                ready.add(message["worker"])
+
+        def send(room_id):
+            queue._publish(
+                {
+                    "method": COMMAND,
+                    "worker": owners[room_id],
+                    "event": "step",
+                    "data": room_id,
+                    "sid": None,
+                }
+            )
+
+        for room_id in room_ids:
+            send(room_id)
+        done = 0
+        start = time.perf_counter()
+        end = start + seconds
+        while time.perf_counter() < end:
+            message = next(messages)
+            if message.get("method") == "emit":
+                done += 1
+                send(message["room"])
+        elapsed = time.perf_counter() - start
+    finally:
+        messages.close()
+        for process in processes:
+            process.terminate()
+            process.join()
+    return done / elapsed, Counter(owners.values())
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--workers", type=int, default=4)
+    parser.add_argument("--rooms", type=int, default=200)
+    parser.add_argument("--seconds", type=float, default=5.0)
+    args = parser.parse_args()
+
+    broker = LocalBroker().start()
+    print(f"CPU 코어: {os.cpu_count()}, 방 수: {args.rooms}")
+    base = None
+    for workers in range(1, args.workers + 1):
+        rate, owned = run(broker.url, workers, args.rooms, args.seconds)
+        base = base or rate
+        print(
+            f"워커 {workers}: {rate:,.0f} commands/sec ({rate / base:.2f}x), "
+            f"워커별 방 수 {sorted(owned.values())}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,383 @@
+"""
+엔진 마이크로 벤치마크와 기준선 비교
+
+    python -m benchmarks.engine
+    python -m benchmarks.engine --save benchmarks/baselines/engine.json
+    python -m benchmarks.engine --compare benchmarks/baselines/engine.json
+
+시드 0..games-1의 게임으로 app.model에서 명령마다 불리는 경로를 케이스별로
+잰다. 입력은 시드로 정해지므로 같은 코드는 매번 같은 일을 하고, 케이스마다
+결과의 체크섬을 남겨 동작이 바뀌었는지도 알 수 있다. 케이스마다 rounds번
+재서 한 번당 시간(µs)의 최솟값과 중앙값을 남긴다 (입력 준비는 재지 않음).
+기준선 비교는 다른 프로세스의 간섭이 가장 적은 최솟값으로 한다. CPU가 하나인
+가상 머신에서는 같은 코드도 실행마다 20% 안팎으로 흔들리므로 threshold를
+그보다 크게 두고, 비교는 기준선을 만든 기계에서만 한다.
+- deal: initialize_deck + deal_cards
+- bidding: 분배부터 주공이 정해질 때까지의 submit_bid
+- play_card: 플레이 페이즈 전체 (_resolve_trick, _update_total_score 포함)
+- trick_winner: 다섯 장이 나온 트릭의 _determine_trick_winner
+- total_score: 끝난 게임의 _update_total_score
+- game_state, bid_state: get_game_state, get_bid_state
+- game_sort: MightyGame.sort_cards, utils_sort: utils.sort_cards,
+  print_cards: utils.print_cards (모든 좌석의 패)
+
+--save는 결과와 기계 정보를 JSON 기준선으로 저장한다. --compare는 기준선보다
+threshold 넘게 느려진 케이스를 REGRESSION으로 표시하고 종료 코드 1로 끝난다
+(체크섬이 다르면 입력이나 결과가 바뀐 것이므로 CHANGED로 표시).
+"""
+
+import argparse
+import copy
+import gc
+import json
+import math
+import platform
+import random
+import statistics
+import sys
+import time
+import zlib
+from typing import Callable, Dict, List, Tuple
+
+from app import utils
+from app.model.deal import DealGenerator
+from app.model.mighty import MightyGame
+from benchmarks.games import NORMAL_SUITS, record_game
+
+
+class Case:
+    """
+    setup()이 만든 입력으로 run(입력)을 잰다
+    run은 결과 목록을 돌려주고, 체크섬은 재는 시간 밖에서 만든다.
+    reuse면 같은 입력으로 run을 다시 돌려도 하는 일이 같다 (상태를 바꾸지
+    않거나 바꿔도 비용이 같음). 아니면 run마다 setup()을 새로 부른다.
+    """
+
+    def __init__(
+        self, name: str, setup: Callable, run: Callable, ops: int, reuse: bool
+    ):
+        self.name = name
+        self.setup = setup
+        self.run = run
+        self.ops = ops
+        self.reuse = reuse
+
+
+def checksum(outputs) -> str:
+    text = json.dumps(outputs, default=str, ensure_ascii=False)
+    return f"{zlib.crc32(text.encode()):08x}"
+
+
+def dealt_game(seed: int) -> MightyGame:
+    game = MightyGame(DealGenerator(seed))
+    for i in range(5):
+        game.add_player(f"Player {i}")
+    game.initialize_deck()
+    game.deal_cards()
+    return game
+
+
+def bid_sequence(game: MightyGame, seed: int) -> List[tuple]:
+    """game을 비딩이 끝날 때까지 진행하고 (좌석, 점수, 무늬) 목록을 돌려준다"""
+    rng = random.Random(seed)
+    bids = []
+    while game.phase == "bidding":
+        idx = game.current_player_idx
+        score = game.current_bid.score + 1 if game.current_bid else 13
+        if score <= 20 and rng.random() < 0.4:
+            suit = rng.choice(NORMAL_SUITS)
+            if game.submit_bid(idx, score, suit):
+                bids.append((idx, score, suit))
+                continue
+        game.submit_bid(idx, None, None)
+        bids.append((idx, None, None))
+    return bids
+
+
+def build_cases(games: int) -> List[Case]:
+    seeds = range(games)
+    recorded = [record_game(seed) for seed in seeds]
+    dealt = [dealt_game(seed) for seed in seeds]
+    bids = [bid_sequence(copy.deepcopy(game), seed) for game, seed in zip(dealt, seeds)]
+
+    # 플레이 중 10수마다의 상태, 다섯 장이 나온 트릭, 끝난 게임
+    positions: List[MightyGame] = []
+    full_tricks: List[MightyGame] = []
+    finished: List[MightyGame] = []
+    for start, moves in recorded:
+        game = copy.deepcopy(start)
+        for i, (card, joker_suit, call_joker) in enumerate(moves):
+            if i % 10 == 0:
+                positions.append(copy.deepcopy(game))
+            if len(game.current_trick) == 4:
+                trick = copy.deepcopy(game)
+                trick.current_trick.append(card)
+                trick.current_player_idx = (trick.current_player_idx + 1) % 5
+                full_tricks.append(trick)
+            game.play_card(game.current_player_idx, card, joker_suit, call_joker)
+        finished.append(game)
+    # 비딩 중의 상태 (공약마다)
+    bidding: List[MightyGame] = []
+    for game, sequence in zip(dealt, bids):
+        game = copy.deepcopy(game)
+        for idx, score, suit in sequence:
+            bidding.append(copy.deepcopy(game))
+            game.submit_bid(idx, score, suit)
+    states = bidding + positions
+    hands = [(player.cards, game.giruda) for game in states for player in game.players]
+
+    def deal(inputs):
+        for game in inputs:
+            game.initialize_deck()
+            game.deal_cards()
+        return [[card.id for card in game.deck] for game in inputs]
+
+    def bidding_run(inputs):
+        for game, sequence in inputs:
+            for idx, score, suit in sequence:
+                game.submit_bid(idx, score, suit)
+        return [(game.president_idx, game.current_bid.score) for game, _ in inputs]
+
+    def play(inputs):
+        for game, moves in inputs:
+            for card, joker_suit, call_joker in moves:
+                game.play_card(game.current_player_idx, card, joker_suit, call_joker)
+        return [[p.total_score for p in game.players] for game, _ in inputs]
+
+    def total_score(inputs):
+        for game in inputs:
+            game._update_total_score()
+        return [[p.total_score for p in game.players] for game in inputs]
+
+    def fresh_dealt():
+        games = []
+        for seed in seeds:
+            game = MightyGame(DealGenerator(seed))
+            for i in range(5):
+                game.add_player(f"Player {i}")
+            games.append(game)
+        return games
+
+    return [
+        Case("deal", fresh_dealt, deal, games, reuse=True),
+        Case(
+            "bidding",
+            lambda: list(zip(copy.deepcopy(dealt), bids)),
+            bidding_run,
+            sum(len(sequence) for sequence in bids),
+            reuse=False,
+        ),
+        Case(
+            "play_card",
+            lambda: [(copy.deepcopy(start), moves) for start, moves in recorded],
+            play,
+            sum(len(moves) for _, moves in recorded),
+            reuse=False,
+        ),
+        Case(
+            "trick_winner",
+            lambda: full_tricks,
+            lambda inputs: [game._determine_trick_winner() for game in inputs],
+            len(full_tricks),
+            reuse=True,
+        ),
+        Case(
+            "total_score",
+            lambda: copy.deepcopy(finished),
+            total_score,
+            len(finished),
+            reuse=True,
+        ),
+        Case(
+            "game_state",
+            lambda: states,
+            lambda inputs: [game.get_game_state() for game in inputs],
+            len(states),
+            reuse=True,
+        ),
+        Case(
+            "bid_state",
+            lambda: states,
+            lambda inputs: [game.get_bid_state() for game in inputs],
+            len(states),
+            reuse=True,
+        ),
+        Case(
+            "game_sort",
+            lambda: [
+                (game, player.cards) for game in states for player in game.players
+            ],
+            lambda inputs: [game.sort_cards(cards) for game, cards in inputs],
+            len(hands),
+            reuse=True,
+        ),
+        Case(
+            "utils_sort",
+            lambda: hands,
+            lambda inputs: [
+                utils.sort_cards(cards, giruda) for cards, giruda in inputs
+            ],
+            len(hands),
+            reuse=True,
+        ),
+        Case(
+            "print_cards",
+            lambda: hands,
+            lambda inputs: [
+                utils.print_cards(cards, giruda) for cards, giruda in inputs
+            ],
+            len(hands),
+            reuse=True,
+        ),
+    ]
+
+
+def timed_runs(case: Case, number: int) -> Tuple[float, list]:
+    """run을 number번 돌린 시간(초)과 마지막 결과 (입력 준비는 재지 않음)"""
+    if case.reuse:
+        inputs = [case.setup()] * number
+    else:
+        inputs = [case.setup() for _ in range(number)]
+    gc.collect()
+    gc.disable()  # 입력 준비에서 생긴 쓰레기를 재는 중에 치우지 않도록
+    try:
+        start = time.perf_counter()
+        for batch in inputs:
+            outputs = case.run(batch)
+        elapsed = time.perf_counter() - start
+    finally:
+        gc.enable()
+    return elapsed, outputs
+
+
+def measure(cases: List[Case], rounds: int, min_time: float) -> Dict[str, Dict]:
+    """
+    케이스마다 rounds번 잰 한 번당 µs (중앙값, 최솟값)과 체크섬
+    한 번 재는 시간이 짧으면 스케줄러 잡음에 묻히므로 run을 min_time초
+    넘게 걸리도록 여러 번 돌려 잰다 (반복 수는 처음 돌린 시간으로 정함).
+    가상 머신은 몇 초 단위로 빨라졌다 느려지므로 한 케이스를 몰아서 재지
+    않고 라운드마다 모든 케이스를 한 번씩 돈다. 체크섬은 처음 돌린 결과로
+    만든다.
+    """
+    numbers, sums = {}, {}
+    for case in cases:
+        first, outputs = timed_runs(case, 1)
+        numbers[case.name] = max(1, math.ceil(min_time / max(first, 1e-6)))
+        sums[case.name] = checksum(outputs)
+    times: Dict[str, List[float]] = {case.name: [] for case in cases}
+    for _ in range(rounds):
+        for case in cases:
+            number = numbers[case.name]
+            elapsed, _ = timed_runs(case, number)
+            times[case.name].append(elapsed / (number * case.ops) * 1e6)
+    return {
+        case.name: {
+            "ops": case.ops,
+            "median_us": statistics.median(times[case.name]),
+            "min_us": min(times[case.name]),
+            "checksum": sums[case.name],
+        }
+        for case in cases
+    }
+
+
+def machine() -> Dict:
+    return {
+        "python": platform.python_version(),
+        "implementation": platform.python_implementation(),
+        "platform": platform.platform(),
+        "machine": platform.machine(),
+        "processor": platform.processor(),
+    }
+
+
+def compare(baseline: Dict, results: Dict, threshold: float) -> Tuple[List[str], int]:
+    """표의 줄과 느려진 케이스 수"""
+    lines = [f"{'케이스':<14} | {'기준 µs':>9} | {'지금 µs':>9} | {'변화':>7} | 판정"]
+    regressions = 0
+    for name, result in results.items():
+        base = baseline["cases"].get(name)
+        if base is None:
+            lines.append(
+                f"{name:<14} | {'-':>9} | {result['min_us']:>9.3f} | {'-':>7} | NEW"
+            )
+            continue
+        change = result["min_us"] / base["min_us"] - 1
+        if base["checksum"] != result["checksum"] or base["ops"] != result["ops"]:
+            status = "CHANGED"
+        elif change > threshold:
+            status = "REGRESSION"
+            regressions += 1
+        elif change < -threshold:
+            status = "faster"
+        else:
+            status = "ok"
+        lines.append(
+            f"{name:<14} | {base['min_us']:>9.3f} | {result['min_us']:>9.3f} | "
+            f"{change:>+7.1%} | {status}"
+        )
+    return lines, regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--games", type=int, default=100)
+    parser.add_argument("--rounds", type=int, default=7)
+    parser.add_argument(
+        "--min-time", type=float, default=0.1, help="한 번의 잼의 최소 시간(초)"
+    )
+    parser.add_argument("--cases", nargs="+", help="이 케이스만 (기본: 전부)")
+    parser.add_argument("--save", help="결과를 저장할 기준선 JSON")
+    parser.add_argument("--compare", help="비교할 기준선 JSON")
+    parser.add_argument(
+        "--threshold", type=float, default=0.3, help="느려졌다고 볼 비율 (0.3 = 30%%)"
+    )
+    args = parser.parse_args()
+
+    cases = build_cases(args.games)
+    if args.cases:
+        cases = [case for case in cases if case.name in args.cases]
+    results = measure(cases, args.rounds, args.min_time)
+    print(f"게임: {args.games}, 반복: {args.rounds}")
+    print(f"{'케이스':<14} | {'횟수':>7} | {'µs/회':>9} | {'최소':>9} | 체크섬")
+    for name, result in results.items():
+        print(
+            f"{name:<14} | {result['ops']:>7,} | {result['median_us']:>9.3f} | "
+            f"{result['min_us']:>9.3f} | {result['checksum']}"
+        )
+
+    if args.save:
+        with open(args.save, "w") as f:
+            json.dump(
+                {
+                    "machine": machine(),
+                    "games": args.games,
+                    "rounds": args.rounds,
+                    "cases": results,
+                },
+                f,
+                indent=2,
+                ensure_ascii=False,
+            )
+            f.write("\n")
+        print(f"기준선 저장: {args.save}")
+
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)
+        print()
+        if baseline["machine"] != machine():
+            print(
+                "주의: 기준선과 다른 기계/파이썬입니다 (시간 비교가 맞지 않을 수 있음)"
+            )
+        if baseline["games"] != args.games:
+            print(f"주의: 기준선의 게임 수는 {baseline['games']}입니다")
+        lines, regressions = compare(baseline, results, args.threshold)
+        print("\n".join(lines))
+        if regressions:
+            print(f"{regressions}개 케이스가 {args.threshold:.0%} 넘게 느려졌습니다")
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,60 @@
+"""
+벤치마크용 게임 생성 도우미
+
+시드로 재현 가능한 랜덤 게임을 만들어 플레이 페이즈 직전 상태와
+그 이후에 실제로 받아들여진 카드 순서를 돌려준다.
+"""
+
+import copy
+import random
+from typing import List, Tuple
+
+from app.model.deal import DealGenerator
+from app.model.mighty import MightyGame, Suit
+
+NORMAL_SUITS = [Suit.SPADE, Suit.DIAMOND, Suit.HEART, Suit.CLOVER]
+
+# (카드, 조커 무늬, 조커콜 여부)
+Move = Tuple[object, object, bool]
+
+
+def game_at_playing(seed: int, no_friend: bool = False) -> MightyGame:
+    """랜덤 비딩/버리기/프렌드 선택을 거쳐 playing 페이즈의 게임을 만든다"""
+    rng = random.Random(seed)
+    game = MightyGame(DealGenerator(seed))
+    for i in range(5):
+        game.add_player(f"Player {i}")
+    game.initialize_deck()
+    game.deal_cards()
+    while game.phase == "bidding":
+        idx = game.current_player_idx
+        score = game.current_bid.score + 1 if game.current_bid else 13
+        if score <= 20 and rng.random() < 0.4:
+            if game.submit_bid(idx, score, rng.choice(NORMAL_SUITS)):
+                continue
+        game.submit_bid(idx, None, None)
+    president = game.players[game.president_idx]
+    game.discard_cards(game.president_idx, rng.sample(president.cards + game.kitty, 3))
+    game.modify_final_bid(game.president_idx, None, None)
+    card = rng.choice(game.legal_friend_cards(game.president_idx))
+    if no_friend:
+        game.select_friend(game.president_idx)
+    else:
+        game.select_friend(game.president_idx, card.suit, card.rank)
+    return game
+
+
+def record_game(seed: int) -> Tuple[MightyGame, List[Move]]:
+    """playing 페이즈 시작 상태와, 끝까지 랜덤으로 둔 합법 수 목록"""
+    rng = random.Random(seed)
+    start = game_at_playing(seed)
+    game = copy.deepcopy(start)
+    moves: List[Move] = []
+    while game.phase == "playing":
+        idx = game.current_player_idx
+        card = rng.choice(game.legal_moves(idx))
+        joker_suit = rng.choice(NORMAL_SUITS) if card.is_joker() else None
+        call_joker = rng.random() < 0.5
+        game.play_card(idx, card, joker_suit, call_joker)
+        moves.append((card, joker_suit, call_joker))
+    return start, moves
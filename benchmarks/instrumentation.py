@@ -0,0 +1,107 @@
+"""
+지표와 로그 비용 벤치마크
+
+    python -m benchmarks.instrumentation --games 200 --repeat 20000
+
+플레이 페이즈의 게임 games개에서 명령 하나마다 서버가 하던 출력과 지금 하는
+계측을 각각 repeat번 돌려 한 번당 시간을 비교한다.
+- print dump: 변경 전 submit_friend가 하던 모든 패 출력 (버리는 stdout으로)
+- sampled dump: sampled(logger)로 감싼 같은 로그 (수준이 꺼져 있으면 만들지 않음)
+- debug off/on: % 인자를 넘긴 logger.debug (꺼짐 / 켜짐 + 버리는 핸들러)
+- observe: EVENT_LATENCY.observe + 카운터 inc (명령마다 하는 지표 갱신)
+- render: /metrics 응답 한 번 (이벤트 10종의 히스토그램)
+"""
+
+import argparse
+import contextlib
+import io
+import logging
+import time
+
+from app import metrics
+from app.logs import SAMPLED, sampled
+from app.utils import format_game_status
+from benchmarks.games import game_at_playing
+
+logger = logging.getLogger("app.benchmark")
+
+EVENTS = [
+    "submit_card",
+    "submit_bid",
+    "submit_friend",
+    "discard_cards_and_update_bid",
+    "join_game_room",
+    "init_game",
+    "sync_state",
+    "ack_state",
+    "ready",
+    "add_bot",
+]
+
+
+def per_call(fn, repeat: int) -> float:
+    """fn 한 번당 µs"""
+    start = time.perf_counter()
+    for _ in range(repeat):
+        fn()
+    return (time.perf_counter() - start) / repeat * 1e6
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--games", type=int, default=200)
+    parser.add_argument("--repeat", type=int, default=20000)
+    args = parser.parse_args()
+
+    games = [game_at_playing(seed) for seed in range(args.games)]
+    sink = io.StringIO()
+    handler = logging.StreamHandler(sink)
+    logger.addHandler(handler)
+    logger.propagate = False
+    i = 0
+
+    def game():
+        nonlocal i
+        i += 1
+        return games[i % len(games)]
+
+    def print_dump():
+        with contextlib.redirect_stdout(sink):
+            print(format_game_status(game()))
+
+    def sampled_dump():
+        g = game()
+        if sampled(logger):
+            logger.debug("게임 상태\n%s", format_game_status(g), extra=SAMPLED)
+
+    def debug():
+        g = game()
+        logger.debug("[Submit Card] %s: %s", g.current_player_idx, g.current_trick)
+
+    histogram = metrics.Histogram("benchmark_latency_seconds", "벤치마크", ["event"])
+    counter = metrics.Counter("benchmark_commands", "벤치마크")
+    metrics.REGISTRY.remove(histogram)
+    metrics.REGISTRY.remove(counter)
+
+    def observe():
+        histogram.observe((i % 97) / 1e4, EVENTS[i % len(EVENTS)])
+        counter.inc()
+
+    for n in range(args.repeat):
+        histogram.observe((n % 97) / 1e4, EVENTS[n % len(EVENTS)])
+
+    print(f"게임: {args.games}, 반복: {args.repeat:,}")
+    print(f"{'방식':<22} | {'µs/회':>9}")
+    rows = [("print dump", print_dump, logging.INFO)]
+    rows += [("sampled dump (INFO)", sampled_dump, logging.INFO)]
+    rows += [("debug off (INFO)", debug, logging.INFO)]
+    rows += [("debug on (DEBUG)", debug, logging.DEBUG)]
+    rows += [("observe + inc", observe, logging.INFO)]
+    for name, fn, level in rows:
+        logger.setLevel(level)
+        print(f"{name:<22} | {per_call(fn, args.repeat):>9.2f}")
+    print(f"{'render':<22} | {per_call(histogram.render, 200):>9.2f}")
+
+
+if __name__ == "__main__":
+    main()
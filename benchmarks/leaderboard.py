@@ -0,0 +1,94 @@
+"""
+순위표 벤치마크
+
+    python -m benchmarks.leaderboard --players 100000 --games 200
+
+플레이어 players명의 프로필이 있는 순위표에서 games판이 끝날 때마다 다섯 명의
+점수를 고치고, 판마다 한 번 로비가 읽는 것(상위 10명 + 한 명의 순위와 위아래
+5명)을 두 방식으로 잰다.
+- sort on read: 점수 dict를 고치고 읽을 때마다 전체를 정렬
+- skip list: Leaderboard.record (뺐다 다시 넣기) + top/around
+두 방식이 돌려준 순위가 같은지도 확인한다.
+"""
+
+import argparse
+import random
+import time
+
+from app.leaderboard import Leaderboard
+from app.model.card import Suit
+from app.model.mighty import Bid
+from app.model.player import Player
+
+
+class FinishedGame:
+    """Leaderboard.record가 읽는 끝난 게임의 필드만 가진 가짜 게임"""
+
+    phase = "game_over"
+
+    def __init__(self, names, rng: random.Random):
+        self.players = []
+        for name in names:
+            player = Player(name)
+            player.points = rng.randrange(0, 8)
+            player.total_score = rng.randrange(-20, 21)
+            self.players.append(player)
+        self.president_idx = 0
+        self.friend_player_idx = 1 if rng.random() < 0.9 else None
+        self.current_bid = Bid(0, rng.randrange(13, 21), Suit.SPADE)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--players", type=int, default=100000)
+    parser.add_argument("--games", type=int, default=200)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    names = [f"player{i}" for i in range(args.players)]
+    rows = [(name, rng.randrange(-500, 500), 10, 5, 2, 1, 2, 1, 0) for name in names]
+    games = [FinishedGame(rng.sample(names, 5), rng) for _ in range(args.games)]
+    readers = [rng.choice(names) for _ in range(args.games)]
+
+    start = time.perf_counter()
+    board = Leaderboard()
+    board.apply(rows)
+    loaded = time.perf_counter() - start
+
+    scores = {row[0]: row[1] for row in rows}
+    start = time.perf_counter()
+    sorted_reads = []
+    for game, reader in zip(games, readers):
+        for player in game.players:
+            scores[player.name] += player.total_score
+        order = sorted(scores, key=lambda name: (-scores[name], name))
+        rank = order.index(reader)
+        sorted_reads.append((order[:10], order[max(0, rank - 5) : rank + 6]))
+    sort_elapsed = time.perf_counter() - start
+
+    start = time.perf_counter()
+    index_reads = []
+    for game, reader in zip(games, readers):
+        board.record(game)
+        top = [entry["name"] for entry in board.top(10)]
+        around = [entry["name"] for entry in board.around(reader, 5)]
+        index_reads.append((top, around))
+    index_elapsed = time.perf_counter() - start
+
+    print(f"플레이어: {args.players:,}, 게임: {args.games:,}")
+    print(f"skip list 만들기: {loaded * 1000:.0f}ms")
+    print(f"{'방식':<14} | {'게임당 µs':>12} | {'games/sec':>10}")
+    for name, elapsed in (
+        ("sort on read", sort_elapsed),
+        ("skip list", index_elapsed),
+    ):
+        print(
+            f"{name:<14} | {elapsed / args.games * 1e6:>12,.1f} | "
+            f"{args.games / elapsed:>10,.0f}"
+        )
+    print("순위 일치" if sorted_reads == index_reads else "순위 불일치!")
+
+
+if __name__ == "__main__":
+    main()
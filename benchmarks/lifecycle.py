@@ -0,0 +1,97 @@
+"""
+방 정리(reaper) 벤치마크
+
+    python -m benchmarks.lifecycle --seconds 1800 --rate 2
+
+시뮬레이션 시계로 seconds초 동안 매초 rate개의 방이 새로 생기는 서버를
+돌린다. 방마다 봇 네 명과 한 판을 두고(1초에 한 수), 일부 방은 끝까지
+두지 않는다.
+- 70%: 게임을 끝까지 둔다
+- 15%: 사람이 모이지 않아 게임을 시작하지 않는다
+- 15%: 게임 도중 호스트의 연결이 끊긴다
+정리하지 않을 때와 GameManager.reap()을 매초 부를 때의 방 수와 메모리
+(tracemalloc)를 비교한다. 정리하면 방 수와 메모리가 일정한 수준에서
+더 늘지 않아야 한다.
+"""
+
+import argparse
+import random
+import tracemalloc
+
+from app.bot_pool import acting_player_idx
+from app.game_manager import GameManager
+from app.lifecycle import RoomReaper
+from app.sim import GreedyPolicy
+from benchmarks.persistence import step
+
+
+def run(seconds: int, rate: int, reap: bool, samples: int):
+    """(시각, 방 수, 메모리 MB) 표본과 이유별 정리 수"""
+    clock = [0.0]
+    manager = GameManager(reaper=RoomReaper(clock=lambda: clock[0]))
+    policy = GreedyPolicy(random.Random(0))
+    rng = random.Random(1)
+    playing = {}  # 방 ID -> 호스트 연결이 끊기는 수 (None이면 끝까지)
+    rows = []
+    serial = 0
+    tracemalloc.start()
+    for second in range(1, seconds + 1):
+        clock[0] = float(second)
+        for _ in range(rate):
+            serial += 1
+            room_id = f"R{serial:07d}"
+            room = manager.create_room(room_id, "Host", f"sid-{serial}")
+            kind = rng.random()
+            if kind < 0.15:
+                continue  # 아무도 오지 않는 방
+            for _ in range(4):
+                manager.add_bot(room_id)
+            room.start_game()
+            manager.mark_dirty(room)
+            playing[room_id] = rng.randrange(60) if kind < 0.3 else None
+        for room_id, leave_at in list(playing.items()):
+            room = manager.rooms.get(room_id)
+            if room is None:
+                del playing[room_id]
+                continue
+            if leave_at == 0:
+                manager.disconnect(room.players[0].sid)
+                del playing[room_id]
+                continue
+            if acting_player_idx(room.game) is not None:
+                step(room.game, policy)
+                manager.mark_dirty(room)
+            if room.game.phase == "game_over":
+                del playing[room_id]
+            elif leave_at is not None:
+                playing[room_id] = leave_at - 1
+        if reap:
+            manager.reap()
+        manager.lobby.flush()  # 서버에서는 LOBBY_INTERVAL마다 보낸다
+        if second % max(1, seconds // samples) == 0:
+            memory = tracemalloc.get_traced_memory()[0] / 1e6
+            rows.append((second, len(manager.rooms), memory))
+    tracemalloc.stop()
+    return rows, manager.reaper.evictions
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--seconds", type=int, default=1800)
+    parser.add_argument("--rate", type=int, default=2)
+    parser.add_argument("--samples", type=int, default=6)
+    args = parser.parse_args()
+
+    off, _ = run(args.seconds, args.rate, False, args.samples)
+    on, evictions = run(args.seconds, args.rate, True, args.samples)
+    print(f"{'시각(초)':>8} | {'정리 안 함':>18} | {'reap()':>18}")
+    for (second, rooms_off, memory_off), (_, rooms_on, memory_on) in zip(off, on):
+        print(
+            f"{second:>8} | {rooms_off:>6}방 {memory_off:>7.1f} MB | "
+            f"{rooms_on:>6}방 {memory_on:>7.1f} MB"
+        )
+    print(f"정리한 방: {dict(evictions)}")
+
+
+if __name__ == "__main__":
+    main()
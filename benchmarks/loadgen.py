@@ -0,0 +1,448 @@
+"""
+Socket.IO 부하 생성기 (실제 서버에 여러 판을 동시에)
+
+    python -m benchmarks.loadgen --rooms 1 4 16 32 --duration 30
+    python -m benchmarks.loadgen --url http://127.0.0.1:5000 --rooms 8
+
+--url이 없으면 run.py처럼 서버를 띄운다 (메모리 저장소, WARNING 로그). 방마다
+클라이언트 다섯 개가 브라우저와 같은 이벤트로 한 판을 끝까지 두고, 끝나면
+새 방을 만들어 duration초 동안 계속 둔다.
+- 방장: create_room -> reconnect_room, 나머지: join_room, 모두 ready
+- game_start를 받으면 join_game_room, 이후 state_patch의 turn 패치로 자기
+  차례를 알고 submit_bid, discard_cards_and_update_bid, submit_friend를 보냄
+- playing에서는 legal_moves를 받으면 submit_card (선이 아니면 조커부터 냄,
+  서버의 submit_card는 조커 무늬를 받지 않으므로 조커로 선을 잡지 않도록)
+- 패치를 받을 때마다 ack_state (game.js와 같음)
+rooms 단계마다 이벤트별 왕복 시간(보낸 때부터 그 명령의 결과 이벤트를 받을
+때까지) p50/p99, 분당 끝난 게임 수, 멈춘 게임 수(stall초 동안 진행 없음),
+서버 CPU 사용률과 RSS(/metrics)를 출력한다.
+
+클라이언트는 python-socketio의 Client를 쓴다 (pip install
+"python-socketio[client]", requests와 websocket-client가 필요).
+"""
+
+import argparse
+import os
+import random
+import statistics
+import subprocess
+import sys
+import threading
+import time
+import urllib.request
+from collections import defaultdict
+from typing import Dict, List, Optional
+
+import socketio
+
+from app.model.card import JOKER_ID, Card
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+# run.py와 같지만 디버그 리로더 없이 (async 모드는 설치된 것을 따름, threading이면
+# Werkzeug 서버를 그대로 씀)
+SERVER = (
+    "import os; from app import app, socketio; "
+    "from app.routes import init_server; init_server(); "
+    "socketio.run(app, port=int(os.environ['PORT']), allow_unsafe_werkzeug=True)"
+)
+
+# 결과 이벤트 -> (명령 이벤트, 보낸 플레이어 이름이 든 필드)
+RESPONSES = {
+    "room_created": ("create_room", None),
+    "player_joined": ("join_room", "username"),
+    "player_ready": ("ready", "username"),
+    "init_game": ("join_game_room", None),
+    "bid_passed": ("submit_bid", "player_name"),
+    "bid_updated": ("submit_bid", "player_name"),
+    "end_discard_and_update_bid": ("discard_cards_and_update_bid", None),
+    "end_friend_selection": ("submit_friend", "president_name"),
+    "card_submitted": ("submit_card", "player_name"),
+}
+EVENTS = [
+    "create_room",
+    "join_room",
+    "ready",
+    "join_game_room",
+    "submit_bid",
+    "discard_cards_and_update_bid",
+    "submit_friend",
+    "submit_card",
+]
+BID_SUITS = ["spade", "diamond", "heart", "clover"]
+JOKER = Card.all_cards()[JOKER_ID].to_dict()
+
+
+class Recorder:
+    """여러 클라이언트 스레드가 남기는 왕복 시간과 결과 수"""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.rtts: Dict[str, List[float]] = defaultdict(list)
+        self.counts: Dict[str, int] = defaultdict(int)
+
+    def rtt(self, event: str, seconds: float) -> None:
+        with self.lock:
+            self.rtts[event].append(seconds)
+
+    def count(self, name: str) -> None:
+        with self.lock:
+            self.counts[name] += 1
+
+
+class Player:
+    """합성 클라이언트 하나 (소켓 하나로 로비, 방, 게임 화면을 모두 처리)"""
+
+    def __init__(self, url, name, recorder, rng, transports):
+        self.url = url
+        self.name = name
+        self.recorder = recorder
+        self.rng = rng
+        self.transports = transports
+        self.sio = socketio.Client(reconnection=False)
+        self.sio.on("*", self.receive)
+        self.joined = threading.Event()
+        self.reset()
+
+    def connect(self) -> None:
+        self.sio.connect(self.url, transports=self.transports)
+
+    def disconnect(self) -> None:
+        self.sio.disconnect()
+
+    def reset(self, room_id: Optional[str] = None) -> None:
+        """새 방의 게임을 시작하기 전의 상태"""
+        self.room_id = room_id
+        self.token: Optional[str] = None
+        self.seat: Optional[int] = None
+        self.version = 0
+        self.turn = None  # (phase, seat, version)
+        self.acted = None  # 마지막으로 둔 turn
+        self.best_bid = 0
+        self.trick = 0  # 지금 트릭에 나온 카드 수
+        self.hand: List[dict] = []
+        self.friends: List[dict] = []
+        self.pending: Dict[str, float] = {}
+        self.progress = time.monotonic()
+        self.joined.clear()
+        self.done = threading.Event()
+
+    def emit(self, event: str, data: dict) -> None:
+        if event in EVENTS:
+            self.pending[event] = time.perf_counter()
+        self.sio.emit(event, data)
+
+    def receive(self, event: str, data=None) -> None:
+        self.progress = time.monotonic()
+        response = RESPONSES.get(event)
+        if response is not None:
+            command, field = response
+            if field is None or (
+                isinstance(data, dict) and data.get(field) == self.name
+            ):
+                sent = self.pending.pop(command, None)
+                if sent is not None:
+                    self.recorder.rtt(command, time.perf_counter() - sent)
+        handler = getattr(self, f"on_{event}", None)
+        if handler is not None:
+            handler(data)
+
+    # 로비와 대기실
+    def on_room_created(self, data):
+        self.room_id, self.token = data["room_id"], data["token"]
+        # 방장의 소켓도 방 채널에 넣는다 (room.js의 reconnect_room)
+        self.emit("reconnect_room", {"room_id": self.room_id, "token": self.token})
+        self.joined.set()
+
+    def on_player_joined(self, data):
+        self.token = data["token"]
+        self.joined.set()
+
+    def on_join_error(self, data):
+        self.recorder.count("join_error")
+
+    def on_game_start(self, data):
+        if data:  # 프렌드 선택 뒤의 패 (game.js의 game_start)
+            self.hand = data["cards"]
+            return
+        self.emit("join_game_room", {"room_id": self.room_id, "token": self.token})
+
+    # 게임
+    def on_init_game(self, data):
+        self.seat = data.get("seat")
+        # 첫 공약 차례는 turn 패치 없이 is_first_player로만 알려 준다
+        if data.get("is_first_player") and data.get("phase") == "bidding":
+            self.turn = self.turn or ("bidding", self.seat, 0)
+        self.act()
+
+    def on_state_snapshot(self, data):
+        self.version = data["v"]
+        self.turn = (data["phase"], data["turn"], data["v"])
+        self.trick = len(data["trick"])
+        self.act()
+
+    def on_state_patch(self, data):
+        for patch in data["patches"]:
+            if patch["v"] <= self.version:
+                continue  # 다시 받은 패치
+            self.version = patch["v"]
+            op = patch["op"]
+            if op == "turn":
+                self.turn = (patch["phase"], patch["seat"], patch["v"])
+            elif op == "bid" and patch["score"]:
+                self.best_bid = max(self.best_bid, patch["score"])
+            elif op == "game_over":
+                self.done.set()
+        self.sio.emit("ack_state", {"room_id": self.room_id, "version": self.version})
+        self.act()
+
+    def on_discard_and_update_bid(self, data):
+        cards = [card for card in data["cards"] if card != JOKER]
+        discard = sorted(cards, key=lambda card: card["rank"])[:3]
+        self.hand = [card for card in data["cards"] if card not in discard]
+        self.emit(
+            "discard_cards_and_update_bid",
+            {
+                "room_id": self.room_id,
+                "token": self.token,
+                "cards": discard,
+                "updated_bid": {"score": None, "suit": data["current_bid_suit"]},
+            },
+        )
+
+    def on_error_message_friend_selection(self, data):
+        self.recorder.count("rejected")
+        self.submit_friend()
+
+    def on_error_message(self, data):
+        self.recorder.count("rejected")
+
+    # legal_moves보다 먼저 오는 이벤트로 지금 트릭의 카드 수를 센다 (패치는 뒤에 옴)
+    def on_card_submitted(self, data):
+        self.trick += 1
+
+    def on_clear_trick(self, data):
+        self.trick = 0
+
+    def on_legal_moves(self, data):
+        cards = data["cards"]
+        # 선이 아니면 조커를 먼저 내서 조커로 선을 잡는 일이 없게 한다
+        if JOKER in cards and (self.trick or len(cards) == 1):
+            card = JOKER
+        else:
+            card = next(card for card in cards if card != JOKER)
+        self.emit("submit_card", {"room_id": self.room_id, "token": self.token, **card})
+
+    def act(self) -> None:
+        """지금 차례가 내 차례이고 아직 두지 않았으면 둔다"""
+        if self.seat is None or self.turn is None or self.acted == self.turn:
+            return
+        phase, seat, _ = self.turn
+        if seat != self.seat:
+            return
+        self.acted = self.turn
+        if phase == "bidding":
+            score = suit = None
+            if self.best_bid < 20 and self.rng.random() < 0.3:
+                score, suit = max(13, self.best_bid + 1), self.rng.choice(BID_SUITS)
+            self.emit(
+                "submit_bid",
+                {
+                    "room_id": self.room_id,
+                    "token": self.token,
+                    "suit": suit,
+                    "score": score,
+                },
+            )
+        elif phase == "friend_selection":
+            self.friends = [
+                card.to_dict()
+                for card in Card.all_cards()
+                if card.to_dict() not in self.hand
+            ]
+            self.rng.shuffle(self.friends)
+            self.submit_friend()
+        # discarding은 discard_and_update_bid로, playing은 legal_moves로 둔다
+
+    def submit_friend(self) -> None:
+        if not self.friends:
+            return
+        card = self.friends.pop()
+        self.emit(
+            "submit_friend", {"room_id": self.room_id, "token": self.token, **card}
+        )
+
+
+class Table:
+    """한 방의 클라이언트 다섯 (방장이 매 판 새 방을 만든다)"""
+
+    def __init__(self, index, url, recorder, transports):
+        rng = random.Random(index)
+        self.recorder = recorder
+        self.players = [
+            Player(url, f"T{index}P{seat}", recorder, rng, transports)
+            for seat in range(5)
+        ]
+
+    def connect(self) -> None:
+        for player in self.players:
+            player.connect()
+
+    def play(self, stall: float) -> bool:
+        """한 판을 끝까지 둔다 (stall초 동안 아무도 진행하지 못하면 False)"""
+        host, guests = self.players[0], self.players[1:]
+        for player in self.players:
+            player.reset()
+        host.emit("create_room", {"username": host.name})
+        if not host.joined.wait(stall):
+            return False
+        for guest in guests:
+            guest.reset(host.room_id)
+            guest.emit("join_room", {"room_id": host.room_id, "username": guest.name})
+            if not guest.joined.wait(stall):
+                return False
+        for player in self.players:
+            player.emit("ready", {"room_id": host.room_id, "token": player.token})
+        while not all(player.done.is_set() for player in self.players):
+            progress = max(player.progress for player in self.players)
+            if time.monotonic() - progress > stall:
+                return False
+            time.sleep(0.05)
+        return True
+
+
+def disconnect_all(tables: List[Table], timeout: float = 10.0) -> None:
+    """모든 클라이언트의 연결을 동시에 끊는다 (서버가 바쁘면 하나씩은 오래 걸림)"""
+    threads = [
+        threading.Thread(target=player.disconnect, daemon=True)
+        for table in tables
+        for player in table.players
+    ]
+    for thread in threads:
+        thread.start()
+    deadline = time.monotonic() + timeout
+    for thread in threads:
+        thread.join(max(0.0, deadline - time.monotonic()))
+
+
+def read_metrics(url: str) -> Dict[str, float]:
+    """서버 /metrics의 (이름{라벨}) -> 값"""
+    with urllib.request.urlopen(url + "/metrics", timeout=10) as response:
+        text = response.read().decode()
+    values = {}
+    for line in text.splitlines():
+        if line and not line.startswith("#"):
+            name, value = line.rsplit(" ", 1)
+            values[name] = float(value)
+    return values
+
+
+def cpu_of(values: Dict[str, float]) -> float:
+    return values.get('mighty_cpu_seconds{mode="user"}', 0.0) + values.get(
+        'mighty_cpu_seconds{mode="system"}', 0.0
+    )
+
+
+def start_server(port: int) -> subprocess.Popen:
+    """서버를 띄우고 /metrics가 응답할 때까지 기다린다"""
+    env = dict(os.environ)
+    env.update(PORT=str(port), MIGHTY_ROOM_DB="", MIGHTY_LOG_LEVEL="WARNING")
+    server = subprocess.Popen(
+        [sys.executable, "-c", SERVER],
+        cwd=ROOT,
+        env=env,
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+        start_new_session=True,  # 서버가 띄운 봇 워커 프로세스까지 함께 종료
+    )
+    deadline = time.monotonic() + 30
+    while time.monotonic() < deadline:
+        try:
+            read_metrics(f"http://127.0.0.1:{port}")
+            return server
+        except OSError:
+            time.sleep(0.2)
+    stop_server(server)
+    raise RuntimeError("서버가 시작되지 않았습니다")
+
+
+def stop_server(server: subprocess.Popen) -> None:
+    os.killpg(server.pid, 15)
+    server.wait(10)
+
+
+def percentile(values: List[float], q: float) -> float:
+    values = sorted(values)
+    return values[min(len(values) - 1, int(q * len(values)))]
+
+
+def run_stage(url, rooms, duration, stall, transports, first_table):
+    """rooms개의 방을 duration초 동안 두고 결과를 출력한다"""
+    recorder = Recorder()
+    tables = [Table(first_table + i, url, recorder, transports) for i in range(rooms)]
+    for table in tables:
+        table.connect()
+    before = read_metrics(url)
+    start = time.perf_counter()
+    deadline = time.monotonic() + duration
+
+    def loop(table):
+        while time.monotonic() < deadline:
+            recorder.count("games" if table.play(stall) else "stalled")
+
+    threads = [threading.Thread(target=loop, args=(table,)) for table in tables]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    elapsed = time.perf_counter() - start
+    after = read_metrics(url)
+
+    counts = recorder.counts
+    cpu = (cpu_of(after) - cpu_of(before)) / elapsed * 100
+    rss = after.get('mighty_memory_bytes{kind="rss"}', 0.0) / 1e6
+    print(
+        f"방 {rooms}: 게임/분 {counts['games'] / elapsed * 60:,.1f}, "
+        f"멈춤 {counts['stalled']}, 거절 {counts['rejected']}, "
+        f"서버 CPU {cpu:.0f}%, RSS {rss:.1f} MB"
+    )
+    for event in EVENTS:
+        rtts = recorder.rtts.get(event)
+        if rtts:
+            print(
+                f"  {event:<30} {len(rtts):>7,}  "
+                f"p50 {percentile(rtts, 0.5) * 1000:>7.1f} ms  "
+                f"p99 {percentile(rtts, 0.99) * 1000:>7.1f} ms  "
+                f"평균 {statistics.fmean(rtts) * 1000:>7.1f} ms"
+            )
+    disconnect_all(tables)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--url", help="이미 떠 있는 서버 (없으면 새로 띄움)")
+    parser.add_argument("--port", type=int, default=5055)
+    parser.add_argument("--rooms", type=int, nargs="+", default=[1, 4, 16, 32])
+    parser.add_argument("--duration", type=float, default=30.0, help="단계별 초")
+    parser.add_argument("--stall", type=float, default=20.0)
+    parser.add_argument(
+        "--transport", choices=["websocket", "polling"], default="websocket"
+    )
+    args = parser.parse_args()
+
+    server = None
+    url = args.url
+    if url is None:
+        server = start_server(args.port)
+        url = f"http://127.0.0.1:{args.port}"
+    try:
+        tables = 0
+        for rooms in args.rooms:
+            run_stage(url, rooms, args.duration, args.stall, [args.transport], tables)
+            tables += rooms
+    finally:
+        if server is not None:
+            stop_server(server)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,102 @@
+"""
+로비 방 목록 피드 벤치마크
+
+    python -m benchmarks.lobby --rooms 2000 --clients 10000 --lobby 500
+
+방 rooms개가 있는 서버에서 changes번의 방 변경(입장, 봇 추가, 게임 시작,
+방 생성/삭제)이 seconds초 동안 고르게 일어난다고 보고, 한 번에 보내는
+JSON을 만드는 시간과 클라이언트로 나가는 바이트 수를 비교한다.
+- full list: 변경마다 전체 방 목록을 만들어 접속한 모든 클라이언트에 broadcast
+- lobby feed: LOBBY_INTERVAL마다 모은 변경분만 로비 클라이언트에게
+로비 클라이언트가 처음 받는 한 페이지 크기도 함께 보여준다.
+"""
+
+import argparse
+import json
+import random
+import time
+
+from app.game_manager import GameManager
+from app.lobby import LOBBY_INTERVAL, PER_PAGE
+
+
+def full_list(manager: GameManager):
+    """변경 전 방식: 모든 방의 요약을 새로 만든다"""
+    return [
+        {
+            "id": room_id,
+            "name": f"Room {room_id}",
+            "current_players": len(room.players),
+            "max_players": 5,
+            "players": [player.name for player in room.players],
+        }
+        for room_id, room in manager.rooms.items()
+    ]
+
+
+def change(manager: GameManager, rng: random.Random, serial: list):
+    """방 하나를 무작위로 바꾼다"""
+    room = manager.rooms[rng.choice(list(manager.rooms))]
+    if room.game is None and len(room.players) < 5:
+        manager.add_bot(room.room_id)
+        if len(room.players) == 5:
+            room.start_game()
+            manager.mark_dirty(room)
+    else:
+        # 끝난 방은 지우고 새 방을 만든다
+        manager.remove_room(room.room_id)
+        serial[0] += 1
+        manager.create_room(f"N{serial[0]:06d}", "Host", None)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--rooms", type=int, default=2000)
+    parser.add_argument("--clients", type=int, default=10000)
+    parser.add_argument("--lobby", type=int, default=500)
+    parser.add_argument("--changes", type=int, default=2000)
+    parser.add_argument("--seconds", type=float, default=10.0)
+    args = parser.parse_args()
+
+    rng = random.Random(0)
+    manager = GameManager()
+    for i in range(args.rooms):
+        manager.create_room(f"R{i:06d}", "Host", None)
+    manager.lobby.flush()
+    serial = [0]
+
+    windows = max(1, int(args.seconds / LOBBY_INTERVAL))
+    per_window = args.changes // windows
+    full_time = feed_time = 0.0
+    full_bytes = feed_bytes = 0
+    for _ in range(windows):
+        for _ in range(per_window):
+            change(manager, rng, serial)
+            t0 = time.perf_counter()
+            payload = json.dumps({"rooms": full_list(manager)})
+            full_time += time.perf_counter() - t0
+            full_bytes += len(payload) * args.clients
+        t0 = time.perf_counter()
+        ops = manager.lobby.flush()
+        payload = json.dumps({"ops": ops})
+        feed_time += time.perf_counter() - t0
+        feed_bytes += len(payload) * args.lobby
+
+    page = json.dumps(manager.lobby.page(0, PER_PAGE))
+    changes = per_window * windows
+    print(f"방 수: {args.rooms}, 변경: {changes}회 / {args.seconds:g}초")
+    print(
+        f"full list:  {full_time * 1000:,.0f} ms, "
+        f"{full_bytes / args.seconds / 1e6:,.1f} MB/s "
+        f"(클라이언트 {args.clients}명)"
+    )
+    print(
+        f"lobby feed: {feed_time * 1000:,.1f} ms, "
+        f"{feed_bytes / args.seconds / 1e6:,.3f} MB/s "
+        f"(로비 {args.lobby}명, 전송 {windows}회)"
+    )
+    print(f"첫 페이지: {len(page):,} bytes ({PER_PAGE}개)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,109 @@
+"""
+방 저장소 벤치마크
+
+    python -m benchmarks.persistence --rooms 100
+
+rooms개의 방에서 봇 다섯 명이 동시에 한 판씩 두는 동안 처리한 게임
+이벤트(명령) 수를 저장 방식별로 비교한다. 각 이벤트 뒤에는 routes의
+after_action처럼 mark_dirty를 부른다.
+- off: 저장하지 않음
+- write-behind: interval초마다 바뀐 방을 한 트랜잭션으로 저장 (서버와 같은 방식)
+- write-through: 이벤트마다 저장
+저장한 뒤에는 새 GameManager로 토큰과 방 ID를 찾아 방을 다시 불러오고
+게임 상태가 원래와 같은지 확인한다.
+"""
+
+import argparse
+import os
+import random
+import tempfile
+import time
+
+from app.bot_pool import acting_player_idx
+from app.game_manager import GameManager
+from app.sim import GreedyPolicy
+from app.store import FLUSH_INTERVAL, SQLiteRoomStore
+from benchmarks.replay import state_of
+
+
+def step(game, policy: GreedyPolicy):
+    """결정할 차례인 플레이어의 명령 하나를 적용한다"""
+    idx = acting_player_idx(game)
+    if game.phase == "bidding":
+        score, suit = (None, None)
+        if idx not in game.passed_players:
+            score, suit = policy.bid(game, idx)
+        if not game.submit_bid(idx, score, suit):
+            game.submit_bid(idx, None, None)
+    elif game.phase == "discarding":
+        game.discard_cards(idx, policy.discard(game, idx))
+    elif game.phase == "modify_bid":
+        game.modify_final_bid(idx, None, None)
+    elif game.phase == "friend_selection":
+        suit, rank = policy.friend(game, idx)
+        if not game.select_friend(idx, suit, rank):
+            game.select_friend(idx)
+    else:
+        for card, joker_suit, call_joker in policy.play(game, idx):
+            if game.play_card(idx, card, joker_suit, call_joker):
+                break
+
+
+def run(manager: GameManager, rooms: int, interval: float) -> float:
+    """모든 방의 게임이 끝날 때까지 두고 초당 이벤트 수를 돌려준다"""
+    policy = GreedyPolicy(random.Random(0))
+    active = []
+    for i in range(rooms):
+        room = manager.create_room(f"R{i:05d}", "Host", None)
+        for _ in range(4):
+            manager.add_bot(room.room_id)
+        room.dealer.seed = i
+        room.start_game()
+        active.append(room)
+
+    events = 0
+    start = time.perf_counter()
+    next_flush = start + interval
+    while active:
+        for room in list(active):
+            step(room.game, policy)
+            manager.mark_dirty(room)
+            events += 1
+            if room.game.phase == "game_over":
+                active.remove(room)
+            if time.perf_counter() >= next_flush:
+                manager.flush()
+                next_flush = time.perf_counter() + interval
+    manager.flush()
+    return events / (time.perf_counter() - start)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--rooms", type=int, default=100)
+    parser.add_argument("--interval", type=float, default=FLUSH_INTERVAL)
+    args = parser.parse_args()
+
+    print(f"방 수: {args.rooms}")
+    print(f"off:           {run(GameManager(), args.rooms, 0):,.0f} events/sec")
+    with tempfile.TemporaryDirectory() as tmp:
+        for name, interval in (("write-behind", args.interval), ("write-through", 0)):
+            path = os.path.join(tmp, f"{name}.db")
+            manager = GameManager(SQLiteRoomStore(path))
+            rate = run(manager, args.rooms, interval)
+            print(f"{name + ':':<15}{rate:,.0f} events/sec")
+
+            # 재시작: 토큰과 방 ID로 처음 찾을 때 저장소에서 불러온다
+            restored = GameManager(SQLiteRoomStore(path))
+            for room_id, room in manager.rooms.items():
+                token = room.get_player_token("Host")
+                session = restored.get_session(token)
+                assert session is not None and session.room.room_id == room_id
+                assert state_of(session.room.game) == state_of(room.game)
+            manager.store.close()
+            restored.store.close()
+    print("복원 확인: 모든 방의 게임 상태가 같습니다")
+
+
+if __name__ == "__main__":
+    main()
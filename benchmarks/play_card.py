@@ -0,0 +1,110 @@
+"""
+play_card 벤치마크
+
+    python -m benchmarks.play_card --games 300
+
+녹화한 랜덤 게임을 다시 재생하면서
+1) play_card 한 번의 평균 시간
+2) play_card 안의 규칙 검사(소지 여부, 조커콜, 무늬 따르기)를
+   리스트 순회 방식과 비트보드 방식으로 각각 돌린 시간
+을 비교한다.
+"""
+
+import argparse
+import copy
+import time
+
+from app.model.bitboard import FOLLOW_MASKS, JOKER_BIT
+from benchmarks.games import record_game
+
+
+def list_checks(pos, card):
+    """비트보드 이전의 리스트 순회 검사"""
+    hand, _, trick, joker_called, joker_suit, giruda = pos
+    if card not in hand:
+        return False
+    if trick and joker_called:
+        if any(c.is_joker() for c in hand) and not card.is_joker():
+            return False
+    if trick:
+        leading_suit = joker_suit if trick[0].is_joker() else trick[0].suit
+        if not (card.is_joker() or card.is_mighty(giruda)):
+            has_leading_suit = any(
+                c.suit == leading_suit
+                for c in hand
+                if not (c.is_joker() or c.is_mighty(giruda))
+            )
+            if has_leading_suit and card.suit != leading_suit:
+                return False
+    return True
+
+
+def mask_checks(pos, card):
+    """비트보드 검사"""
+    _, mask, trick, joker_called, joker_suit, giruda = pos
+    if not mask & card.bit:
+        return False
+    if trick and joker_called:
+        if mask & JOKER_BIT and not card.is_joker():
+            return False
+    if trick:
+        leading_suit = joker_suit if trick[0].is_joker() else trick[0].suit
+        if not (card.is_joker() or card.is_mighty(giruda)):
+            if mask & FOLLOW_MASKS[giruda][leading_suit] and card.suit != leading_suit:
+                return False
+    return True
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--games", type=int, default=300)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    recorded = [record_game(seed) for seed in range(args.games)]
+
+    # 검사 대상 국면: 각 수를 두기 직전의
+    # (손패, 손패 마스크, 현재 트릭, 조커콜 여부, 조커 무늬, 기루다)
+    positions = []
+    play_time = 0.0
+    play_calls = 0
+    for _ in range(args.repeat):
+        for start, moves in recorded:
+            game = copy.deepcopy(start)
+            for card, joker_suit, call_joker in moves:
+                idx = game.current_player_idx
+                player = game.players[idx]
+                positions.append(
+                    (
+                        list(player.cards),
+                        player.mask,
+                        list(game.current_trick),
+                        game.joker_called_in_this_trick,
+                        game.joker_suit,
+                        game.giruda,
+                    )
+                )
+                t0 = time.perf_counter()
+                game.play_card(idx, card, joker_suit, call_joker)
+                play_time += time.perf_counter() - t0
+                play_calls += 1
+
+    def run(check):
+        calls = 0
+        t0 = time.perf_counter()
+        for pos in positions:
+            for card in pos[0]:
+                check(pos, card)
+                calls += 1
+        return (time.perf_counter() - t0) / calls, calls
+
+    print(f"play_card: {play_time / play_calls * 1e6:.2f} us/call ({play_calls} calls)")
+    list_cost, calls = run(list_checks)
+    mask_cost, _ = run(mask_checks)
+    print(f"규칙 검사 (리스트):   {list_cost * 1e6:.3f} us/call ({calls} calls)")
+    print(f"규칙 검사 (비트보드): {mask_cost * 1e6:.3f} us/call")
+    print(f"속도 향상: {list_cost / mask_cost:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
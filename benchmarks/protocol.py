@@ -0,0 +1,116 @@
+"""
+소켓 프로토콜 크기 벤치마크
+
+    python -m benchmarks.protocol --games 200
+
+녹화한 게임을 다시 두면서 서버가 좌석마다 보내는 트래픽이 많은 이벤트
+(손패, 카드 제출, 트릭 종료, 낼 수 있는 카드, 상태 패치)를 JSON과
+app.protocol의 바이너리 프레임으로 각각 만들어 크기와 인코딩 시간을
+비교한다. 모든 프레임은 decode_frame으로 풀어서 JSON 본문과 같은지
+확인한다.
+"""
+
+import argparse
+import copy
+import json
+import time
+from collections import defaultdict
+
+from app import protocol
+from app.model.bitboard import cards_of
+from app.model.view import GameView
+from benchmarks.games import record_game
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--games", type=int, default=200)
+    args = parser.parse_args()
+
+    json_bytes = defaultdict(int)
+    binary_bytes = defaultdict(int)
+    json_time = binary_time = 0.0
+
+    def measure(event, data, encode, *encode_args):
+        nonlocal json_time, binary_time
+        t0 = time.perf_counter()
+        text = json.dumps(data)
+        t1 = time.perf_counter()
+        frame = encode(*encode_args)
+        t2 = time.perf_counter()
+        json_time += t1 - t0
+        binary_time += t2 - t1
+        json_bytes[event] += len(text)
+        binary_bytes[event] += len(frame)
+        assert protocol.decode_frame(frame, names) == (event, data), event
+
+    for seed in range(args.games):
+        start, moves = record_game(seed)
+        game = copy.deepcopy(start)
+        views = GameView(game)
+        names = [player.name for player in game.players]
+        sent = [game.version] * 5
+        for seat in range(5):
+            hand = views.hand(seat)
+            measure("game_start", {"cards": hand}, protocol.encode_game_start, hand)
+
+        for card, joker_suit, call_joker in moves:
+            seat = game.current_player_idx
+            game.play_card(seat, card, joker_suit, call_joker)
+            for _ in range(5):
+                measure(
+                    "card_submitted",
+                    {"player_name": names[seat], **card.to_dict()},
+                    protocol.encode_card_submitted,
+                    seat,
+                    card,
+                )
+            if not game.current_trick:
+                winner = game.current_player_idx
+                for _ in range(5):
+                    measure(
+                        "clear_trick",
+                        {"winner_name": names[winner]},
+                        protocol.encode_clear_trick,
+                        winner,
+                    )
+            if game.phase == "playing":
+                mask = game.legal_move_mask(game.current_player_idx)
+                measure(
+                    "legal_moves",
+                    {"cards": [c.to_dict() for c in cards_of(mask)]},
+                    protocol.encode_legal_moves,
+                    mask,
+                )
+            for viewer in range(5):
+                patches = game.get_patches(sent[viewer], viewer)
+                sent[viewer] = game.version
+                measure(
+                    "state_patch",
+                    {"patches": patches},
+                    protocol.encode_state_patch,
+                    patches,
+                )
+
+    print(f"게임 수: {args.games} (좌석 5개)")
+    print(f"{'이벤트':<16}{'JSON':>12}{'binary':>12}{'감소':>8}")
+    for event in protocol.EVENTS:
+        print(
+            f"{event:<16}{json_bytes[event] / args.games:>12,.0f}"
+            f"{binary_bytes[event] / args.games:>12,.0f}"
+            f"{json_bytes[event] / binary_bytes[event]:>7.1f}x"
+        )
+    total_json = sum(json_bytes.values())
+    total_binary = sum(binary_bytes.values())
+    print(
+        f"{'합계 (bytes/game)':<16}{total_json / args.games:>12,.0f}"
+        f"{total_binary / args.games:>12,.0f}{total_json / total_binary:>7.1f}x"
+    )
+    print(
+        f"인코딩 시간: JSON {json_time / args.games * 1e3:.2f} ms/game, "
+        f"binary {binary_time / args.games * 1e3:.2f} ms/game"
+    )
+
+
+if __name__ == "__main__":
+    main()
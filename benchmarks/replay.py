@@ -0,0 +1,85 @@
+"""
+명령 로그 재생 벤치마크
+
+    python -m benchmarks.replay --games 300
+
+GreedyPolicy로 ActionLog를 붙인 게임을 끝까지 둔 뒤, 로그만으로 게임을
+다시 만드는 두 방식의 속도를 비교한다.
+- replay: 처음부터 모든 명령을 다시 적용
+- recover: 마지막 스냅샷 + 그 이후 명령만 다시 적용
+두 방식 모두 원래 게임과 상태(version, 패치 포함)가 같은지 확인한다.
+"""
+
+import argparse
+import gc
+import random
+import time
+
+from app.model.deal import DealGenerator
+from app.model.log import ActionLog, recover, replay
+from app.model.mighty import MightyGame
+from app.sim import GreedyPolicy, play_game
+
+
+def record_log(seed: int) -> MightyGame:
+    """로그를 붙이고 GreedyPolicy로 한 판을 끝까지 둔 게임"""
+    rng = random.Random(seed)
+    game = MightyGame(DealGenerator(seed))
+    game.log = ActionLog(seed)
+    for i in range(5):
+        game.add_player(f"Player {i}")
+    game.initialize_deck()
+    game.deal_cards()
+    play_game(game, [GreedyPolicy(rng) for _ in range(5)])
+    return game
+
+
+def state_of(game: MightyGame) -> dict:
+    """비교용 게임 상태 (pickle 결과는 공유 참조에 따라 달라지므로 값으로 비교)"""
+    state = game.__getstate__()
+    state["players"] = [vars(player) for player in game.players]
+    state["current_bid"] = vars(game.current_bid) if game.current_bid else None
+    state["bid_history"] = [vars(bid) for bid in game.bid_history]
+    state["dealer"] = vars(game.dealer)
+    state["patches"] = list(game.patches)
+    return state
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--games", type=int, default=300)
+    args = parser.parse_args()
+
+    games = [record_log(seed) for seed in range(args.games)]
+    actions = sum(len(game.log) for game in games)
+
+    for game in games:
+        expected = state_of(game)
+        assert state_of(replay(game.log)) == expected, "replay 결과가 다릅니다"
+        assert state_of(recover(game.log)) == expected, "recover 결과가 다릅니다"
+
+    def rate(rebuild) -> float:
+        # 결과를 모아 두지 않아야 GC 비용이 섞이지 않는다
+        gc.collect()
+        start = time.perf_counter()
+        for game in games:
+            rebuild(game.log)
+        return args.games / (time.perf_counter() - start)
+
+    tail = sum(len(game.log) - game.log.snapshot[0] for game in games)
+    replay_rate = rate(replay)
+    recover_rate = rate(recover)
+
+    print(f"게임 수: {args.games} (명령 {actions / args.games:.1f}개/게임)")
+    print(
+        f"replay:  {replay_rate:,.0f} games/sec, "
+        f"{replay_rate * actions / args.games:,.0f} actions/sec"
+    )
+    print(
+        f"recover: {recover_rate:,.0f} games/sec "
+        f"(스냅샷 이후 명령 {tail / args.games:.1f}개/게임)"
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,70 @@
+"""
+완전 정보 솔버 벤치마크
+
+    python -m benchmarks.solver --games 10 --tricks 2,3,4,5,6
+    python -m benchmarks.solver --games 3 --tricks 10 -v
+
+녹화한 게임을 남은 트릭 수별로 잘라 만든 국면들을 DoubleDummySolver로
+풀고, 남은 트릭 수마다 평균/최대 시간, 탐색 노드 수, 초당 노드 수를
+출력한다. --tricks 10은 플레이 시작 직후의 전체 국면을 푼다. 남은 트릭이
+늘어날수록 시간이 빠르게 늘어나므로 기본값은 6트릭까지만 풀고, 전체
+국면은 국면마다 수 분이 걸리므로 -v로 국면별 결과를 바로 찍어 본다.
+"""
+
+import argparse
+import copy
+import time
+
+from app.model.solver import DoubleDummySolver, Position
+from benchmarks.games import record_game
+
+
+def collect_positions(games, tricks_left):
+    """각 게임에서 남은 트릭이 tricks_left개인 트릭 시작 국면"""
+    positions = []
+    for seed in range(games):
+        start, moves = record_game(seed)
+        game = copy.deepcopy(start)
+        for card, joker_suit, call_joker in moves[: len(moves) - 5 * tricks_left]:
+            game.play_card(game.current_player_idx, card, joker_suit, call_joker)
+        if game.phase == "playing":
+            positions.append(Position.from_game(game))
+    return positions
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--games", type=int, default=10)
+    parser.add_argument("--tricks", default="2,3,4,5,6", help="남은 트릭 수 목록")
+    parser.add_argument("-v", "--verbose", action="store_true", help="국면별 결과 출력")
+    args = parser.parse_args()
+
+    print(
+        f"{'트릭':>4} {'국면':>4} {'평균':>9} {'최대':>9} {'노드':>10} {'nodes/sec':>12}"
+    )
+    for tricks_left in map(int, args.tricks.split(",")):
+        positions = collect_positions(args.games, tricks_left)
+        times = []
+        nodes = 0
+        for position in positions:
+            solver = DoubleDummySolver(position)
+            t0 = time.perf_counter()
+            value = solver.solve()
+            times.append(time.perf_counter() - t0)
+            nodes += solver.nodes
+            if args.verbose:
+                print(
+                    f"     값 {value:>2} {times[-1] * 1000:>9.1f}ms "
+                    f"{solver.nodes:>10,}",
+                    flush=True,
+                )
+        elapsed = sum(times)
+        print(
+            f"{tricks_left:>4} {len(positions):>4} "
+            f"{elapsed / len(positions) * 1000:>7.1f}ms {max(times) * 1000:>7.1f}ms "
+            f"{nodes // len(positions):>10,} {nodes / elapsed:>12,.0f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
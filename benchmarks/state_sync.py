@@ -0,0 +1,63 @@
+"""
+상태 동기화 벤치마크
+
+    python -m benchmarks.state_sync --games 200
+
+녹화한 게임을 다시 두면서 변경이 있을 때마다 다섯 좌석에 보낼 내용을
+두 가지 방식으로 만들어 JSON 크기와 직렬화 시간을 비교한다.
+- 전체 상태: 좌석마다 get_game_state()
+- 패치: 좌석마다 마지막으로 보낸 version 이후의 get_patches()
+"""
+
+import argparse
+import copy
+import json
+import time
+
+from benchmarks.games import record_game
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--games", type=int, default=200)
+    args = parser.parse_args()
+
+    events = 0
+    full_bytes = patch_bytes = 0
+    full_time = patch_time = 0.0
+    for seed in range(args.games):
+        start, moves = record_game(seed)
+        game = copy.deepcopy(start)
+        sent = [game.version] * 5
+        for card, joker_suit, call_joker in moves:
+            game.play_card(game.current_player_idx, card, joker_suit, call_joker)
+            events += 1
+
+            t0 = time.perf_counter()
+            for seat in range(5):
+                full_bytes += len(json.dumps(game.get_game_state()))
+            t1 = time.perf_counter()
+            for seat in range(5):
+                patches = game.get_patches(sent[seat], seat)
+                patch_bytes += len(json.dumps({"patches": patches}))
+                sent[seat] = game.version
+            t2 = time.perf_counter()
+            full_time += t1 - t0
+            patch_time += t2 - t1
+
+    print(f"이벤트 수: {events} (좌석 5개)")
+    print(
+        f"전체 상태: {full_bytes / events:,.0f} bytes/event, "
+        f"{full_time / events * 1e6:,.1f} us/event"
+    )
+    print(
+        f"패치:      {patch_bytes / events:,.0f} bytes/event, "
+        f"{patch_time / events * 1e6:,.1f} us/event"
+    )
+    print(
+        f"크기 {full_bytes / patch_bytes:.1f}x, 시간 {full_time / patch_time:.1f}x 감소"
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,100 @@
+"""
+트릭 판정 벤치마크
+
+    python -m benchmarks.tricks --games 300
+
+녹화한 게임에서 완성된 트릭들을 모아 두고, 카드마다 조건을 다시 따지던
+이전 방식(legacy)과 파워 표를 찾는 현재 _determine_trick_winner로
+초당 판정 가능한 트릭 수를 비교한다.
+"""
+
+import argparse
+import copy
+import time
+
+from app.model.card import Card
+from app.model.mighty import MightyGame
+from benchmarks.games import record_game
+
+
+def legacy_card_power(game, card, leading_suit):
+    if game.joker_called_in_this_trick and card.is_joker():
+        return 0
+    if card.is_joker():
+        return 900
+    if card.is_mighty(game.giruda):
+        return 1000
+    if card.suit == game.giruda:
+        return 800 + card.rank
+    if card.suit == leading_suit:
+        return 700 + card.rank
+    return card.rank
+
+
+def legacy_trick_winner(game):
+    first_card = game.current_trick[0]
+    leading_suit = first_card.suit if isinstance(first_card, Card) else None
+    highest_power = -1
+    winner_idx = 0
+    for i, card in enumerate(game.current_trick):
+        power = legacy_card_power(game, card, leading_suit)
+        if power > highest_power:
+            highest_power = power
+            winner_idx = (game.current_player_idx - (5 - i)) % 5
+    return winner_idx
+
+
+def collect_tricks(games):
+    """(트릭 5장, 기루다, 조커콜 여부, 트릭 종료 시점의 current_player_idx)"""
+    tricks = []
+    for seed in range(games):
+        start, moves = record_game(seed)
+        game = copy.deepcopy(start)
+        for card, joker_suit, call_joker in moves:
+            idx = game.current_player_idx
+            if len(game.current_trick) == 4:
+                tricks.append(
+                    (
+                        game.current_trick + [card],
+                        game.giruda,
+                        game.joker_called_in_this_trick,
+                        (idx + 1) % 5,
+                    )
+                )
+            game.play_card(idx, card, joker_suit, call_joker)
+    return tricks
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--games", type=int, default=300)
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    tricks = collect_tricks(args.games)
+    game = MightyGame()
+
+    def run(resolve):
+        winners = []
+        t0 = time.perf_counter()
+        for _ in range(args.repeat):
+            for cards, giruda, joker_called, current_player_idx in tricks:
+                game.current_trick = cards
+                game.giruda = giruda
+                game.joker_called_in_this_trick = joker_called
+                game.current_player_idx = current_player_idx
+                winners.append(resolve(game))
+        return len(winners) / (time.perf_counter() - t0), winners
+
+    legacy_rate, legacy_winners = run(legacy_trick_winner)
+    table_rate, table_winners = run(MightyGame._determine_trick_winner)
+    assert legacy_winners == table_winners, "판정 결과가 다릅니다"
+
+    print(f"트릭 수: {len(tricks)} x {args.repeat}")
+    print(f"이전 방식: {legacy_rate:,.0f} tricks/sec")
+    print(f"파워 표:   {table_rate:,.0f} tricks/sec")
+    print(f"속도 향상: {table_rate / legacy_rate:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
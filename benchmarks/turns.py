@@ -0,0 +1,115 @@
+"""
+차례 타이머 벤치마크
+
+    python -m benchmarks.turns --timers 1000 10000 100000 --ops 300000
+
+방 timers개에 차례 타이머가 하나씩 걸려 있는 서버를 시뮬레이션 시계로
+돌린다. 명령 하나마다 무작위 방의 타이머를 다시 걸고(이전 타이머 취소 +
+새 만료 시각), TURN_TICK마다 만료된 타이머를 꺼낸다. 만료된 방은 바로 다시
+건다 (기본 행동 뒤의 다음 차례). 방식별로 명령당 시간과 타이머 메모리
+(tracemalloc)를 비교하고, 꺼낸 타이머가 모두 같은지 확인한다.
+- hierarchical: HierarchicalTimerWheel (차례 타이머가 쓰는 방식)
+- hashed: TimerWheel (방 정리가 쓰는 한 단 휠, 한 바퀴보다 먼 타이머는
+  칸마다 매번 다시 확인)
+- heap: heapq + 취소된 항목을 꺼낼 때 버림 (취소가 O(1)이지만 힙이 커짐)
+"""
+
+import argparse
+import heapq
+import random
+import time
+import tracemalloc
+
+from app.lifecycle import HierarchicalTimerWheel, TimerWheel
+from app.turns import TURN_TICK, TURN_TIMEOUTS
+
+
+class HeapTimers:
+    """비교용: 힙에 (만료 시각, 번호, 키)를 넣고 최신 번호만 유효"""
+
+    def __init__(self, tick: float = TURN_TICK, now=0.0):
+        self.heap = []
+        self.latest = {}
+        self.serial = 0
+
+    def __len__(self) -> int:
+        return len(self.latest)
+
+    def schedule(self, key, deadline: float) -> None:
+        self.serial += 1
+        self.latest[key] = self.serial
+        heapq.heappush(self.heap, (deadline, self.serial, key))
+
+    def cancel(self, key) -> None:
+        self.latest.pop(key, None)
+
+    def advance(self, now: float):
+        expired = []
+        while self.heap and self.heap[0][0] <= now:
+            _, serial, key = heapq.heappop(self.heap)
+            if self.latest.get(key) == serial:
+                del self.latest[key]
+                expired.append(key)
+        return expired
+
+
+WHEELS = {
+    "hierarchical": lambda: HierarchicalTimerWheel(TURN_TICK),
+    "hashed": lambda: TimerWheel(TURN_TICK),
+    "heap": lambda: HeapTimers(TURN_TICK),
+}
+
+
+def run(make, timers: int, ops: int, rate: float):
+    """(명령당 µs, 타이머 메모리 MB, 만료 순서 체크섬)"""
+    rng = random.Random(0)
+    timeouts = list(TURN_TIMEOUTS.values())
+    tracemalloc.start()
+    wheel = make()
+    now = 0.0
+    for key in range(timers):
+        wheel.schedule(key, rng.uniform(0, max(timeouts)))
+    memory = tracemalloc.get_traced_memory()[0] / 1e6
+    tracemalloc.stop()
+
+    per_tick = max(1, int(rate * TURN_TICK))  # tick 사이의 명령 수
+    checksum = expired_count = 0
+    start = time.perf_counter()
+    for i in range(ops):
+        key = rng.randrange(timers)
+        wheel.schedule(key, now + rng.choice(timeouts))
+        if i % per_tick == 0:
+            now += TURN_TICK
+            # 꺼내는 순서는 방식마다 다르므로 정렬해서 같은 순서로 다시 건다
+            for key in sorted(wheel.advance(now)):
+                checksum = (checksum * 31 + key) % (1 << 61)
+                expired_count += 1
+                wheel.schedule(key, now + rng.choice(timeouts))
+    elapsed = time.perf_counter() - start
+    return elapsed / ops * 1e6, memory, (checksum, expired_count)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--timers", type=int, nargs="+", default=[1000, 10000, 100000])
+    parser.add_argument("--ops", type=int, default=300000)
+    parser.add_argument("--rate", type=float, default=2000, help="초당 명령 수")
+    args = parser.parse_args()
+
+    print(f"명령: {args.ops:,}회, 초당 {args.rate:,.0f}회")
+    print(f"{'타이머':>8} | " + " | ".join(f"{name:>22}" for name in WHEELS))
+    for timers in args.timers:
+        cells = []
+        expected = None
+        for name, make in WHEELS.items():
+            per_op, memory, result = run(make, timers, args.ops, args.rate)
+            if expected is None:
+                expected = result
+            assert result == expected, f"{name}의 만료 결과가 다릅니다"
+            cells.append(f"{per_op:>6.2f} µs {memory:>8.1f} MB")
+        print(f"{timers:>8,} | " + " | ".join(f"{cell:>22}" for cell in cells))
+    print(f"만료 {expected[1]:,}회 (방식별 결과 같음)")
+
+
+if __name__ == "__main__":
+    main()
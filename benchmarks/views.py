@@ -0,0 +1,55 @@
+"""
+좌석별 화면 상태 캐시 벤치마크
+
+    python -m benchmarks.views --games 50 --requests 20
+
+녹화한 게임의 매 수마다 재접속 폭주처럼 다섯 좌석과 관전자가 상태를
+requests번씩 요청한다고 보고, 매번 get_snapshot으로 새로 만드는 방식과
+GameView 캐시를 비교한다. 두 방식의 결과가 같은지도 확인한다.
+"""
+
+import argparse
+import copy
+import time
+
+from app.model.view import GameView
+from benchmarks.games import record_game
+
+VIEWERS = (None, 0, 1, 2, 3, 4)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--games", type=int, default=50)
+    parser.add_argument("--requests", type=int, default=20)
+    args = parser.parse_args()
+
+    served = 0
+    direct_time = cached_time = 0.0
+    for seed in range(args.games):
+        start, moves = record_game(seed)
+        game = copy.deepcopy(start)
+        views = GameView(game)
+        for card, joker_suit, call_joker in moves:
+            game.play_card(game.current_player_idx, card, joker_suit, call_joker)
+
+            t0 = time.perf_counter()
+            for _ in range(args.requests):
+                direct = [game.get_snapshot(seat) for seat in VIEWERS]
+            t1 = time.perf_counter()
+            for _ in range(args.requests):
+                cached = [views.seat(seat) for seat in VIEWERS]
+            t2 = time.perf_counter()
+            assert direct == cached, "캐시된 상태가 다릅니다"
+            direct_time += t1 - t0
+            cached_time += t2 - t1
+            served += args.requests * len(VIEWERS)
+
+    print(f"요청 수: {served}")
+    print(f"get_snapshot: {served / direct_time:,.0f} views/sec")
+    print(f"GameView:     {served / cached_time:,.0f} views/sec")
+    print(f"속도 향상: {direct_time / cached_time:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
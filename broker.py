@@ -0,0 +1,5 @@
+from app.cluster import main
+
+if __name__ == "__main__":
+    # 여러 워커를 Redis 없이 띄워 볼 때 쓰는 local:// 메시지 큐 (app/cluster.py)
+    main()
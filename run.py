@@ -1,4 +1,10 @@
+import os
+
 from app import app, socketio
+from app.routes import init_server
 
 if __name__ == "__main__":
-    socketio.run(app, debug=True)
+    # 저장소, 분석 기록, 백그라운드 작업은 서버 프로세스에서만 시작한다
+    init_server()
+    # 여러 워커를 띄울 때는 워커마다 PORT를 다르게 준다 (app/cluster.py)
+    socketio.run(app, debug=True, port=int(os.environ.get("PORT", 5000)))
@@ -10,5 +10,9 @@ setup(
         "flask-socketio",
         "eventlet",
     ],
+    extras_require={
+        # 시뮬레이션, 배치 엔진, 분석 샤드(npz)용 (서버는 numpy 없이 돈다)
+        "sim": ["numpy"],
+    },
     python_requires=">=3.7",
 )
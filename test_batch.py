@@ -0,0 +1,65 @@
+"""
+BatchGame을 MightyGame과 비교한다 (numpy가 필요함)
+
+    python -m pytest test_batch.py
+
+benchmarks.batch.differential로 같은 시작 국면의 게임들을 두 엔진에서 같은
+수로 끝까지 두고, 수마다 차례와 낼 수 있는 카드, 끝나면 점수와 프렌드
+공개가 같은지 확인한다.
+"""
+
+import copy
+
+import pytest
+
+np = pytest.importorskip("numpy")
+
+from app.model.batch import BatchGame
+from app.model.card import Card, Suit
+from benchmarks.batch import differential, starting_games
+
+GAMES = 200
+
+
+@pytest.fixture(scope="module")
+def starts():
+    """시드 0..GAMES-1의 플레이 페이즈 시작 국면 (일곱 판에 한 판은 노프렌드)"""
+    return starting_games(GAMES)
+
+
+@pytest.mark.parametrize("seed", [0, 1, 2])
+def test_matches_mighty_game(starts, seed):
+    assert differential(starts, seed) == []
+
+
+@pytest.mark.parametrize("joker_call_rate", [0.0, 1.0])
+def test_matches_mighty_game_with_joker_calls(starts, joker_call_rate):
+    assert differential(starts, 3, joker_call_rate) == []
+
+
+def test_illegal_move_changes_nothing(starts):
+    batch = BatchGame.from_games(copy.deepcopy(starts[:2]))
+    hands = batch.hands.copy()
+    legal = batch.legal_masks()
+    # 첫 게임은 손에 없는 카드를 낸다
+    missing = next(c.id for c in Card.all_cards() if not int(legal[0]) & c.bit)
+    held = next(c.id for c in Card.all_cards() if int(legal[1]) & c.bit)
+    with pytest.raises(ValueError):
+        batch.play([missing, held], [0, 0], [False, False])
+    assert batch.step == 0
+    assert (batch.hands == hands).all()
+
+
+def test_joker_lead_needs_suit(starts):
+    games = [
+        game
+        for game in copy.deepcopy(starts)
+        if game.players[game.current_player_idx].mask & Card(Suit.JOKER, 0).bit
+    ][:1]
+    assert games, "조커로 시작하는 게임이 없음"
+    batch = BatchGame.from_games(games)
+    joker = Card(Suit.JOKER, 0).id
+    with pytest.raises(ValueError):
+        batch.play([joker], [-1], [False])
+    batch.play([joker], [2], [False])
+    assert batch.lead_suit[0] == 2
@@ -0,0 +1,95 @@
+"""
+local:// 메시지 큐(app/cluster.py)로 두 워커가 방 명령을 주고받는지 확인한다
+
+    python -m pytest test_cluster.py
+
+브로커 하나에 워커 두 개의 Socket.IO 서버를 붙이고 방 명령 전달(forward)과
+broadcast가 상대 워커의 on_command에 닿는지 본다. 서버마다 async 모드
+(threading, eventlet)로 돌리며, eventlet은 monkey_patch 없이 돌려 리스너가
+기다리는 동안에도 허브의 다른 작업이 멈추지 않는지도 본다.
+"""
+
+import time
+
+import pytest
+import socketio
+
+from app.cluster import Cluster, LocalBroker, make_manager
+
+MODES = ["threading", "eventlet"]
+WORKERS = {"a": "", "b": ""}
+
+
+def wait_for(server, predicate, timeout=5.0):
+    deadline = time.monotonic() + timeout
+    while not predicate():
+        assert time.monotonic() < deadline, "메시지 큐로 보낸 명령이 오지 않았습니다"
+        server.sleep(0.01)
+
+
+@pytest.fixture(scope="module")
+def broker():
+    return LocalBroker().start()
+
+
+@pytest.mark.parametrize("mode", MODES)
+def test_two_workers_through_local_broker(broker, mode):
+    if mode != "threading":
+        pytest.importorskip(mode)
+    received = {worker_id: [] for worker_id in WORKERS}
+    clusters, servers = {}, {}
+    for worker_id in WORKERS:
+        cluster = Cluster(worker_id, dict(WORKERS), broker.url)
+        cluster.on_command = received[worker_id].append
+        server = socketio.Server(
+            async_mode=mode, client_manager=make_manager(broker.url, cluster)
+        )
+        cluster.manager = server.manager
+        server.manager.initialize()
+        clusters[worker_id], servers[worker_id] = cluster, server
+    a, b = clusters["a"], clusters["b"]
+    server = servers["a"]
+
+    ticks = []
+
+    def tick():
+        while True:
+            ticks.append(None)
+            server.sleep(0.01)
+
+    server.start_background_task(tick)
+
+    # 구독이 끝나기 전에 보낸 메시지는 사라지므로 닿을 때까지 broadcast한다
+    def broadcast_reached():
+        a.broadcast("hello", len(received["b"]))
+        server.sleep(0.05)
+        return received["b"]
+
+    wait_for(server, broadcast_reached)
+    assert received["b"][0]["event"] == "hello"
+    # 자기가 보낸 broadcast는 받지 않는다
+    assert all(message["event"] != "hello" for message in received["a"])
+
+    room_of = {}
+    for i in range(100):
+        room_of.setdefault(a.owner(f"R{i}"), f"R{i}")
+    assert set(room_of) == set(WORKERS)
+    a.forward(room_of["b"], "submit_card", {"card": 1}, "sid-1")
+    b.forward(room_of["a"], "submit_bid", {"score": 13}, "sid-2")
+    wait_for(server, lambda: len(received["b"]) > 1 and received["a"])
+
+    to_b = [m for m in received["b"] if m["event"] == "submit_card"]
+    to_a = [m for m in received["a"] if m["event"] == "submit_bid"]
+    assert to_b == [
+        {
+            "method": "mighty_command",
+            "worker": "b",
+            "event": "submit_card",
+            "data": {"card": 1},
+            "sid": "sid-1",
+            "host_id": a.manager.host_id,
+        }
+    ]
+    assert [m["data"] for m in to_a] == [{"score": 13}]
+    # 리스너가 브로커를 기다리는 동안에도 다른 작업이 돌았다
+    assert len(ticks) > 3
@@ -0,0 +1,92 @@
+"""
+순위표의 SkipList와 Leaderboard를 확인한다
+
+    python -m pytest test_leaderboard.py
+
+SkipList는 무작위 insert/remove 순서마다 rank, slice, len을 sorted()로 만든
+기준 목록과 비교한다.
+"""
+
+import bisect
+import random
+
+import pytest
+
+from app.leaderboard import Leaderboard, SkipList
+from app.model.card import Suit
+from app.model.mighty import Bid, MightyGame
+
+
+@pytest.mark.parametrize("seed", range(10))
+def test_skip_list_matches_sorted(seed):
+    rng = random.Random(seed)
+    index = SkipList(seed)
+    expected = []  # 정렬된 기준 목록
+    for _ in range(1500):
+        key = (rng.randrange(-50, 50), f"p{rng.randrange(200)}")
+        at = bisect.bisect_left(expected, key)
+        present = at < len(expected) and expected[at] == key
+        if present and rng.random() < 0.5:
+            assert index.remove(key)
+            del expected[at]
+        elif not present:
+            index.insert(key)
+            expected.insert(at, key)
+        else:
+            assert not index.remove((key[0], key[1] + "x"))
+        assert len(index) == len(expected)
+        if rng.random() < 0.05:
+            assert [index.rank(k) for k in expected] == list(range(len(expected)))
+        start = rng.randrange(-5, len(expected) + 5)
+        stop = start + rng.randrange(0, 30)
+        assert index.slice(start, stop) == expected[max(0, start) : max(0, stop)]
+    assert index.slice(0, len(expected)) == expected
+
+
+def test_skip_list_rank_of_missing_key():
+    index = SkipList(0)
+    assert index.rank((0, "a")) is None
+    index.insert((0, "b"))
+    assert index.rank((0, "a")) is None
+    assert index.rank((0, "c")) is None
+    assert not index.remove((0, "a"))
+
+
+def finished_game(names, president=0, friend=1, team_points=(10, 4)):
+    """president와 friend가 team_points를 딴, 13 스페이드 공약으로 끝난 게임"""
+    game = MightyGame()
+    for name in names:
+        game.add_player(name)
+    game.phase = "game_over"
+    game.president_idx = president
+    game.friend_player_idx = friend
+    game.current_bid = Bid(president, 13, Suit.SPADE)
+    game.players[president].points, game.players[friend].points = team_points
+    won = sum(team_points) >= 13
+    for seat, player in enumerate(game.players):
+        on_team = seat in (president, friend)
+        player.total_score = (2 if seat == president else 1) * (
+            1 if on_team == won else -1
+        )
+    return game
+
+
+def test_record_ranks_and_skips_bots():
+    board = Leaderboard()
+    board.record(finished_game(["a", "b", "c", "d", "Bot 1"]), bots=["Bot 1"])
+    assert len(board) == 4
+    assert board.rank("Bot 1") is None
+    assert [entry["name"] for entry in board.top()] == ["a", "b", "c", "d"]
+    assert board.entry("a")["president_win_rate"] == 1.0
+    assert board.entry("a")["bid_margin"] == 1.0
+    assert [entry["name"] for entry in board.around("c", 1)] == ["b", "c", "d"]
+
+
+def test_profiles_are_keyed_by_display_name():
+    # 계정이 없으므로 다른 방에서도 같은 이름이면 같은 프로필에 더해진다
+    board = Leaderboard()
+    board.record(finished_game(["a", "b", "c", "d", "e"]))
+    board.record(finished_game(["e", "f", "g", "h", "a"], president=4, friend=0))
+    assert board.entry("a")["games"] == 2
+    assert board.entry("a")["score"] == 4
+    assert board.rank("a") == 1
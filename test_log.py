@@ -0,0 +1,74 @@
+"""
+명령 로그(app/model/log.py)의 replay와 recover를 확인한다
+
+    python -m pytest test_log.py
+
+GreedyPolicy로 끝까지 둔 게임의 로그를 처음부터 다시 적용한 게임과 마지막
+스냅샷에서 복구한 게임이 원래 게임과 같은 상태인지 비교한다.
+"""
+
+import pickle
+import random
+
+import pytest
+
+from app.model.card import Card
+from app.model.deal import DealGenerator
+from app.model.log import ActionLog, apply, recover, replay
+from app.model.mighty import MightyGame
+from app.sim import GreedyPolicy, play_game
+from benchmarks.replay import state_of
+
+
+def logged_game(seed: int, snapshot_every: int) -> MightyGame:
+    rng = random.Random(seed)
+    game = MightyGame(DealGenerator(seed))
+    game.log = ActionLog(seed, snapshot_every)
+    for i in range(5):
+        game.add_player(f"Player {i}")
+    game.initialize_deck()
+    game.deal_cards()
+    play_game(game, [GreedyPolicy(rng) for _ in range(5)])
+    return game
+
+
+@pytest.mark.parametrize("seed", range(10))
+def test_replay_matches_original(seed):
+    game = logged_game(seed, snapshot_every=32)
+    assert game.phase == "game_over"
+    assert state_of(replay(game.log)) == state_of(game)
+
+
+@pytest.mark.parametrize("snapshot_every", [1, 7, 1000])
+def test_recover_matches_original(snapshot_every):
+    game = logged_game(0, snapshot_every)
+    assert (game.log.snapshot is None) == (snapshot_every > len(game.log))
+    recovered = recover(game.log)
+    assert state_of(recovered) == state_of(game)
+    assert recovered.log is game.log
+
+
+def test_recovered_game_keeps_logging():
+    game = logged_game(1, snapshot_every=5)
+    recovered = recover(game.log)
+    recovered.reset_game()
+    recovered.initialize_deck()
+    recovered.deal_cards()
+    # 다음 판도 같은 로그에 이어서 기록되므로 처음부터 다시 둘 수 있다
+    assert state_of(replay(game.log)) == state_of(recovered)
+    assert recovered.deal_no == 1
+
+
+def test_snapshot_does_not_nest_the_log():
+    game = logged_game(2, snapshot_every=5)
+    position, data = game.log.snapshot
+    assert position % 5 == 0
+    assert pickle.loads(data).log is None
+
+
+def test_apply_rejects_bad_actions():
+    game = logged_game(3, snapshot_every=32)
+    with pytest.raises(ValueError):
+        apply(game, ("teleport",))
+    with pytest.raises(ValueError):
+        apply(game, ("play", 0, Card.all_cards()[0].id, None, False))
@@ -0,0 +1,82 @@
+"""
+바이너리 소켓 프로토콜(app/protocol.py)의 왕복을 확인한다
+
+    python -m pytest test_protocol.py
+
+encode_*로 만든 프레임을 decode_frame으로 풀면 JSON 프로토콜로 보냈을 본문과
+같아야 한다. 상태 패치는 실제로 끝까지 둔 게임의 좌석별 패치를 쓴다.
+"""
+
+import pytest
+
+from app import protocol
+from app.model.bitboard import cards_of, mask_of
+from app.model.card import Card
+from benchmarks.replay import record_log
+
+NAMES = [f"Player {i}" for i in range(5)]
+CARDS = Card.all_cards()
+
+
+@pytest.mark.parametrize("card", CARDS, ids=str)
+def test_card_submitted(card):
+    frame = protocol.encode_card_submitted(3, card)
+    assert len(frame) == 3
+    assert protocol.decode_frame(frame, NAMES) == (
+        "card_submitted",
+        {"player_name": "Player 3", **card.to_dict()},
+    )
+
+
+def test_clear_trick():
+    frame = protocol.encode_clear_trick(4)
+    assert protocol.decode_frame(frame, NAMES) == (
+        "clear_trick",
+        {"winner_name": "Player 4"},
+    )
+
+
+@pytest.mark.parametrize("mask", [0, mask_of(CARDS), mask_of(CARDS[::7])])
+def test_legal_moves(mask):
+    frame = protocol.encode_legal_moves(mask)
+    assert len(frame) == 9
+    assert protocol.decode_frame(frame, NAMES) == (
+        "legal_moves",
+        {"cards": [card.to_dict() for card in cards_of(mask)]},
+    )
+
+
+def test_game_start_keeps_hand_order():
+    hand = [card.to_dict() for card in reversed(CARDS[:13])]
+    frame = protocol.encode_game_start(hand)
+    assert protocol.decode_frame(frame, NAMES) == ("game_start", {"cards": hand})
+
+
+@pytest.mark.parametrize("seed", range(5))
+def test_state_patches_of_a_full_game(seed):
+    game = record_log(seed)
+    game.reset_game()
+    ops = set()
+    for viewer in (None, 0, 1, 2, 3, 4):
+        patches = game.get_patches(0, viewer)
+        frame = protocol.encode_state_patch(patches)
+        assert protocol.decode_frame(frame, NAMES) == (
+            "state_patch",
+            {"patches": patches},
+        )
+        ops.update(patch["op"] for patch in patches)
+    # GreedyPolicy는 공약을 고치지 않고, 프렌드가 드러나지 않는 판도 있다
+    assert set(protocol.PATCH_OPS) - ops <= {"final_bid", "friend_revealed"}
+
+
+def test_no_friend_and_passed_bid():
+    patches = [
+        {"op": "bid", "seat": 2, "score": None, "suit": None, "v": 1},
+        {"op": "friend", "card": None, "v": 2},
+        {"op": "final_bid", "score": 15, "suit": None, "v": 3},
+    ]
+    frame = protocol.encode_state_patch(patches)
+    assert protocol.decode_frame(frame, NAMES) == (
+        "state_patch",
+        {"patches": patches},
+    )
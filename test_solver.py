@@ -0,0 +1,94 @@
+"""
+DoubleDummySolver를 엔진 위의 완전 탐색과 비교한다
+
+    python -m pytest test_solver.py
+
+시드별로 녹화한 게임을 8-10장이 남은 국면(2트릭 이하)에서 자르고, MightyGame을
+복사해 가며 모든 합법 수(선 조커의 무늬 넷, 선 클로버 3의 조커콜 여부 포함)를
+minimax로 둔 값과 솔버의 값이 같은지 확인한다. 완전 탐색으로는 너무 오래
+걸리는 3-4트릭 국면은 transposition table과 하한/상한 자르기를 끈 솔버와
+비교한다.
+"""
+
+import copy
+
+import pytest
+
+from app.model.card import NORMAL_SUITS, Suit
+from app.model.mighty import MightyGame
+from app.model.solver import DoubleDummySolver, Position
+from benchmarks.games import record_game
+from benchmarks.solver import collect_positions
+
+SEEDS = range(70)
+
+
+def brute_force(game: MightyGame) -> int:
+    """엔진으로 남은 트릭을 모두 두어 본 주공팀 점수 (주공팀 최대화, 나머지 최소화)"""
+    team = {game.president_idx, game.friend_player_idx} - {None}
+
+    def points(g):
+        return sum(g.players[seat].points for seat in team)
+
+    base = points(game)
+
+    def search(g):
+        if g.phase != "playing":
+            return points(g) - base
+        idx = g.current_player_idx
+        values = []
+        for card in g.legal_moves(idx):
+            options = [(None, False)]
+            if not g.current_trick and card.is_joker():
+                options = [(suit, False) for suit in NORMAL_SUITS]
+            elif not g.current_trick and card.suit == Suit.CLOVER and card.rank == 3:
+                options = [(None, False), (None, True)]
+            for joker_suit, call_joker in options:
+                child = copy.deepcopy(g)
+                assert child.play_card(idx, card, joker_suit, call_joker)
+                values.append(search(child))
+        return max(values) if idx in team else min(values)
+
+    return search(game)
+
+
+def endgame(seed: int) -> MightyGame:
+    """seed 게임에서 8-10장이 남은 국면"""
+    start, moves = record_game(seed)
+    game = copy.deepcopy(start)
+    for card, joker_suit, call_joker in moves[: 40 + seed % 3]:
+        game.play_card(game.current_player_idx, card, joker_suit, call_joker)
+    return game
+
+
+@pytest.mark.parametrize("seed", SEEDS)
+def test_solver_matches_brute_force(seed):
+    game = endgame(seed)
+    if game.phase != "playing":
+        pytest.skip("남은 트릭이 없는 게임")
+    expected = brute_force(game)
+    assert DoubleDummySolver(Position.from_game(game)).solve() == expected
+
+
+class NoTable(dict):
+    """아무것도 저장하지 않는 transposition table"""
+
+    def __setitem__(self, key, value):
+        pass
+
+
+@pytest.mark.parametrize("tricks_left", [3, 4])
+def test_pruning_keeps_value(tricks_left):
+    for position in collect_positions(20, tricks_left):
+        plain = DoubleDummySolver(position)
+        plain.table = NoTable()
+        plain._bounds = lambda total: (0, total)
+        assert DoubleDummySolver(position).solve() == plain.solve()
+
+
+def test_best_moves_agree_with_solve():
+    game = endgame(0)
+    solver = DoubleDummySolver(Position.from_game(game))
+    value = solver.solve()
+    moves = DoubleDummySolver(Position.from_game(game)).best_moves()
+    assert moves[0][1] == value
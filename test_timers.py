@@ -0,0 +1,142 @@
+"""
+타이머 휠(app/lifecycle.py)과 그 위의 RoomReaper, TurnTimers를 확인한다
+
+    python -m pytest test_timers.py
+
+두 휠은 무작위 schedule/cancel/advance 순서를 만료 시각 dict로 된 기준 모델과
+비교한다. 칸 수를 작게 잡아 한 바퀴보다 먼 타이머와 위 휠의 내려보내기가
+자주 일어나게 한다.
+"""
+
+import random
+
+import pytest
+
+from app.game_manager import GameRoom
+from app.lifecycle import HierarchicalTimerWheel, RoomReaper, TimerWheel
+from app.turns import TurnTimers
+
+WHEELS = {
+    "hashed": lambda now: TimerWheel(tick=1.0, slots=8, now=now),
+    "hierarchical": lambda now: HierarchicalTimerWheel(
+        tick=1.0, slots=4, levels=3, now=now
+    ),
+}
+
+
+@pytest.mark.parametrize("kind", WHEELS)
+@pytest.mark.parametrize("seed", range(5))
+def test_wheel_matches_model(kind, seed):
+    rng = random.Random(seed)
+    now = rng.uniform(0, 100)
+    wheel = WHEELS[kind](now)
+    pending = {}  # 키 -> 만료 시각
+    for _ in range(3000):
+        op = rng.random()
+        if op < 0.5:
+            key = rng.randrange(40)
+            deadline = now + rng.choice((3, 40, 400)) * rng.random()
+            wheel.schedule(key, deadline)
+            pending[key] = deadline
+        elif op < 0.6:
+            key = rng.randrange(40)
+            wheel.cancel(key)
+            pending.pop(key, None)
+        else:
+            now += rng.choice((0, 2, 50)) * rng.random()
+            expected = sorted(
+                key for key, deadline in pending.items() if deadline <= now
+            )
+            assert sorted(wheel.advance(now)) == expected
+            for key in expected:
+                del pending[key]
+        assert len(wheel) == len(pending)
+
+
+@pytest.mark.parametrize("kind", WHEELS)
+def test_wheel_ignores_time_going_back(kind):
+    wheel = WHEELS[kind](10.0)
+    wheel.schedule("a", 12.0)
+    assert wheel.advance(5.0) == []
+    assert wheel.advance(12.0) == ["a"]
+
+
+def lobby_room(room_id="R1"):
+    return GameRoom(room_id, "host", "sid-host")
+
+
+def test_reaper_idle_lobby():
+    reaper = RoomReaper(idle_lobby=10, finished=5, grace=3, clock=lambda: 0.0)
+    room = lobby_room()
+    reaper.touch(room, now=0)
+    assert reaper.due(9) == []
+    # 활동이 있으면 타이머를 다시 건다
+    reaper.touch(room, now=5)
+    assert reaper.due(12) == []
+    assert reaper.due(15) == ["R1"]
+    assert reaper.reason(room, 15) == "idle_lobby"
+
+
+def test_reaper_abandoned_room():
+    reaper = RoomReaper(idle_lobby=10, finished=5, grace=3, clock=lambda: 0.0)
+    room = lobby_room()
+    reaper.touch(room, now=0)
+    for session in room.sessions.values():
+        session.disconnected_at = 2.0
+    reaper.schedule(room)
+    assert reaper.reason(room, 4) is None
+    assert reaper.due(5) == ["R1"]
+    assert reaper.reason(room, 5) == "abandoned"
+
+
+def test_reaper_forget():
+    reaper = RoomReaper(idle_lobby=10, clock=lambda: 0.0)
+    room = lobby_room()
+    reaper.touch(room, now=0)
+    reaper.forget("R1")
+    assert reaper.due(100) == []
+
+
+def started_room():
+    room = lobby_room()
+    for i in range(1, 5):
+        room.add_player(f"p{i}", f"sid-{i}")
+    room.start_game()
+    return room
+
+
+def test_turn_timer_expires_once():
+    timers = TurnTimers({"bidding": 30}, tick=0.5, clock=lambda: 0.0)
+    room = started_room()
+    seat = room.game.current_player_idx
+    timers.arm(room, now=0)
+    assert timers.due(29) == []
+    assert timers.due(30) == ["R1"]
+    assert timers.expired(room, 30) == seat
+    assert timers.expired(room, 31) is None
+    assert timers.timeouts_applied["bidding"] == 1
+
+
+def test_turn_timer_skips_moved_turn():
+    timers = TurnTimers({"bidding": 30}, tick=0.5, clock=lambda: 0.0)
+    room = started_room()
+    timers.arm(room, now=0)
+    # 차례가 넘어간 뒤에 만료된 타이머는 기본 행동을 두지 않는다
+    assert room.game.submit_bid(room.game.current_player_idx, None, None)
+    assert timers.due(30) == ["R1"]
+    assert timers.expired(room, 30) is None
+
+
+def test_turn_timer_not_armed_for_bots_or_untimed_phases():
+    room = started_room()
+    untimed = TurnTimers({}, clock=lambda: 0.0)
+    untimed.arm(room, now=0)
+    assert len(untimed) == 0
+
+    timers = TurnTimers({"bidding": 30}, clock=lambda: 0.0)
+    timers.arm(room, now=0)
+    assert len(timers) == 1
+    room.bot_names.add(room.game.players[room.game.current_player_idx].name)
+    timers.arm(room, now=1)
+    assert len(timers) == 0
+    assert timers.due(100) == []